@@ -9,8 +9,27 @@ Simple CRUD Interface for SQL Server Database
 import streamlit as st
 import pyodbc
 import pandas as pd
+import io
+import time
+import uuid
+from concurrent.futures import CancelledError, as_completed
 from datetime import datetime
 
+from db_config import CONNECTION_STRING, READ_REPLICA_CONNECTION_STRINGS, read_only
+from db_pool import ConnectionPool
+from db_router import LOGIN_TIMEOUT, Backend, DatabaseRouter, server_name
+from query_cache import QueryCache, is_cacheable, make_key, read_tables, written_tables
+from pagination import PAGE_SIZE_OPTIONS, KeysetQuery, SortKey, fetch_page
+from event_search import CITIES_SQL, EVENT_STATUSES, EVENT_TYPES, SEARCH_INSTALLED_SQL, events_query
+from lookups import TYPEAHEAD_LIMIT, search_bookings, search_customers, search_events
+from export import EXPORT_FORMATS, available_formats, export_query
+from columnar import available as columnar_available, read_frame
+from seat_map import AVAILABLE, BOOKED, SeatMapService
+from query_metrics import InstrumentedConnection, QueryMetrics, set_scope
+from background import BACKGROUND_WORKERS, BackgroundQueries, QueryCancelled
+from bulk_import import IMPORT_BATCH_SIZE, IMPORTS, import_csv
+from credentials import open_key_session
+
 # Page configuration
 st.set_page_config(
     page_title="Event Booking System",
@@ -18,49 +37,317 @@ st.set_page_config(
     layout="wide"
 )
 
-# Database connection configuration
+# Connection pool sizing (per Streamlit server process)
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 10
+POOL_CHECKOUT_TIMEOUT = 10  # seconds to wait for a free connection
+POOL_KEY_SESSION = True  # keep EventBookingSymKey open on pooled connections (encryption_script.sql)
+
+# Read replicas (EVENT_BOOKING_READ_REPLICAS, see db_config.py and read_replica_script.sql)
+REPLICA_MAX_STALENESS = 30  # seconds a replica may lag for Dashboard/View reads; 0 keeps them on the primary
+REPORT_MAX_STALENESS = 300  # report previews and exports tolerate more lag
+
+# Query result cache (per Streamlit server process)
+QUERY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+QUERY_CACHE_DEFAULT_TTL = 30  # seconds; pass ttl=0 to execute_query to bypass
+REPORT_CACHE_TTL = 300
+COUNT_CACHE_TTL = 60  # total row counts shown under paginated grids
+LOOKUP_CACHE_TTL = 15  # typeahead results for the Update/Delete tabs
+REPORT_PREVIEW_ROWS = 1000  # rows shown on screen; exports always include every row
+COLUMNAR_REPORTS = True  # report previews/exports as Arrow batches when arrow-odbc is installed (columnar.py)
+SEAT_MAP_TRACK_HOLDS = None  # None = show holds when SQL_Scripts/seat_hold_script.sql is installed
+SEAT_MAP_MAX_AGE = 5  # seconds before a seat map re-checks the database for other sessions' bookings
+DASHBOARD_STATS = None  # Dashboard totals from DASHBOARD_STATS; None = when SQL_Scripts/dashboard_stats_script.sql is installed
+EVENT_SEARCH = None  # search box and date/city filters on View Events; None = when SQL_Scripts/search_script.sql is installed
+SLOW_QUERY_MS = 500  # queries at least this slow go to the slow-query log
+SLOW_QUERY_LOG = "slow_queries.log"  # JSON lines; None keeps the log in memory only
+
 @st.cache_resource
-def get_connection():
-    """Create database connection"""
-    try:
-        conn = pyodbc.connect(
-            'DRIVER={ODBC Driver 17 for SQL Server};'
-            'SERVER=localhost,1433;'  # Change to your server
-            'DATABASE=EventBookingSystem;'
-            'UID=sa;'  # Change to your username
-            'PWD=Aggysalve@2627;'  # Change to your password
-            'TrustServerCertificate=yes;'
+def get_query_metrics():
+    """Create the shared query timing/slow-query store shown on the Performance page"""
+    return QueryMetrics(slow_query_ms=SLOW_QUERY_MS, slow_log_path=SLOW_QUERY_LOG)
+
+@st.cache_resource
+def get_connection_pool():
+    """Create the shared database connection pool (every cursor it hands out is timed)"""
+    metrics = get_query_metrics()
+    return ConnectionPool(
+        lambda: InstrumentedConnection(pyodbc.connect(CONNECTION_STRING), metrics),
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        checkout_timeout=POOL_CHECKOUT_TIMEOUT,
+        on_connect=open_key_session if POOL_KEY_SESSION else None
+    )
+
+@st.cache_resource
+def get_router():
+    """Create the read/write router over the primary pool and one pool per read replica"""
+    metrics = get_query_metrics()
+    replicas = []
+    for replica_string in map(read_only, READ_REPLICA_CONNECTION_STRINGS):
+        pool = ConnectionPool(
+            lambda conn_str=replica_string: InstrumentedConnection(
+                pyodbc.connect(conn_str, timeout=LOGIN_TIMEOUT), metrics
+            ),
+            min_size=0,  # a replica that is down must not hold up startup
+            max_size=POOL_MAX_SIZE,
+            checkout_timeout=POOL_CHECKOUT_TIMEOUT
         )
-        return conn
-    except Exception as e:
-        st.error(f"Database connection failed: {e}")
-        return None
+        replicas.append(Backend(server_name(replica_string), pool, replica_string))
+    primary = Backend("primary", get_connection_pool(), CONNECTION_STRING)
+    return DatabaseRouter(primary, replicas, max_staleness=REPLICA_MAX_STALENESS)
 
-def execute_query(query, params=None, fetch=True):
-    """Execute SQL query"""
-    conn = get_connection()
-    if conn is None:
-        return None
-    
-    try:
+@st.cache_resource
+def get_query_cache():
+    """Create the shared query result cache"""
+    return QueryCache(max_bytes=QUERY_CACHE_MAX_BYTES, default_ttl=QUERY_CACHE_DEFAULT_TTL)
+
+def _fetch_rows(query, params):
+    """Run a SELECT on a pooled primary connection and return plain row tuples (errors propagate)"""
+    with get_connection_pool().connection() as conn:
         cursor = conn.cursor()
-        if params:
+        try:
             cursor.execute(query, params)
+            return [tuple(row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+
+@st.cache_resource
+def get_seat_map_service():
+    """Create the shared per-show seat availability bitmaps"""
+    return SeatMapService(_fetch_rows, track_holds=SEAT_MAP_TRACK_HOLDS, max_age=SEAT_MAP_MAX_AGE)
+
+def invalidate_tables(*tables):
+    """Evict cached results that read any of the given tables"""
+    get_query_cache().invalidate_tables(set(tables))
+
+def note_write():
+    """Remember when this session last wrote, so its reads skip replicas that do not have it yet"""
+    st.session_state["last_write_at"] = time.monotonic()
+
+@st.cache_resource
+def get_background_queries():
+    """Create the shared worker pool for running a page's queries concurrently"""
+    return BackgroundQueries(max_workers=BACKGROUND_WORKERS)
+
+def _execute(pool, cache, query, params, fetch, token):
+    """Run SQL on a connection from pool; a DataFrame for fetch, else commit and evict what it wrote"""
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            if token is not None:
+                token.attach(cursor)
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            
+            if fetch:
+                columns = [column[0] for column in cursor.description]
+                results = cursor.fetchall()
+                return pd.DataFrame.from_records(results, columns=columns)
+            else:
+                conn.commit()
+                cache.invalidate_tables(written_tables(query))
+                return True
+        finally:
+            if token is not None:
+                token.detach(cursor)
+            cursor.close()
+
+def _run_query(router, cache, query, params=None, fetch=True, ttl=None, token=None, columnar_metrics=None,
+               max_staleness=None, written_at=None):
+    """
+    Execute SQL through the read/write router, serving SELECTs from the result cache.
+    
+    Raises on error and makes no st.* calls, so it is safe on background threads.
+    token is the CancelToken of a background run; its cursor is cancelled when the
+    page is rerun before the query finishes.
+    columnar_metrics (a QueryMetrics) reads a SELECT into an Arrow-backed DataFrame
+    with arrow-odbc instead, when it is installed, timing it into those metrics.
+    SELECT-only statements may run on a read replica at most max_staleness seconds
+    behind that already has written_at (the session's last write); anything else
+    runs on the primary.
+    """
+    cacheable = fetch and ttl != 0 and is_cacheable(query)
+    
+    if cacheable:
+        key = make_key(query, params)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    def run(backend):
+        started = time.monotonic()
+        if fetch and columnar_metrics is not None and columnar_available():
+            result = read_frame(query, params, token=token, metrics=columnar_metrics,
+                                connection_string=backend.connection_string)
         else:
-            cursor.execute(query)
-        
-        if fetch:
-            columns = [column[0] for column in cursor.description]
-            results = cursor.fetchall()
-            return pd.DataFrame.from_records(results, columns=columns)
-        else:
-            conn.commit()
-            return True
+            result = _execute(backend.pool, cache, query, params, fetch, token)
+        if cacheable:
+            cache.put(key, result, read_tables(query), ttl, as_of=backend.as_of(started))
+        return result
+    
+    if fetch and is_cacheable(query):
+        return router.read(run, max_staleness, written_at)
+    return router.write(run)
+
+def execute_query(query, params=None, fetch=True, ttl=None, max_staleness=None):
+    """Execute SQL query through the read/write router, serving SELECTs from the result cache"""
+    try:
+        result = _run_query(get_router(), get_query_cache(), query, params, fetch, ttl,
+                            max_staleness=max_staleness, written_at=st.session_state.get("last_write_at"))
+    except Exception as e:
+        st.error(f"Query error: {e}")
+        return None
+    if not (fetch and is_cacheable(query)):
+        note_write()
+    return result
+
+def submit_query(query, params=None, ttl=None, columnar=False, max_staleness=None):
+    """Start a SELECT on the background pool; collect it with query_result()"""
+    return query_run.submit(_run_query, get_router(), get_query_cache(), query, params, True, ttl,
+                            columnar_metrics=get_query_metrics() if columnar else None,
+                            max_staleness=max_staleness, written_at=st.session_state.get("last_write_at"))
+
+def query_result(future):
+    """DataFrame of a submitted query, or None after showing its error"""
+    try:
+        return future.result()
+    except (QueryCancelled, CancelledError):
+        return None
     except Exception as e:
         st.error(f"Query error: {e}")
         return None
-    finally:
-        cursor.close()
+
+DASHBOARD_STATS_INSTALLED_SQL = "SELECT OBJECT_ID('DASHBOARD_STATS', 'U') AS StatsTable"
+
+def dashboard_stats_enabled():
+    """DASHBOARD_STATS, or when it is None whether dashboard_stats_script.sql is installed (re-checked every REPORT_CACHE_TTL)"""
+    if DASHBOARD_STATS is not None:
+        return DASHBOARD_STATS
+    installed = execute_query(DASHBOARD_STATS_INSTALLED_SQL, ttl=REPORT_CACHE_TTL)
+    return installed is not None and installed["StatsTable"].notna().any()
+
+def event_search_enabled():
+    """EVENT_SEARCH, or when it is None whether search_script.sql is installed (re-checked every REPORT_CACHE_TTL)"""
+    if EVENT_SEARCH is not None:
+        return EVENT_SEARCH
+    installed = execute_query(SEARCH_INSTALLED_SQL, ttl=REPORT_CACHE_TTL)
+    return installed is not None and installed["SearchFunction"].notna().any()
+
+def _set_page(grid, after, before, step):
+    """Move a paginated grid to the page after/before a cursor"""
+    state = st.session_state[f"{grid}_page"]
+    state["after"] = after
+    state["before"] = before
+    state["number"] += step
+
+def render_keyset_grid(grid, keyset_query, label):
+    """Render one keyset-paginated page of a grid with Prev/Next navigation"""
+    page_size = st.selectbox("Rows per page", PAGE_SIZE_OPTIONS, key=f"{grid}_page_size")
+    
+    # Start over from the first page whenever filters or page size change
+    state = st.session_state.setdefault(f"{grid}_page", {})
+    signature = (keyset_query.signature(), page_size)
+    if state.get("signature") != signature:
+        state.update(signature=signature, after=None, before=None, number=1)
+    
+    page = fetch_page(execute_query, keyset_query, page_size, after=state["after"], before=state["before"])
+    if page is None:
+        return
+    if page.rows.empty:
+        st.warning(f"No {label.lower()} found")
+        return
+    if page.prev_cursor is None:
+        state["number"] = 1
+    
+    st.dataframe(page.rows, use_container_width=True)
+    
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        st.button("◀ Prev", key=f"{grid}_prev", disabled=page.prev_cursor is None,
+                  on_click=_set_page, args=(grid, None, page.prev_cursor, -1))
+    with col2:
+        st.button("Next ▶", key=f"{grid}_next", disabled=page.next_cursor is None,
+                  on_click=_set_page, args=(grid, page.next_cursor, None, 1))
+    with col3:
+        count_sql, count_params = keyset_query.count_sql()
+        total = execute_query(count_sql, count_params, ttl=COUNT_CACHE_TTL)
+        if total is not None and not total.empty:
+            st.info(f"Page {state['number']} | Total {label}: {int(total['Total'].iloc[0]):,}")
+
+def typeahead_select(label, key, search, hint):
+    """
+    Search box plus a selectbox of at most TYPEAHEAD_LIMIT matches.
+    
+    The search only runs when the text box is submitted (Enter or focus change),
+    which debounces keystrokes; each lookup is a bounded index seek and is cached.
+    """
+    term = st.text_input(f"Search {label}", key=f"{key}_term",
+                         placeholder=f"Search by {hint}, then press Enter")
+    
+    sql, params = search(term, TYPEAHEAD_LIMIT)
+    matches = execute_query(sql, params, ttl=LOOKUP_CACHE_TTL)
+    if matches is None:
+        return None
+    if matches.empty:
+        st.info(f"No {label.lower()}s match '{term}'")
+        return None
+    
+    options = dict(zip(matches['Label'], matches['ID']))
+    selected = st.selectbox(f"Select {label}", list(options.keys()), key=f"{key}_select")
+    if len(matches) == TYPEAHEAD_LIMIT:
+        st.caption(f"Showing the first {TYPEAHEAD_LIMIT} matches - refine the search to narrow it down")
+    return int(options[selected])
+
+def submit_report_preview(view, order_by):
+    """Start loading the top REPORT_PREVIEW_ROWS rows of a report view in the background"""
+    preview_query = f"SELECT TOP (?) * FROM {view} ORDER BY {order_by}"
+    return submit_query(preview_query, (REPORT_PREVIEW_ROWS,), ttl=REPORT_CACHE_TTL, columnar=COLUMNAR_REPORTS,
+                        max_staleness=REPORT_MAX_STALENESS)
+
+def render_report(key, view, order_by, label, preview):
+    """
+    Show the preview rows of a report view and offer a streamed export of all of it.
+    
+    The export is only produced when requested and is written chunk by chunk to a
+    spooled temp file, so the full report is never held in a DataFrame.
+    """
+    if preview is None or preview.empty:
+        return
+    
+    st.dataframe(preview, use_container_width=True)
+    if len(preview) == REPORT_PREVIEW_ROWS:
+        st.caption(f"Showing the first {REPORT_PREVIEW_ROWS:,} rows - the download includes every row")
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Format", available_formats(), key=f"{key}_format", label_visibility="collapsed")
+    with col2:
+        prepare = st.button(f"Prepare {label}", key=f"{key}_prepare")
+    
+    if prepare:
+        extension, mime = EXPORT_FORMATS[fmt]
+        try:
+            with st.spinner(f"Exporting {label}..."):
+                export_file, row_count = get_router().read(
+                    lambda backend: export_query(
+                        backend.pool, f"SELECT * FROM {view} ORDER BY {order_by}", fmt=fmt,
+                        columnar=COLUMNAR_REPORTS, connection_string=backend.connection_string
+                    ),
+                    REPORT_MAX_STALENESS, st.session_state.get("last_write_at")
+                )
+            with export_file:
+                st.download_button(
+                    label=f"Download {label} ({row_count:,} rows)",
+                    data=export_file.read(),
+                    file_name=f"{key}.{extension}",
+                    mime=mime,
+                    key=f"{key}_download"
+                )
+        except Exception as e:
+            st.error(f"Export error: {e}")
 
 # =============================================
 # SIDEBAR NAVIGATION
@@ -71,12 +358,26 @@ st.sidebar.markdown("---")
 
 menu = st.sidebar.radio(
     "Navigation",
-    ["Dashboard", "Customers", "Events", "Bookings", "Reports"]
+    ["Dashboard", "Customers", "Events", "Bookings", "Reports", "Import", "Performance"]
 )
+set_scope(menu)
+
+# Background queries of this script run; a rerun cancels whatever the previous one left running
+session_key = st.session_state.setdefault("session_key", uuid.uuid4().hex)
+query_run = get_background_queries().begin_run(session_key)
 
 st.sidebar.markdown("---")
 st.sidebar.info("Group 5 - DAMG6210\nNortheastern University")
 
+with st.sidebar.expander("Query Cache"):
+    cache_stats = get_query_cache().stats()
+    st.caption(
+        f"Hits: {cache_stats['hits']} | Misses: {cache_stats['misses']} | "
+        f"Hit rate: {cache_stats['hit_rate']:.0%}\n\n"
+        f"Entries: {cache_stats['entries']} ({cache_stats['bytes'] / 1024:,.0f} KB) | "
+        f"Evictions: {cache_stats['evictions']} | Invalidations: {cache_stats['invalidations']}"
+    )
+
 # =============================================
 # DASHBOARD PAGE
 # =============================================
@@ -84,16 +385,45 @@ st.sidebar.info("Group 5 - DAMG6210\nNortheastern University")
 if menu == "Dashboard":
     st.title("📊 Dashboard")
     
-    # Get statistics
-    stats_query = """
-    SELECT 
-        (SELECT COUNT(*) FROM CUSTOMER) AS TotalCustomers,
-        (SELECT COUNT(*) FROM EVENT WHERE Status = 'Scheduled') AS UpcomingEvents,
-        (SELECT COUNT(*) FROM BOOKING WHERE BookingStatus = 'Confirmed') AS ActiveBookings,
-        (SELECT ISNULL(SUM(TotalAmount), 0) FROM BOOKING WHERE BookingStatus IN ('Confirmed', 'Completed')) AS TotalRevenue
+    # Get statistics (maintained incrementally by triggers when dashboard_stats_script.sql is installed)
+    if dashboard_stats_enabled():
+        stats_query = """
+        SELECT 
+            SUM(TotalCustomers) AS TotalCustomers,
+            SUM(UpcomingEvents) AS UpcomingEvents,
+            SUM(ActiveBookings) AS ActiveBookings,
+            SUM(TotalRevenue) AS TotalRevenue
+        FROM DASHBOARD_STATS
+        """
+    else:
+        stats_query = """
+        SELECT 
+            (SELECT COUNT(*) FROM CUSTOMER) AS TotalCustomers,
+            (SELECT COUNT(*) FROM EVENT WHERE Status = 'Scheduled') AS UpcomingEvents,
+            (SELECT COUNT(*) FROM BOOKING WHERE BookingStatus = 'Confirmed') AS ActiveBookings,
+            (SELECT ISNULL(SUM(TotalAmount), 0) FROM BOOKING WHERE BookingStatus IN ('Confirmed', 'Completed')) AS TotalRevenue
+        """
+    
+    recent_bookings_query = """
+    SELECT TOP 10
+        B.BookingID,
+        U.FirstName + ' ' + U.LastName AS CustomerName,
+        E.Title AS EventName,
+        B.BookingDateTime,
+        B.TotalAmount,
+        B.BookingStatus
+    FROM BOOKING B
+    INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
+    INNER JOIN [USER] U ON C.UserID = U.UserID
+    INNER JOIN EVENT E ON B.EventID = E.EventID
+    ORDER BY B.BookingDateTime DESC
     """
     
-    stats = execute_query(stats_query)
+    # Both queries run concurrently; each section renders as soon as its own result is in
+    stats_future = submit_query(stats_query)
+    recent_bookings_future = submit_query(recent_bookings_query)
+    
+    stats = query_result(stats_future)
     
     if stats is not None and not stats.empty:
         col1, col2, col3, col4 = st.columns(4)
@@ -115,22 +445,7 @@ if menu == "Dashboard":
     
     # Recent bookings
     st.subheader("📋 Recent Bookings")
-    recent_bookings_query = """
-    SELECT TOP 10
-        B.BookingID,
-        U.FirstName + ' ' + U.LastName AS CustomerName,
-        E.Title AS EventName,
-        B.BookingDateTime,
-        B.TotalAmount,
-        B.BookingStatus
-    FROM BOOKING B
-    INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
-    INNER JOIN [USER] U ON C.UserID = U.UserID
-    INNER JOIN EVENT E ON B.EventID = E.EventID
-    ORDER BY B.BookingDateTime DESC
-    """
-    
-    recent_bookings = execute_query(recent_bookings_query)
+    recent_bookings = query_result(recent_bookings_future)
     if recent_bookings is not None and not recent_bookings.empty:
         st.dataframe(recent_bookings, use_container_width=True)
     else:
@@ -147,31 +462,30 @@ elif menu == "Customers":
     
     # TAB 1: View Customers
     with tab1:
+        set_scope(menu, "View Customers")
         st.subheader("All Customers")
         
-        customers_query = """
-        SELECT 
-            C.CustomerID,
-            U.FirstName,
-            U.LastName,
-            U.Email,
-            U.PhoneNumber,
-            C.LoyaltyPoints
-        FROM CUSTOMER C
-        INNER JOIN [USER] U ON C.UserID = U.UserID
-        ORDER BY C.CustomerID
-        """
-        
-        customers = execute_query(customers_query)
+        customers_page_query = KeysetQuery(
+            """
+            SELECT 
+                C.CustomerID,
+                U.FirstName,
+                U.LastName,
+                U.Email,
+                U.PhoneNumber,
+                C.LoyaltyPoints
+            FROM CUSTOMER C
+            INNER JOIN [USER] U ON C.UserID = U.UserID
+            """,
+            sort_keys=[SortKey("C.CustomerID", "CustomerID")],
+            count_from="CUSTOMER C"
+        )
         
-        if customers is not None and not customers.empty:
-            st.dataframe(customers, use_container_width=True)
-            st.info(f"Total Customers: {len(customers)}")
-        else:
-            st.warning("No customers found")
+        render_keyset_grid("customers", customers_page_query, "Customers")
     
     # TAB 2: Add Customer
     with tab2:
+        set_scope(menu, "Add Customer")
         st.subheader("Add New Customer")
         
         with st.form("add_customer_form"):
@@ -198,27 +512,30 @@ elif menu == "Customers":
                         VALUES (?, ?, ?, ?, 'TEMP_HASH', 'Customer', NULL, NULL, NULL)
                         """
                         
-                        conn = get_connection()
-                        cursor = conn.cursor()
-                        cursor.execute(user_query, (first_name, last_name, email, phone_number))
-                        user_id = cursor.fetchone()[0]
-                        
-                        # Insert into CUSTOMER table
-                        customer_query = """
-                        INSERT INTO CUSTOMER (UserID, LoyaltyPoints)
-                        OUTPUT INSERTED.CustomerID
-                        VALUES (?, ?)
-                        """
-                        cursor.execute(customer_query, (user_id, loyalty_points))
-                        customer_id = cursor.fetchone()[0]
-                        
-                        # Update USER with CustomerID
-                        update_query = "UPDATE [USER] SET CustomerID = ? WHERE UserID = ?"
-                        cursor.execute(update_query, (customer_id, user_id))
-                        
-                        conn.commit()
-                        cursor.close()
-                        
+                        with get_connection_pool().connection() as conn:
+                            cursor = conn.cursor()
+                            cursor.execute(user_query, (first_name, last_name, email, phone_number))
+                            user_id = cursor.fetchone()[0]
+                            
+                            # Insert into CUSTOMER table
+                            customer_query = """
+                            INSERT INTO CUSTOMER (UserID, LoyaltyPoints)
+                            OUTPUT INSERTED.CustomerID
+                            VALUES (?, ?)
+                            """
+                            cursor.execute(customer_query, (user_id, loyalty_points))
+                            customer_id = cursor.fetchone()[0]
+                            
+                            # Update USER with CustomerID
+                            update_query = "UPDATE [USER] SET CustomerID = ? WHERE UserID = ?"
+                            cursor.execute(update_query, (customer_id, user_id))
+                            
+                            conn.commit()
+                            cursor.close()
+                        # This transaction bypasses execute_query, so evict what it wrote here
+                        invalidate_tables(*written_tables(user_query + customer_query + update_query))
+                        note_write()
+                            
                         st.success(f"✅ Customer added successfully! Customer ID: {customer_id}")
                         st.balloons()
                     except Exception as e:
@@ -228,17 +545,13 @@ elif menu == "Customers":
     
     # TAB 3: Update/Delete Customer
     with tab3:
+        set_scope(menu, "Update/Delete")
         st.subheader("Update or Delete Customer")
         
-        customers = execute_query(customers_query)
+        customer_id = typeahead_select("Customer", "customer_lookup", search_customers,
+                                       "ID, email, or first/last name")
         
-        if customers is not None and not customers.empty:
-            customer_options = {f"{row['CustomerID']} - {row['FirstName']} {row['LastName']}": row['CustomerID'] 
-                              for _, row in customers.iterrows()}
-            
-            selected_customer = st.selectbox("Select Customer", list(customer_options.keys()))
-            customer_id = customer_options[selected_customer]
-            
+        if customer_id is not None:
             # Get customer details
             customer_detail_query = """
             SELECT 
@@ -274,29 +587,31 @@ elif menu == "Customers":
                         
                         if update_button:
                             try:
-                                conn = get_connection()
-                                cursor = conn.cursor()
-                                
-                                # Update USER
-                                update_user_query = """
-                                UPDATE [USER] 
-                                SET FirstName = ?, LastName = ?, Email = ?, PhoneNumber = ?
-                                WHERE UserID = ?
-                                """
-                                cursor.execute(update_user_query, 
-                                             (new_first_name, new_last_name, new_email, new_phone, customer['UserID']))
-                                
-                                # Update CUSTOMER
-                                update_customer_query = """
-                                UPDATE CUSTOMER 
-                                SET LoyaltyPoints = ?
-                                WHERE CustomerID = ?
-                                """
-                                cursor.execute(update_customer_query, (new_loyalty, customer_id))
-                                
-                                conn.commit()
-                                cursor.close()
-                                
+                                with get_connection_pool().connection() as conn:
+                                    cursor = conn.cursor()
+                                    
+                                    # Update USER
+                                    update_user_query = """
+                                    UPDATE [USER] 
+                                    SET FirstName = ?, LastName = ?, Email = ?, PhoneNumber = ?
+                                    WHERE UserID = ?
+                                    """
+                                    cursor.execute(update_user_query, 
+                                                 (new_first_name, new_last_name, new_email, new_phone, customer['UserID']))
+                                    
+                                    # Update CUSTOMER
+                                    update_customer_query = """
+                                    UPDATE CUSTOMER 
+                                    SET LoyaltyPoints = ?
+                                    WHERE CustomerID = ?
+                                    """
+                                    cursor.execute(update_customer_query, (new_loyalty, customer_id))
+                                    
+                                    conn.commit()
+                                    cursor.close()
+                                invalidate_tables(*written_tables(update_user_query + update_customer_query))
+                                note_write()
+                                    
                                 st.success("✅ Customer updated successfully!")
                                 st.rerun()
                             except Exception as e:
@@ -323,56 +638,64 @@ elif menu == "Customers":
 elif menu == "Events":
     st.title("📅 Event Management")
     
+    # Organizers for the Add Event dropdown and cities for the search filter load in the background
+    organizers_query = "SELECT OrganizerID, CompanyName FROM ORGANIZER ORDER BY CompanyName"
+    organizers_future = submit_query(organizers_query)
+    event_search = event_search_enabled()
+    cities_future = submit_query(CITIES_SQL, ttl=REPORT_CACHE_TTL) if event_search else None
+    
     tab1, tab2, tab3 = st.tabs(["View Events", "Add Event", "Update/Delete"])
     
     # TAB 1: View Events
     with tab1:
+        set_scope(menu, "View Events")
         st.subheader("All Events")
         
+        search_text = None
+        if event_search:
+            search_text = st.text_input("Search events", key="event_search",
+                                        placeholder="Title, genre, team, tournament, venue, theater or city")
+        
         # Filter options
         col1, col2 = st.columns(2)
         with col1:
-            event_type_filter = st.selectbox("Filter by Type", ["All", "Movie", "Sport", "Exhibition"])
+            event_type_filter = st.selectbox("Filter by Type", ["All"] + EVENT_TYPES)
         with col2:
-            status_filter = st.selectbox("Filter by Status", ["All", "Scheduled", "Ongoing", "Completed", "Cancelled"])
-        
-        events_query = """
-        SELECT 
-            E.EventID,
-            E.Title,
-            E.EventType,
-            E.Status,
-            E.StartDateTime,
-            E.EndDateTime,
-            E.Duration,
-            O.CompanyName AS Organizer
-        FROM EVENT E
-        LEFT JOIN ORGANIZER O ON E.OrganizerID = O.OrganizerID
-        WHERE 1=1
-        """
+            status_filter = st.selectbox("Filter by Status", ["All"] + EVENT_STATUSES)
         
-        if event_type_filter != "All":
-            events_query += f" AND E.EventType = '{event_type_filter}'"
-        if status_filter != "All":
-            events_query += f" AND E.Status = '{status_filter}'"
-        
-        events_query += " ORDER BY E.StartDateTime DESC"
+        date_range = ()
+        city_filter = "All"
+        if event_search:
+            col1, col2 = st.columns(2)
+            with col1:
+                date_range = st.date_input("Starting between", value=(), key="event_date_range")
+            with col2:
+                cities = query_result(cities_future)
+                city_options = ["All"] + (cities["City"].tolist() if cities is not None else [])
+                city_filter = st.selectbox("Filter by City", city_options)
         
-        events = execute_query(events_query)
+        # Everything is bound as parameters. Search text pages through the ranked results of
+        # tvf_SearchEvents (search_script.sql); otherwise paging seeks on IX_Event_StartDateTime,
+        # or on IX_Event_Status_StartDateTime / IX_Event_Type_StartDateTime /
+        # IX_Event_Type_Status_StartDateTime when filtered
+        events_page_query = events_query(
+            search_text,
+            event_type=None if event_type_filter == "All" else event_type_filter,
+            status=None if status_filter == "All" else status_filter,
+            start_date=date_range[0] if len(date_range) > 0 else None,
+            end_date=date_range[1] if len(date_range) > 1 else None,
+            city=None if city_filter == "All" else city_filter
+        )
         
-        if events is not None and not events.empty:
-            st.dataframe(events, use_container_width=True)
-            st.info(f"Total Events: {len(events)}")
-        else:
-            st.warning("No events found")
+        render_keyset_grid("events", events_page_query, "Events")
     
     # TAB 2: Add Event
     with tab2:
+        set_scope(menu, "Add Event")
         st.subheader("Add New Event")
         
         # Get organizers for dropdown
-        organizers_query = "SELECT OrganizerID, CompanyName FROM ORGANIZER ORDER BY CompanyName"
-        organizers = execute_query(organizers_query)
+        organizers = query_result(organizers_future)
         
         with st.form("add_event_form"):
             col1, col2 = st.columns(2)
@@ -422,18 +745,12 @@ elif menu == "Events":
     
     # TAB 3: Update/Delete Event
     with tab3:
+        set_scope(menu, "Update/Delete")
         st.subheader("Update or Delete Event")
         
-        events_query = "SELECT EventID, Title FROM EVENT ORDER BY StartDateTime DESC"
-        events = execute_query(events_query)
+        event_id = typeahead_select("Event", "event_lookup", search_events, "ID or title")
         
-        if events is not None and not events.empty:
-            event_options = {f"{row['EventID']} - {row['Title']}": row['EventID'] 
-                           for _, row in events.iterrows()}
-            
-            selected_event = st.selectbox("Select Event", list(event_options.keys()))
-            event_id = event_options[selected_event]
-            
+        if event_id is not None:
             # Get event details
             event_detail_query = "SELECT * FROM EVENT WHERE EventID = ?"
             event_detail = execute_query(event_detail_query, (event_id,))
@@ -488,56 +805,56 @@ elif menu == "Events":
 elif menu == "Bookings":
     st.title("🎫 Booking Management")
     
-    tab1, tab2 = st.tabs(["View Bookings", "Update/Delete"])
+    tab1, tab2, tab3 = st.tabs(["View Bookings", "Update/Delete", "Seat Map"])
     
     # TAB 1: View Bookings
     with tab1:
+        set_scope(menu, "View Bookings")
         st.subheader("All Bookings")
         
         # Filter
         status_filter = st.selectbox("Filter by Status", ["All", "Confirmed", "Cancelled", "Completed"])
         
-        bookings_query = """
-        SELECT 
-            B.BookingID,
-            U.FirstName + ' ' + U.LastName AS CustomerName,
-            E.Title AS EventName,
-            B.BookingDateTime,
-            B.TotalAmount,
-            B.BookingStatus
-        FROM BOOKING B
-        INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
-        INNER JOIN [USER] U ON C.UserID = U.UserID
-        INNER JOIN EVENT E ON B.EventID = E.EventID
-        WHERE 1=1
-        """
-        
+        # Filters are bound as parameters; paging seeks on IX_Booking_BookingDateTime, or on
+        # IX_Booking_Status_DateTime when filtered (BookingDateTime DESC, then the clustered
+        # BookingID ascending)
+        booking_filters = []
         if status_filter != "All":
-            bookings_query += f" AND B.BookingStatus = '{status_filter}'"
+            booking_filters.append(("B.BookingStatus = ?", (status_filter,)))
         
-        bookings_query += " ORDER BY B.BookingDateTime DESC"
-        
-        bookings = execute_query(bookings_query)
+        bookings_page_query = KeysetQuery(
+            """
+            SELECT 
+                B.BookingID,
+                U.FirstName + ' ' + U.LastName AS CustomerName,
+                E.Title AS EventName,
+                B.BookingDateTime,
+                B.TotalAmount,
+                B.BookingStatus
+            FROM BOOKING B
+            INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
+            INNER JOIN [USER] U ON C.UserID = U.UserID
+            INNER JOIN EVENT E ON B.EventID = E.EventID
+            """,
+            sort_keys=[
+                SortKey("B.BookingDateTime", "BookingDateTime", descending=True, sql_type="DATETIME"),
+                SortKey("B.BookingID", "BookingID")
+            ],
+            filters=booking_filters,
+            count_from="BOOKING B"
+        )
         
-        if bookings is not None and not bookings.empty:
-            st.dataframe(bookings, use_container_width=True)
-            st.info(f"Total Bookings: {len(bookings)}")
-        else:
-            st.warning("No bookings found")
+        render_keyset_grid("bookings", bookings_page_query, "Bookings")
     
     # TAB 2: Update/Delete Booking
     with tab2:
+        set_scope(menu, "Update/Delete")
         st.subheader("Update or Delete Booking")
         
-        bookings = execute_query(bookings_query)
+        booking_id = typeahead_select("Booking", "booking_lookup", search_bookings,
+                                      "booking ID, or customer email/last name")
         
-        if bookings is not None and not bookings.empty:
-            booking_options = {f"{row['BookingID']} - {row['CustomerName']} - {row['EventName']}": row['BookingID'] 
-                             for _, row in bookings.iterrows()}
-            
-            selected_booking = st.selectbox("Select Booking", list(booking_options.keys()))
-            booking_id = booking_options[selected_booking]
-            
+        if booking_id is not None:
             # Get booking details
             booking_detail_query = "SELECT * FROM BOOKING WHERE BookingID = ?"
             booking_detail = execute_query(booking_detail_query, (booking_id,))
@@ -577,13 +894,62 @@ elif menu == "Bookings":
                     
                     if st.button("Delete Booking", type="primary"):
                         try:
+                            # Seats freed by the cascade, so the seat maps can be updated in place
+                            freed_seats = execute_query(
+                                "SELECT ShowID, SeatID FROM SEAT_BOOKING WHERE BookingID = ?",
+                                (booking_id,), ttl=0, max_staleness=0
+                            )
                             delete_query = "DELETE FROM BOOKING WHERE BookingID = ?"
-                            execute_query(delete_query, (booking_id,), fetch=False)
+                            if execute_query(delete_query, (booking_id,), fetch=False) and freed_seats is not None:
+                                for show_id, seats in freed_seats.groupby("ShowID"):
+                                    get_seat_map_service().release(int(show_id), seats["SeatID"].astype(int).tolist())
                             
                             st.success("✅ Booking deleted successfully!")
                             st.rerun()
                         except Exception as e:
                             st.error(f"Error deleting booking: {e}")
+    
+    # TAB 3: Seat Map
+    with tab3:
+        set_scope(menu, "Seat Map")
+        st.subheader("Seat Availability")
+        
+        shows = execute_query("""
+            SELECT TOP 200
+                SH.ShowID,
+                CONCAT(SH.ShowID, ' - ', E.Title, ' (', CONVERT(VARCHAR(16), SH.ShowDateTime, 120), ')') AS Label
+            FROM SHOW SH
+            INNER JOIN EVENT E ON SH.EventID = E.EventID
+            ORDER BY SH.ShowDateTime DESC
+        """, ttl=LOOKUP_CACHE_TTL)
+        
+        if shows is not None and not shows.empty:
+            show_ids = dict(zip(shows['Label'], shows['ShowID']))
+            show_id = int(show_ids[st.selectbox("Show", list(show_ids))])
+            
+            try:
+                seat_maps = get_seat_map_service()
+                
+                col1, col2 = st.columns(2)
+                col1.metric("Available Seats", seat_maps.available_count(show_id))
+                with col2:
+                    together = st.number_input("Seats together", min_value=1, max_value=20, value=2)
+                    best_seats = seat_maps.find_contiguous(show_id, int(together))
+                    if best_seats:
+                        st.write(f"First {int(together)} adjacent seats: {', '.join(map(str, best_seats))}")
+                    else:
+                        st.write(f"No {int(together)} adjacent seats left")
+                
+                # One grid row per seat row: green available, red booked, yellow held
+                symbols = {AVAILABLE: "🟩", BOOKED: "🟥"}
+                seat_grid = pd.DataFrame({
+                    row_number: {seat_number: symbols.get(status, "🟨") for _, seat_number, _, status in seats}
+                    for row_number, seats in seat_maps.seat_map(show_id).items()
+                }).T
+                st.dataframe(seat_grid, use_container_width=True)
+                st.caption("🟩 available · 🟥 booked · 🟨 held")
+            except Exception as e:
+                st.error(f"Error loading seat map: {e}")
 
 # =============================================
 # REPORTS PAGE
@@ -592,66 +958,137 @@ elif menu == "Bookings":
 elif menu == "Reports":
     st.title("📈 Reports")
     
-    # Customer Summary Report
-    st.subheader("Customer Summary Report")
-    customer_report_query = """
-    SELECT * FROM vw_CustomerBookingSummary
-    ORDER BY TotalSpent DESC
-    """
-    customer_report = execute_query(customer_report_query)
+    reports = [
+        ("customer_report", "Customer Summary Report", "vw_CustomerBookingSummary", "TotalSpent DESC", "Customer Report"),
+        ("event_report", "Event Performance Report", "vw_EventPerformanceDashboard", "TotalRevenue DESC", "Event Report"),
+        ("theater_report", "Theater Screen Utilization Report", "vw_TheaterScreenUtilization", "UtilizationRate DESC", "Theater Report"),
+        # One set-based query over tvf_EventOccupancy
+        ("occupancy_report", "Upcoming Event Occupancy", "vw_UpcomingEventOccupancy", "OccupancyRate DESC", "Occupancy Report"),
+    ]
     
-    if customer_report is not None and not customer_report.empty:
-        st.dataframe(customer_report, use_container_width=True)
-        
-        # Download button
-        csv = customer_report.to_csv(index=False)
-        st.download_button(
-            label="Download Customer Report",
-            data=csv,
-            file_name="customer_report.csv",
-            mime="text/csv"
-        )
+    # Lay out every section with a placeholder, start all previews at once, and fill
+    # each section as its query finishes, so the page waits for the slowest report only
+    sections = {}
+    futures = {}
+    for i, (key, title, view, order_by, label) in enumerate(reports):
+        if i > 0:
+            st.markdown("---")
+        st.subheader(title)
+        sections[key] = st.empty()
+        sections[key].info(f"Loading {label.lower()}...")
+        futures[submit_report_preview(view, order_by)] = (key, view, order_by, label)
     
-    st.markdown("---")
+    for future in as_completed(futures):
+        key, view, order_by, label = futures[future]
+        with sections[key].container():
+            render_report(key, view, order_by, label, query_result(future))
+
+# =============================================
+# IMPORT PAGE
+# =============================================
+
+elif menu == "Import":
+    st.title("📥 Bulk Import")
     
-    # Event Performance Report
-    st.subheader("Event Performance Report")
-    event_report_query = """
-    SELECT * FROM vw_EventPerformanceDashboard
-    ORDER BY TotalRevenue DESC
-    """
-    event_report = execute_query(event_report_query)
+    kind_label = st.selectbox("Import", [kind.label for kind in IMPORTS.values()])
+    kind = next(kind for kind in IMPORTS.values() if kind.label == kind_label)
     
-    if event_report is not None and not event_report.empty:
-        st.dataframe(event_report, use_container_width=True)
-        
-        # Download button
-        csv = event_report.to_csv(index=False)
-        st.download_button(
-            label="Download Event Report",
-            data=csv,
-            file_name="event_report.csv",
-            mime="text/csv"
-        )
+    columns = ", ".join(f"{name}*" if name in kind.required else name for name, _ in kind.columns)
+    st.caption(f"CSV with a header row: {columns} (* required). "
+               "Dates as YYYY-MM-DD HH:MM. Rows are checked and loaded "
+               f"{IMPORT_BATCH_SIZE:,} at a time; invalid rows are skipped and listed below.")
     
-    st.markdown("---")
+    uploaded = st.file_uploader("CSV file", type=["csv"])
     
-    # Theater Utilization Report
-    st.subheader("Theater Screen Utilization Report")
-    theater_report_query = """
-    SELECT * FROM vw_TheaterScreenUtilization
-    ORDER BY UtilizationRate DESC
-    """
-    theater_report = execute_query(theater_report_query)
+    if uploaded is not None and st.button(f"Import {kind.label}", type="primary"):
+        progress = st.progress(0.0, text="Importing...")
+        
+        def show_progress(summary, outcomes):
+            done = min(uploaded.tell() / max(uploaded.size, 1), 1.0)
+            progress.progress(done, text=f"{summary.rows:,} rows, {summary.loaded:,} loaded, "
+                                         f"{summary.rejected:,} rejected")
+        
+        stream = io.TextIOWrapper(uploaded, encoding="utf-8-sig", newline="")
+        try:
+            with get_connection_pool().connection() as conn:
+                summary = import_csv(conn, kind, stream, on_batch=show_progress)
+        except Exception as e:
+            st.error(f"Import error: {e}")
+            summary = None
+        finally:
+            # Batches committed before a failure are kept, so evict either way
+            invalidate_tables(*kind.tables)
+            note_write()
+        progress.empty()
+        
+        if summary is not None:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Loaded", f"{summary.loaded:,}")
+            with col2:
+                st.metric("Rejected", f"{summary.rejected:,}")
+            with col3:
+                st.metric("Rows / s", f"{summary.rows_per_second:,.0f}")
+            
+            if summary.errors:
+                errors = pd.DataFrame(summary.errors, columns=["Line", "Error"])
+                st.dataframe(errors, use_container_width=True)
+                st.download_button("Download errors", errors.to_csv(index=False),
+                                   file_name=f"{kind.name}_import_errors.csv", mime="text/csv")
+            else:
+                st.success(f"✅ Imported {summary.loaded:,} {kind.name}")
+
+# =============================================
+# PERFORMANCE PAGE
+# =============================================
+
+elif menu == "Performance":
+    st.title("⏱️ Query Performance")
+    
+    metrics = get_query_metrics()
+    summary = metrics.summary()
     
-    if theater_report is not None and not theater_report.empty:
-        st.dataframe(theater_report, use_container_width=True)
+    if summary:
+        df = pd.DataFrame(summary)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Queries", f"{int(df['count'].sum()):,}")
+        with col2:
+            st.metric("Errors", f"{int(df['errors'].sum()):,}")
+        with col3:
+            st.metric("Query Time", f"{df['total_ms'].sum() / 1000:,.1f} s")
+        with col4:
+            st.metric("Slow Queries", len(metrics.slow_queries()))
         
-        # Download button
-        csv = theater_report.to_csv(index=False)
-        st.download_button(
-            label="Download Theater Report",
-            data=csv,
-            file_name="theater_report.csv",
-            mime="text/csv"
-        )
\ No newline at end of file
+        # Filter to one page/tab to see which of its queries is at fault
+        scopes = ["All"] + sorted(df['scope'].unique())
+        scope = st.selectbox("Page / Tab", scopes)
+        if scope != "All":
+            df = df[df['scope'] == scope]
+        st.dataframe(df, use_container_width=True)
+    else:
+        st.info("No queries recorded yet - browse the other pages first")
+    
+    router = get_router()
+    if router.replicas:
+        st.subheader(f"Read Replicas (used while <= {REPLICA_MAX_STALENESS} s behind)")
+        st.dataframe(pd.DataFrame(router.stats()), use_container_width=True)
+    
+    st.subheader(f"Slow Queries (>= {SLOW_QUERY_MS} ms)")
+    slow = metrics.slow_queries()
+    if slow:
+        st.dataframe(pd.DataFrame(slow), use_container_width=True)
+    else:
+        st.info("No slow queries recorded")
+    
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        st.download_button("Prometheus metrics", metrics.to_prometheus(),
+                           file_name="query_metrics.prom", mime="text/plain")
+    with col2:
+        st.download_button("JSON dump", metrics.to_json(),
+                           file_name="query_metrics.json", mime="application/json")
+    with col3:
+        if st.button("Reset"):
+            metrics.reset()
+            st.rerun()
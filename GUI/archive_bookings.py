@@ -0,0 +1,91 @@
+"""
+=============================================
+Event & Ticket Booking System - Booking Archive
+Group 5 - DAMG6210
+Command-line entry point for sp_ArchiveClosedBookings and sp_PurgeArchive
+=============================================
+
+Usage (from the GUI folder):
+    python archive_bookings.py                          # archive closed bookings older than 12 months
+    python archive_bookings.py --horizon-months 6 --max-months 3
+    python archive_bookings.py --retention-months 84    # also purge archived months older than 7 years
+"""
+
+import argparse
+import sys
+
+from db_config import connect
+
+
+def _run(conn, statement, params):
+    """Execute one archive procedure and return its ARCHIVE_RUN_LOG row as a dict"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(statement, params)
+        # Skip row counts of the procedure's statements up to its summary result set
+        while cursor.description is None and cursor.nextset():
+            pass
+        columns = [column[0] for column in cursor.description]
+        row = cursor.fetchone()
+        return dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+
+def archive_closed_bookings(conn, horizon_months=12, max_months=None):
+    """
+    Move closed bookings past the horizon into the archive tier.
+
+    The procedure commits one transaction per month, so conn must be in
+    autocommit mode; months finished before an error stay archived.
+    """
+    return _run(
+        conn,
+        "EXEC sp_ArchiveClosedBookings @HorizonMonths = ?, @MaxMonths = ?",
+        (horizon_months, max_months)
+    )
+
+
+def purge_archive(conn, retention_months):
+    """Drop archived months older than the retention period"""
+    return _run(conn, "EXEC sp_PurgeArchive @RetentionMonths = ?", (retention_months,))
+
+
+def _summary(result):
+    seconds = (result["FinishedAt"] - result["StartedAt"]).total_seconds()
+    return (
+        f"{result['RunType']} run #{result['RunID']} {result['Status'].lower()}: "
+        f"{result['MonthsProcessed']} month(s) before {result['Cutoff']}, "
+        f"{result['BookingsMoved']} booking(s), {result['AuditRowsMoved']} audit row(s) "
+        f"in {seconds:.1f}s"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive closed bookings and purge expired archive months.")
+    parser.add_argument("--horizon-months", type=int, default=12,
+                        help="archive closed bookings older than this many months (default: 12)")
+    parser.add_argument("--max-months", type=int, default=None,
+                        help="archive at most this many months in one run (default: all)")
+    parser.add_argument("--retention-months", type=int, default=None,
+                        help="also purge archived months older than this (default: keep everything)")
+    args = parser.parse_args(argv)
+
+    conn = connect(autocommit=True)
+    try:
+        results = [archive_closed_bookings(conn, args.horizon_months, args.max_months)]
+        if args.retention_months is not None:
+            results.append(purge_archive(conn, args.retention_months))
+    except Exception as e:
+        print(f"Archive failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+    for result in results:
+        print(_summary(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
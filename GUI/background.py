@@ -0,0 +1,129 @@
+"""
+=============================================
+Event & Ticket Booking System - Background Queries
+Group 5 - DAMG6210
+Thread pool that runs a page's independent queries concurrently
+=============================================
+"""
+
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from query_metrics import current_scope, set_scope
+
+BACKGROUND_WORKERS = 8
+
+
+class QueryCancelled(Exception):
+    """Raised inside a task whose script run was superseded by a newer one"""
+
+
+class CancelToken:
+    """
+    Shared by every task of one script run.
+
+    Tasks attach the cursor they are executing on; cancel() marks the run as
+    cancelled and calls cursor.cancel() (SQLCancel in pyodbc) on each of them,
+    so a statement already running on the server is stopped, not just abandoned.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cursors = set()
+        self.cancelled = False
+
+    def check(self):
+        if self.cancelled:
+            raise QueryCancelled("Query cancelled by a newer run of the page")
+
+    def attach(self, cursor):
+        with self._lock:
+            self.check()
+            self._cursors.add(cursor)
+
+    def detach(self, cursor):
+        with self._lock:
+            self._cursors.discard(cursor)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            cursors = list(self._cursors)
+        for cursor in cursors:
+            try:
+                cursor.cancel()
+            except Exception:
+                pass
+
+
+class QueryRun:
+    """The background tasks submitted by one Streamlit script run"""
+
+    def __init__(self, executor):
+        self._executor = executor
+        self._futures = set()
+        self._lock = threading.Lock()
+        self.token = CancelToken()
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, token=<CancelToken>, **kwargs) on the pool; returns a Future"""
+        scope = current_scope()
+        token = self.token
+
+        def task():
+            token.check()
+            set_scope(scope)  # keep query metrics tagged with the page that asked
+            return fn(*args, token=token, **kwargs)
+
+        future = self._executor.submit(task)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def cancel(self):
+        """Drop queued tasks and stop running statements"""
+        self.token.cancel()
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+
+class BackgroundQueries:
+    """
+    Process-wide worker pool shared by all sessions.
+
+    Each script run calls begin_run(session_key); starting a new run cancels
+    whatever the same session's previous run still has queued or running, so
+    clicking around quickly does not pile up stale queries on the database.
+    Runs are held weakly: once a script run has finished and its last task is
+    done nothing references it, and its session's entry drops out by itself.
+    """
+
+    def __init__(self, max_workers=BACKGROUND_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background-query")
+        self._runs = weakref.WeakValueDictionary()  # session key -> latest QueryRun
+        self._lock = threading.Lock()
+
+    def begin_run(self, session_key):
+        run = QueryRun(self._executor)
+        with self._lock:
+            previous = self._runs.get(session_key)
+            self._runs[session_key] = run
+        if previous is not None:
+            previous.cancel()
+        return run
+
+    def shutdown(self):
+        with self._lock:
+            runs = list(self._runs.values())
+            self._runs.clear()
+        for run in runs:
+            run.cancel()
+        self._executor.shutdown(wait=False)
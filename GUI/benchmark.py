@@ -0,0 +1,383 @@
+"""
+=============================================
+Event & Ticket Booking System - Benchmark Suite
+Group 5 - DAMG6210
+Timings and logical reads for every procedure, UDF, view and GUI page query
+=============================================
+
+Usage (from the GUI folder):
+    python benchmark.py --save            # record the baseline for this dataset size
+    python benchmark.py                   # compare against it; exit code 1 on regression
+    python benchmark.py --only vw_ --repeat 10 --threshold 0.3
+    python benchmark.py --json current.json
+
+Each case runs once to warm the cache and then --repeat times; the median of
+each metric is kept. CPU time and logical/physical reads are the session's
+counters in sys.dm_exec_sessions before and after the batch; elapsed time is
+measured on the client and includes fetching every row. Procedures that write
+run inside a transaction that is rolled back after each repetition.
+
+Baselines are keyed by dataset size (order of magnitude of BOOKING rows), so
+one file can hold baselines for 10^4, 10^6, ... datasets built with
+generate_data.py. Point EVENT_BOOKING_CONNECTION_STRING at each database in
+turn to benchmark them.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import statistics
+import sys
+import time
+
+from db_config import connect
+from event_search import events_query
+from lookups import search_bookings, search_customers, search_events
+from workload import (BOOKINGS_PAGE, CUSTOMERS_PAGE, EVENTS_PAGE, PAGE_SIZE, RECENT_BOOKINGS_SQL, bookings_page_query,
+                      dashboard_stats_sql, events_page_query)
+
+BASELINE_FILE = "benchmark_baseline.json"
+REPEAT = 5
+REGRESSION_THRESHOLD = 0.20  # fail when a metric grows by more than 20%...
+NOISE_FLOORS = {             # ...and by more than this absolute amount
+    "logical_reads": 50,
+    "cpu_ms": 5,
+    "elapsed_ms": 10,
+}
+
+_SESSION_COUNTERS_SQL = """
+    SELECT cpu_time, logical_reads, reads
+    FROM sys.dm_exec_sessions
+    WHERE session_id = @@SPID
+"""
+
+_KEYS_SQL = """
+    SELECT TOP 1 B.BookingID, B.CustomerID, B.EventID
+    FROM BOOKING B
+    WHERE B.BookingStatus = 'Confirmed'
+      AND B.BookingID >= (SELECT (MIN(BookingID) + MAX(BookingID)) / 2 FROM BOOKING)
+    ORDER BY B.BookingID
+"""
+
+_FREE_SEATS_SQL = """
+    SELECT TOP 2 SH.ShowID, ST.SeatID, SH.Price
+    FROM SHOW SH
+    INNER JOIN SEAT ST ON ST.ScreenID = SH.ScreenID
+    WHERE SH.EventID = ?
+      AND NOT EXISTS (SELECT 1 FROM SEAT_BOOKING SB WHERE SB.ShowID = SH.ShowID AND SB.SeatID = ST.SeatID)
+    ORDER BY SH.ShowID, ST.SeatID
+"""
+
+
+class Case:
+    """One benchmarked statement"""
+
+    def __init__(self, name, kind, sql, params=(), mutating=False):
+        self.name = name
+        self.kind = kind
+        self.sql = sql
+        self.params = params
+        self.mutating = mutating
+
+
+def _drain(cursor):
+    """Fetch every row of every result set; returns the row count"""
+    rows = 0
+    while True:
+        if cursor.description is not None:
+            rows += len(cursor.fetchall())
+        if not cursor.nextset():
+            return rows
+
+
+def _counters(cursor):
+    cursor.execute(_SESSION_COUNTERS_SQL)
+    cpu_ms, logical_reads, physical_reads = cursor.fetchone()
+    return cpu_ms, logical_reads, physical_reads
+
+
+def pick_keys(cursor):
+    """Representative keys from the middle of the data, stable across runs of the same dataset"""
+    cursor.execute(_KEYS_SQL)
+    row = cursor.fetchone()
+    if row is None:
+        raise RuntimeError("No confirmed bookings to benchmark against - load data first")
+    keys = {"booking_id": row[0], "customer_id": row[1], "event_id": row[2]}
+
+    cursor.execute("SELECT MIN(SnackID) FROM SNACK")
+    keys["snack_id"] = cursor.fetchone()[0]
+
+    cursor.execute("SELECT MAX(BookingDateTime) FROM BOOKING")
+    end = cursor.fetchone()[0]
+    keys["report_end"] = end
+    keys["report_start"] = end - datetime.timedelta(days=90)
+
+    cursor.execute(_FREE_SEATS_SQL, (keys["event_id"],))
+    seats = cursor.fetchall()
+    keys["show_id"] = seats[0][0] if seats else None
+    keys["free_seats"] = [seat[1] for seat in seats if seat[0] == keys["show_id"]]
+    keys["seat_price"] = float(seats[0][2]) if seats else 0.0
+
+    cursor.execute("SELECT COUNT_BIG(*) FROM BOOKING")
+    keys["bookings"] = cursor.fetchone()[0]
+    return keys
+
+
+def build_cases(cursor, keys):
+    cases = []
+
+    # --- stored procedures (writes are rolled back) ---
+    cases.append(Case(
+        "sp_GenerateRevenueReport", "procedure",
+        "EXEC sp_GenerateRevenueReport @StartDate = ?, @EndDate = ?",
+        (keys["report_start"], keys["report_end"])
+    ))
+    cases.append(Case(
+        "sp_CancelBooking", "procedure",
+        "DECLARE @Refund DECIMAL(10,2); EXEC sp_CancelBooking @BookingID = ?, @RefundAmount = @Refund OUTPUT;",
+        (keys["booking_id"],), mutating=True
+    ))
+    if keys["snack_id"] is not None:
+        cases.append(Case(
+            "sp_AddSnacksToBooking", "procedure",
+            "DECLARE @Total DECIMAL(10,2); "
+            "EXEC sp_AddSnacksToBooking @BookingID = ?, @SnackID = ?, @Quantity = 2, @NewTotalAmount = @Total OUTPUT;",
+            (keys["booking_id"], keys["snack_id"]), mutating=True
+        ))
+    cases.append(Case(
+        "sp_UpdateEventStatus", "procedure",
+        "DECLARE @Affected INT; "
+        "EXEC sp_UpdateEventStatus @EventID = ?, @NewStatus = 'Cancelled', @AffectedBookings = @Affected OUTPUT;",
+        (keys["event_id"],), mutating=True
+    ))
+    if keys["free_seats"]:
+        cases.append(Case(
+            "sp_CreateBookingWithPayment", "procedure",
+            "DECLARE @BookingID INT, @PaymentID INT; "
+            "EXEC sp_CreateBookingWithPayment @CustomerID = ?, @EventID = ?, @ShowID = ?, @SeatIDs = ?, "
+            "@PaymentAmount = ?, @PaymentType = 'Wallet', @WalletType = 'Apple Pay', "
+            "@BookingID = @BookingID OUTPUT, @PaymentID = @PaymentID OUTPUT;",
+            (keys["customer_id"], keys["event_id"], keys["show_id"],
+             ",".join(str(seat_id) for seat_id in keys["free_seats"]),
+             keys["seat_price"] * len(keys["free_seats"])),
+            mutating=True
+        ))
+
+    # --- scalar UDFs and their inline/batch TVFs, once per call and across a page of rows ---
+    cases.append(Case("fn_CalculateCustomerLifetimeValue", "function",
+                      "SELECT dbo.fn_CalculateCustomerLifetimeValue(?)", (keys["customer_id"],)))
+    cases.append(Case("tvf_CustomerLifetimeValue", "function",
+                      "SELECT LifetimeValue FROM dbo.tvf_CustomerLifetimeValue(?)", (keys["customer_id"],)))
+    if keys["show_id"] is not None:
+        cases.append(Case("fn_GetAvailableSeatsForShow", "function",
+                          "SELECT dbo.fn_GetAvailableSeatsForShow(?)", (keys["show_id"],)))
+        cases.append(Case("tvf_AvailableSeatsForShow", "function",
+                          "SELECT AvailableSeats FROM dbo.tvf_AvailableSeatsForShow(?)", (keys["show_id"],)))
+    cases.append(Case("fn_CalculateEventOccupancy", "function",
+                      "SELECT dbo.fn_CalculateEventOccupancy(?)", (keys["event_id"],)))
+    cases.append(Case("tvf_EventOccupancy", "function",
+                      "SELECT OccupancyRate FROM dbo.tvf_EventOccupancy(?)", (keys["event_id"],)))
+
+    page_customers = (f"SELECT TOP {PAGE_SIZE} CustomerID FROM CUSTOMER WHERE CustomerID >= ? ORDER BY CustomerID",
+                      (keys["customer_id"],))
+    page_events = f"SELECT TOP {PAGE_SIZE} EventID FROM EVENT ORDER BY StartDateTime DESC"
+    cases.append(Case("fn_CalculateCustomerLifetimeValue x page", "function",
+                      f"SELECT P.CustomerID, dbo.fn_CalculateCustomerLifetimeValue(P.CustomerID) "
+                      f"FROM ({page_customers[0]}) P", page_customers[1]))
+    cases.append(Case("tvf_CustomerLifetimeValue x page", "function",
+                      f"SELECT P.CustomerID, LTV.LifetimeValue FROM ({page_customers[0]}) P "
+                      "CROSS APPLY dbo.tvf_CustomerLifetimeValue(P.CustomerID) LTV", page_customers[1]))
+    cases.append(Case("tvf_CustomerLifetimeValueBatch x page", "function",
+                      f"DECLARE @IDs VARCHAR(MAX) = (SELECT STRING_AGG(CAST(CustomerID AS VARCHAR(MAX)), ',') "
+                      f"FROM ({page_customers[0]}) P); "
+                      "SELECT CustomerID, LifetimeValue FROM dbo.tvf_CustomerLifetimeValueBatch(@IDs)",
+                      page_customers[1]))
+    cases.append(Case("fn_CalculateEventOccupancy x page", "function",
+                      f"SELECT P.EventID, dbo.fn_CalculateEventOccupancy(P.EventID) FROM ({page_events}) P"))
+    cases.append(Case("tvf_EventOccupancy x page", "function",
+                      f"SELECT P.EventID, OCC.OccupancyRate FROM ({page_events}) P "
+                      "CROSS APPLY dbo.tvf_EventOccupancy(P.EventID) OCC"))
+    cases.append(Case("tvf_EventOccupancyBatch x page", "function",
+                      f"DECLARE @IDs VARCHAR(MAX) = (SELECT STRING_AGG(CAST(EventID AS VARCHAR(MAX)), ',') "
+                      f"FROM ({page_events}) P); "
+                      "SELECT EventID, OccupancyRate FROM dbo.tvf_EventOccupancyBatch(@IDs)"))
+
+    # --- every vw_* view installed in the database ---
+    cursor.execute("SELECT name FROM sys.views WHERE name LIKE 'vw[_]%' ORDER BY name")
+    for (view,) in cursor.fetchall():
+        cases.append(Case(view, "view", f"SELECT * FROM {view}"))
+
+    # --- GUI page queries ---
+    cases.append(Case("page: dashboard stats", "page", dashboard_stats_sql(cursor)))
+    cases.append(Case("page: recent bookings", "page", RECENT_BOOKINGS_SQL))
+    for label, query, after in [("customers", CUSTOMERS_PAGE, (keys["customer_id"],)),
+                                ("events", EVENTS_PAGE, None),
+                                ("events by status", events_page_query(status="Scheduled"), None),
+                                ("events by type+status", events_page_query("Movie", "Scheduled"), None),
+                                ("bookings", BOOKINGS_PAGE, None),
+                                ("bookings by status", bookings_page_query("Cancelled"), None)]:
+        sql, params = query.page_sql(PAGE_SIZE, after=after)
+        cases.append(Case(f"page: {label} grid", "page", sql, params))
+        cases.append(Case(f"page: {label} count", "page", *query.count_sql()))
+    cases.append(Case("page: customer lookup", "page", *search_customers("Ma")))
+    cases.append(Case("page: event lookup", "page", *search_events("Gen")))
+    cases.append(Case("page: booking lookup", "page", *search_bookings(str(keys["booking_id"]))))
+    cases.append(Case("page: booking lookup by name", "page", *search_bookings("Ma")))
+
+    # --- event search, when search_script.sql is installed ---
+    cursor.execute("SELECT OBJECT_ID('dbo.tvf_SearchEvents')")
+    if cursor.fetchone()[0] is not None:
+        for label, query in [("word", events_query("comedy")),
+                             ("two words", events_query("generated movie")),
+                             ("prefix + type", events_query("gen", event_type="Sport")),
+                             ("word + status", events_query("drama", status="Scheduled"))]:
+            sql, params = query.page_sql(PAGE_SIZE)
+            cases.append(Case(f"page: search {label}", "page", sql, params))
+            cases.append(Case(f"page: search {label} count", "page", *query.count_sql()))
+    return cases
+
+
+def measure(conn, case, repeat=REPEAT):
+    """Median metrics of repeat runs of case, after one warm-up run"""
+    cursor = conn.cursor()
+    samples = []
+    try:
+        for run in range(repeat + 1):
+            cpu0, logical0, physical0 = _counters(cursor)
+            started = time.perf_counter()
+            if case.params:
+                cursor.execute(case.sql, case.params)
+            else:
+                cursor.execute(case.sql)
+            rows = _drain(cursor)
+            elapsed = time.perf_counter() - started
+            cpu1, logical1, physical1 = _counters(cursor)
+            conn.rollback()
+            if run > 0:
+                samples.append((elapsed * 1000, cpu1 - cpu0, logical1 - logical0, physical1 - physical0))
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return {
+        "kind": case.kind,
+        "rows": rows,
+        "elapsed_ms": round(statistics.median(s[0] for s in samples), 2),
+        "cpu_ms": statistics.median(s[1] for s in samples),
+        "logical_reads": statistics.median(s[2] for s in samples),
+        "physical_reads": statistics.median(s[3] for s in samples),
+    }
+
+
+def dataset_label(bookings):
+    """Order of magnitude of the BOOKING table, e.g. '10^6'"""
+    return f"10^{max(len(str(bookings)) - 1, 0)}"
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """[(case, metric, baseline, current)] for every metric past the threshold and its noise floor"""
+    regressions = []
+    for name, metrics in current.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if "error" in metrics:
+            regressions.append((name, "error", None, metrics["error"]))
+            continue
+        for metric, floor in NOISE_FLOORS.items():
+            old, new = before.get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def run_suite(conn, only=None, repeat=REPEAT, log=print):
+    cursor = conn.cursor()
+    try:
+        keys = pick_keys(cursor)
+        cases = build_cases(cursor, keys)
+    finally:
+        cursor.close()
+    conn.rollback()
+
+    results = {}
+    for case in cases:
+        if only and only not in case.name:
+            continue
+        try:
+            results[case.name] = measure(conn, case, repeat)
+            r = results[case.name]
+            log(f"{case.name:<48}{r['elapsed_ms']:>10.1f} ms{r['cpu_ms']:>8} cpu ms{r['logical_reads']:>12} reads")
+        except Exception as e:
+            results[case.name] = {"kind": case.kind, "error": str(e)}
+            log(f"{case.name:<48} ERROR: {e}")
+    return keys["bookings"], results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark procedures, UDFs, views and GUI page queries.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="record these results as the baseline")
+    parser.add_argument("--dataset", help="baseline key (default: order of magnitude of BOOKING rows)")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="allowed relative growth per metric (0.2 = 20%%)")
+    parser.add_argument("--json", help="also write this run's results to this file")
+    args = parser.parse_args(argv)
+
+    conn = connect()
+    try:
+        bookings, results = run_suite(conn, args.only, args.repeat)
+    finally:
+        conn.close()
+
+    dataset = args.dataset or dataset_label(bookings)
+    run = {
+        "bookings": bookings,
+        "recorded": datetime.datetime.now().isoformat(timespec="seconds"),
+        "cases": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({dataset: run}, f, indent=2, default=str)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+
+    if args.save:
+        if args.only and dataset in baselines:
+            baselines[dataset]["cases"].update(results)
+        else:
+            baselines[dataset] = run
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2, default=str)
+        print(f"Saved baseline for dataset {dataset} ({len(results)} cases) to {args.baseline}")
+        return 0
+
+    errors = [name for name, metrics in results.items() if "error" in metrics]
+    if dataset not in baselines:
+        print(f"No baseline for dataset {dataset} in {args.baseline}; run with --save to record one.")
+        return 1 if errors else 0
+
+    regressions = compare(results, baselines[dataset]["cases"], args.threshold)
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name}: {metric} {old} -> {new}")
+    for name in errors:
+        if not any(r[0] == name for r in regressions):
+            print(f"FAILED {name}: {results[name]['error']}")
+    if regressions or errors:
+        return 1
+    print(f"No regressions against the {dataset} baseline ({len(results)} cases).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+=============================================
+Event & Ticket Booking System - Bulk Booking Client
+Group 5 - DAMG6210
+Batch wrapper around sp_CreateBookingsBulk
+=============================================
+"""
+
+REQUEST_COLUMNS = (
+    "RequestRowID", "CustomerID", "ShowID", "PaymentAmount", "PaymentType",
+    "CardNumber", "CardHolderName", "WalletType", "PayPalEmail"
+)
+
+_STAGING_DDL = """
+    DROP TABLE IF EXISTS #BulkBookingRequest;
+    DROP TABLE IF EXISTS #BulkBookingSeat;
+    CREATE TABLE #BulkBookingRequest (
+        RequestRowID INT NOT NULL PRIMARY KEY,
+        CustomerID INT NOT NULL,
+        ShowID INT NOT NULL,
+        PaymentAmount DECIMAL(10,2) NOT NULL,
+        PaymentType VARCHAR(20) NOT NULL,
+        CardNumber VARCHAR(16) NULL,
+        CardHolderName VARCHAR(100) NULL,
+        WalletType VARCHAR(50) NULL,
+        PayPalEmail VARCHAR(100) NULL
+    );
+    CREATE TABLE #BulkBookingSeat (
+        RequestRowID INT NOT NULL,
+        SeatID INT NOT NULL,
+        PRIMARY KEY (RequestRowID, SeatID)
+    );
+"""
+
+_EXEC_SQL = """
+    SET NOCOUNT ON;
+    DECLARE @Requests BookingRequestList;
+    DECLARE @Seats BookingSeatList;
+    INSERT INTO @Requests SELECT * FROM #BulkBookingRequest;
+    INSERT INTO @Seats SELECT * FROM #BulkBookingSeat;
+    EXEC sp_CreateBookingsBulk @Requests, @Seats;
+"""
+
+
+def _request_row(row_id, request):
+    return (
+        row_id,
+        request["customer_id"],
+        request["show_id"],
+        request["payment_amount"],
+        request["payment_type"],
+        request.get("card_number"),
+        request.get("card_holder_name"),
+        request.get("wallet_type"),
+        request.get("paypal_email"),
+    )
+
+
+def create_bookings_bulk(conn, requests, seat_map=None):
+    """
+    Book a batch of requests with one call to sp_CreateBookingsBulk.
+
+    Each request is a dict with customer_id, show_id, seat_ids, payment_amount,
+    payment_type and the payment details it needs (card_number/card_holder_name,
+    wallet_type or paypal_email). An optional request_id is echoed back; it
+    defaults to the request's position (starting at 1).
+
+    The batch is staged into session temp tables with fast_executemany (array
+    parameter binding, a handful of network round trips however many rows) and
+    handed to the procedure as table-valued parameters in a single batch.
+    Returns one dict per request: request_id, status ('Booked'/'Rejected'),
+    booking_id, payment_id and error. seat_map is an optional SeatMapService
+    updated with the seats that were booked.
+    """
+    request_rows = []
+    seat_rows = []
+    seats_by_row = {}
+    for position, request in enumerate(requests, start=1):
+        row_id = request.get("request_id", position)
+        request_rows.append(_request_row(row_id, request))
+        seat_ids = [int(seat_id) for seat_id in dict.fromkeys(request["seat_ids"])]
+        seat_rows.extend((row_id, seat_id) for seat_id in seat_ids)
+        seats_by_row[row_id] = (request["show_id"], seat_ids)
+
+    if not request_rows:
+        return []
+
+    cursor = conn.cursor()
+    try:
+        # The DDL first drops staging tables a failed call may have left on this connection
+        cursor.execute(_STAGING_DDL)
+        cursor.fast_executemany = True
+        cursor.executemany(
+            f"INSERT INTO #BulkBookingRequest ({', '.join(REQUEST_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(REQUEST_COLUMNS))})",
+            request_rows
+        )
+        if seat_rows:
+            cursor.executemany(
+                "INSERT INTO #BulkBookingSeat (RequestRowID, SeatID) VALUES (?, ?)",
+                seat_rows
+            )
+        cursor.fast_executemany = False
+
+        cursor.execute(_EXEC_SQL)
+        while cursor.description is None and cursor.nextset():
+            pass
+        outcomes = [
+            {
+                "request_id": row.RequestRowID,
+                "status": row.Status,
+                "booking_id": row.BookingID,
+                "payment_id": row.PaymentID,
+                "error": row.ErrorMessage,
+            }
+            for row in cursor.fetchall()
+        ]
+
+        cursor.execute("DROP TABLE #BulkBookingRequest; DROP TABLE #BulkBookingSeat;")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    if seat_map is not None:
+        for outcome in outcomes:
+            if outcome["status"] == "Booked":
+                seat_map.mark_booked(*seats_by_row[outcome["request_id"]])
+    return outcomes
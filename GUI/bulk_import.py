@@ -0,0 +1,386 @@
+"""
+=============================================
+Event & Ticket Booking System - Bulk CSV Import
+Group 5 - DAMG6210
+Streamed, batch-validated loading of customers, events and shows
+=============================================
+
+Usage (from the GUI folder):
+    python bulk_import.py customers customers.csv
+    python bulk_import.py events catalog.csv --report events_outcome.csv
+    python bulk_import.py shows shows.csv --batch-size 20000
+
+The CSV is read a batch at a time, so memory stays bounded by one batch.
+Each row is parsed and checked against the table's CHECK constraints in
+Python; rows that pass are staged into a session temp table with
+fast_executemany and handed to sp_ImportCustomers / sp_ImportEvents /
+sp_ImportShows (bulk_import_script.sql), which check keys and uniqueness
+set-based and load the batch in one transaction. Rejected rows are reported
+with their CSV line number; the other rows of the batch are still loaded.
+"""
+
+import argparse
+import csv
+import datetime
+import decimal
+import re
+import sys
+import time
+from collections import namedtuple
+
+from db_config import connect
+
+IMPORT_BATCH_SIZE = 10_000
+
+EVENT_TYPES = ("Movie", "Sport", "Exhibition")
+EVENT_STATUSES = ("Scheduled", "Ongoing", "Completed", "Cancelled")
+_EMAIL = re.compile(r".+@.{2,}\..{2,}", re.DOTALL)  # CHK_User_Email: LIKE '%_@__%.__%'
+_MIN_DATETIME = datetime.datetime(1753, 1, 1)  # earliest SQL Server DATETIME
+
+
+class RowError(ValueError):
+    """A CSV row that cannot be loaded; the message is reported against its line"""
+
+
+# --- field parsers (blank cells are None) ---
+
+def _text(row, name, max_length, required=False):
+    value = (row.get(name) or "").strip()
+    if not value:
+        if required:
+            raise RowError(f"{name} is required.")
+        return None
+    if len(value) > max_length:
+        raise RowError(f"{name} is longer than {max_length} characters.")
+    return value
+
+
+def _int(row, name, required=False):
+    value = (row.get(name) or "").strip()
+    if not value:
+        if required:
+            raise RowError(f"{name} is required.")
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RowError(f"{name} must be a whole number.") from None
+
+
+def _price(row, name):
+    value = (row.get(name) or "").strip()
+    if not value:
+        raise RowError(f"{name} is required.")
+    try:
+        price = decimal.Decimal(value).quantize(decimal.Decimal("0.01"))
+    except (decimal.InvalidOperation, ValueError):
+        raise RowError(f"{name} must be a number.") from None
+    if price <= 0 or price >= 10 ** 8:  # CHK_Show_Price, DECIMAL(10,2)
+        raise RowError(f"{name} must be greater than zero and less than 100,000,000.")
+    return price
+
+
+def _datetime(row, name):
+    """ISO 8601 date or date-time ('2025-06-01 19:30', '2025-06-01T19:30:00')"""
+    value = (row.get(name) or "").strip()
+    if not value:
+        raise RowError(f"{name} is required.")
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise RowError(f"{name} is not a valid date/time (use YYYY-MM-DD HH:MM).") from None
+    if parsed.tzinfo is not None:
+        raise RowError(f"{name} must not include a time zone.")
+    if parsed < _MIN_DATETIME:
+        raise RowError(f"{name} is before 1753-01-01.")
+    return parsed.replace(microsecond=0)  # DATETIME cannot hold microseconds; fast_executemany rejects them
+
+
+def _choice(row, name, choices, default=None):
+    value = (row.get(name) or "").strip()
+    if not value:
+        if default is None:
+            raise RowError(f"{name} is required.")
+        return default
+    for choice in choices:
+        if value.lower() == choice.lower():
+            return choice
+    raise RowError(f"{name} must be one of: {', '.join(choices)}.")
+
+
+# --- row parsers: CSV dict -> staging tuple (without RowNumber) ---
+
+def parse_customer(row):
+    email = _text(row, "Email", 100, required=True)
+    if not _EMAIL.fullmatch(email):
+        raise RowError("Email address is not valid.")
+    loyalty_points = _int(row, "LoyaltyPoints") or 0
+    if loyalty_points < 0:
+        raise RowError("LoyaltyPoints cannot be negative.")
+    return (
+        _text(row, "FirstName", 50, required=True),
+        _text(row, "LastName", 50, required=True),
+        email,
+        _text(row, "PhoneNumber", 15),
+        loyalty_points,
+    )
+
+
+def parse_event(row):
+    start = _datetime(row, "StartDateTime")
+    end = _datetime(row, "EndDateTime")
+    if end <= start:
+        raise RowError("EndDateTime must be after StartDateTime.")
+    duration = _int(row, "Duration")
+    if duration is not None and duration < 0:
+        raise RowError("Duration cannot be negative.")
+    return (
+        _int(row, "OrganizerID"),
+        _text(row, "Title", 200, required=True),
+        _text(row, "Description", 1000),
+        _choice(row, "EventType", EVENT_TYPES),
+        _choice(row, "Status", EVENT_STATUSES, default="Scheduled"),
+        _text(row, "Language", 30),
+        start,
+        end,
+        duration,
+    )
+
+
+def parse_show(row):
+    return (
+        _int(row, "EventID", required=True),
+        _int(row, "MovieID"),
+        _int(row, "ScreenID", required=True),
+        _datetime(row, "ShowDateTime"),
+        _text(row, "ShowType", 20),
+        _price(row, "Price"),
+    )
+
+
+# columns: (CSV header / staging column, SQL type) in the order the parser returns them
+ImportKind = namedtuple("ImportKind", "name label columns required parse procedure table_type tables")
+
+IMPORTS = {
+    "customers": ImportKind(
+        "customers", "Customers",
+        [("FirstName", "VARCHAR(50)"), ("LastName", "VARCHAR(50)"), ("Email", "VARCHAR(100)"),
+         ("PhoneNumber", "VARCHAR(15)"), ("LoyaltyPoints", "INT")],
+        {"FirstName", "LastName", "Email"},
+        parse_customer, "sp_ImportCustomers", "CustomerImportList",
+        {"USER", "CUSTOMER", "DASHBOARD_STATS"}
+    ),
+    "events": ImportKind(
+        "events", "Events",
+        [("OrganizerID", "INT"), ("Title", "VARCHAR(200)"), ("Description", "VARCHAR(1000)"),
+         ("EventType", "VARCHAR(50)"), ("Status", "VARCHAR(20)"), ("Language", "VARCHAR(30)"),
+         ("StartDateTime", "DATETIME"), ("EndDateTime", "DATETIME"), ("Duration", "INT")],
+        {"Title", "EventType", "StartDateTime", "EndDateTime"},
+        parse_event, "sp_ImportEvents", "EventImportList",
+        {"EVENT", "DASHBOARD_STATS"}
+    ),
+    "shows": ImportKind(
+        "shows", "Shows",
+        [("EventID", "INT"), ("MovieID", "INT"), ("ScreenID", "INT"), ("ShowDateTime", "DATETIME"),
+         ("ShowType", "VARCHAR(20)"), ("Price", "DECIMAL(10,2)")],
+        {"EventID", "ScreenID", "ShowDateTime", "Price"},
+        parse_show, "sp_ImportShows", "ShowImportList",
+        {"SHOW"}
+    ),
+}
+
+# One outcome per CSV row: line is the CSV line number, new_id the created key
+RowOutcome = namedtuple("RowOutcome", "line status new_id error")
+
+
+def _staging_sql(kind):
+    names = [name for name, _ in kind.columns]
+    ddl = ",\n".join(f"        {name} {sql_type} NULL" for name, sql_type in kind.columns)
+    create = f"""
+    DROP TABLE IF EXISTS #ImportRows;
+    CREATE TABLE #ImportRows (
+        RowNumber INT NOT NULL PRIMARY KEY,
+{ddl}
+    );
+"""
+    insert = (f"INSERT INTO #ImportRows (RowNumber, {', '.join(names)}) "
+              f"VALUES ({', '.join('?' * (len(names) + 1))})")
+    run = f"""
+    SET NOCOUNT ON;
+    DECLARE @Rows {kind.table_type};
+    INSERT INTO @Rows SELECT * FROM #ImportRows;
+    DROP TABLE #ImportRows;
+    EXEC {kind.procedure} @Rows;
+"""
+    return create, insert, run
+
+
+def check_header(kind, fieldnames):
+    """Map the CSV's headers (any case) onto the import's columns; raises ValueError on a bad header"""
+    if not fieldnames:
+        raise ValueError("The file is empty or has no header row.")
+    known = {name.lower(): name for name, _ in kind.columns}
+    mapping = {}
+    unknown = []
+    for header in fieldnames:
+        name = known.get((header or "").strip().lower())
+        if name is None:
+            unknown.append(header)
+        else:
+            mapping[header] = name
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {kind.name}: {', '.join(map(str, unknown))}. "
+                         f"Expected: {', '.join(known.values())}")
+    missing = kind.required - set(mapping.values())
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(sorted(missing))}")
+    return mapping
+
+
+def read_batches(kind, stream, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Parse a CSV text stream into batches of (staged rows, rejected outcomes).
+
+    Staged rows are (line, *values) tuples ready for #ImportRows; the header
+    is line 1. Only one batch is held in memory at a time.
+    """
+    reader = csv.DictReader(stream)
+    mapping = check_header(kind, reader.fieldnames)
+    staged, rejected = [], []
+    for record in reader:
+        line = reader.line_num
+        if None in record:
+            rejected.append(RowOutcome(line, "Rejected", None, "Row has more cells than the header."))
+        else:
+            row = {mapping[header]: value for header, value in record.items()}
+            try:
+                staged.append((line, *kind.parse(row)))
+            except RowError as e:
+                rejected.append(RowOutcome(line, "Rejected", None, str(e)))
+        if len(staged) + len(rejected) >= batch_size:
+            yield staged, rejected
+            staged, rejected = [], []
+    if staged or rejected:
+        yield staged, rejected
+
+
+def load_batch(conn, kind, staged):
+    """Stage one batch with fast_executemany and load it through the import procedure; commits"""
+    if not staged:
+        return []
+    create, insert, run = _staging_sql(kind)
+    cursor = conn.cursor()
+    try:
+        # The DDL first drops a staging table a failed batch may have left on this connection
+        cursor.execute(create)
+        cursor.fast_executemany = True
+        cursor.executemany(insert, staged)
+        cursor.fast_executemany = False
+
+        cursor.execute(run)
+        while cursor.description is None and cursor.nextset():
+            pass
+        outcomes = [RowOutcome(row.RowNumber, row.Status, row.NewID, row.ErrorMessage)
+                    for row in cursor.fetchall()]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return outcomes
+
+
+class ImportSummary:
+    """Running totals of one import; errors holds (line, message) for every rejected row"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.rows = 0
+        self.loaded = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def rejected(self):
+        return len(self.errors)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add(self, outcomes):
+        for outcome in outcomes:
+            self.rows += 1
+            if outcome.status == "Loaded":
+                self.loaded += 1
+            else:
+                self.errors.append((outcome.line, outcome.error))
+        self.seconds = time.perf_counter() - self.started
+
+
+def import_csv(conn, kind, stream, batch_size=IMPORT_BATCH_SIZE, on_batch=None):
+    """
+    Import a CSV text stream of the given kind ('customers', 'events', 'shows').
+
+    Each batch is committed on its own, so a failure part way through (lost
+    connection, deadlock) leaves the earlier batches loaded; the exception is
+    raised after the rollback of the failing batch. on_batch(summary, outcomes)
+    is called after each batch with that batch's outcomes in line order.
+    Returns an ImportSummary.
+    """
+    kind = IMPORTS[kind] if isinstance(kind, str) else kind
+    summary = ImportSummary(kind)
+    for staged, rejected in read_batches(kind, stream, batch_size):
+        outcomes = sorted(load_batch(conn, kind, staged) + rejected)
+        summary.add(outcomes)
+        if on_batch is not None:
+            on_batch(summary, outcomes)
+    summary.seconds = time.perf_counter() - summary.started
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import customers, events or shows from a CSV file.")
+    parser.add_argument("kind", choices=list(IMPORTS))
+    parser.add_argument("file", help="CSV file with a header row (UTF-8)")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per staged batch")
+    parser.add_argument("--report", help="write every row's outcome (line, status, new ID, error) to this CSV")
+    args = parser.parse_args(argv)
+
+    kind = IMPORTS[args.kind]
+    report_file = open(args.report, "w", newline="", encoding="utf-8") if args.report else None
+    report = csv.writer(report_file) if report_file else None
+    if report:
+        report.writerow(["Line", "Status", f"New{kind.label[:-1]}ID", "Error"])
+
+    def on_batch(summary, outcomes):
+        if report:
+            report.writerows(outcomes)
+        print(f"  {summary.rows:,} rows, {summary.loaded:,} loaded, {summary.rejected:,} rejected "
+              f"({summary.rows_per_second:,.0f} rows/s)")
+
+    conn = connect()
+    try:
+        with open(args.file, newline="", encoding="utf-8-sig") as stream:
+            summary = import_csv(conn, kind, stream, batch_size=args.batch_size, on_batch=on_batch)
+    except Exception as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 2
+    finally:
+        conn.close()
+        if report_file:
+            report_file.close()
+
+    print(f"Imported {summary.loaded:,} of {summary.rows:,} {kind.name} in {summary.seconds:.1f}s "
+          f"({summary.rows_per_second:,.0f} rows/s); {summary.rejected:,} rejected")
+    for line, error in summary.errors[:20]:
+        print(f"  line {line}: {error}")
+    if summary.rejected > 20:
+        print(f"  ... {summary.rejected - 20:,} more" + (f" in {args.report}" if args.report else ""))
+    return 1 if summary.rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+=============================================
+Event & Ticket Booking System - Columnar Fetch
+Group 5 - DAMG6210
+Arrow-native result sets: ODBC column buffers straight into Arrow, no per-row objects
+=============================================
+
+Usage (from the GUI folder):
+    python columnar.py --benchmark                                   # every report view, rows vs columnar
+    python columnar.py --benchmark --view vw_CustomerBookingSummary --repeat 5
+
+pyodbc builds one Row object per row, and the GUI then copies those rows
+into a DataFrame. arrow-odbc binds column buffers and fills them a batch at a
+time with bulk ODBC fetches, so results arrive as Arrow record batches.
+Frames built from them are Arrow-backed (pandas ArrowDtype columns over the
+same buffers), and the CSV/Parquet export writes the batches as they come.
+
+Both packages are optional (pip install arrow-odbc pyarrow). Without them
+available() is False and the GUI keeps using pyodbc rows. arrow-odbc opens
+its own connection per query, so the GUI uses it for report previews and
+exports, where results are large, and keeps small grid pages on the pool.
+"""
+
+import argparse
+import datetime
+import decimal
+import multiprocessing
+import statistics
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+# Columnar fetch is optional: it needs arrow-odbc and pyarrow, which are not in requirements.txt
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    from arrow_odbc import read_arrow_batches_from_odbc
+except ImportError:
+    pa = None
+    pa_csv = None
+    pq = None
+    read_arrow_batches_from_odbc = None
+
+from db_config import CONNECTION_STRING, connect
+
+BATCH_ROWS = 10000  # rows per bulk ODBC fetch (one Arrow record batch)
+MAX_TEXT_BYTES = 8000  # buffer per value for VARCHAR(MAX)/NVARCHAR(MAX) columns
+MAX_BINARY_BYTES = 8000
+BENCHMARK_REPEAT = 3
+
+# SQL type each Python parameter type is bound as by pyodbc; bool before int (bool is an int)
+_PARAM_TYPES = [
+    (bool, "BIT"),
+    (int, "BIGINT"),
+    (float, "FLOAT"),
+    (decimal.Decimal, "DECIMAL(38, 10)"),
+    (datetime.datetime, "DATETIME2"),
+    (datetime.date, "DATE"),
+]
+
+
+def available():
+    """True when arrow-odbc and pyarrow are installed"""
+    return read_arrow_batches_from_odbc is not None
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, decimal.Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+def bind_parameters(query, params):
+    """
+    Query and parameters as arrow-odbc takes them.
+
+    arrow-odbc binds every parameter as text, so each ? whose value is not a
+    string is wrapped in a CAST to the type pyodbc would have bound; TOP (?)
+    and typed comparisons then behave exactly as they do through pyodbc.
+    A ? inside a string literal or a -- or /* */ comment is left alone.
+    """
+    if not params:
+        return query, None
+
+    params = list(params)
+    parts = []
+    texts = []
+    in_string = False
+    in_line_comment = False
+    block_depth = 0  # T-SQL block comments nest
+    position = 0
+    while position < len(query):
+        char = query[position]
+        pair = query[position:position + 2]
+        if in_line_comment:
+            in_line_comment = char != "\n"
+        elif block_depth:
+            if pair in ("/*", "*/"):
+                block_depth += 1 if pair == "/*" else -1
+                parts.append(pair)
+                position += 2
+                continue
+        elif in_string:
+            in_string = char != "'"  # a doubled '' closes and reopens the literal
+        elif char == "'":
+            in_string = True
+        elif pair == "--":
+            in_line_comment = True
+        elif pair == "/*":
+            block_depth = 1
+            parts.append(pair)
+            position += 2
+            continue
+        position += 1
+        if char != "?" or in_string or in_line_comment or block_depth:
+            parts.append(char)
+            continue
+        if len(texts) == len(params):
+            raise ValueError("More ? placeholders than parameters")
+        value = params[len(texts)]
+        sql_type = next((name for py_type, name in _PARAM_TYPES if isinstance(value, py_type)), None)
+        parts.append(f"CAST(? AS {sql_type})" if sql_type and value is not None else "?")
+        texts.append(_text(value))
+    if len(texts) != len(params):
+        raise ValueError("Fewer ? placeholders than parameters")
+    return "".join(parts), texts
+
+
+def read_batches(query, params=None, batch_rows=BATCH_ROWS, connection_string=CONNECTION_STRING):
+    """Reader over the query's Arrow record batches (iterate it; .schema is known up front)"""
+    if not available():
+        raise RuntimeError("Columnar fetch requires the arrow-odbc and pyarrow packages")
+    query, parameters = bind_parameters(query, params)
+    return read_arrow_batches_from_odbc(
+        query=query,
+        connection_string=connection_string,
+        batch_size=batch_rows,
+        parameters=parameters,
+        max_text_size=MAX_TEXT_BYTES,
+        max_binary_size=MAX_BINARY_BYTES,
+    )
+
+
+def read_table(query, params=None, token=None, batch_rows=BATCH_ROWS, connection_string=CONNECTION_STRING):
+    """
+    Whole result as a pyarrow Table.
+
+    token is a background CancelToken: a newer run of the page stops the read
+    between batches (arrow-odbc has no way to cancel a running statement).
+    """
+    if token is not None:
+        token.check()
+    reader = read_batches(query, params, batch_rows, connection_string)
+    batches = []
+    for batch in reader:
+        if token is not None:
+            token.check()
+        batches.append(batch)
+    return pa.Table.from_batches(batches, schema=reader.schema)
+
+
+def read_frame(query, params=None, token=None, metrics=None, batch_rows=BATCH_ROWS,
+               connection_string=CONNECTION_STRING):
+    """Arrow-backed DataFrame of a SELECT, timed into metrics (a QueryMetrics) when given"""
+    started = time.perf_counter()
+    table = None
+    error = None
+    try:
+        table = read_table(query, params, token, batch_rows, connection_string)
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        if metrics is not None:
+            metrics.record(query, params, time.perf_counter() - started,
+                           rows=table.num_rows if table is not None else 0,
+                           nbytes=table.nbytes if table is not None else 0, error=error)
+
+
+def export_batches(query, spool, fmt, params=None, batch_rows=BATCH_ROWS, connection_string=CONNECTION_STRING):
+    """Write the query's batches to spool as CSV or Parquet; returns the row count"""
+    reader = read_batches(query, params, batch_rows, connection_string)
+    if fmt == "CSV":
+        writer = pa_csv.CSVWriter(spool, reader.schema)
+    else:
+        writer = pq.ParquetWriter(spool, reader.schema)
+
+    row_count = 0
+    try:
+        for batch in reader:
+            writer.write_batch(batch)
+            row_count += batch.num_rows
+    finally:
+        writer.close()
+    return row_count
+
+
+# -----------------------------------------
+# Benchmark: pyodbc rows vs columnar, one child process per measurement
+# -----------------------------------------
+
+def _read_rows(query):
+    """The row path execute_query used: fetchall() and DataFrame.from_records"""
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+    finally:
+        conn.close()
+
+
+def _measure(mode, query, repeat, trace_memory, results):
+    try:
+        results.put(_measure_once(mode, query, repeat, trace_memory))
+    except Exception as e:
+        results.put({"error": f"{mode}: {e}"})
+
+
+def _measure_once(mode, query, repeat, trace_memory):
+    read = _read_rows if mode == "rows" else read_frame
+    read(query)  # warm the server's buffer pool and plan cache, and load driver code
+
+    if trace_memory:
+        tracemalloc.start()
+        frame = read(query)
+        python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        # Arrow buffers are not allocated through Python; its pool tracks its own peak
+        arrow_peak = pa.default_memory_pool().max_memory() if pa is not None else 0
+        return {"rows": len(frame), "peak_mb": (python_peak + arrow_peak) / 2 ** 20}
+
+    cpu, wall = [], []
+    for _ in range(repeat):
+        cpu0, wall0 = time.process_time(), time.perf_counter()
+        read(query)
+        cpu.append(time.process_time() - cpu0)
+        wall.append(time.perf_counter() - wall0)
+    return {"cpu_s": statistics.median(cpu), "wall_s": statistics.median(wall)}
+
+
+def _in_child(mode, query, repeat, trace_memory):
+    """Run one measurement in a fresh process, so peaks are not carried over between runs"""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    child = context.Process(target=_measure, args=(mode, query, repeat, trace_memory, results))
+    child.start()
+    try:
+        result = results.get(timeout=3600)
+    finally:
+        child.join()
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
+
+
+def benchmark_view(view, repeat=BENCHMARK_REPEAT):
+    """{mode: {rows, cpu_s, wall_s, peak_mb}} for SELECT * FROM view through both paths"""
+    query = f"SELECT * FROM {view}"
+    return {
+        mode: {**_in_child(mode, query, repeat, False), **_in_child(mode, query, repeat, True)}
+        for mode in ("rows", "columnar")
+    }
+
+
+def main(argv=None):
+    from workload import REPORTS
+
+    parser = argparse.ArgumentParser(description="Columnar (arrow-odbc) result fetching.")
+    parser.add_argument("--benchmark", action="store_true", required=True,
+                        help="compare CPU time and peak memory of the row and columnar paths")
+    parser.add_argument("--view", action="append",
+                        help="report view to read (repeatable; default: every report view)")
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT)
+    args = parser.parse_args(argv)
+
+    if not available():
+        print("Columnar fetch requires the arrow-odbc and pyarrow packages", file=sys.stderr)
+        return 1
+
+    views = args.view or [view for view, _ in REPORTS]
+    print(f"{'view':<32}{'rows':>10}{'cpu s rows':>12}{'columnar':>10}{'peak MB rows':>14}{'columnar':>10}")
+    try:
+        for view in views:
+            result = benchmark_view(view, args.repeat)
+            rows, columnar = result["rows"], result["columnar"]
+            print(f"{view:<32}{columnar['rows']:>10,}{rows['cpu_s']:>12.3f}{columnar['cpu_s']:>10.3f}"
+                  f"{rows['peak_mb']:>14.1f}{columnar['peak_mb']:>10.1f}")
+    except Exception as e:
+        print(f"Benchmark failed: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+=============================================
+Event & Ticket Booking System - Credentials Client
+Group 5 - DAMG6210
+Batched password verification and card masking (encryption_script.sql)
+=============================================
+
+Usage (from the GUI folder):
+    python credentials.py --benchmark               # logins/sec and masked rows/sec, per-call vs batched
+    python credentials.py --benchmark --rows 5000
+
+Every call to sp_VerifyUserPassword or sp_GetMaskedCardNumber opens and
+closes EventBookingSymKey, which decrypts the key with the certificate's
+private key each time. Connections that call open_key_session once (the GUI
+pool does it for every connection it opens) keep the key open for their
+lifetime, and the procedures reuse it.
+"""
+
+import argparse
+import sys
+import time
+
+from db_config import connect
+
+VERIFY_BATCH_SIZE = 1000  # credentials per sp_VerifyUserPasswordsBatch call
+MASK_BATCH_SIZE = 1000  # CardIDs per tvf_MaskedCardNumbersBatch call
+BENCHMARK_ROWS = 1000
+
+# Skipped on databases where encryption_script.sql has not been run
+KEY_SESSION_SQL = """
+    IF KEY_ID('EventBookingSymKey') IS NOT NULL
+       AND NOT EXISTS (SELECT * FROM sys.openkeys
+                       WHERE key_name = 'EventBookingSymKey' AND database_id = DB_ID())
+        OPEN SYMMETRIC KEY EventBookingSymKey DECRYPTION BY CERTIFICATE EventBookingCert;
+"""
+
+_STAGING_DDL = """
+    DROP TABLE IF EXISTS #Credentials;
+    CREATE TABLE #Credentials (
+        RowID INT NOT NULL PRIMARY KEY,
+        Email VARCHAR(100) NOT NULL,
+        PasswordToVerify VARCHAR(255) NOT NULL
+    );
+"""
+
+_VERIFY_SQL = """
+    SET NOCOUNT ON;
+    DECLARE @Credentials CredentialList;
+    INSERT INTO @Credentials SELECT * FROM #Credentials;
+    EXEC sp_VerifyUserPasswordsBatch @Credentials;
+"""
+
+
+def open_key_session(conn):
+    """Open EventBookingSymKey for the lifetime of conn (use as ConnectionPool on_connect)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(KEY_SESSION_SQL)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def verify_passwords(conn, credentials):
+    """
+    Verify (email, password) pairs; returns one bool per pair, in order.
+
+    Each chunk of VERIFY_BATCH_SIZE pairs is staged into a session temp table
+    with fast_executemany and checked by one sp_VerifyUserPasswordsBatch call,
+    so the key is opened (at most) once per chunk rather than once per login.
+    Unknown emails are reported as not valid.
+    """
+    credentials = list(credentials)
+    results = [False] * len(credentials)
+    if not credentials:
+        return results
+
+    cursor = conn.cursor()
+    try:
+        for offset, chunk in enumerate(_chunks(credentials, VERIFY_BATCH_SIZE)):
+            base = offset * VERIFY_BATCH_SIZE
+            # The DDL first drops a staging table a failed call may have left on this connection
+            cursor.execute(_STAGING_DDL)
+            cursor.fast_executemany = True
+            cursor.executemany(
+                "INSERT INTO #Credentials (RowID, Email, PasswordToVerify) VALUES (?, ?, ?)",
+                [(base + i, email, password) for i, (email, password) in enumerate(chunk)]
+            )
+            cursor.fast_executemany = False
+
+            cursor.execute(_VERIFY_SQL)
+            while cursor.description is None and cursor.nextset():
+                pass
+            for row in cursor.fetchall():
+                results[row.RowID] = bool(row.IsValid)
+
+        cursor.execute("DROP TABLE #Credentials;")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return results
+
+
+def masked_card_numbers(conn, card_ids):
+    """Return {CardID: '************1234'} for the given cards, MASK_BATCH_SIZE per query"""
+    card_ids = [int(card_id) for card_id in dict.fromkeys(card_ids)]
+    masked = {}
+    cursor = conn.cursor()
+    try:
+        for chunk in _chunks(card_ids, MASK_BATCH_SIZE):
+            cursor.execute(
+                "SELECT CardID, MaskedCardNumber FROM dbo.tvf_MaskedCardNumbersBatch(?)",
+                (",".join(map(str, chunk)),)
+            )
+            masked.update((row.CardID, row.MaskedCardNumber) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+    return masked
+
+
+# -----------------------------------------
+# Per-call baseline (one procedure call, and one key open, per row)
+# -----------------------------------------
+
+def _verify_one_by_one(conn, credentials):
+    cursor = conn.cursor()
+    try:
+        results = []
+        for email, password in credentials:
+            cursor.execute("""
+                DECLARE @IsValid BIT;
+                EXEC sp_VerifyUserPassword @Email = ?, @PasswordToVerify = ?, @IsValid = @IsValid OUTPUT;
+                SELECT @IsValid AS IsValid;
+            """, (email, password))
+            while cursor.description is None and cursor.nextset():
+                pass
+            results.append(bool(cursor.fetchone().IsValid))
+        return results
+    finally:
+        cursor.close()
+
+
+def _mask_one_by_one(conn, card_ids):
+    cursor = conn.cursor()
+    try:
+        masked = {}
+        for card_id in card_ids:
+            cursor.execute("""
+                DECLARE @Masked VARCHAR(20);
+                EXEC sp_GetMaskedCardNumber @CardID = ?, @MaskedCardNumber = @Masked OUTPUT;
+                SELECT @Masked AS MaskedCardNumber;
+            """, (card_id,))
+            while cursor.description is None and cursor.nextset():
+                pass
+            masked[card_id] = cursor.fetchone().MaskedCardNumber
+        return masked
+    finally:
+        cursor.close()
+
+
+def _load_sample(conn, rows):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT TOP (?) Email, PasswordHash FROM [USER] WHERE PasswordHashEncrypted IS NOT NULL ORDER BY UserID",
+            (rows,)
+        )
+        credentials = [(row.Email, row.PasswordHash) for row in cursor.fetchall()]
+        cursor.execute("SELECT TOP (?) CardID FROM CARD_PAYMENT ORDER BY CardID", (rows,))
+        card_ids = [row.CardID for row in cursor.fetchall()]
+        return credentials, card_ids
+    finally:
+        cursor.close()
+
+
+def _rate(count, seconds):
+    return count / seconds if seconds > 0 else float("inf")
+
+
+def run_benchmark(rows=BENCHMARK_ROWS):
+    """Time per-call vs batched verification and masking; returns a dict of rates"""
+    baseline_conn = connect(autocommit=True)
+    batched_conn = connect()
+    try:
+        credentials, card_ids = _load_sample(baseline_conn, rows)
+        if not credentials or not card_ids:
+            raise RuntimeError("No encrypted users or card payments - run encryption_script.sql on loaded data first")
+        open_key_session(batched_conn)
+
+        started = time.perf_counter()
+        expected = _verify_one_by_one(baseline_conn, credentials)
+        verify_before = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual = verify_passwords(batched_conn, credentials)
+        verify_after = time.perf_counter() - started
+        if actual != expected:
+            raise RuntimeError("Batched verification disagrees with sp_VerifyUserPassword")
+
+        started = time.perf_counter()
+        expected_masks = _mask_one_by_one(baseline_conn, card_ids)
+        mask_before = time.perf_counter() - started
+
+        started = time.perf_counter()
+        actual_masks = masked_card_numbers(batched_conn, card_ids)
+        mask_after = time.perf_counter() - started
+        if actual_masks != expected_masks:
+            raise RuntimeError("tvf_MaskedCardNumbersBatch disagrees with sp_GetMaskedCardNumber")
+    finally:
+        baseline_conn.close()
+        batched_conn.close()
+
+    return {
+        "logins": len(credentials),
+        "cards": len(card_ids),
+        "logins_per_sec_before": _rate(len(credentials), verify_before),
+        "logins_per_sec_after": _rate(len(credentials), verify_after),
+        "masked_per_sec_before": _rate(len(card_ids), mask_before),
+        "masked_per_sec_after": _rate(len(card_ids), mask_after),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batched password verification and card masking.")
+    parser.add_argument("--benchmark", action="store_true", required=True,
+                        help="compare per-call procedures with the batched APIs")
+    parser.add_argument("--rows", type=int, default=BENCHMARK_ROWS,
+                        help=f"users and cards to sample (default: {BENCHMARK_ROWS})")
+    args = parser.parse_args(argv)
+
+    try:
+        result = run_benchmark(args.rows)
+    except Exception as e:
+        print(f"Benchmark failed: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{'':<22}{'per call':>12}{'batched':>12}{'speedup':>10}")
+    for label, count, key in (("logins/sec", result["logins"], "logins_per_sec"),
+                              ("masked rows/sec", result["cards"], "masked_per_sec")):
+        before, after = result[f"{key}_before"], result[f"{key}_after"]
+        print(f"{label + f' ({count})':<22}{before:>12.0f}{after:>12.0f}{after / before:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+=============================================
+Event & Ticket Booking System - Database Configuration
+Group 5 - DAMG6210
+Connection settings shared by the GUI and the command-line tools
+=============================================
+"""
+
+import os
+
+# Set EVENT_BOOKING_CONNECTION_STRING to override without editing this file
+CONNECTION_STRING = os.environ.get(
+    "EVENT_BOOKING_CONNECTION_STRING",
+    'DRIVER={ODBC Driver 17 for SQL Server};'
+    'SERVER=localhost,1433;'  # Change to your server
+    'DATABASE=EventBookingSystem;'
+    'UID=sa;'  # Change to your username
+    'PWD=Aggysalve@2627;'  # Change to your password
+    'TrustServerCertificate=yes;'
+)
+
+# Read replicas for SELECT-only pages: connection strings separated by |, e.g.
+#   EVENT_BOOKING_READ_REPLICAS="DRIVER=...;SERVER=localhost,1434;...|DRIVER=...;SERVER=replica2;..."
+# Empty (the default) sends every query to CONNECTION_STRING. See db_router.py.
+READ_REPLICA_CONNECTION_STRINGS = [
+    conn_str.strip()
+    for conn_str in os.environ.get("EVENT_BOOKING_READ_REPLICAS", "").split("|")
+    if conn_str.strip()
+]
+
+
+def read_only(conn_str):
+    """conn_str with ApplicationIntent=ReadOnly, so an availability group routes it to a readable secondary"""
+    if "applicationintent" in conn_str.lower():
+        return conn_str
+    return conn_str.rstrip(";") + ";ApplicationIntent=ReadOnly;"
+
+
+def connect(autocommit=False):
+    """Open a new pyodbc connection using CONNECTION_STRING"""
+    import pyodbc
+    return pyodbc.connect(CONNECTION_STRING, autocommit=autocommit)
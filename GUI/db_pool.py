@@ -0,0 +1,208 @@
+"""
+=============================================
+Event & Ticket Booking System - Connection Pool
+Group 5 - DAMG6210
+Thread-safe DB-API connection pool for the GUI data layer
+=============================================
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class PoolClosed(Exception):
+    """Raised when a connection is requested from a closed pool"""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of DB-API connections.
+
+    Works with any DB-API 2.0 driver: `connect` is a zero-argument callable
+    returning a new connection (pyodbc for SQL Server, sqlite3 for local testing).
+
+    - min_size connections are opened up front and kept open
+    - at most max_size connections exist at any time; extra callers wait
+      up to checkout_timeout seconds before PoolTimeout is raised
+    - connections idle for longer than validate_after seconds are health-checked
+      on borrow, dead ones are discarded and replaced with a fresh connection
+    - on_connect, if given, is called with every newly opened connection to set
+      up session state that should live as long as the connection (e.g. an open
+      symmetric key); a connection it fails on is closed and not pooled
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, checkout_timeout=10.0,
+                 health_check_query="SELECT 1", validate_after=1.0, on_connect=None):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+
+        self._connect = connect
+        self._on_connect = on_connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.health_check_query = health_check_query
+        self.validate_after = validate_after
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, returned_at)
+        self._size = 0
+        self._closed = False
+
+        # Warm up the pool; a database that is down at startup should not
+        # prevent the app from loading, connections are retried on checkout.
+        for _ in range(min_size):
+            try:
+                conn = self._open()
+            except Exception:
+                break
+            self._size += 1
+            self._idle.append((conn, time.monotonic()))
+
+    # -----------------------------------------
+    # Checkout / checkin
+    # -----------------------------------------
+
+    def checkout(self, timeout=None):
+        """Borrow a healthy connection, opening a new one if the pool has room"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise PoolClosed("Connection pool is closed")
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    action = "validate"
+                elif self._size < self.max_size:
+                    self._size += 1
+                    conn, returned_at = None, None
+                    action = "open"
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"No database connection available after {timeout:.1f}s "
+                            f"(pool size {self.max_size})"
+                        )
+                    self._lock.wait(remaining)
+                    continue
+
+            if action == "open":
+                try:
+                    return self._open()
+                except Exception:
+                    self._release_slot()
+                    raise
+
+            # Validate outside the lock so a slow health check does not block other callers
+            if time.monotonic() - returned_at < self.validate_after or self._is_healthy(conn):
+                return conn
+
+            self._discard(conn)
+
+    def checkin(self, conn, broken=False):
+        """Return a connection to the pool, discarding it if it is broken"""
+        if not broken:
+            try:
+                # Never hand out a connection with an open transaction
+                conn.rollback()
+            except Exception:
+                broken = True
+
+        with self._lock:
+            if not broken and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                self._lock.notify()
+                return
+
+        self._discard(conn)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks a connection out and always returns it"""
+        conn = self.checkout(timeout)
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            # A failed query may mean the socket died underneath us
+            broken = not self._is_healthy(conn)
+            raise
+        finally:
+            self.checkin(conn, broken=broken)
+
+    # -----------------------------------------
+    # Maintenance
+    # -----------------------------------------
+
+    def close(self):
+        """Close every idle connection; checked-out ones are closed on checkin"""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._lock.notify_all()
+
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        """Snapshot of pool usage"""
+        with self._lock:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+    # -----------------------------------------
+    # Internal helpers
+    # -----------------------------------------
+
+    def _open(self):
+        conn = self._connect()
+        if self._on_connect is not None:
+            try:
+                self._on_connect(conn)
+            except Exception:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+                raise
+        return conn
+
+    def _is_healthy(self, conn):
+        try:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(self.health_check_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        self._release_slot()
+
+    def _release_slot(self):
+        with self._lock:
+            self._size -= 1
+            self._lock.notify()
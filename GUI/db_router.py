@@ -0,0 +1,307 @@
+"""
+=============================================
+Event & Ticket Booking System - Read/Write Router
+Group 5 - DAMG6210
+Routes SELECT-only work to read replicas and everything else to the primary
+=============================================
+
+Usage (from the GUI folder):
+    python db_router.py --status                 # lag and health of each replica in EVENT_BOOKING_READ_REPLICAS
+    python db_router.py --status --interval 5    # keep checking every 5 seconds
+
+Each database is a Backend: a ConnectionPool plus the connection string
+arrow-odbc needs for columnar reads. DatabaseRouter.read() runs a function on
+a replica that is up, no more than max_staleness seconds behind the primary
+and already has the caller's last write; with no such replica it runs on the
+primary. DatabaseRouter.write() always runs on the primary.
+
+Lag is measured with the REPLICA_HEARTBEAT row (read_replica_script.sql): the
+primary stamps it, replication carries it to the replicas, and the difference
+between the two stamps is how far behind a replica is. A replica whose
+heartbeat cannot be read is not used, so with the script missing every read
+stays on the primary.
+"""
+
+import argparse
+import random
+import re
+import sys
+import threading
+import time
+
+from db_pool import ConnectionPool, PoolTimeout
+
+MAX_STALENESS = 30  # seconds a replica may lag by default
+CHECK_INTERVAL = 5  # seconds between heartbeat checks
+RETRY_AFTER = 30  # seconds an unreachable replica is skipped before it is tried again
+LOGIN_TIMEOUT = 5  # seconds to wait when connecting to a replica
+
+HEARTBEAT_SQL = "EXEC sp_ReplicaHeartbeat"
+READ_HEARTBEAT_SQL = "SELECT UpdatedAt FROM REPLICA_HEARTBEAT WHERE HeartbeatID = 1"
+
+# SQLSTATEs of a refused or lost connection (08xxx) and of login/query timeouts
+_CONNECTION_SQLSTATES = ("08", "HYT00", "HYT01")
+
+_SERVER = re.compile(r"(?:^|;)\s*(?:SERVER|ADDRESS|ADDR)\s*=\s*([^;]+)", re.IGNORECASE)
+
+
+def is_connection_error(error):
+    """True when error means the database could not be reached, not that the statement failed"""
+    if isinstance(error, PoolTimeout):
+        return True
+    sqlstate = error.args[0] if error.args else None
+    return isinstance(sqlstate, str) and sqlstate.startswith(_CONNECTION_SQLSTATES)
+
+
+def server_name(conn_str):
+    """SERVER= part of a connection string, for display without the credentials"""
+    match = _SERVER.search(conn_str)
+    return match.group(1).strip() if match else "replica"
+
+
+class Backend:
+    """One database the router can send work to"""
+
+    def __init__(self, name, pool, connection_string=None):
+        self.name = name
+        self.pool = pool
+        self.connection_string = connection_string
+
+        self.lag = None  # seconds behind the primary at the last check; None = unknown
+        self.caught_up_to = None  # time.monotonic() the replica was known to be current as of
+        self.down_until = 0.0  # time.monotonic() before which the backend is not tried
+        self.last_error = None
+        self.reads = 0
+        self.failures = 0
+
+    def as_of(self, started):
+        """time.monotonic() a read started at `started` is known to be current as of"""
+        return started if self.caught_up_to is None else min(started, self.caught_up_to)
+
+
+class DatabaseRouter:
+    """
+    Routes database work between a primary and zero or more read replicas.
+
+    - write() runs on the primary
+    - read() picks at random among the replicas that are up, lag at most
+      max_staleness seconds and have caught up with written_at (the caller's
+      last write), and otherwise runs on the primary; max_staleness=0 always
+      reads from the primary
+    - a replica that cannot be reached is skipped for retry_after seconds and
+      the read moves on to the next candidate, ending with the primary; any
+      other error is raised, as the statement would fail on the primary too
+    - lag is re-measured every check_interval seconds by whichever read finds
+      the last check out of date (a replica that is down is not checked)
+    """
+
+    def __init__(self, primary, replicas=(), max_staleness=MAX_STALENESS, check_interval=CHECK_INTERVAL,
+                 retry_after=RETRY_AFTER):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.max_staleness = max_staleness
+        self.check_interval = check_interval
+        self.retry_after = retry_after
+
+        self._check_lock = threading.Lock()
+        self._checked_at = None
+
+    # -----------------------------------------
+    # Routing
+    # -----------------------------------------
+
+    def write(self, fn):
+        """fn(backend) on the primary"""
+        return fn(self.primary)
+
+    def read(self, fn, max_staleness=None, written_at=None):
+        """
+        fn(backend) on a replica that is fresh enough, or on the primary.
+
+        max_staleness: seconds of replication lag the caller accepts (default: the router's)
+        written_at: time.monotonic() of the caller's last write, which the replica must have
+        """
+        for backend in self._read_candidates(max_staleness, written_at):
+            if backend is self.primary:
+                self.primary.reads += 1
+                return fn(backend)
+            try:
+                result = fn(backend)
+            except Exception as e:
+                if not is_connection_error(e):
+                    raise
+                self._mark_down(backend, e)
+                continue
+            backend.reads += 1
+            return result
+
+    def _read_candidates(self, max_staleness, written_at):
+        max_staleness = self.max_staleness if max_staleness is None else max_staleness
+        if not self.replicas or max_staleness <= 0:
+            return [self.primary]
+
+        self._check_if_due()
+        now = time.monotonic()
+        fresh = [
+            replica for replica in self.replicas
+            if replica.down_until <= now
+            and replica.lag is not None and replica.lag <= max_staleness
+            and (written_at is None or replica.caught_up_to >= written_at)
+        ]
+        random.shuffle(fresh)  # spread reads over the replicas
+        return fresh + [self.primary]
+
+    # -----------------------------------------
+    # Heartbeat checks
+    # -----------------------------------------
+
+    def check(self):
+        """Measure every replica's lag now; returns {name: lag in seconds, or None if unknown}"""
+        started = time.monotonic()
+        try:
+            primary_time = self._query_time(self.primary.pool, HEARTBEAT_SQL, commit=True)
+            self.primary.last_error = None
+        except Exception as e:
+            primary_time = None
+            self.primary.last_error = str(e)
+
+        for replica in self.replicas:
+            if replica.down_until > started:
+                continue
+            try:
+                replica_time = self._query_time(replica.pool, READ_HEARTBEAT_SQL)
+            except Exception as e:
+                replica.lag = None
+                replica.last_error = str(e)
+                if is_connection_error(e):
+                    self._mark_down(replica, e)
+                continue
+
+            if primary_time is None:
+                replica.lag = None
+                continue
+            # Both stamps come from the primary's clock; the replica is current up to its stamp
+            replica.lag = max((primary_time - replica_time).total_seconds(), 0.0)
+            replica.caught_up_to = started - replica.lag
+            replica.last_error = None
+
+        self._checked_at = started
+        return {replica.name: replica.lag for replica in self.replicas}
+
+    def _check_if_due(self):
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return
+        # One reader runs the check; the others route on the previous measurements meanwhile
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            if self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval:
+                self.check()
+        finally:
+            self._check_lock.release()
+
+    def _query_time(self, pool, query, commit=False):
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query)
+                value = cursor.fetchone()[0]
+                if commit:
+                    conn.commit()
+                return value
+            finally:
+                cursor.close()
+
+    def _mark_down(self, replica, error):
+        replica.down_until = time.monotonic() + self.retry_after
+        replica.lag = None
+        replica.last_error = str(error)
+        replica.failures += 1
+
+    # -----------------------------------------
+    # Monitoring
+    # -----------------------------------------
+
+    def stats(self):
+        """One row per backend: role, lag, whether reads can use it, and counters"""
+        now = time.monotonic()
+        rows = [{
+            "backend": self.primary.name,
+            "role": "primary",
+            "lag_s": 0.0,
+            "usable": True,
+            "reads": self.primary.reads,
+            "failures": self.primary.failures,
+            "last_error": self.primary.last_error,
+        }]
+        for replica in self.replicas:
+            rows.append({
+                "backend": replica.name,
+                "role": "replica",
+                "lag_s": replica.lag,
+                "usable": replica.down_until <= now and replica.lag is not None
+                          and replica.lag <= self.max_staleness,
+                "reads": replica.reads,
+                "failures": replica.failures,
+                "last_error": replica.last_error,
+            })
+        return rows
+
+    def close(self):
+        """Close every backend's pool"""
+        for backend in [self.primary] + self.replicas:
+            backend.pool.close()
+
+
+def from_config(max_staleness=MAX_STALENESS, check_interval=CHECK_INTERVAL, retry_after=RETRY_AFTER):
+    """Router over plain pyodbc pools for CONNECTION_STRING and READ_REPLICA_CONNECTION_STRINGS"""
+    import pyodbc
+    from db_config import CONNECTION_STRING, READ_REPLICA_CONNECTION_STRINGS, read_only
+
+    def pool(conn_str, **kwargs):
+        return ConnectionPool(lambda: pyodbc.connect(conn_str, **kwargs), min_size=0, max_size=2)
+
+    primary = Backend("primary", pool(CONNECTION_STRING), CONNECTION_STRING)
+    replicas = [
+        Backend(server_name(conn_str), pool(read_only(conn_str), timeout=LOGIN_TIMEOUT), read_only(conn_str))
+        for conn_str in READ_REPLICA_CONNECTION_STRINGS
+    ]
+    return DatabaseRouter(primary, replicas, max_staleness, check_interval, retry_after)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read replica lag and health.")
+    parser.add_argument("--status", action="store_true", required=True,
+                        help="measure the lag of each configured read replica")
+    parser.add_argument("--interval", type=float, default=None,
+                        help=f"repeat every N seconds (e.g. {CHECK_INTERVAL})")
+    parser.add_argument("--max-staleness", type=float, default=MAX_STALENESS,
+                        help=f"lag in seconds above which a replica is not used (default: {MAX_STALENESS})")
+    args = parser.parse_args(argv)
+
+    router = from_config(max_staleness=args.max_staleness, retry_after=0)
+    if not router.replicas:
+        print("No read replicas configured - set EVENT_BOOKING_READ_REPLICAS (see db_config.py)", file=sys.stderr)
+        return 1
+
+    try:
+        while True:
+            router.check()
+            if router.primary.last_error:
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} primary heartbeat failed: {router.primary.last_error}")
+            for row in router.stats()[1:]:
+                lag = "unknown" if row["lag_s"] is None else f"{row['lag_s']:.1f}s behind"
+                status = "used" if row["usable"] else "not used"
+                print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {row['backend']}: {lag}, {status}"
+                      + (f" ({row['last_error']})" if row["last_error"] else ""))
+            if args.interval is None:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        router.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
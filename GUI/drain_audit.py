@@ -0,0 +1,62 @@
+"""
+=============================================
+Event & Ticket Booking System - Audit Drainer
+Group 5 - DAMG6210
+Moves queued booking changes into BOOKING_AUDIT (audit_queue_script.sql)
+=============================================
+
+Usage (from the GUI folder):
+    python drain_audit.py                 # drain the queue once
+    python drain_audit.py --interval 10   # keep draining every 10 seconds
+"""
+
+import argparse
+import sys
+import time
+
+from db_config import connect
+
+DRAIN_INTERVAL = 10  # seconds between drains in --interval mode
+DRAIN_BATCH_SIZE = 5000
+
+
+def drain_audit_queue(conn, batch_size=DRAIN_BATCH_SIZE):
+    """Drain BOOKING_AUDIT_QUEUE; returns the number of audit rows moved"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            DECLARE @RowsDrained INT;
+            EXEC sp_DrainBookingAuditQueue @BatchSize = ?, @RowsDrained = @RowsDrained OUTPUT;
+            SELECT @RowsDrained AS RowsDrained;
+        """, (batch_size,))
+        while cursor.description is None and cursor.nextset():
+            pass
+        return cursor.fetchone().RowsDrained
+    finally:
+        cursor.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drain the booking audit queue.")
+    parser.add_argument("--interval", type=float, default=None,
+                        help=f"repeat the drain every N seconds (e.g. {DRAIN_INTERVAL})")
+    parser.add_argument("--batch-size", type=int, default=DRAIN_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    # The procedure commits each batch itself
+    conn = connect(autocommit=True)
+    try:
+        while True:
+            drained = drain_audit_queue(conn, args.batch_size)
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} moved {drained} audit row(s)")
+            if args.interval is None:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+=============================================
+Event & Ticket Booking System - Event Search
+Group 5 - DAMG6210
+Ranked, faceted event discovery over the search index (search_script.sql)
+=============================================
+
+Usage (from the GUI folder):
+    python event_search.py "jazz festival"                        # top matches, best first
+    python event_search.py comedy --type Movie --city Boston --from 2025-01-01 --to 2025-06-30
+    python event_search.py --rebuild                              # re-index every event (after bulk loads)
+    python event_search.py --benchmark                            # latency of one- and two-word searches
+
+events_query() builds the Events grid query. With search text it pages
+through dbo.tvf_SearchEvents, ranked by score and then newest first; without
+it the grid browses EVENT newest first. Type, status, date range and city
+filters apply in both modes, always as bound parameters.
+
+Words are matched the way the index stores them (lower case, punctuation
+dropped, stop words ignored) and from 3 letters on also as prefixes, so
+"champ" finds "Championship". Every word has to match, in any of the indexed
+fields: title, description, movie title and genre, sport, tournament, league,
+teams, exhibition theme and curator, venue and theater names and cities.
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import time
+
+from pagination import KeysetQuery, SortKey
+
+SEARCH_LATENCY_TARGET_MS = 50
+BENCHMARK_QUERIES = 200
+RESULT_LIMIT = 20
+
+EVENT_TYPES = ["Movie", "Sport", "Exhibition"]
+EVENT_STATUSES = ["Scheduled", "Ongoing", "Completed", "Cancelled"]
+
+REBUILD_SQL = "EXEC sp_RebuildEventSearch"
+CITIES_SQL = "SELECT City FROM THEATER UNION SELECT City FROM VENUE ORDER BY City"
+SEARCH_INSTALLED_SQL = "SELECT OBJECT_ID('dbo.tvf_SearchEvents') AS SearchFunction"
+
+# Words of the index to draw benchmark queries from: the most common ones, so the
+# search is measured where it has the most postings to read
+_BENCHMARK_TERMS_SQL = "SELECT TOP (?) Term FROM EVENT_SEARCH_VOCAB ORDER BY DocCount DESC"
+
+_SEARCH_FROM = "dbo.tvf_SearchEvents(?, ?, ?, ?, ?, ?) S"
+
+
+def _day_after(date):
+    """Exclusive upper bound for a date range that includes the whole end date"""
+    return datetime.datetime.combine(date + datetime.timedelta(days=1), datetime.time())
+
+
+def _day_start(date):
+    return datetime.datetime.combine(date, datetime.time())
+
+
+def events_query(text=None, event_type=None, status=None, start_date=None, end_date=None, city=None):
+    """
+    The Events grid query for the given search text and filters (None = any).
+
+    start_date and end_date are dates, both inclusive; city matches the city
+    of a theater showing the event or the venue of one of its matches.
+    """
+    text = (text or "").strip()
+    start_from = _day_start(start_date) if start_date is not None else None
+    start_to = _day_after(end_date) if end_date is not None else None
+
+    if text:
+        # The function checks every facet while it reads the index
+        return KeysetQuery(
+            f"""
+            SELECT S.Score, E.EventID, E.Title, E.EventType, E.Status, S.StartDateTime, E.EndDateTime,
+                   E.Duration, O.CompanyName AS Organizer
+            FROM {_SEARCH_FROM}
+            INNER JOIN EVENT E ON E.EventID = S.EventID
+            LEFT JOIN ORGANIZER O ON E.OrganizerID = O.OrganizerID
+            """,
+            sort_keys=[
+                SortKey("S.Score", "Score", descending=True),
+                SortKey("S.StartDateTime", "StartDateTime", descending=True, sql_type="DATETIME"),
+                SortKey("S.EventID", "EventID", descending=True)
+            ],
+            count_from=_SEARCH_FROM,
+            params=[text, event_type, status, start_from, start_to, city]
+        )
+
+    filters = []
+    if event_type is not None:
+        filters.append(("E.EventType = ?", (event_type,)))
+    if status is not None:
+        filters.append(("E.Status = ?", (status,)))
+    if start_from is not None:
+        filters.append(("E.StartDateTime >= CAST(? AS DATETIME)", (start_from,)))
+    if start_to is not None:
+        filters.append(("E.StartDateTime < CAST(? AS DATETIME)", (start_to,)))
+    if city is not None:
+        filters.append(("EXISTS (SELECT * FROM EVENT_SEARCH_CITY EC WHERE EC.City = ? AND EC.EventID = E.EventID)",
+                        (city,)))
+    return KeysetQuery(
+        """
+        SELECT E.EventID, E.Title, E.EventType, E.Status, E.StartDateTime, E.EndDateTime, E.Duration,
+               O.CompanyName AS Organizer
+        FROM EVENT E
+        LEFT JOIN ORGANIZER O ON E.OrganizerID = O.OrganizerID
+        """,
+        sort_keys=[
+            SortKey("E.StartDateTime", "StartDateTime", descending=True, sql_type="DATETIME"),
+            SortKey("E.EventID", "EventID", descending=True)
+        ],
+        filters=filters,
+        count_from="EVENT E"
+    )
+
+
+def search(cursor, text, limit=RESULT_LIMIT, **facets):
+    """The first limit results of a search as (columns, rows)"""
+    sql, params = events_query(text, **facets).page_sql(limit)
+    cursor.execute(sql, params)
+    return [column[0] for column in cursor.description], cursor.fetchall()[:limit]
+
+
+def benchmark(cursor, queries=BENCHMARK_QUERIES, seed=0):
+    """{label: {p50_ms, p95_ms, max_ms}} for one-word and two-word searches of common words"""
+    cursor.execute(_BENCHMARK_TERMS_SQL, (100,))
+    terms = [row[0] for row in cursor.fetchall()]
+    if not terms:
+        raise RuntimeError("The search index is empty - run search_script.sql or event_search.py --rebuild")
+
+    rng = random.Random(seed)
+    # Each workload makes (text, facets) for one search
+    workloads = {
+        "one word": lambda: (rng.choice(terms), {}),
+        "two words": lambda: (" ".join(rng.sample(terms, min(len(terms), 2))), {}),
+        "prefix": lambda: (rng.choice(terms)[:3], {}),
+        "word + type": lambda: (rng.choice(terms), {"event_type": rng.choice(EVENT_TYPES)}),
+    }
+
+    results = {}
+    for label, make in workloads.items():
+        timings = []
+        for _ in range(queries):
+            text, facets = make()
+            started = time.perf_counter()
+            search(cursor, text, **facets)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        results[label] = {
+            "p50_ms": statistics.median(timings),
+            "p95_ms": timings[int(len(timings) * 0.95) - 1],
+            "max_ms": timings[-1],
+        }
+    return results
+
+
+def main(argv=None):
+    from db_config import connect
+
+    parser = argparse.ArgumentParser(description="Search events by title, genre, teams, venue and more.")
+    parser.add_argument("text", nargs="?", help="words to search for")
+    parser.add_argument("--type", choices=EVENT_TYPES)
+    parser.add_argument("--status", choices=EVENT_STATUSES)
+    parser.add_argument("--city")
+    parser.add_argument("--from", dest="start_date", type=datetime.date.fromisoformat,
+                        help="first start date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end_date", type=datetime.date.fromisoformat,
+                        help="last start date (YYYY-MM-DD)")
+    parser.add_argument("--limit", type=int, default=RESULT_LIMIT)
+    parser.add_argument("--rebuild", action="store_true", help="re-index every event")
+    parser.add_argument("--benchmark", action="store_true",
+                        help=f"measure search latency against the {SEARCH_LATENCY_TARGET_MS} ms target")
+    parser.add_argument("--queries", type=int, default=BENCHMARK_QUERIES,
+                        help="searches per benchmark workload")
+    args = parser.parse_args(argv)
+
+    if not (args.text or args.rebuild or args.benchmark):
+        parser.error("give search text, --rebuild or --benchmark")
+
+    conn = connect(autocommit=True)
+    try:
+        cursor = conn.cursor()
+
+        if args.rebuild:
+            started = time.perf_counter()
+            cursor.execute(REBUILD_SQL)
+            while cursor.description is None and cursor.nextset():
+                pass
+            events, postings, terms = cursor.fetchone()
+            print(f"Indexed {events:,} events: {postings:,} postings of {terms:,} words "
+                  f"in {time.perf_counter() - started:.1f}s")
+
+        if args.text:
+            columns, rows = search(cursor, args.text, args.limit, event_type=args.type, status=args.status,
+                                   start_date=args.start_date, end_date=args.end_date, city=args.city)
+            print("  ".join(columns))
+            for row in rows:
+                print("  ".join("" if value is None else str(value) for value in row))
+            print(f"({len(rows)} shown)")
+
+        if args.benchmark:
+            print(f"{'search':<14}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+            failed = False
+            for label, timing in benchmark(cursor, args.queries).items():
+                failed = failed or timing["p95_ms"] > SEARCH_LATENCY_TARGET_MS
+                print(f"{label:<14}{timing['p50_ms']:>10.1f}{timing['p95_ms']:>10.1f}{timing['max_ms']:>10.1f}")
+            print(f"p95 {'above' if failed else 'within'} the {SEARCH_LATENCY_TARGET_MS} ms target")
+            return 1 if failed else 0
+    except Exception as e:
+        print(f"Search failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+=============================================
+Event & Ticket Booking System - Event Transitions
+Group 5 - DAMG6210
+Command-line entry point for the chunked event status transition engine
+=============================================
+
+Usage (from the GUI folder):
+    python event_transitions.py --event 42 --status Cancelled   # cancel an event in batches
+    python event_transitions.py --resume 17                      # continue a failed transition
+    python event_transitions.py --schedule                       # start/complete events by time, run open transitions
+    python event_transitions.py --schedule --interval 300        # keep scheduling every 5 minutes
+"""
+
+import argparse
+import sys
+import time
+
+from db_config import connect
+
+TRANSITION_BATCH_SIZE = 1000  # bookings per transaction
+SCHEDULE_INTERVAL = 300  # seconds between scheduler runs in --interval mode
+
+_TRANSITION_COLUMNS = """
+    TransitionID, EventID, FromStatus, ToStatus, Status, LastBookingID,
+    BatchesRun, BookingsUpdated, TicketsUpdated, ErrorMessage
+"""
+
+
+def _fetch_row(cursor):
+    """Skip row counts up to the first result set and return its first row as a dict"""
+    while cursor.description is None and cursor.nextset():
+        pass
+    columns = [column[0] for column in cursor.description]
+    return dict(zip(columns, cursor.fetchone()))
+
+
+def start_transition(conn, event_id, new_status):
+    """Set the event's status and return the TransitionID of its booking/ticket work"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            DECLARE @TransitionID INT;
+            EXEC sp_StartEventTransition @EventID = ?, @NewStatus = ?, @TransitionID = @TransitionID OUTPUT;
+            SELECT @TransitionID AS TransitionID;
+        """, (event_id, new_status))
+        return _fetch_row(cursor)["TransitionID"]
+    finally:
+        cursor.close()
+
+
+def run_transition(conn, transition_id, batch_size=TRANSITION_BATCH_SIZE, max_batches=None):
+    """
+    Run (or resume) a transition and return its EVENT_STATUS_TRANSITION row as a dict.
+
+    Each batch commits on its own, so conn must be in autocommit mode; if
+    the procedure fails, the batches before the error stay applied and the
+    next call continues from the checkpoint.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "EXEC sp_RunEventTransition @TransitionID = ?, @BatchSize = ?, @MaxBatches = ?",
+            (transition_id, batch_size, max_batches)
+        )
+        while cursor.nextset():
+            pass
+        cursor.execute(
+            f"SELECT {_TRANSITION_COLUMNS} FROM EVENT_STATUS_TRANSITION WHERE TransitionID = ?",
+            (transition_id,)
+        )
+        return _fetch_row(cursor)
+    finally:
+        cursor.close()
+
+
+def schedule_transitions(conn, batch_size=TRANSITION_BATCH_SIZE, max_batches_per_event=None):
+    """Apply time-driven status changes and run open transitions; returns the summary row"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "EXEC sp_ScheduleEventTransitions @BatchSize = ?, @MaxBatchesPerEvent = ?",
+            (batch_size, max_batches_per_event)
+        )
+        return _fetch_row(cursor)
+    finally:
+        cursor.close()
+
+
+def _print_transition(row):
+    print(
+        f"Transition #{row['TransitionID']} (event {row['EventID']} -> {row['ToStatus']}) "
+        f"{row['Status'].lower()}: {row['BookingsUpdated']} booking(s), {row['TicketsUpdated']} ticket(s) "
+        f"in {row['BatchesRun']} batch(es), checkpoint BookingID {row['LastBookingID']}"
+    )
+    if row["ErrorMessage"]:
+        print(f"  last error: {row['ErrorMessage']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run chunked event status transitions.")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--event", type=int, help="event to move to --status")
+    mode.add_argument("--resume", type=int, metavar="TRANSITION_ID", help="continue an unfinished transition")
+    mode.add_argument("--schedule", action="store_true",
+                      help="start/complete events whose start/end has passed and run open transitions")
+    parser.add_argument("--status", choices=["Scheduled", "Ongoing", "Completed", "Cancelled"])
+    parser.add_argument("--batch-size", type=int, default=TRANSITION_BATCH_SIZE,
+                        help=f"bookings per transaction (default: {TRANSITION_BATCH_SIZE})")
+    parser.add_argument("--max-batches", type=int, default=None,
+                        help="stop each transition after this many batches (default: run to the end)")
+    parser.add_argument("--interval", type=float, default=None,
+                        help=f"with --schedule, repeat every N seconds (e.g. {SCHEDULE_INTERVAL})")
+    args = parser.parse_args(argv)
+
+    if args.event is not None and args.status is None:
+        parser.error("--event requires --status")
+
+    conn = connect(autocommit=True)
+    try:
+        if args.schedule:
+            while True:
+                summary = schedule_transitions(conn, args.batch_size, args.max_batches)
+                print(
+                    f"{time.strftime('%Y-%m-%d %H:%M:%S')} started {summary['EventsStarted']} and completed "
+                    f"{summary['EventsCompleted']} event(s); ran {summary['TransitionsRun']} transition(s), "
+                    f"{summary['TransitionsFinished']} finished, {summary['TransitionsFailed']} failed"
+                )
+                if args.interval is None:
+                    return 0
+                time.sleep(args.interval)
+
+        transition_id = args.resume
+        if transition_id is None:
+            transition_id = start_transition(conn, args.event, args.status)
+        try:
+            row = run_transition(conn, transition_id, args.batch_size, args.max_batches)
+        except Exception as e:
+            print(f"Transition #{transition_id} failed: {e}", file=sys.stderr)
+            print(f"Resume with: python event_transitions.py --resume {transition_id}", file=sys.stderr)
+            return 1
+        _print_transition(row)
+        return 0
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        print(f"Event transition failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
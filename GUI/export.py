@@ -0,0 +1,165 @@
+"""
+=============================================
+Event & Ticket Booking System - Streaming Export
+Group 5 - DAMG6210
+Chunked CSV/Parquet export that never materializes the full result set
+=============================================
+"""
+
+import csv
+import datetime
+import decimal
+import io
+import tempfile
+
+from columnar import available as columnar_available, export_batches
+from db_config import CONNECTION_STRING
+
+# Parquet export is optional: it needs pyarrow, which is not in requirements.txt
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_CHUNK_ROWS = 5000
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024  # spill to a temp file on disk above this size
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats():
+    """Export formats usable with the installed packages"""
+    return [name for name in EXPORT_FORMATS if name != "Parquet" or pa is not None]
+
+
+def export_query(pool, query, params=None, fmt="CSV", chunk_rows=EXPORT_CHUNK_ROWS, columnar=False,
+                 connection_string=CONNECTION_STRING):
+    """
+    Run a query on a pooled connection and stream its rows into a spooled temp file.
+
+    Rows are pulled with fetchmany(chunk_rows) and written incrementally, so memory
+    stays bounded by one chunk plus SPOOL_MAX_MEMORY however large the report is.
+    With columnar=True (and arrow-odbc installed) the query runs on its own
+    connection to connection_string (the database the pool connects to) instead
+    and Arrow batches are written as they are fetched, without building a Python
+    object per row.
+    Returns (file, row_count) with the file positioned at the start.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "Parquet" and pa is None:
+        raise RuntimeError("Parquet export requires the pyarrow package")
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY, mode="w+b")
+    try:
+        if columnar and columnar_available():
+            row_count = export_batches(query, spool, fmt, params, batch_rows=chunk_rows,
+                                       connection_string=connection_string)
+            spool.seek(0)
+            return spool, row_count
+
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                if fmt == "CSV":
+                    row_count = _write_csv(cursor, spool, chunk_rows)
+                else:
+                    row_count = _write_parquet(cursor, spool, chunk_rows)
+            finally:
+                cursor.close()
+    except Exception:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool, row_count
+
+
+def _write_csv(cursor, spool, chunk_rows):
+    text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow([column[0] for column in cursor.description])
+
+    row_count = 0
+    while True:
+        rows = cursor.fetchmany(chunk_rows)
+        if not rows:
+            break
+        writer.writerows(rows)
+        row_count += len(rows)
+
+    text.flush()
+    text.detach()  # keep the underlying spool open
+    return row_count
+
+
+def _arrow_type(type_code, precision, scale):
+    """Arrow type for a DB-API cursor.description type code"""
+    if type_code is bool:
+        return pa.bool_()
+    if type_code is int:
+        return pa.int64()
+    if type_code is float:
+        return pa.float64()
+    if type_code is decimal.Decimal:
+        return pa.decimal128(precision or 38, scale or 0)
+    if type_code is datetime.datetime:
+        return pa.timestamp("ms")
+    if type_code is datetime.date:
+        return pa.date32()
+    if type_code is datetime.time:
+        return pa.time64("us")
+    if type_code in (bytes, bytearray):
+        return pa.binary()
+    if type_code is str:
+        return pa.string()
+    return None  # driver did not report a type (e.g. sqlite); inferred from the data
+
+
+def arrow_schema(description, first_rows=None):
+    """
+    Arrow schema built from cursor.description so every chunk shares one schema.
+
+    Columns whose type the driver does not report are inferred from first_rows.
+    """
+    columns = list(zip(*first_rows)) if first_rows else [()] * len(description)
+    fields = []
+    for column, values in zip(description, columns):
+        arrow_type = _arrow_type(column[1], column[4], column[5])
+        if arrow_type is None:
+            arrow_type = pa.array(values).type if values else pa.string()
+            if pa.types.is_null(arrow_type):
+                arrow_type = pa.string()
+        fields.append(pa.field(column[0], arrow_type))
+    return pa.schema(fields)
+
+
+def _write_parquet(cursor, spool, chunk_rows):
+    rows = cursor.fetchmany(chunk_rows)
+    schema = arrow_schema(cursor.description, rows)
+    writer = pq.ParquetWriter(spool, schema)
+
+    row_count = 0
+    try:
+        while rows:
+            columns = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            )
+            writer.write_batch(batch)
+            row_count += len(rows)
+            rows = cursor.fetchmany(chunk_rows)
+    finally:
+        writer.close()
+    return row_count
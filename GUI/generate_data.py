@@ -0,0 +1,368 @@
+"""
+=============================================
+Event & Ticket Booking System - Synthetic Data Generator
+Group 5 - DAMG6210
+Seeded, schema-valid bulk data for performance and load testing
+=============================================
+
+Usage (from the GUI folder):
+    python generate_data.py --bookings 100000
+    python generate_data.py --bookings 10000000 --seed 7 --batch-size 50000
+
+Appends to the existing database (run after insert_script.sql). Rows get
+explicit IDs above the current maximum of each table, so the same seed
+against the same starting database always produces the same data. Every row
+respects the schema's foreign keys, CHECK constraints and the
+UNIQUE (ShowID, SeatID) seat rule; cancelled bookings hold no seats, as after
+sp_CancelBooking.
+
+Sizes are derived from --bookings (about 10 bookings per customer and one
+event per 2,000 bookings) unless overridden. Memory stays bounded by one
+batch per table, so 10^8 bookings only need time and disk.
+After a large load, run EXEC sp_ReconcileDashboardStats,
+python refresh_reporting.py --full and python event_search.py --rebuild.
+"""
+
+import argparse
+import datetime
+import random
+import sys
+import time
+
+from db_config import connect
+
+DEFAULT_BOOKINGS = 10_000
+BATCH_SIZE = 10_000
+START_DATE = datetime.datetime(2024, 1, 1)
+DAYS = 730
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+    "Daniel", "Lisa", "Matthew", "Nancy", "Anthony", "Priya", "Wei", "Fatima", "Hiroshi", "Olga",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Patel", "Chen", "Khan", "Tanaka", "Ivanova",
+]
+CITIES = [("Boston", "MA", "02116"), ("Cambridge", "MA", "02139"), ("New York", "NY", "10001"),
+          ("Providence", "RI", "02903"), ("Hartford", "CT", "06103"), ("Portland", "ME", "04101")]
+GENRES = ["Action", "Comedy", "Drama", "Sci-Fi", "Horror", "Animation", "Thriller", "Romance"]
+RATINGS = ["G", "PG", "PG-13", "R"]
+SPORTS = [("Basketball", "NBA"), ("Baseball", "MLB"), ("Hockey", "NHL"), ("Soccer", "MLS"), ("Football", "NFL")]
+THEMES = ["Modern Art", "Ancient History", "Science & Technology", "Photography", "Natural History"]
+WALLETS = ["Apple Pay", "Google Pay", "Samsung Pay"]
+SHOW_TYPES = [(10, "Matinee"), (17, "Evening"), (21, "Night")]
+
+# Booking mix: status weights and seats per booking
+STATUS_WEIGHTS = (("Confirmed", 80), ("Completed", 12), ("Cancelled", 8))
+SEATS_PER_BOOKING = (1, 1, 2, 2, 2, 2, 3, 4, 4, 6)
+
+
+class TableWriter:
+    """Buffers rows for one table and bulk inserts them with fast_executemany"""
+
+    def __init__(self, cursor, table, columns, identity=False):
+        self.cursor = cursor
+        self.table = table
+        self.identity = identity
+        self.sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        self.rows = []
+        self.written = 0
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.identity:
+            self.cursor.execute(f"SET IDENTITY_INSERT {self.table} ON")
+        self.cursor.executemany(self.sql, self.rows)
+        if self.identity:
+            self.cursor.execute(f"SET IDENTITY_INSERT {self.table} OFF")
+        self.written += len(self.rows)
+        self.rows = []
+
+
+class DataGenerator:
+    """
+    Streams synthetic rows into the database in foreign-key order.
+
+    Writers are flushed together, parents first, whenever any buffer reaches
+    batch_size, and each flush is its own transaction.
+    """
+
+    def __init__(self, conn, bookings, seed=42, batch_size=BATCH_SIZE, customers=None, events=None,
+                 theaters=None, log=print):
+        self.conn = conn
+        self.rng = random.Random(seed)
+        self.bookings = bookings
+        self.batch_size = batch_size
+        self.n_customers = customers or max(100, bookings // 10)
+        self.n_events = events or max(20, bookings // 2000)
+        self.n_theaters = theaters or max(3, min(200, bookings // 50_000))
+        self.n_organizers = max(5, self.n_events // 20)
+        self.log = log
+
+        self.cursor = conn.cursor()
+        self.cursor.fast_executemany = True
+        self.next_ids = {}
+
+        def writer(table, columns, identity=True):
+            return TableWriter(self.cursor, table, columns, identity)
+
+        # Declaration order is flush order (parents before children)
+        self.writers = [
+            writer("ORGANIZER", ["OrganizerID", "CompanyName", "ContactEmail", "ContactPhone"]),
+            writer("[USER]", ["UserID", "FirstName", "LastName", "Email", "PhoneNumber", "PasswordHash",
+                              "CustomerID", "Role"]),
+            writer("CUSTOMER", ["CustomerID", "UserID", "LoyaltyPoints"]),
+            writer("THEATER", ["TheaterID", "TheaterName", "City", "State", "ZipCode", "ContactNumber"]),
+            writer("SCREEN", ["ScreenID", "TheaterID", "ScreenNumber", "SeatCapacity"]),
+            writer("SEAT", ["SeatID", "ScreenID", "RowNumber", "SeatNumber", "SeatType"]),
+            writer("EVENT", ["EventID", "OrganizerID", "Title", "Description", "EventType", "Status",
+                             "Language", "StartDateTime", "EndDateTime", "Duration"]),
+            writer("MOVIE", ["MovieID", "EventID", "Title", "Genre", "Rating", "ReleaseDate"]),
+            writer("SPORT", ["SportID", "EventID", "SportType", "TournamentName", "League"]),
+            writer("EXHIBITION", ["ExhibitionID", "EventID", "ExhibitionTheme", "CuratorFName", "CuratorLName"]),
+            writer("SHOW", ["ShowID", "EventID", "MovieID", "ScreenID", "ShowDateTime", "ShowType", "Price"]),
+            writer("BOOKING", ["BookingID", "CustomerID", "EventID", "BookingDateTime", "TotalAmount",
+                               "BookingStatus"]),
+            writer("SEAT_BOOKING", ["BookingID", "SeatID", "ShowID"], identity=False),
+            writer("TICKET", ["BookingID", "TicketStatus", "IssueDate", "ValidUntil", "QRCode"], identity=False),
+            writer("PAYMENT", ["PaymentID", "BookingID", "Amount", "PaymentDateTime", "TransactionReference"]),
+            writer("CARD_PAYMENT", ["PaymentID", "CardNumber", "CardLast4", "CardHolderName", "ExpiryDate"],
+                   identity=False),
+            writer("WALLET_PAYMENT", ["PaymentID", "WalletType"], identity=False),
+            writer("PAYPAL_PAYMENT", ["PaymentID", "PayPalEmail"], identity=False),
+        ]
+        self.by_table = {w.table.strip("[]"): w for w in self.writers}
+
+    # --- plumbing ---
+
+    def _first_id(self, table, column):
+        self.cursor.execute(f"SELECT ISNULL(MAX({column}), 0) FROM {table}")
+        return self.cursor.fetchone()[0] + 1
+
+    def new_id(self, table):
+        value = self.next_ids[table]
+        self.next_ids[table] = value + 1
+        return value
+
+    def add(self, table, row):
+        writer = self.by_table[table]
+        writer.add(row)
+        if len(writer.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for writer in self.writers:
+            writer.flush()
+        self.conn.commit()
+
+    # --- generation ---
+
+    def run(self):
+        for table, column in [("ORGANIZER", "OrganizerID"), ("USER", "UserID"), ("CUSTOMER", "CustomerID"),
+                              ("THEATER", "TheaterID"), ("SCREEN", "ScreenID"), ("SEAT", "SeatID"),
+                              ("EVENT", "EventID"), ("MOVIE", "MovieID"), ("SPORT", "SportID"),
+                              ("EXHIBITION", "ExhibitionID"), ("SHOW", "ShowID"), ("BOOKING", "BookingID"),
+                              ("PAYMENT", "PaymentID")]:
+            self.next_ids[table] = self._first_id(f"[{table}]", column)
+
+        started = time.perf_counter()
+        organizers = self.generate_organizers()
+        self.first_customer = self.next_ids["CUSTOMER"]
+        self.generate_customers()
+        screens = self.generate_venues()
+        events = self.generate_events(organizers)
+        self.flush()
+        self.log(f"Reference data written ({time.perf_counter() - started:.1f}s)")
+
+        self.generate_bookings(events, screens, started)
+        self.flush()
+        self.cursor.close()
+
+        elapsed = time.perf_counter() - started
+        self.log(f"Done in {elapsed:.1f}s:")
+        for writer in self.writers:
+            if writer.written:
+                self.log(f"  {writer.table:<16} {writer.written:>12,}")
+
+    def generate_organizers(self):
+        ids = []
+        for i in range(self.n_organizers):
+            organizer_id = self.new_id("ORGANIZER")
+            self.add("ORGANIZER", (organizer_id, f"Generated Promotions {organizer_id}",
+                                   f"events{organizer_id}@example.com", f"617-555-{i % 10000:04d}"))
+            ids.append(organizer_id)
+        return ids
+
+    def generate_customers(self):
+        rng = self.rng
+        for _ in range(self.n_customers):
+            user_id = self.new_id("USER")
+            customer_id = self.new_id("CUSTOMER")
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            self.add("USER", (user_id, first, last, f"{first.lower()}.{last.lower()}.{user_id}@example.com",
+                              f"555-{rng.randint(100, 999)}-{rng.randint(0, 9999):04d}",
+                              "GENERATED_HASH", customer_id, "Customer"))
+            self.add("CUSTOMER", (customer_id, user_id, rng.randint(0, 2000)))
+
+    def generate_venues(self):
+        """Theaters with 4-10 screens of 6-16 rows x 8-20 seats; returns [(ScreenID, [SeatID, ...])]"""
+        rng = self.rng
+        screens = []
+        for _ in range(self.n_theaters):
+            theater_id = self.new_id("THEATER")
+            city, state, zip_code = rng.choice(CITIES)
+            self.add("THEATER", (theater_id, f"Generated Cinema {theater_id}", city, state, zip_code,
+                                 f"617-555-{theater_id % 10000:04d}"))
+            for screen_number in range(1, rng.randint(4, 10) + 1):
+                screen_id = self.new_id("SCREEN")
+                rows, per_row = rng.randint(6, 16), rng.randint(8, 20)
+                self.add("SCREEN", (screen_id, theater_id, screen_number, rows * per_row))
+                seat_ids = []
+                for r in range(rows):
+                    seat_type = "Premium" if r < 2 else ("VIP" if r == rows - 1 else "Regular")
+                    for number in range(1, per_row + 1):
+                        seat_id = self.new_id("SEAT")
+                        self.add("SEAT", (seat_id, screen_id, chr(ord("A") + r), number, seat_type))
+                        seat_ids.append(seat_id)
+                screens.append((screen_id, seat_ids))
+        return screens
+
+    def generate_events(self, organizers):
+        """Returns [(EventID, MovieID or None, StartDateTime, EndDateTime)]"""
+        rng = self.rng
+        as_of = START_DATE + datetime.timedelta(days=DAYS)
+        events = []
+        for _ in range(self.n_events):
+            event_id = self.new_id("EVENT")
+            event_type = rng.choices(["Movie", "Sport", "Exhibition"], weights=[70, 20, 10])[0]
+            start = START_DATE + datetime.timedelta(days=rng.randrange(DAYS), hours=rng.choice([10, 14, 18, 19]))
+            if event_type == "Movie":
+                end = start + datetime.timedelta(days=rng.randint(14, 60))
+                duration = rng.randint(85, 180)
+            else:
+                duration = rng.randint(120, 480)
+                end = start + datetime.timedelta(minutes=duration)
+
+            if rng.random() < 0.03:
+                status = "Cancelled"
+            elif end < as_of:
+                status = "Completed"
+            else:
+                status = "Scheduled"
+
+            title = f"Generated {event_type} {event_id}"
+            self.add("EVENT", (event_id, rng.choice(organizers), title, f"Synthetic {event_type.lower()} event",
+                               event_type, status, "English", start, end, duration))
+
+            movie_id = None
+            if event_type == "Movie":
+                movie_id = self.new_id("MOVIE")
+                self.add("MOVIE", (movie_id, event_id, title, rng.choice(GENRES), rng.choice(RATINGS),
+                                   (start - datetime.timedelta(days=7)).date()))
+            elif event_type == "Sport":
+                sport, league = rng.choice(SPORTS)
+                self.add("SPORT", (self.new_id("SPORT"), event_id, sport, f"{league} Season", league))
+            else:
+                self.add("EXHIBITION", (self.new_id("EXHIBITION"), event_id, rng.choice(THEMES),
+                                        rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)))
+            events.append((event_id, movie_id, start, end))
+        return events
+
+    def generate_bookings(self, events, screens, started):
+        """Fill shows one at a time until the booking target is reached"""
+        rng = self.rng
+        statuses = [s for s, _ in STATUS_WEIGHTS]
+        weights = [w for _, w in STATUS_WEIGHTS]
+        last_customer = self.next_ids["CUSTOMER"] - 1
+        remaining = self.bookings
+        report_every = max(self.bookings // 10, 1)
+
+        while remaining > 0:
+            event_id, movie_id, start, end = rng.choice(events)
+            screen_id, seat_ids = rng.choice(screens)
+            show_hour, show_type = rng.choice(SHOW_TYPES)
+            show_day = start + datetime.timedelta(days=rng.randrange(max((end - start).days, 1)))
+            show_time = show_day.replace(hour=show_hour, minute=rng.choice([0, 15, 30, 45]))
+            price = round(rng.uniform(8, 45), 2)
+            show_id = self.new_id("SHOW")
+            self.add("SHOW", (show_id, event_id, movie_id, screen_id, show_time, show_type, price))
+
+            # Sell a contiguous run of the screen from a random starting seat
+            offset = rng.randrange(len(seat_ids))
+            seats = seat_ids[offset:] + seat_ids[:offset]
+            position, target = 0, int(len(seats) * rng.uniform(0.3, 0.95))
+
+            while position < target and remaining > 0:
+                count = min(rng.choice(SEATS_PER_BOOKING), len(seats) - position)
+                status = rng.choices(statuses, weights)[0]
+                if status == "Completed" and show_time > START_DATE + datetime.timedelta(days=DAYS):
+                    status = "Confirmed"
+                booked_at = max(START_DATE, show_time - datetime.timedelta(minutes=rng.randint(30, 60 * 24 * 30)))
+                amount = round(price * count, 2)
+                booking_id = self.new_id("BOOKING")
+                self.add("BOOKING", (booking_id, rng.randint(self.first_customer, last_customer), event_id,
+                                     booked_at, amount, status))
+
+                ticket_status = {"Confirmed": "Active", "Completed": "Used", "Cancelled": "Cancelled"}[status]
+                for seat_id in seats[position:position + count]:
+                    if status != "Cancelled":
+                        self.add("SEAT_BOOKING", (booking_id, seat_id, show_id))
+                    self.add("TICKET", (booking_id, ticket_status, booked_at.date(),
+                                        (booked_at + datetime.timedelta(days=30)).date(),
+                                        f"QR{booking_id}-{seat_id}"))
+                if status != "Cancelled":
+                    position += count
+
+                payment_id = self.new_id("PAYMENT")
+                self.add("PAYMENT", (payment_id, booking_id, amount, booked_at, f"GEN-{booking_id}"))
+                method = rng.random()
+                if method < 0.6:
+                    card_number = f"4{rng.randrange(10 ** 15):015d}"
+                    self.add("CARD_PAYMENT", (payment_id, card_number, card_number[-4:],
+                                              f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                                              (booked_at + datetime.timedelta(days=3 * 365)).date()))
+                elif method < 0.85:
+                    self.add("WALLET_PAYMENT", (payment_id, rng.choice(WALLETS)))
+                else:
+                    self.add("PAYPAL_PAYMENT", (payment_id, f"buyer{booking_id}@example.com"))
+
+                remaining -= 1
+                done = self.bookings - remaining
+                if done % report_every == 0:
+                    rate = done / max(time.perf_counter() - started, 1e-9)
+                    self.log(f"  {done:,}/{self.bookings:,} bookings ({rate:,.0f}/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic booking data.")
+    parser.add_argument("--bookings", type=int, default=DEFAULT_BOOKINGS,
+                        help=f"number of bookings to create (default: {DEFAULT_BOOKINGS:,})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per bulk insert")
+    parser.add_argument("--customers", type=int, help="default: bookings / 10")
+    parser.add_argument("--events", type=int, help="default: bookings / 2000")
+    parser.add_argument("--theaters", type=int, help="default: bookings / 50000 (3-200)")
+    args = parser.parse_args(argv)
+
+    conn = connect()
+    try:
+        DataGenerator(conn, args.bookings, seed=args.seed, batch_size=args.batch_size,
+                      customers=args.customers, events=args.events, theaters=args.theaters).run()
+    except Exception as e:
+        conn.rollback()
+        print(f"Generation failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
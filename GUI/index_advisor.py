@@ -0,0 +1,774 @@
+"""
+=============================================
+Event & Ticket Booking System - Index Advisor
+Group 5 - DAMG6210
+Covering index proposals from the real workload, plus unused/duplicate index checks
+=============================================
+
+Usage (from the GUI folder):
+    python index_advisor.py                                   # analyse, write index_advice.sql
+    python index_advisor.py --log slow_queries.log            # only statements the GUI logged as slow
+    python index_advisor.py --apply --benchmark --report index_report.json
+    python index_advisor.py --apply --drop-redundant              # also drop the redundant indexes
+
+The workload is the plan cache: the --top statements compiled in this
+database by logical reads (sys.dm_exec_query_stats), with their cached plans,
+plus the server's missing-index DMVs. With --log, it is narrowed to the
+statements in the GUI's slow-query log (query_metrics.py), weighted by the
+time the GUI spent on them. Each plan is searched for
+  - missing-index hints (equality, inequality and included columns)
+  - sorts on one table's columns fed by a filtered access to that table:
+    an index keyed on the filter columns and then the sort columns returns
+    rows already in order, so a TOP (n) page stops after n rows
+  - key lookups: the nonclustered index used is proposed again with the
+    looked-up columns included
+Proposals an existing index already serves are dropped. Existing indexes
+whose key duplicates or prefixes another index on the same table (with its
+columns included there) are flagged, as are indexes written but not read
+since the server started.
+
+The advice file is an ordinary script (sqlcmd -i index_advice.sql). Drops of
+unused indexes are left commented out: usage counters reset on restart, so
+an index used by a monthly report can look unused. Drops of redundant
+indexes are commented out too unless --drop-redundant is given, and even
+then the script re-checks that the index is not unique or backing a primary
+key or unique constraint before dropping it. --benchmark runs the
+benchmark.py suite before and after --apply and reports the difference.
+"""
+
+import argparse
+import datetime
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+import benchmark
+from db_config import connect
+from query_metrics import fingerprint
+
+ADVICE_FILE = "index_advice.sql"
+TOP_STATEMENTS = 200
+
+_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+
+_WORKLOAD_SQL = """
+    SELECT TOP (?)
+        qs.execution_count,
+        qs.total_logical_reads,
+        qs.total_elapsed_time / 1000 AS total_elapsed_ms,
+        SUBSTRING(st.text, qs.statement_start_offset / 2 + 1,
+                  (CASE qs.statement_end_offset WHEN -1 THEN DATALENGTH(st.text)
+                        ELSE qs.statement_end_offset END - qs.statement_start_offset) / 2 + 1) AS statement_text,
+        qp.query_plan
+    FROM sys.dm_exec_query_stats qs
+    CROSS APPLY sys.dm_exec_sql_text(qs.sql_handle) st
+    CROSS APPLY sys.dm_exec_text_query_plan(qs.plan_handle, qs.statement_start_offset, qs.statement_end_offset) qp
+    WHERE qp.dbid = DB_ID()
+      AND st.text NOT LIKE '%sys.dm[_]exec[_]query[_]stats%'
+    ORDER BY qs.total_logical_reads DESC
+"""
+
+_MISSING_INDEX_SQL = """
+    SELECT
+        OBJECT_SCHEMA_NAME(d.object_id) AS SchemaName,
+        OBJECT_NAME(d.object_id) AS TableName,
+        d.equality_columns,
+        d.inequality_columns,
+        d.included_columns,
+        gs.user_seeks * gs.avg_total_user_cost * gs.avg_user_impact / 100.0 AS Weight
+    FROM sys.dm_db_missing_index_details d
+    INNER JOIN sys.dm_db_missing_index_groups g ON g.index_handle = d.index_handle
+    INNER JOIN sys.dm_db_missing_index_group_stats gs ON gs.group_handle = g.index_group_handle
+    WHERE d.database_id = DB_ID()
+"""
+
+_INDEXES_SQL = """
+    SELECT
+        s.name AS SchemaName,
+        t.name AS TableName,
+        i.name AS IndexName,
+        i.type AS IndexType,
+        CAST(CASE WHEN i.is_primary_key = 1 OR i.is_unique_constraint = 1 OR i.is_unique = 1
+                  THEN 1 ELSE 0 END AS BIT) AS IsUnique,
+        i.has_filter AS IsFiltered,
+        c.name AS ColumnName,
+        ic.is_descending_key AS IsDescending,
+        ic.is_included_column AS IsIncluded,
+        ISNULL(us.user_seeks, 0) + ISNULL(us.user_scans, 0) + ISNULL(us.user_lookups, 0) AS Reads,
+        ISNULL(us.user_updates, 0) AS Writes
+    FROM sys.indexes i
+    INNER JOIN sys.tables t ON t.object_id = i.object_id
+    INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+    INNER JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+    INNER JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+    LEFT JOIN sys.dm_db_index_usage_stats us
+        ON us.database_id = DB_ID() AND us.object_id = i.object_id AND us.index_id = i.index_id
+    WHERE t.is_ms_shipped = 0
+      AND i.type IN (1, 2)  -- rowstore clustered and nonclustered
+      AND (ic.key_ordinal > 0 OR ic.is_included_column = 1)
+    ORDER BY s.name, t.name, i.index_id, ic.is_included_column, ic.key_ordinal, ic.index_column_id
+"""
+
+_SERVER_SQL = """
+    SELECT DB_NAME() AS DatabaseName, sqlserver_start_time AS StartTime
+    FROM sys.dm_os_sys_info
+"""
+
+_BRACKETED = re.compile(r"\[([^\]]+)\]")
+_PARAM_MARKER = re.compile(r"@P\d+\b")
+_GO = re.compile(r"^\s*GO\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+class IndexDef:
+    """
+    An index, existing or proposed.
+
+    keys is a list of (column, descending) pairs; the first equality_keys of
+    them are equality-filter columns, whose order does not matter.
+    """
+
+    def __init__(self, schema, table, keys, includes=(), name=None, equality_keys=0):
+        self.schema = schema
+        self.table = table
+        self.keys = list(keys)
+        key_names = {column.lower() for column, _ in self.keys}
+        self.includes = {column for column in includes if column.lower() not in key_names}
+        self.name = name
+        self.equality_keys = equality_keys
+        # existing indexes
+        self.clustered = False
+        self.unique = False
+        self.filtered = False
+        self.reads = 0
+        self.writes = 0
+        # proposals
+        self.weight = 0.0
+        self.reasons = []
+        self.replaces = None  # existing index widened in place (DROP_EXISTING)
+
+    @property
+    def table_key(self):
+        return self.schema.lower(), self.table.lower()
+
+    def columns(self):
+        return {column.lower() for column, _ in self.keys} | {column.lower() for column in self.includes}
+
+    def describe(self):
+        keys = ", ".join(f"{column}{' DESC' if desc else ''}" for column, desc in self.keys)
+        text = f"{self.table}({keys})"
+        if self.includes:
+            text += f" INCLUDE ({', '.join(sorted(self.includes))})"
+        return text
+
+
+# -----------------------------------------
+# Workload and catalog
+# -----------------------------------------
+
+def client_sql(statement_text):
+    """Server text of a prepared statement in the form the GUI runs it: '(@P1 int)... @P1' -> '... ?'"""
+    text = statement_text.lstrip()
+    if text.startswith("(@"):
+        depth = 0
+        for position, char in enumerate(text):
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    text = text[position + 1:]
+                    break
+    return _PARAM_MARKER.sub("?", text)
+
+
+def read_slow_log(path):
+    """Total logged milliseconds per statement fingerprint from a query_metrics slow-query log"""
+    totals = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            totals[entry["fingerprint"]] = totals.get(entry["fingerprint"], 0.0) + entry["ms"]
+    return totals
+
+
+def load_workload(conn, top=TOP_STATEMENTS, slow_log=None):
+    """[(statement_text, weight, plan_xml)]; weight is logical reads, or logged ms with slow_log"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_WORKLOAD_SQL, (top,))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    workload = []
+    for row in rows:
+        if not row.query_plan:
+            continue
+        weight = float(row.total_logical_reads)
+        if slow_log is not None:
+            weight = slow_log.get(fingerprint(client_sql(row.statement_text)))
+            if weight is None:
+                continue
+        workload.append((row.statement_text, weight, row.query_plan))
+    return workload
+
+
+def load_indexes(conn):
+    """{(schema, table): [IndexDef]} for every rowstore index of every user table"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_INDEXES_SQL)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    indexes = {}
+    by_name = {}
+    for row in rows:
+        key = (row.SchemaName, row.TableName, row.IndexName)
+        index = by_name.get(key)
+        if index is None:
+            index = by_name[key] = IndexDef(row.SchemaName, row.TableName, [], name=row.IndexName)
+            index.clustered = row.IndexType == 1
+            index.unique = bool(row.IsUnique)
+            index.filtered = bool(row.IsFiltered)
+            index.reads = row.Reads
+            index.writes = row.Writes
+            indexes.setdefault(index.table_key, []).append(index)
+        if row.IsIncluded:
+            index.includes.add(row.ColumnName)
+        else:
+            index.keys.append((row.ColumnName, bool(row.IsDescending)))
+    return indexes
+
+
+def load_missing_index_hints(conn):
+    """Proposals from the server-wide missing-index DMVs"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_MISSING_INDEX_SQL)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    proposals = []
+    for row in rows:
+        equality = _BRACKETED.findall(row.equality_columns or "")
+        inequality = _BRACKETED.findall(row.inequality_columns or "")
+        proposal = IndexDef(
+            row.SchemaName, row.TableName,
+            [(column, False) for column in equality + inequality],
+            _BRACKETED.findall(row.included_columns or ""),
+            equality_keys=len(equality)
+        )
+        proposal.weight = float(row.Weight or 0)
+        proposal.reasons.append("missing-index DMV")
+        proposals.append(proposal)
+    return proposals
+
+
+# -----------------------------------------
+# Plan analysis
+# -----------------------------------------
+
+def _strip(name):
+    return name.strip("[]") if name else name
+
+
+def _table_refs(element, schema, table):
+    """Column names under element that belong to schema.table"""
+    return [
+        ref.get("Column")
+        for ref in element.iter(_NS + "ColumnReference")
+        if _strip(ref.get("Table")) == table and _strip(ref.get("Schema")) == schema
+    ]
+
+
+def _conjuncts(scalar):
+    """ScalarOperators ANDed together at the top of a predicate (OR branches are not filters)"""
+    logical = scalar.find(_NS + "Logical")
+    if logical is not None and logical.get("Operation") == "AND":
+        for child in logical.findall(_NS + "ScalarOperator"):
+            yield from _conjuncts(child)
+    else:
+        yield scalar
+
+
+def _equality_columns(index_scan, schema, table):
+    """Columns the access filters with '= constant/parameter', from its seek and residual predicates"""
+    columns = []
+    for prefix in index_scan.iter(_NS + "Prefix"):
+        range_columns = prefix.find(_NS + "RangeColumns")
+        if prefix.get("ScanType") == "EQ" and range_columns is not None:
+            columns.extend(_table_refs(range_columns, schema, table))
+
+    predicate = index_scan.find(_NS + "Predicate")
+    if predicate is not None and predicate.find(_NS + "ScalarOperator") is not None:
+        for conjunct in _conjuncts(predicate.find(_NS + "ScalarOperator")):
+            compare = conjunct.find(_NS + "Compare")
+            if compare is None or compare.get("CompareOp") != "EQ":
+                continue
+            operands = compare.findall(_NS + "ScalarOperator")
+            if len(operands) != 2:
+                continue
+            # column = value, where the value side references no table (a constant or parameter)
+            for mine, other in ((operands[0], operands[1]), (operands[1], operands[0])):
+                mine = _table_refs(mine, schema, table)
+                if len(mine) == 1 and not any(ref.get("Table") for ref in other.iter(_NS + "ColumnReference")):
+                    columns.append(mine[0])
+    return list(dict.fromkeys(columns))
+
+
+def _accesses(plan):
+    """Table accesses of a plan grouped by (schema, table, alias)"""
+    accesses = {}
+    for relop in plan.iter(_NS + "RelOp"):
+        index_scan = relop.find(_NS + "IndexScan")
+        if index_scan is None:
+            continue
+        obj = index_scan.find(_NS + "Object")
+        schema, table = _strip(obj.get("Schema")), _strip(obj.get("Table"))
+        access = accesses.setdefault((schema, table, obj.get("Alias")), {
+            "schema": schema, "table": table, "equality": [], "outputs": set(),
+            "lookup_columns": set(), "index": None,
+        })
+        columns = set(_table_refs(relop.find(_NS + "OutputList"), schema, table))
+        if index_scan.get("Lookup") in ("1", "true"):
+            predicate = index_scan.find(_NS + "Predicate")
+            if predicate is not None:
+                columns.update(_table_refs(predicate, schema, table))
+            access["lookup_columns"].update(columns)
+        else:
+            access["index"] = _strip(obj.get("Index"))
+            access["equality"].extend(
+                column for column in _equality_columns(index_scan, schema, table)
+                if column not in access["equality"]
+            )
+        access["outputs"].update(columns)
+    return accesses
+
+
+def analyse_plan(plan_xml, weight, existing):
+    """Index proposals for one cached statement plan"""
+    proposals = []
+    root = ET.fromstring(plan_xml)
+    for plan in root.iter(_NS + "QueryPlan"):
+        for group in plan.iter(_NS + "MissingIndexGroup"):
+            impact = float(group.get("Impact") or 0)
+            for missing in group.iter(_NS + "MissingIndex"):
+                usage = {"EQUALITY": [], "INEQUALITY": [], "INCLUDE": []}
+                for column_group in missing.findall(_NS + "ColumnGroup"):
+                    usage[column_group.get("Usage")].extend(
+                        _strip(column.get("Name")) for column in column_group.findall(_NS + "Column")
+                    )
+                proposal = IndexDef(
+                    _strip(missing.get("Schema")), _strip(missing.get("Table")),
+                    [(column, False) for column in usage["EQUALITY"] + usage["INEQUALITY"]],
+                    usage["INCLUDE"], equality_keys=len(usage["EQUALITY"])
+                )
+                proposal.weight = weight * impact / 100.0
+                proposal.reasons.append(f"missing-index hint ({impact:.0f}% impact)")
+                proposals.append(proposal)
+
+        accesses = _accesses(plan)
+        sorted_aliases = set()
+        for relop in plan.iter(_NS + "RelOp"):
+            sort = relop.find(_NS + "Sort")
+            if sort is None:
+                sort = relop.find(_NS + "TopSort")
+            if sort is None:
+                continue
+            order = []
+            for order_column in sort.iter(_NS + "OrderByColumn"):
+                ref = order_column.find(_NS + "ColumnReference")
+                descending = order_column.get("Ascending") not in ("1", "true")
+                order.append((ref.get("Schema"), ref.get("Table"), ref.get("Alias"), ref.get("Column"), descending))
+            aliases = {(_strip(s), _strip(t), a) for s, t, a, _, _ in order}
+            if len(aliases) != 1 or next(iter(aliases)) not in accesses:
+                continue  # sorts on expressions or on several tables cannot come from one index
+            alias = next(iter(aliases))
+            access = accesses[alias]
+            equality = access["equality"]
+            keys = [(column, False) for column in equality]
+            keys += [(column, descending) for _, _, _, column, descending in order if column not in equality]
+            proposal = IndexDef(access["schema"], access["table"], keys, access["outputs"],
+                                equality_keys=len(equality))
+            proposal.weight = weight
+            filtered = f" filtered on {', '.join(equality)}" if equality else ""
+            proposal.reasons.append(f"sort on {', '.join(column for *_, column, _ in order)}{filtered}")
+            proposals.append(proposal)
+            sorted_aliases.add(alias)
+
+        for alias, access in accesses.items():
+            if alias in sorted_aliases or not access["lookup_columns"] or access["index"] is None:
+                continue
+            used = next((index for index in existing.get((access["schema"].lower(), access["table"].lower()), [])
+                         if index.name == access["index"] and not index.clustered), None)
+            if used is None:
+                continue
+            proposal = IndexDef(used.schema, used.table, used.keys, used.includes | access["lookup_columns"],
+                                name=used.name)
+            proposal.replaces = used
+            proposal.weight = weight
+            proposal.reasons.append(f"key lookups for {', '.join(sorted(access['lookup_columns']))}")
+            proposals.append(proposal)
+    return proposals
+
+
+# -----------------------------------------
+# Comparison with existing indexes
+# -----------------------------------------
+
+def _clustered_keys(indexes):
+    clustered = next((index for index in indexes if index.clustered), None)
+    return clustered.keys if clustered is not None else []
+
+
+def _effective_keys(index, clustered_keys):
+    """Key order of a nonclustered index, with the clustered key columns SQL Server appends"""
+    if index.clustered:
+        return index.keys
+    names = {column.lower() for column, _ in index.keys}
+    return index.keys + [(column, desc) for column, desc in clustered_keys if column.lower() not in names]
+
+
+def serves(index, wanted, clustered_keys):
+    """True when index returns every row wanted would, in the same order, with every column it needs"""
+    if index.filtered:
+        return False
+    keys = _effective_keys(index, clustered_keys)
+    if len(keys) < len(wanted.keys):
+        return False
+
+    eq = wanted.equality_keys
+    if {c.lower() for c, _ in keys[:eq]} != {c.lower() for c, _ in wanted.keys[:eq]}:
+        return False
+    rest, have = wanted.keys[eq:], keys[eq:eq + len(wanted.keys) - eq]
+    if [c.lower() for c, _ in rest] != [c.lower() for c, _ in have]:
+        return False
+    # Same direction on every column, or every column reversed (a backward scan)
+    flips = {desc != other for (_, desc), (_, other) in zip(rest, have)}
+    if len(flips) > 1:
+        return False
+
+    if index.clustered:
+        return True
+    covered = index.columns() | {column.lower() for column, _ in clustered_keys}
+    return {column.lower() for column in wanted.includes} <= covered
+
+
+def _as_wanted(index):
+    return IndexDef(index.schema, index.table, index.keys, index.includes)
+
+
+def _proposal_name(proposal, taken):
+    table = "".join(part.capitalize() for part in proposal.table.split("_"))
+    name = f"IX_{table}_{'_'.join(column for column, _ in proposal.keys)}"[:120]
+    candidate, suffix = name, 2
+    while candidate.lower() in taken:
+        candidate, suffix = f"{name}_{suffix}", suffix + 1
+    taken.add(candidate.lower())
+    return candidate
+
+
+class Advice:
+    """Proposals plus flagged existing indexes"""
+
+    def __init__(self):
+        self.proposals = []
+        self.redundant = []  # (index, reason) - served by another index, safe to drop
+        self.unused = []  # index - written, never read since the server started
+
+
+def analyse(workload, existing, hints=()):
+    """Turn the workload's plans into Advice against the existing indexes"""
+    candidates = list(hints)
+    for _, weight, plan_xml in workload:
+        try:
+            candidates.extend(analyse_plan(plan_xml, weight, existing))
+        except ET.ParseError:
+            continue  # plans deeper than the XML type allows come back truncated
+
+    # Merge identical proposals
+    merged = {}
+    for candidate in candidates:
+        key = (candidate.table_key, candidate.replaces.name if candidate.replaces else None,
+               candidate.equality_keys,
+               tuple(sorted(c.lower() for c, _ in candidate.keys[:candidate.equality_keys])),
+               tuple((c.lower(), d) for c, d in candidate.keys[candidate.equality_keys:]))
+        if key in merged:
+            merged[key].includes |= candidate.includes - {c for c, _ in merged[key].keys}
+            merged[key].weight += candidate.weight
+            merged[key].reasons.extend(r for r in candidate.reasons if r not in merged[key].reasons)
+        else:
+            merged[key] = candidate
+    candidates = sorted(merged.values(), key=lambda c: (-len(c.keys), -len(c.includes), -c.weight))
+
+    advice = Advice()
+    taken = {index.name.lower() for indexes in existing.values() for index in indexes}
+    for candidate in candidates:
+        indexes = existing.get(candidate.table_key, [])
+        clustered_keys = _clustered_keys(indexes)
+        if any(serves(index, candidate, clustered_keys) for index in indexes):
+            continue
+        # A wider proposal on the same table may already serve this one
+        keeper = next((p for p in advice.proposals if p.table_key == candidate.table_key
+                       and serves(p, candidate, clustered_keys)), None)
+        if keeper is not None:
+            keeper.weight += candidate.weight
+            keeper.reasons.extend(r for r in candidate.reasons if r not in keeper.reasons)
+            continue
+        if candidate.replaces is None:
+            # The clustered key is stored in every nonclustered index and appended
+            # (ascending) to its key, so it never needs to be declared
+            clustered_names = {column.lower() for column, _ in clustered_keys}
+            if len(clustered_keys) == 1 and len(candidate.keys) > 1 \
+                    and candidate.keys[-1][0].lower() in clustered_names and not candidate.keys[-1][1]:
+                candidate.keys.pop()
+            candidate.includes = {column for column in candidate.includes if column.lower() not in clustered_names}
+            candidate.name = _proposal_name(candidate, taken)
+        advice.proposals.append(candidate)
+    advice.proposals.sort(key=lambda p: -p.weight)
+
+    # Existing indexes whose declared key is a prefix of another index's key, with
+    # their columns stored there too: every seek on them can use the other one
+    for table_key, indexes in existing.items():
+        clustered_keys = _clustered_keys(indexes)
+        proposals = [p for p in advice.proposals if p.table_key == table_key]
+        for position, index in enumerate(indexes):
+            if index.clustered or index.unique or index.filtered:
+                continue
+            if any(p.replaces is index for p in proposals):
+                continue
+            wanted = _as_wanted(index)
+            served_by = None
+            for other_position, other in enumerate(indexes):
+                if other is index or other.clustered or not serves(other, wanted, clustered_keys):
+                    continue
+                # Of two interchangeable indexes, keep the first
+                if other_position > position and serves(index, _as_wanted(other), clustered_keys):
+                    continue
+                served_by = other
+                break
+            if served_by is not None:
+                advice.redundant.append((index, f"served by {served_by.name}"))
+                continue
+            proposal = next((p for p in proposals if serves(p, wanted, clustered_keys)), None)
+            if proposal is not None:
+                advice.redundant.append((index, f"superseded by proposed {proposal.name}"))
+                continue
+            if index.reads == 0 and index.writes > 0:
+                advice.unused.append(index)
+    return advice
+
+
+# -----------------------------------------
+# Advice script
+# -----------------------------------------
+
+def _column_list(columns):
+    return ", ".join(f"[{column}]" for column in columns)
+
+
+def _key_list(keys):
+    return ", ".join(f"[{column}]{' DESC' if desc else ''}" for column, desc in keys)
+
+
+def _object(index):
+    return f"[{index.schema}].[{index.table}]"
+
+
+def _create_sql(proposal):
+    lines = [f"    CREATE NONCLUSTERED INDEX [{proposal.name}]",
+             f"    ON {_object(proposal)}({_key_list(proposal.keys)})"]
+    if proposal.includes:
+        lines.append(f"    INCLUDE ({_column_list(sorted(proposal.includes))})")
+    if proposal.replaces is not None:
+        lines.append("    WITH (DROP_EXISTING = ON)")
+    lines[-1] += ";"
+    return "\n".join(lines)
+
+
+def _exists(index, droppable=False):
+    condition = (f"EXISTS (SELECT * FROM sys.indexes WHERE name = '{index.name}' "
+                 f"AND object_id = OBJECT_ID('{_object(index)}')")
+    if droppable:
+        condition += " AND is_unique = 0 AND is_primary_key = 0 AND is_unique_constraint = 0"
+    return condition + ")"
+
+
+def advice_script(advice, database, workload_note, drop_redundant=False):
+    """The advice as a runnable T-SQL script; redundant drops stay commented out unless drop_redundant"""
+    out = [
+        "-- =============================================",
+        "-- Event & Ticket Booking System - INDEX ADVICE",
+        f"-- Generated by GUI/index_advisor.py on {datetime.datetime.now():%Y-%m-%d %H:%M}",
+        f"-- Workload: {workload_note}",
+        "-- =============================================",
+        "",
+        f"USE [{database}];",
+        "GO",
+        "",
+    ]
+    for number, proposal in enumerate(advice.proposals, start=1):
+        out.append(f"-- Proposal {number}: {proposal.describe()}")
+        out.append(f"--   weight {proposal.weight:,.0f}; {'; '.join(proposal.reasons)}")
+        if proposal.replaces is not None:
+            out.append(f"--   widens {proposal.replaces.describe()}")
+            out.append(f"IF {_exists(proposal)}")
+        else:
+            out.append(f"IF NOT {_exists(proposal)}")
+        out += ["BEGIN", _create_sql(proposal), f"    PRINT 'Created Index: {proposal.name}';", "END", "GO", ""]
+
+    for index, reason in advice.redundant:
+        out.append(f"-- Redundant: {index.name} {index.describe()} - {reason}")
+        out.append(f"--   {index.writes:,} writes, {index.reads:,} reads since the server started")
+        if not drop_redundant:
+            out.append(f"-- DROP INDEX [{index.name}] ON {_object(index)};")
+            out.append("")
+            continue
+        out += [f"IF {_exists(index, droppable=True)}", "BEGIN",
+                f"    DROP INDEX [{index.name}] ON {_object(index)};",
+                f"    PRINT 'Dropped Index: {index.name}';", "END", "GO", ""]
+
+    for index in advice.unused:
+        out.append(f"-- Unused: {index.name} {index.describe()} - "
+                   f"{index.writes:,} writes and no reads since the server started")
+        out.append(f"-- DROP INDEX [{index.name}] ON {_object(index)};")
+        out.append("")
+    return "\n".join(out)
+
+
+def apply_script(conn, script):
+    """Run the script batch by batch (GO-separated); conn must be in autocommit mode"""
+    cursor = conn.cursor()
+    try:
+        for batch in _GO.split(script):
+            if not batch.strip() or all(line.startswith("--") for line in batch.strip().splitlines()):
+                continue
+            cursor.execute(batch)
+            while cursor.nextset():
+                pass
+    finally:
+        cursor.close()
+
+
+# -----------------------------------------
+# Benchmark report
+# -----------------------------------------
+
+def _pct(before, after):
+    if not before:
+        return ""
+    return f"{(after - before) / before * 100:+.0f}%"
+
+
+def print_benchmark(before, after):
+    print(f"{'case':<48}{'ms before':>11}{'ms after':>10}{'reads before':>14}{'reads after':>13}{'reads':>8}")
+    for name, old in before.items():
+        new = after.get(name)
+        if new is None:
+            print(f"{name:<48} missing after apply")
+            continue
+        error = old.get("error") or new.get("error")
+        if error:
+            print(f"{name:<48} ERROR: {error}")
+            continue
+        print(f"{name:<48}{old['elapsed_ms']:>11.1f}{new['elapsed_ms']:>10.1f}"
+              f"{old['logical_reads']:>14}{new['logical_reads']:>13}"
+              f"{_pct(old['logical_reads'], new['logical_reads']):>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Propose covering indexes for the cached workload.")
+    parser.add_argument("--top", type=int, default=TOP_STATEMENTS,
+                        help=f"cached statements to analyse, by logical reads (default: {TOP_STATEMENTS})")
+    parser.add_argument("--log", help="query_metrics slow-query log; analyse only the statements in it")
+    parser.add_argument("--output", default=ADVICE_FILE, help=f"advice script (default: {ADVICE_FILE})")
+    parser.add_argument("--apply", action="store_true", help="run the advice script after writing it")
+    parser.add_argument("--drop-redundant", action="store_true",
+                        help="drop redundant indexes instead of leaving the drops commented out")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="with --apply, run the benchmark suite before and after")
+    parser.add_argument("--only", help="benchmark only cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=None, help="benchmark repetitions per case")
+    parser.add_argument("--report", help="write the advice and benchmark results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.benchmark and not args.apply:
+        parser.error("--benchmark compares before and after --apply")
+
+    slow_log = read_slow_log(args.log) if args.log else None
+
+    conn = connect(autocommit=True)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(_SERVER_SQL)
+        server = cursor.fetchone()
+        cursor.close()
+
+        workload = load_workload(conn, args.top, slow_log)
+        existing = load_indexes(conn)
+        hints = load_missing_index_hints(conn) if slow_log is None else []
+        advice = analyse(workload, existing, hints)
+
+        source = f"slow-query log {args.log}" if args.log else "plan cache"
+        note = (f"{len(workload)} statement(s) from the {source}; "
+                f"usage counters since {server.StartTime:%Y-%m-%d %H:%M}")
+        script = advice_script(advice, server.DatabaseName, note, args.drop_redundant)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(script)
+
+        print(f"Analysed {note}")
+        for proposal in advice.proposals:
+            action = "widen" if proposal.replaces is not None else "create"
+            print(f"  {action:<7}{proposal.name}: {proposal.describe()} (weight {proposal.weight:,.0f})")
+        for index, reason in advice.redundant:
+            print(f"  {'drop  ' if args.drop_redundant else 'redundant'} {index.name}: {reason}")
+        for index in advice.unused:
+            print(f"  unused {index.name}: {index.writes:,} writes, no reads")
+        print(f"Wrote {args.output}")
+
+        report = {
+            "workload": note,
+            "proposals": [{"name": p.name, "index": p.describe(), "weight": p.weight, "reasons": p.reasons,
+                           "widens": p.replaces.name if p.replaces else None} for p in advice.proposals],
+            "redundant": [{"name": i.name, "index": i.describe(), "reason": r} for i, r in advice.redundant],
+            "unused": [{"name": i.name, "index": i.describe(), "writes": i.writes} for i in advice.unused],
+        }
+
+        if args.apply:
+            if args.benchmark:
+                repeat = args.repeat or benchmark.REPEAT
+                bench_conn = connect()
+                try:
+                    print("Benchmarking before...")
+                    _, before = benchmark.run_suite(bench_conn, args.only, repeat, log=lambda line: None)
+                    apply_script(conn, script)
+                    print(f"Applied {args.output}; benchmarking after...")
+                    _, after = benchmark.run_suite(bench_conn, args.only, repeat, log=lambda line: None)
+                finally:
+                    bench_conn.close()
+                print_benchmark(before, after)
+                report["benchmark"] = {"before": before, "after": after}
+            else:
+                apply_script(conn, script)
+                print(f"Applied {args.output}")
+
+        if args.report:
+            with open(args.report, "w") as f:
+                json.dump(report, f, indent=2, default=str)
+        return 0
+    except Exception as e:
+        print(f"Index advisor failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
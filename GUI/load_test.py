@@ -0,0 +1,207 @@
+"""
+=============================================
+Event & Ticket Booking System - Load Test Driver
+Group 5 - DAMG6210
+Open-loop mixed read/write workload at a target QPS with latency percentiles
+=============================================
+
+Usage (from the GUI folder):
+    python load_test.py --qps 200 --duration 60
+    python load_test.py --qps 500 --duration 120 --workers 64 --mix "dashboard=50,create_booking=50"
+    python load_test.py --qps 100 --read-only --json results.json
+
+Requests are issued on a fixed schedule (open loop): when the database falls
+behind, queued requests keep their scheduled start time, so latency includes
+the wait and the tail is not hidden by the client slowing down.
+"""
+
+import argparse
+import json
+import queue
+import random
+import sys
+import threading
+import time
+
+from db_config import connect
+from workload import DEFAULT_MIX, OPERATIONS, WRITE_OPERATIONS, load_context
+
+DEFAULT_QPS = 50
+DEFAULT_DURATION = 30  # seconds
+DEFAULT_WORKERS = 16
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def parse_mix(text):
+    """'dashboard=20,create_booking=5' -> {name: weight}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}'. Choose from: {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LoadTest:
+    """Schedules operations at a fixed rate and runs them on a pool of worker connections"""
+
+    def __init__(self, connect_fn, mix, qps, duration, workers, seed=42):
+        self.connect_fn = connect_fn
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.qps = qps
+        self.duration = duration
+        self.workers = workers
+        self.seed = seed
+        self.requests = queue.Queue(maxsize=workers * 100)
+        self.lock = threading.Lock()
+        self.latencies = {name: [] for name in self.names}
+        self.errors = {name: 0 for name in self.names}
+        self.dropped = 0
+        self.error_samples = {}
+
+    def run(self):
+        conn = self.connect_fn()
+        try:
+            cursor = conn.cursor()
+            ctx = load_context(cursor)
+            cursor.close()
+        finally:
+            conn.close()
+
+        threads = [threading.Thread(target=self._worker, args=(ctx, self.seed + i), daemon=True)
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        started = time.perf_counter()
+        self._dispatch(started)
+        for _ in threads:
+            self.requests.put(None)
+        for thread in threads:
+            thread.join()
+        return self.report(time.perf_counter() - started)
+
+    def _dispatch(self, started):
+        rng = random.Random(self.seed)
+        total = int(self.qps * self.duration)
+        for i in range(total):
+            scheduled = started + i / self.qps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name = rng.choices(self.names, self.weights)[0]
+            try:
+                self.requests.put_nowait((scheduled, name))
+            except queue.Full:
+                # Workers are hopelessly behind; count it instead of blocking the schedule
+                with self.lock:
+                    self.dropped += 1
+
+    def _worker(self, ctx, seed):
+        rng = random.Random(seed)
+        conn = self.connect_fn()
+        cursor = conn.cursor()
+        try:
+            while True:
+                item = self.requests.get()
+                if item is None:
+                    return
+                scheduled, name = item
+                try:
+                    OPERATIONS[name](cursor, rng, ctx)
+                    failed = None
+                except Exception as e:
+                    failed = e
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                latency = time.perf_counter() - scheduled
+                with self.lock:
+                    if failed is None:
+                        self.latencies[name].append(latency)
+                    else:
+                        self.errors[name] += 1
+                        self.error_samples.setdefault(name, str(failed))
+        finally:
+            cursor.close()
+            conn.close()
+
+    def report(self, elapsed):
+        operations = {}
+        completed = 0
+        for name in self.names:
+            values = sorted(self.latencies[name])
+            completed += len(values)
+            operations[name] = {
+                "kind": "write" if name in WRITE_OPERATIONS else "read",
+                "count": len(values),
+                "errors": self.errors[name],
+                "p50_ms": _ms(percentile(values, 50)),
+                "p95_ms": _ms(percentile(values, 95)),
+                "p99_ms": _ms(percentile(values, 99)),
+                "max_ms": _ms(values[-1] if values else None),
+            }
+        return {
+            "target_qps": self.qps,
+            "achieved_qps": round(completed / elapsed, 1) if elapsed else 0,
+            "duration_s": round(elapsed, 1),
+            "workers": self.workers,
+            "dropped": self.dropped,
+            "operations": operations,
+            "error_samples": self.error_samples,
+        }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def print_report(result):
+    print(f"Target {result['target_qps']} QPS, achieved {result['achieved_qps']} QPS "
+          f"over {result['duration_s']}s with {result['workers']} workers "
+          f"({result['dropped']} dropped)")
+    print(f"{'operation':<18}{'kind':<7}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in result["operations"].items():
+        cells = [stats[key] if stats[key] is not None else "-" for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")]
+        print(f"{name:<18}{stats['kind']:<7}{stats['count']:>8}{stats['errors']:>8}"
+              + "".join(f"{cell:>10}" for cell in cells))
+    for name, message in result["error_samples"].items():
+        print(f"  first {name} error: {message}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a mixed workload at a target QPS.")
+    parser.add_argument("--qps", type=float, default=DEFAULT_QPS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="concurrent connections")
+    parser.add_argument("--mix", help="operation weights, e.g. 'dashboard=20,create_booking=5'")
+    parser.add_argument("--read-only", action="store_true", help="drop write operations from the mix")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix) if args.mix else dict(DEFAULT_MIX)
+    if args.read_only:
+        mix = {name: weight for name, weight in mix.items() if name not in WRITE_OPERATIONS}
+
+    result = LoadTest(connect, mix, args.qps, args.duration, args.workers, seed=args.seed).run()
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
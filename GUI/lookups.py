@@ -0,0 +1,137 @@
+"""
+=============================================
+Event & Ticket Booking System - Typeahead Lookups
+Group 5 - DAMG6210
+Bounded, index-backed record search for the Update/Delete tabs
+=============================================
+"""
+
+TYPEAHEAD_LIMIT = 20
+
+
+def _like_prefix(term):
+    """Escape LIKE wildcards in user input and turn it into a prefix pattern"""
+    escaped = term.replace("[", "[[]").replace("%", "[%]").replace("_", "[_]")
+    return escaped + "%"
+
+
+def search_customers(term, limit=TYPEAHEAD_LIMIT):
+    """
+    Customers matching an ID, email prefix or first/last name prefix.
+
+    Each branch is a TOP (n) seek on an index ordered the same way
+    (clustered CustomerID, IX_User_Email, IX_User_LastName_FirstName, IX_User_FirstName),
+    so the cost is bounded by the limit, not the table size.
+    Parameters are cast to VARCHAR so the seek is not lost to an NVARCHAR conversion.
+    """
+    term = (term or "").strip()
+    select = """
+        SELECT TOP (?)
+            C.CustomerID AS ID,
+            CONCAT(C.CustomerID, ' - ', U.FirstName, ' ', U.LastName, ' (', U.Email, ')') AS Label
+        FROM CUSTOMER C
+        INNER JOIN [USER] U ON C.UserID = U.UserID
+    """
+
+    if not term:
+        return select + " ORDER BY C.CustomerID DESC", (limit,)
+
+    if term.isdigit():
+        return select + " WHERE C.CustomerID = ?", (limit, int(term))
+
+    if "@" in term:
+        return (
+            select + " WHERE U.Email LIKE CAST(? AS VARCHAR(100)) ORDER BY U.Email",
+            (limit, _like_prefix(term))
+        )
+
+    if " " in term:
+        first, last = term.split(None, 1)
+        return (
+            select + " WHERE U.LastName LIKE CAST(? AS VARCHAR(50)) AND U.FirstName = CAST(? AS VARCHAR(50))"
+                     " ORDER BY U.LastName, U.FirstName",
+            (limit, _like_prefix(last), first)
+        )
+
+    pattern = _like_prefix(term)
+    sql = f"""
+        SELECT TOP (?) ID, Label
+        FROM (
+            SELECT * FROM ({select} WHERE U.LastName LIKE CAST(? AS VARCHAR(50)) ORDER BY U.LastName, U.FirstName) AS ByLast
+            UNION
+            SELECT * FROM ({select} WHERE U.FirstName LIKE CAST(? AS VARCHAR(50)) ORDER BY U.FirstName) AS ByFirst
+        ) AS Matches
+        ORDER BY Label
+    """
+    return sql, (limit, limit, pattern, limit, pattern)
+
+
+def search_events(term, limit=TYPEAHEAD_LIMIT):
+    """Events matching an ID or title prefix (IX_Event_Title); newest first when empty"""
+    term = (term or "").strip()
+    select = """
+        SELECT TOP (?)
+            E.EventID AS ID,
+            CONCAT(E.EventID, ' - ', E.Title, ' (', CONVERT(VARCHAR(10), E.StartDateTime, 120), ')') AS Label
+        FROM EVENT E
+    """
+
+    if not term:
+        return select + " ORDER BY E.StartDateTime DESC", (limit,)
+
+    if term.isdigit():
+        return select + " WHERE E.EventID = ?", (limit, int(term))
+
+    return (
+        select + " WHERE E.Title LIKE CAST(? AS VARCHAR(200)) ORDER BY E.Title",
+        (limit, _like_prefix(term))
+    )
+
+
+def search_bookings(term, limit=TYPEAHEAD_LIMIT):
+    """
+    Bookings matching a booking ID, or the customer's email / last name prefix.
+
+    A name or email first seeks at most limit matching users (IX_User_Email or
+    IX_User_LastName_FirstName), then takes at most limit latest bookings of
+    each (IX_Booking_CustomerID), so only limit * limit rows are ever sorted.
+    """
+    term = (term or "").strip()
+    select = """
+        SELECT TOP (?)
+            B.BookingID AS ID,
+            CONCAT(B.BookingID, ' - ', U.FirstName, ' ', U.LastName, ' - ', E.Title) AS Label
+        FROM BOOKING B
+        INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
+        INNER JOIN [USER] U ON C.UserID = U.UserID
+        INNER JOIN EVENT E ON B.EventID = E.EventID
+    """
+
+    if not term:
+        return select + " ORDER BY B.BookingDateTime DESC", (limit,)
+
+    if term.isdigit():
+        return select + " WHERE B.BookingID = ?", (limit, int(term))
+
+    column = "U.Email" if "@" in term else "U.LastName"
+    sql = f"""
+        SELECT TOP (?)
+            B.BookingID AS ID,
+            CONCAT(B.BookingID, ' - ', U.FirstName, ' ', U.LastName, ' - ', E.Title) AS Label
+        FROM (
+            SELECT TOP (?) U.UserID, U.FirstName, U.LastName
+            FROM [USER] U
+            WHERE {column} LIKE CAST(? AS VARCHAR(100))
+            ORDER BY {column}
+        ) AS U
+        INNER JOIN CUSTOMER C ON C.UserID = U.UserID
+        CROSS APPLY (
+            SELECT TOP (?) CB.BookingID, CB.EventID, CB.BookingDateTime
+            FROM BOOKING CB
+            WHERE CB.CustomerID = C.CustomerID
+            ORDER BY CB.BookingDateTime DESC
+        ) AS B
+        INNER JOIN EVENT E ON B.EventID = E.EventID
+        ORDER BY B.BookingDateTime DESC
+    """
+    return sql, (limit, limit, _like_prefix(term), limit)
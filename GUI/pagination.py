@@ -0,0 +1,173 @@
+"""
+=============================================
+Event & Ticket Booking System - Keyset Pagination
+Group 5 - DAMG6210
+Seek-based paging so every grid page costs the same regardless of table size
+=============================================
+"""
+
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250]
+
+
+class SortKey:
+    """
+    One column of a keyset ordering.
+
+    expression is the SQL used in WHERE/ORDER BY (e.g. "B.BookingDateTime"),
+    column is the result-set column holding its value. sql_type wraps the bound
+    parameter in a CAST so DATETIME keys compare exactly (pyodbc binds datetime2).
+    """
+
+    def __init__(self, expression, column, descending=False, sql_type=None):
+        self.expression = expression
+        self.column = column
+        self.descending = descending
+        self.sql_type = sql_type
+
+    def placeholder(self):
+        return f"CAST(? AS {self.sql_type})" if self.sql_type else "?"
+
+
+class KeysetQuery:
+    """
+    A SELECT paged by seeking past the last row seen instead of OFFSET.
+
+    select_sql is the SELECT ... FROM ... JOIN part without WHERE/ORDER BY.
+    filters is a list of (sql_fragment, params) ANDed together.
+    params are bound to ? placeholders in select_sql itself (e.g. the arguments
+    of a table-valued function in its FROM clause).
+    count_from is the FROM clause used for the total row count (base table only);
+    it takes the same params when it repeats the parameterized part of select_sql.
+    The sort keys must be unique together and match an index for the seek to be cheap.
+    """
+
+    def __init__(self, select_sql, sort_keys, filters=None, count_from=None, params=None):
+        self.select_sql = select_sql.strip()
+        self.sort_keys = sort_keys
+        self.filters = filters or []
+        self.count_from = count_from
+        self.params = list(params or [])
+
+    def signature(self):
+        """Identity of the query and its filter values, used to reset paging on change"""
+        return (self.select_sql, tuple(self.params),
+                tuple((sql, tuple(params)) for sql, params in self.filters))
+
+    def page_sql(self, page_size, after=None, before=None):
+        """SQL and params for the page after/before a cursor, fetching one extra row to detect more pages"""
+        backwards = before is not None
+        cursor = before if backwards else after
+
+        where = [sql for sql, _ in self.filters]
+        params = self.params + [value for _, values in self.filters for value in values]
+
+        if cursor is not None:
+            seek_sql, seek_params = self._seek_predicate(cursor, backwards)
+            where.append(seek_sql)
+            params.extend(seek_params)
+
+        order = ", ".join(
+            f"{key.expression} {'DESC' if key.descending != backwards else 'ASC'}"
+            for key in self.sort_keys
+        )
+
+        # select_sql starts with SELECT; TOP is bound as a parameter so plans are reused
+        sql = "SELECT TOP (?) " + self.select_sql[len("SELECT"):].lstrip()
+        if where:
+            sql += "\nWHERE " + "\n  AND ".join(f"({clause})" for clause in where)
+        sql += f"\nORDER BY {order}"
+        return sql, [page_size + 1] + params
+
+    def count_sql(self):
+        """SQL and params for the total number of rows matching the filters"""
+        sql = f"SELECT COUNT(*) AS Total FROM {self.count_from}"
+        if self.filters:
+            sql += " WHERE " + " AND ".join(f"({clause})" for clause, _ in self.filters)
+        return sql, self.params + [value for _, values in self.filters for value in values]
+
+    def _seek_predicate(self, cursor, backwards):
+        """
+        Row-value comparison (k1, k2, ...) > (v1, v2, ...) expanded for SQL Server.
+
+        The leading key gets a plain range predicate so the optimizer can seek on it:
+        k1 >= v1 AND (k1 > v1 OR (k1 = v1 AND k2 > v2) OR ...)
+        """
+        def op(key, strict):
+            forward = not key.descending
+            if backwards:
+                forward = not forward
+            return (">" if forward else "<") + ("" if strict else "=")
+
+        first = self.sort_keys[0]
+        params = [cursor[0]]
+        range_sql = f"{first.expression} {op(first, False)} {first.placeholder()}"
+
+        branches = []
+        for i, key in enumerate(self.sort_keys):
+            parts = []
+            for j in range(i):
+                prev = self.sort_keys[j]
+                parts.append(f"{prev.expression} = {prev.placeholder()}")
+                params.append(cursor[j])
+            parts.append(f"{key.expression} {op(key, True)} {key.placeholder()}")
+            params.append(cursor[i])
+            branches.append(" AND ".join(parts))
+
+        if len(branches) == 1:
+            return f"{first.expression} {op(first, True)} {first.placeholder()}", [cursor[0]]
+        return f"{range_sql} AND (({') OR ('.join(branches)}))", params
+
+
+class KeysetPage:
+    """One page of rows plus the cursors needed to move forward and back"""
+
+    def __init__(self, rows, next_cursor, prev_cursor):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def _plain(value):
+    """Convert pandas/numpy scalars back to plain Python values for parameter binding"""
+    if hasattr(value, "to_pydatetime"):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+def _row_key(rows, position, sort_keys):
+    row = rows.iloc[position]
+    return tuple(_plain(row[key.column]) for key in sort_keys)
+
+
+def fetch_page(run_query, keyset_query, page_size, after=None, before=None):
+    """
+    Fetch one page using run_query(sql, params) -> DataFrame.
+
+    Returns None when the query fails, otherwise a KeysetPage whose cursors are
+    None at either end of the result set.
+    """
+    sql, params = keyset_query.page_sql(page_size, after=after, before=before)
+    rows = run_query(sql, params)
+    if rows is None:
+        return None
+
+    has_more = len(rows) > page_size
+    rows = rows.iloc[:page_size]
+
+    if before is not None:
+        # Backward pages are read in reverse index order; flip them for display
+        rows = rows.iloc[::-1]
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, after is not None
+
+    rows = rows.reset_index(drop=True)
+    if rows.empty:
+        return KeysetPage(rows, None, None)
+
+    keys = keyset_query.sort_keys
+    next_cursor = _row_key(rows, -1, keys) if has_next else None
+    prev_cursor = _row_key(rows, 0, keys) if has_prev else None
+    return KeysetPage(rows, next_cursor, prev_cursor)
@@ -0,0 +1,275 @@
+"""
+=============================================
+Event & Ticket Booking System - Query Result Cache
+Group 5 - DAMG6210
+TTL + LRU result cache with table-tagged invalidation
+=============================================
+"""
+
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Base tables read by each view, so a write to BOOKING also evicts cached report views
+VIEW_DEPENDENCIES = {
+    # Live and archived rows (ARCHIVE_* is written by sp_ArchiveClosedBookings)
+    "VW_ALLBOOKINGS": {"BOOKING", "ARCHIVE_BOOKING"},
+    "VW_ALLTICKETS": {"TICKET", "ARCHIVE_TICKET"},
+    "VW_ALLSEATBOOKINGS": {"SEAT_BOOKING", "ARCHIVE_SEAT_BOOKING"},
+    "VW_ALLBOOKINGSNACKS": {"BOOKING_SNACK", "ARCHIVE_BOOKING_SNACK"},
+    "VW_ALLPAYMENTS": {"PAYMENT", "ARCHIVE_PAYMENT"},
+    "VW_ALLBOOKINGAUDIT": {"BOOKING_AUDIT", "ARCHIVE_BOOKING_AUDIT"},
+    "VW_CUSTOMERBOOKINGSUMMARY": {"CUSTOMER", "USER", "VW_ALLBOOKINGS", "VW_ALLTICKETS"},
+    "VW_EVENTPERFORMANCEDASHBOARD": {"EVENT", "ORGANIZER", "VW_ALLBOOKINGS", "VW_ALLTICKETS", "SHOW"},
+    "VW_THEATERSCREENUTILIZATION": {"THEATER", "SCREEN", "SHOW", "VW_ALLSEATBOOKINGS"},
+    "VW_POWERBI_SALESOVERVIEW": {"VW_ALLBOOKINGS", "CUSTOMER", "USER", "EVENT", "ORGANIZER", "VW_ALLTICKETS", "VW_ALLBOOKINGSNACKS"},
+    "VW_POWERBI_THEATERPERFORMANCE": {"THEATER", "SCREEN", "SHOW", "EVENT", "MOVIE", "VW_ALLSEATBOOKINGS"},
+    "VW_POWERBI_CUSTOMERINSIGHTS": {"CUSTOMER", "USER", "VW_ALLBOOKINGS", "VW_ALLTICKETS"},
+    "VW_POWERBI_PRODUCTPERFORMANCE": {"EVENT", "MOVIE", "SPORT", "VW_ALLBOOKINGS", "VW_ALLTICKETS", "SHOW"},
+    "VW_POWERBI_TIMESERIES": {"VW_ALLBOOKINGS", "VW_ALLTICKETS", "EVENT"},
+    "VW_POWERBI_SNACKSALES": {"SNACK", "VW_ALLBOOKINGSNACKS"},
+    "VW_UPCOMINGEVENTOCCUPANCY": {"EVENT", "TVF_EVENTOCCUPANCY"},
+    # Inline table-valued functions read like views (psm_script.sql)
+    "TVF_EVENTOCCUPANCY": {"SHOW", "SCREEN", "VW_ALLSEATBOOKINGS"},
+    "TVF_EVENTOCCUPANCYBATCH": {"SHOW", "SCREEN", "VW_ALLSEATBOOKINGS"},
+    "TVF_CUSTOMERLIFETIMEVALUE": {"VW_ALLBOOKINGS"},
+    "TVF_CUSTOMERLIFETIMEVALUEBATCH": {"VW_ALLBOOKINGS"},
+    "TVF_AVAILABLESEATSFORSHOW": {"SHOW", "SEAT", "SEAT_BOOKING"},
+    "TVF_AVAILABLESEATSFORSHOWBATCH": {"SHOW", "SEAT", "SEAT_BOOKING"},
+    # Event search reads only its index tables (search_script.sql)
+    "TVF_SEARCHEVENTS": {"EVENT_SEARCH_TERM", "EVENT_SEARCH_VOCAB", "EVENT_SEARCH_CITY"},
+}
+
+_EVENT_SEARCH_INDEX = {"EVENT_SEARCH_TERM", "EVENT_SEARCH_VOCAB", "EVENT_SEARCH_CITY"}
+
+# Rows removed or changed implicitly (ON DELETE CASCADE, triggers) when a table is written
+WRITE_CASCADES = {
+    "USER": {"CUSTOMER", "EMPLOYEE"},
+    "CUSTOMER": {"DASHBOARD_STATS"},
+    "EVENT": {"MOVIE", "SPORT", "EXHIBITION", "DASHBOARD_STATS", "EVENT_STATUS_TRANSITION"} | _EVENT_SEARCH_INDEX,
+    "BOOKING": {"TICKET", "SEAT_BOOKING", "BOOKING_SNACK", "BOOKING_AUDIT", "BOOKING_AUDIT_QUEUE", "DASHBOARD_STATS"},
+    "PAYMENT": {"CARD_PAYMENT", "WALLET_PAYMENT", "PAYPAL_PAYMENT"},
+    # Search index triggers (search_script.sql)
+    **{table: _EVENT_SEARCH_INDEX
+       for table in ("MOVIE", "SPORT", "EXHIBITION", "MATCH", "SHOW", "TEAM", "VENUE", "THEATER")},
+}
+
+ALL_TABLES = "*"
+
+_WHITESPACE = re.compile(r"\s+")
+_OBJECT_NAME = r"((?:\[?\w+\]?\.)?\[?\w+\]?)"
+_READ_PATTERN = re.compile(r"\b(?:FROM|JOIN|APPLY)\s+" + _OBJECT_NAME, re.IGNORECASE)
+_WRITE_PATTERN = re.compile(
+    r"\b(?:INSERT\s+INTO|INSERT|UPDATE|DELETE\s+FROM|DELETE|MERGE\s+INTO|MERGE|TRUNCATE\s+TABLE)\s+" + _OBJECT_NAME,
+    re.IGNORECASE
+)
+_EXEC_PATTERN = re.compile(r"^\s*(?:EXEC|EXECUTE)\b|\{\s*CALL\b", re.IGNORECASE)
+
+
+def normalize_sql(query):
+    """Collapse whitespace so formatting differences share one cache entry"""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def _table_name(name):
+    return name.split(".")[-1].strip("[]").upper()
+
+
+def _expand(tables, mapping):
+    """Add every table reachable through the mapping (cascades can chain)"""
+    expanded = set()
+    pending = list(tables)
+    while pending:
+        table = pending.pop()
+        if table not in expanded:
+            expanded.add(table)
+            pending.extend(mapping.get(table, ()))
+    return expanded
+
+
+def read_tables(query):
+    """Tables (with views expanded to their base tables) a SELECT depends on"""
+    tables = {_table_name(name) for name in _READ_PATTERN.findall(query)}
+    return _expand(tables, VIEW_DEPENDENCIES)
+
+
+def written_tables(query):
+    """Tables modified by a DML statement; stored procedure calls may touch anything"""
+    if _EXEC_PATTERN.search(query):
+        return {ALL_TABLES}
+    tables = {_table_name(name) for name in _WRITE_PATTERN.findall(query)}
+    return _expand(tables, WRITE_CASCADES)
+
+
+def is_cacheable(query):
+    """Only plain SELECT / CTE queries are cached"""
+    head = query.lstrip().split(None, 1)
+    return bool(head) and head[0].upper() in ("SELECT", "WITH") and not written_tables(query)
+
+
+def make_key(query, params=None):
+    """Cache key: normalized SQL text plus parameter values"""
+    if params is None:
+        return (normalize_sql(query), ())
+    if not isinstance(params, (list, tuple)):
+        params = (params,)
+    return (normalize_sql(query), tuple(params))
+
+
+def estimate_size(value):
+    """Approximate memory footprint of a cached result in bytes"""
+    memory_usage = getattr(value, "memory_usage", None)
+    if memory_usage is not None:
+        try:
+            return int(memory_usage(index=True, deep=True).sum())
+        except TypeError:
+            pass
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "tables", "expires_at", "size")
+
+    def __init__(self, value, tables, expires_at, size):
+        self.value = value
+        self.tables = tables
+        self.expires_at = expires_at
+        self.size = size
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results bounded by an approximate memory budget.
+
+    Entries expire after their TTL and are tagged with the tables they read, so a
+    write only evicts results that depend on the tables it touched. Cached values
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, default_ttl=30):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._by_table = {}
+        self._bytes = 0
+        self._written_at = {}  # table -> time.monotonic() of its last invalidation
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        """Return a cached result, or default on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(self, key, value, tables, ttl=None, as_of=None):
+        """
+        Store a result tagged with the tables it was read from.
+
+        as_of is the time.monotonic() the result's data was current as of (when the
+        query started, or earlier for a lagging read replica); a result older than
+        the last write to one of its tables is not stored.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return False
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            if as_of is not None and any(
+                self._written_at.get(table, float("-inf")) > as_of for table in (ALL_TABLES, *tables)
+            ):
+                return False
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = _Entry(value, frozenset(tables), time.monotonic() + ttl, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def invalidate_tables(self, tables):
+        """Evict every entry that read any of the given tables; returns the number evicted"""
+        with self._lock:
+            now = time.monotonic()
+            if ALL_TABLES in tables:
+                self._written_at[ALL_TABLES] = now
+                removed = len(self._entries)
+                self._clear()
+            else:
+                keys = set()
+                for table in tables:
+                    self._written_at[table.upper()] = now
+                    keys |= self._by_table.get(table.upper(), set())
+                for key in keys:
+                    self._remove(key)
+                removed = len(keys)
+            self.invalidations += removed
+            return removed
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._clear()
+
+    def stats(self):
+        """Counters for monitoring how much load the cache takes off the database"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    # -----------------------------------------
+    # Internal helpers (caller holds the lock)
+    # -----------------------------------------
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def _clear(self):
+        self._entries.clear()
+        self._by_table.clear()
+        self._bytes = 0
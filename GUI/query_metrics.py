@@ -0,0 +1,374 @@
+"""
+=============================================
+Event & Ticket Booking System - Query Metrics
+Group 5 - DAMG6210
+Per-query timing, row/byte counts, slow-query log and histogram dumps
+=============================================
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+
+# Latency histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_QUERY_MS = 500
+SLOW_LOG_KEEP = 200  # recent slow queries kept in memory for the Performance page
+
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRINGS = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w@#])-?\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+_scope = threading.local()
+
+
+def normalize(sql):
+    """SQL text with comments dropped, literals replaced by ? and whitespace collapsed"""
+    sql = _COMMENTS.sub(" ", sql)
+    sql = _STRINGS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("IN (?)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def fingerprint(sql):
+    """Short stable ID shared by every execution of the same statement shape"""
+    return hashlib.sha1(normalize(sql).lower().encode("utf-8")).hexdigest()[:12]
+
+
+def params_hash(params):
+    if not params:
+        return None
+    return hashlib.sha1(repr(tuple(params)).encode("utf-8")).hexdigest()[:12]
+
+
+def _row_bytes(row):
+    """
+    Approximate wire size of one row (pyodbc does not expose the real byte count).
+
+    Cursors only size a sample row per fetch and multiply it by the rows
+    fetched, so the estimate costs the same for 10 rows as for 200,000.
+    """
+    size = 0
+    for value in row:
+        if value is None:
+            continue
+        if isinstance(value, (str, bytes, bytearray)):
+            size += len(value)
+        else:
+            size += 8
+    return size
+
+
+def set_scope(page, tab=None):
+    """Tag queries issued by this thread (one Streamlit script run) with the page/tab rendering them"""
+    _scope.name = f"{page} / {tab}" if tab else page
+
+
+def current_scope():
+    return getattr(_scope, "name", "-")
+
+
+class _Series:
+    """Aggregates of one (fingerprint, scope) pair"""
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last bucket is +Inf
+
+    def add(self, seconds, rows, nbytes, error):
+        self.count += 1
+        self.errors += 1 if error else 0
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.rows += rows
+        self.bytes += nbytes
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def quantile(self, q):
+        """Upper bound of the histogram bucket holding the q-th quantile (capped at the max)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(LATENCY_BUCKETS[i], self.max_seconds) if i < len(LATENCY_BUCKETS) else self.max_seconds
+        return self.max_seconds
+
+
+class QueryMetrics:
+    """
+    Thread-safe store of query executions.
+
+    Each execution updates a latency histogram and row/byte totals per SQL
+    fingerprint and page scope. Executions slower than slow_query_ms are kept in
+    a short in-memory list and, when slow_log_path is set, appended to that file
+    as one JSON object per line.
+    """
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, slow_log_path=None):
+        self.slow_query_ms = slow_query_ms
+        self._series = {}
+        self._slow = deque(maxlen=SLOW_LOG_KEEP)
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+        self._slow_logger = None
+        if slow_log_path:
+            self._slow_logger = logging.getLogger(f"query_metrics.slow.{id(self)}")
+            self._slow_logger.propagate = False
+            self._slow_logger.setLevel(logging.INFO)
+            self._slow_logger.addHandler(logging.FileHandler(slow_log_path, encoding="utf-8"))
+
+    def record(self, sql, params, seconds, rows=0, nbytes=0, error=None, scope=None):
+        scope = scope or current_scope()
+        key = (fingerprint(sql), scope)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(normalize(sql))
+            series.add(seconds, rows, nbytes, error)
+
+        if seconds * 1000 >= self.slow_query_ms:
+            entry = {
+                "time": datetime.datetime.now().isoformat(timespec="seconds"),
+                "scope": scope,
+                "fingerprint": key[0],
+                "params_hash": params_hash(params),
+                "ms": round(seconds * 1000, 1),
+                "rows": rows,
+                "bytes": nbytes,
+                "error": str(error) if error else None,
+                "sql": series.sql,
+            }
+            with self._lock:
+                self._slow.append(entry)
+            if self._slow_logger is not None:
+                self._slow_logger.info(json.dumps(entry))
+
+    def summary(self, histograms=False):
+        """One dict per (fingerprint, scope), slowest total time first"""
+        with self._lock:
+            items = [(key, s, list(s.buckets)) for key, s in self._series.items()]
+        result = []
+        for (fp, scope), s, buckets in items:
+            row = {
+                "fingerprint": fp,
+                "scope": scope,
+                "count": s.count,
+                "errors": s.errors,
+                "total_ms": round(s.total_seconds * 1000, 1),
+                "avg_ms": round(s.total_seconds * 1000 / s.count, 2) if s.count else 0,
+                "p50_ms": _ms(s.quantile(0.50)),
+                "p95_ms": _ms(s.quantile(0.95)),
+                "p99_ms": _ms(s.quantile(0.99)),
+                "max_ms": _ms(s.max_seconds),
+                "rows": s.rows,
+                "bytes": s.bytes,
+                "sql": s.sql,
+            }
+            if histograms:
+                row["histogram"] = dict(zip([*map(str, LATENCY_BUCKETS), "+Inf"], buckets))
+            result.append(row)
+        result.sort(key=lambda row: row["total_ms"], reverse=True)
+        return result
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+            self._slow.clear()
+            self.started = time.time()
+
+    def to_json(self):
+        return json.dumps({
+            "since": datetime.datetime.fromtimestamp(self.started).isoformat(timespec="seconds"),
+            "queries": self.summary(histograms=True),
+            "slow_queries": self.slow_queries(),
+        }, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (cumulative histogram buckets)"""
+        lines = [
+            "# HELP eventbooking_query_duration_seconds GUI query latency",
+            "# TYPE eventbooking_query_duration_seconds histogram",
+        ]
+        totals = []
+        with self._lock:
+            items = list(self._series.items())
+            for (fp, scope), s in items:
+                labels = f'fingerprint="{fp}",scope="{_escape(scope)}"'
+                cumulative = 0
+                for bound, n in zip([*map(str, LATENCY_BUCKETS), "+Inf"], s.buckets):
+                    cumulative += n
+                    lines.append(f'eventbooking_query_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f"eventbooking_query_duration_seconds_sum{{{labels}}} {s.total_seconds:.6f}")
+                lines.append(f"eventbooking_query_duration_seconds_count{{{labels}}} {s.count}")
+                totals.append((labels, s))
+        for name, attr, help_text in [("rows", "rows", "Rows returned"),
+                                      ("bytes", "bytes", "Approximate bytes returned"),
+                                      ("errors", "errors", "Failed executions")]:
+            lines.append(f"# HELP eventbooking_query_{name}_total {help_text}")
+            lines.append(f"# TYPE eventbooking_query_{name}_total counter")
+            for labels, s in totals:
+                lines.append(f"eventbooking_query_{name}_total{{{labels}}} {getattr(s, attr)}")
+        return "\n".join(lines) + "\n"
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Pending:
+    """The statement a cursor is running, until it is recorded"""
+
+    __slots__ = ("sql", "params", "started", "ended", "rows", "bytes", "row_bytes")
+
+    def __init__(self, sql, params):
+        self.sql = sql
+        self.params = params
+        self.started = self.ended = time.perf_counter()
+        self.rows = 0
+        self.bytes = 0
+        self.row_bytes = None  # sample row size of the current result set
+
+
+class InstrumentedCursor:
+    """
+    DB-API cursor wrapper that times each statement from execute() until its
+    last result set is fetched and records it.
+
+    A statement is recorded when the cursor moves on (the next statement,
+    nextset() running out of result sets, or close()), with the time of its
+    last execute/fetch/nextset call as its end, so rows of every result set of
+    a multi-result procedure are counted.
+    """
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._pending = None  # _Pending
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # Settings such as fast_executemany must reach the real cursor
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _finish(self, error=None):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            if error is not None:
+                pending.ended = time.perf_counter()
+            self._metrics.record(pending.sql, pending.params, pending.ended - pending.started,
+                                 pending.rows, pending.bytes, error)
+
+    def _start(self, sql, params, run):
+        self._finish()
+        self._pending = _Pending(sql, params)
+        try:
+            run()
+        except Exception as e:
+            self._finish(e)
+            raise
+        self._pending.ended = time.perf_counter()
+        return self
+
+    def execute(self, sql, *params):
+        flat = params[0] if len(params) == 1 and isinstance(params[0], (list, tuple)) else params
+        return self._start(sql, flat, lambda: self._cursor.execute(sql, *params))
+
+    def executemany(self, sql, seq_of_params):
+        return self._start(sql, None, lambda: self._cursor.executemany(sql, seq_of_params))
+
+    def _fetched(self, rows, batch=True):
+        pending = self._pending
+        if pending is None:
+            return
+        pending.ended = time.perf_counter()
+        if rows:
+            # One sample row per batch (per result set for fetchone)
+            if batch or pending.row_bytes is None:
+                pending.row_bytes = _row_bytes(rows[0])
+            pending.rows += len(rows)
+            pending.bytes += pending.row_bytes * len(rows)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._fetched([row] if row is not None else [], batch=False)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._fetched(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._fetched(rows)
+        return rows
+
+    def nextset(self):
+        try:
+            more = self._cursor.nextset()
+        except Exception as e:
+            self._finish(e)
+            raise
+        if self._pending is not None:
+            self._pending.ended = time.perf_counter()
+            self._pending.row_bytes = None
+        if not more:
+            self._finish()
+        return more
+
+    def close(self):
+        self._finish()
+        self._cursor.close()
+
+
+class InstrumentedConnection:
+    """DB-API connection wrapper whose cursors are InstrumentedCursors"""
+
+    def __init__(self, conn, metrics):
+        self._conn = conn
+        self._metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self):
+        return InstrumentedCursor(self._conn.cursor(), self._metrics)
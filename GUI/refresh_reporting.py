@@ -0,0 +1,67 @@
+"""
+=============================================
+Event & Ticket Booking System - Reporting Refresh
+Group 5 - DAMG6210
+Command-line entry point for sp_RefreshReportingTables
+=============================================
+
+Usage (from the GUI folder):
+    python refresh_reporting.py            # incremental: only days changed since the last run
+    python refresh_reporting.py --full     # rebuild every day
+"""
+
+import argparse
+import sys
+
+from db_config import connect
+
+
+def refresh_reporting(conn, full=False, overlap_days=1):
+    """
+    Run one refresh and return its RPT_REFRESH_LOG row as a dict.
+
+    The procedure commits its own transaction; errors are re-raised by the driver.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "EXEC sp_RefreshReportingTables @FullRefresh = ?, @OverlapDays = ?",
+            (1 if full else 0, overlap_days)
+        )
+        # Skip row counts of the procedure's statements up to its summary result set
+        while cursor.description is None and cursor.nextset():
+            pass
+        columns = [column[0] for column in cursor.description]
+        row = cursor.fetchone()
+        return dict(zip(columns, row))
+    finally:
+        cursor.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh the RPT_* reporting tables.")
+    parser.add_argument("--full", action="store_true",
+                        help="rebuild every booking day instead of only changed days")
+    parser.add_argument("--overlap-days", type=int, default=1,
+                        help="recent days always reprocessed on incremental runs (default: 1)")
+    args = parser.parse_args(argv)
+
+    conn = connect(autocommit=True)
+    try:
+        result = refresh_reporting(conn, full=args.full, overlap_days=args.overlap_days)
+    except Exception as e:
+        print(f"Refresh failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        conn.close()
+
+    print(
+        f"{result['RunType']} refresh #{result['RunID']} {result['Status'].lower()}: "
+        f"{result['DaysRefreshed']} day(s), {result['BookingRowsLoaded']} booking row(s) "
+        f"in {(result['FinishedAt'] - result['StartedAt']).total_seconds():.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
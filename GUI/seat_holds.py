@@ -0,0 +1,155 @@
+"""
+=============================================
+Event & Ticket Booking System - Seat Holds
+Group 5 - DAMG6210
+Client for the hold -> confirm seat reservation flow and its expiry sweeper
+=============================================
+
+Usage (from the GUI folder):
+    python seat_holds.py --sweep                 # purge expired holds once
+    python seat_holds.py --sweep --interval 30   # keep sweeping every 30 seconds
+"""
+
+import argparse
+import sys
+import time
+
+from db_config import connect
+
+HOLD_SECONDS = 300
+SWEEP_INTERVAL = 30  # seconds between sweeps in --interval mode
+SWEEP_BATCH_SIZE = 1000
+
+
+class SeatUnavailable(Exception):
+    """Raised when a requested seat is sold or held by another buyer"""
+
+
+class HoldExpired(Exception):
+    """Raised when a hold lapsed (or was released) before it was confirmed"""
+
+
+class HoldNotOwned(Exception):
+    """Raised when a hold taken for one customer is confirmed by another"""
+
+
+class SeatsSold(Exception):
+    """Raised when a held seat was booked while the hold was being taken"""
+
+
+def _call(conn, sql, params):
+    """Run a procedure returning one status row, commit, and return that row"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        while cursor.description is None and cursor.nextset():
+            pass
+        row = cursor.fetchone()
+        conn.commit()
+        return row
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def hold_seats(conn, show_id, seat_ids, customer_id=None, hold_seconds=HOLD_SECONDS, hold_token=None,
+               seat_map=None):
+    """
+    Hold every seat in seat_ids for hold_seconds, or none of them.
+
+    Returns (hold_token, expires_at_utc). Pass hold_token to add seats to an
+    existing hold. Raises SeatUnavailable when any seat is sold or held.
+    seat_map is an optional SeatMapService kept in step with the result.
+    """
+    row = _call(
+        conn,
+        "EXEC sp_HoldSeats @ShowID = ?, @SeatIDs = ?, @CustomerID = ?, @HoldSeconds = ?, @HoldToken = ?",
+        (show_id, ",".join(str(int(seat_id)) for seat_id in seat_ids), customer_id, hold_seconds, hold_token)
+    )
+    if row.Status != "Held":
+        if seat_map is not None:
+            seat_map.invalidate(show_id)  # our view of the show was stale
+        raise SeatUnavailable(f"Seats {list(seat_ids)} are not available for show {show_id}")
+    if seat_map is not None:
+        seat_map.mark_held(show_id, seat_ids, str(row.HoldToken), row.ExpiresAt)
+    return str(row.HoldToken), row.ExpiresAt
+
+
+def confirm_hold(conn, hold_token, customer_id, payment_amount, payment_type,
+                 card_number=None, card_holder_name=None, wallet_type=None, paypal_email=None,
+                 seat_map=None):
+    """
+    Convert a hold into a paid booking. Returns (booking_id, payment_id).
+
+    Raises HoldExpired or SeatsSold when the hold can no longer be honoured;
+    the caller should offer the buyer new seats. Raises HoldNotOwned when the
+    hold was taken for a different customer (the hold is left in place).
+    """
+    row = _call(
+        conn,
+        "EXEC sp_ConfirmHeldSeats @HoldToken = ?, @CustomerID = ?, @PaymentAmount = ?, @PaymentType = ?, "
+        "@CardNumber = ?, @CardHolderName = ?, @WalletType = ?, @PayPalEmail = ?",
+        (hold_token, customer_id, payment_amount, payment_type,
+         card_number, card_holder_name, wallet_type, paypal_email)
+    )
+    if row.Status == "NotHeld":
+        raise HoldNotOwned(f"Hold {hold_token} belongs to another customer")
+    if seat_map is not None:
+        seat_map.release_hold(hold_token)
+    if row.Status == "Expired":
+        raise HoldExpired(f"Hold {hold_token} has expired")
+    if row.Status == "SeatsSold":
+        raise SeatsSold(f"A seat in hold {hold_token} was already sold")
+    if seat_map is not None:
+        seat_map.mark_booked(row.ShowID, [int(seat_id) for seat_id in row.SeatIDs.split(",")])
+    return row.BookingID, row.PaymentID
+
+
+def release_hold(conn, hold_token, seat_map=None):
+    """Give held seats back before they expire"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("EXEC sp_ReleaseSeatHold @HoldToken = ?", (hold_token,))
+        conn.commit()
+    finally:
+        cursor.close()
+    if seat_map is not None:
+        seat_map.release_hold(hold_token)
+
+
+def sweep_expired_holds(conn, batch_size=SWEEP_BATCH_SIZE):
+    """Purge lapsed holds; returns the number of seats released"""
+    row = _call(conn, "EXEC sp_SweepExpiredSeatHolds @BatchSize = ?", (batch_size,))
+    return row.SeatsSwept
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seat hold maintenance.")
+    parser.add_argument("--sweep", action="store_true", help="purge expired seat holds")
+    parser.add_argument("--interval", type=float, default=None,
+                        help=f"repeat the sweep every N seconds (e.g. {SWEEP_INTERVAL})")
+    parser.add_argument("--batch-size", type=int, default=SWEEP_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    if not args.sweep:
+        parser.print_help()
+        return 2
+
+    conn = connect()
+    try:
+        while True:
+            swept = sweep_expired_holds(conn, args.batch_size)
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} swept {swept} expired seat hold(s)")
+            if args.interval is None:
+                return 0
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+=============================================
+Event & Ticket Booking System - Seat Map Service
+Group 5 - DAMG6210
+In-memory per-show seat availability bitmaps
+=============================================
+"""
+
+import datetime
+import threading
+import time
+from collections import OrderedDict
+
+SEAT_MAP_MAX_SHOWS = 1000
+SEAT_MAP_MAX_AGE = 5  # seconds a map is served before its change stamp is checked again
+
+AVAILABLE = "available"
+BOOKED = "booked"
+HELD = "held"
+
+_SEATS_SQL = """
+    SELECT ST.SeatID, ST.RowNumber, ST.SeatNumber, ST.SeatType
+    FROM SHOW SH
+    INNER JOIN SEAT ST ON ST.ScreenID = SH.ScreenID
+    WHERE SH.ShowID = ?
+    ORDER BY ST.RowNumber, ST.SeatNumber
+"""
+_BOOKED_SQL = "SELECT SeatID FROM SEAT_BOOKING WHERE ShowID = ?"
+_HELD_SQL = """
+    SELECT SeatID, HoldToken, ExpiresAt
+    FROM SEAT_HOLD
+    WHERE ShowID = ? AND ExpiresAt > SYSUTCDATETIME()
+"""
+
+# Changes made by other processes (bookings, cancellations, bulk loads, other GUI
+# servers) show up here: an insert raises the MAX, a delete lowers the COUNT.
+# Both come from IX_SeatBooking_ShowID (and PK_SeatHold), so the check is one seek.
+_BOOKED_STAMP_SQL = "SELECT COUNT_BIG(*), MAX(SeatBookingID) FROM SEAT_BOOKING WHERE ShowID = ?"
+_STAMP_SQL = """
+    SELECT B.Seats, B.LastSeatBookingID, H.Seats, H.LastHeldAt
+    FROM (SELECT COUNT_BIG(*) AS Seats, MAX(SeatBookingID) AS LastSeatBookingID
+          FROM SEAT_BOOKING WHERE ShowID = ?) AS B
+    CROSS JOIN (SELECT COUNT_BIG(*) AS Seats, MAX(HeldAt) AS LastHeldAt
+                FROM SEAT_HOLD WHERE ShowID = ? AND ExpiresAt > SYSUTCDATETIME()) AS H
+"""
+_HOLDS_INSTALLED_SQL = "SELECT OBJECT_ID('SEAT_HOLD', 'U')"
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _popcount(mask):
+    return bin(mask).count("1")
+
+
+class ShowSeatMap:
+    """
+    Seat state of one show as Python-int bitsets.
+
+    Bit i is the i-th seat of the screen in (RowNumber, SeatNumber) order, so each
+    row occupies a contiguous run of bits. adjacent has bit i set when seat i+1 is
+    the next seat number in the same row, which makes "n seats together" a few
+    shifts and ANDs.
+    """
+
+    def __init__(self, show_id, seats):
+        self.show_id = show_id
+        self.seat_ids = []
+        self.labels = []
+        self.index_of = {}
+        self.row_masks = OrderedDict()
+        self.adjacent = 0
+        self.booked = 0
+        self.held = 0
+        self.hold_expiry = {}  # hold token -> (expires_at, mask)
+        self.stamp = None  # change stamp of the database state the map was loaded from
+        self.checked_at = 0.0  # time.monotonic() the stamp was last confirmed
+
+        for index, (seat_id, row_number, seat_number, seat_type) in enumerate(seats):
+            self.seat_ids.append(seat_id)
+            self.labels.append((row_number, seat_number, seat_type))
+            self.index_of[seat_id] = index
+            self.row_masks[row_number] = self.row_masks.get(row_number, 0) | (1 << index)
+            if index > 0:
+                prev_row, prev_number, _ = self.labels[index - 1]
+                if prev_row == row_number and prev_number + 1 == seat_number:
+                    self.adjacent |= 1 << (index - 1)
+
+        self.all_seats = (1 << len(self.seat_ids)) - 1
+
+    def mask(self, seat_ids):
+        """Bitmask of the given seat IDs (seats not on this screen are ignored)"""
+        result = 0
+        for seat_id in seat_ids:
+            index = self.index_of.get(seat_id)
+            if index is not None:
+                result |= 1 << index
+        return result
+
+    def seats(self, mask):
+        """Seat IDs whose bits are set in mask"""
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.seat_ids[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def expire_holds(self, now=None):
+        """Drop holds whose expiry has passed"""
+        now = now or _utcnow()
+        for token, (expires_at, mask) in list(self.hold_expiry.items()):
+            if expires_at <= now:
+                del self.hold_expiry[token]
+                self.held &= ~mask
+
+    def free(self):
+        return self.all_seats & ~(self.booked | self.held)
+
+    def available_count(self):
+        return _popcount(self.free())
+
+    def find_contiguous(self, count, row_number=None):
+        """Lowest-numbered run of count free adjacent seats (optionally in one row), or []"""
+        if count < 1:
+            return []
+        free = self.free()
+        if row_number is not None:
+            free &= self.row_masks.get(row_number, 0)
+
+        starts = free
+        for k in range(1, count):
+            starts &= (free >> k) & (self.adjacent >> (k - 1))
+        if not starts:
+            return []
+
+        first = (starts & -starts).bit_length() - 1
+        return self.seats(((1 << count) - 1) << first)
+
+    def status(self, index):
+        bit = 1 << index
+        if self.booked & bit:
+            return BOOKED
+        if self.held & bit:
+            return HELD
+        return AVAILABLE
+
+    def seat_map(self):
+        """{RowNumber: [(SeatID, SeatNumber, SeatType, status), ...]} in seat order"""
+        result = OrderedDict()
+        for index, seat_id in enumerate(self.seat_ids):
+            row_number, seat_number, seat_type = self.labels[index]
+            result.setdefault(row_number, []).append((seat_id, seat_number, seat_type, self.status(index)))
+        return result
+
+
+class SeatMapService:
+    """
+    Thread-safe cache of ShowSeatMap objects, loaded lazily from SEAT/SEAT_BOOKING.
+
+    run_query(sql, params) must return a list of row tuples. Booking, cancel and
+    hold paths in this process call mark_booked/release/mark_held/... after their
+    transaction commits so the maps follow them at once. Writes made anywhere
+    else are caught by a change stamp (seat bookings and live holds of the show),
+    checked when a map is more than max_age seconds old; a changed stamp reloads
+    the map. Maps that are not loaded ignore updates; they are read fresh when
+    next needed. track_holds=None tracks holds when SEAT_HOLD exists
+    (seat_hold_script.sql); True/False forces it on or off.
+    """
+
+    def __init__(self, run_query, max_shows=SEAT_MAP_MAX_SHOWS, track_holds=None, max_age=SEAT_MAP_MAX_AGE):
+        self.run_query = run_query
+        self.max_shows = max_shows
+        self.track_holds = track_holds
+        self.max_age = max_age
+        self._maps = OrderedDict()
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.reloads = 0
+
+    def _holds_tracked(self):
+        if self.track_holds is None:
+            self.track_holds = self.run_query(_HOLDS_INSTALLED_SQL, ())[0][0] is not None
+        return self.track_holds
+
+    def _stamp(self, show_id):
+        if self._holds_tracked():
+            return tuple(self.run_query(_STAMP_SQL, (show_id, show_id))[0])
+        return tuple(self.run_query(_BOOKED_STAMP_SQL, (show_id,))[0])
+
+    def _load(self, show_id):
+        # Stamp first: a write landing during the load then shows up as a change next time
+        stamp = self._stamp(show_id)
+        seat_map = ShowSeatMap(show_id, self.run_query(_SEATS_SQL, (show_id,)))
+        seat_map.stamp = stamp
+        seat_map.checked_at = time.monotonic()
+        seat_map.booked = seat_map.mask(row[0] for row in self.run_query(_BOOKED_SQL, (show_id,)))
+        if self._holds_tracked():
+            for seat_id, token, expires_at in self.run_query(_HELD_SQL, (show_id,)):
+                bit = seat_map.mask((seat_id,))
+                expiry, mask = seat_map.hold_expiry.get(str(token), (expires_at, 0))
+                seat_map.hold_expiry[str(token)] = (expiry, mask | bit)
+                seat_map.held |= bit
+        return seat_map
+
+    def get(self, show_id):
+        """The seat map of a show, loading it on first use and reloading it when the database changed"""
+        with self._lock:
+            cached = self._maps.get(show_id)
+            if cached is not None:
+                self._maps.move_to_end(show_id)
+                if time.monotonic() - cached.checked_at < self.max_age:
+                    cached.expire_holds()
+                    return cached
+
+        # Queries run outside the lock so one slow show does not stall the others
+        if cached is not None and self._stamp(show_id) == cached.stamp:
+            with self._lock:
+                cached.checked_at = time.monotonic()
+                cached.expire_holds()
+                return cached
+
+        loaded = self._load(show_id)
+        with self._lock:
+            seat_map = self._maps.get(show_id)
+            if seat_map is None or seat_map is cached:
+                # Another thread may have loaded a newer map meanwhile; keep that one
+                self._maps[show_id] = seat_map = loaded
+                self.loads += 1
+                if cached is not None:
+                    self.reloads += 1
+            self._maps.move_to_end(show_id)
+            while len(self._maps) > self.max_shows:
+                self._maps.popitem(last=False)
+            return seat_map
+
+    def _update(self, show_id, change):
+        with self._lock:
+            seat_map = self._maps.get(show_id)
+            if seat_map is not None:
+                change(seat_map)
+
+    # --- queries ---
+
+    def available_count(self, show_id):
+        return self.get(show_id).available_count()
+
+    def find_contiguous(self, show_id, count, row_number=None):
+        return self.get(show_id).find_contiguous(count, row_number)
+
+    def seat_map(self, show_id):
+        return self.get(show_id).seat_map()
+
+    # --- booking / cancel / hold paths ---
+
+    def mark_booked(self, show_id, seat_ids):
+        def change(seat_map):
+            seat_map.booked |= seat_map.mask(seat_ids)
+        self._update(show_id, change)
+
+    def release(self, show_id, seat_ids):
+        """Seats freed by a cancelled or deleted booking"""
+        def change(seat_map):
+            seat_map.booked &= ~seat_map.mask(seat_ids)
+        self._update(show_id, change)
+
+    def mark_held(self, show_id, seat_ids, hold_token, expires_at):
+        def change(seat_map):
+            mask = seat_map.mask(seat_ids)
+            _, previous = seat_map.hold_expiry.get(hold_token, (expires_at, 0))
+            seat_map.hold_expiry[hold_token] = (expires_at, previous | mask)
+            seat_map.held |= mask
+        self._update(show_id, change)
+
+    def release_hold(self, hold_token):
+        """Drop a released or confirmed hold from whichever show has it"""
+        with self._lock:
+            for seat_map in self._maps.values():
+                entry = seat_map.hold_expiry.pop(hold_token, None)
+                if entry is not None:
+                    seat_map.held &= ~entry[1]
+                    return
+
+    def invalidate(self, show_id=None):
+        """Forget one show (or all), forcing a reload on next use"""
+        with self._lock:
+            if show_id is None:
+                self._maps.clear()
+            else:
+                self._maps.pop(show_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {"shows": len(self._maps), "loads": self.loads, "reloads": self.reloads}
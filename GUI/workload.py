@@ -0,0 +1,272 @@
+"""
+=============================================
+Event & Ticket Booking System - Workload Operations
+Group 5 - DAMG6210
+The GUI's page queries and booking paths as replayable operations
+=============================================
+
+Each operation is a function (cursor, rng, ctx) that runs one request the way
+app.py or a booking client would and fetches its whole result. ctx holds ID
+ranges read once by load_context(), so operations pick realistic random keys,
+and the dashboard totals query that fits the database.
+Used by load_test.py.
+"""
+
+from event_search import EVENT_STATUSES, EVENT_TYPES, events_query
+from pagination import KeysetQuery, SortKey
+from lookups import search_bookings, search_customers, search_events
+
+PAGE_SIZE = 50
+REPORT_PREVIEW_ROWS = 1000
+
+NAME_PREFIXES = ["A", "B", "Ch", "D", "G", "H", "J", "K", "L", "M", "Ma", "P", "R", "S", "T", "W"]
+SEARCH_TERMS = ["comedy", "drama", "thriller", "generated movie", "generated sport", "exhibition", "cinema", "act"]
+
+# Filter choices offered by the grids' selectboxes (event types/statuses come from event_search)
+BOOKING_STATUSES = ["Confirmed", "Cancelled", "Completed"]
+FILTERED_PAGE_SHARE = 0.5  # share of grid page loads that apply a filter
+
+CUSTOMERS_PAGE = KeysetQuery(
+    """
+    SELECT C.CustomerID, U.FirstName, U.LastName, U.Email, U.PhoneNumber, C.LoyaltyPoints
+    FROM CUSTOMER C
+    INNER JOIN [USER] U ON C.UserID = U.UserID
+    """,
+    sort_keys=[SortKey("C.CustomerID", "CustomerID")],
+    count_from="CUSTOMER C"
+)
+
+def events_page_query(event_type=None, status=None):
+    """The Events grid query, with the filters app.py adds for its Type/Status selectboxes"""
+    return events_query(event_type=event_type, status=status)
+
+
+def bookings_page_query(status=None):
+    """The Bookings grid query, with the filter app.py adds for its Status selectbox"""
+    filters = [("B.BookingStatus = ?", (status,))] if status is not None else []
+    return KeysetQuery(
+        """
+        SELECT B.BookingID, U.FirstName + ' ' + U.LastName AS CustomerName, E.Title AS EventName,
+               B.BookingDateTime, B.TotalAmount, B.BookingStatus
+        FROM BOOKING B
+        INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
+        INNER JOIN [USER] U ON C.UserID = U.UserID
+        INNER JOIN EVENT E ON B.EventID = E.EventID
+        """,
+        sort_keys=[
+            SortKey("B.BookingDateTime", "BookingDateTime", descending=True, sql_type="DATETIME"),
+            SortKey("B.BookingID", "BookingID")
+        ],
+        filters=filters,
+        count_from="BOOKING B"
+    )
+
+
+EVENTS_PAGE = events_page_query()
+BOOKINGS_PAGE = bookings_page_query()
+
+DASHBOARD_STATS_SQL = """
+    SELECT SUM(TotalCustomers), SUM(UpcomingEvents), SUM(ActiveBookings), SUM(TotalRevenue)
+    FROM DASHBOARD_STATS
+"""
+
+# Without dashboard_stats_script.sql the dashboard counts the base tables
+DASHBOARD_COUNTS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM CUSTOMER),
+        (SELECT COUNT(*) FROM EVENT WHERE Status = 'Scheduled'),
+        (SELECT COUNT(*) FROM BOOKING WHERE BookingStatus = 'Confirmed'),
+        (SELECT ISNULL(SUM(TotalAmount), 0) FROM BOOKING WHERE BookingStatus IN ('Confirmed', 'Completed'))
+"""
+
+DASHBOARD_STATS_INSTALLED_SQL = "SELECT OBJECT_ID('DASHBOARD_STATS', 'U')"
+
+RECENT_BOOKINGS_SQL = """
+    SELECT TOP 10 B.BookingID, U.FirstName + ' ' + U.LastName AS CustomerName, E.Title AS EventName,
+           B.BookingDateTime, B.TotalAmount, B.BookingStatus
+    FROM BOOKING B
+    INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
+    INNER JOIN [USER] U ON C.UserID = U.UserID
+    INNER JOIN EVENT E ON B.EventID = E.EventID
+    ORDER BY B.BookingDateTime DESC
+"""
+
+REPORTS = [
+    ("vw_CustomerBookingSummary", "TotalSpent DESC"),
+    ("vw_EventPerformanceDashboard", "TotalRevenue DESC"),
+    ("vw_TheaterScreenUtilization", "UtilizationRate DESC"),
+    ("vw_UpcomingEventOccupancy", "OccupancyRate DESC"),
+]
+
+
+def _run(cursor, sql, params=()):
+    if params:
+        cursor.execute(sql, params)
+    else:
+        cursor.execute(sql)
+    while cursor.description is None and cursor.nextset():
+        pass
+    return cursor.fetchall() if cursor.description is not None else []
+
+
+def dashboard_stats_sql(cursor):
+    """DASHBOARD_STATS_SQL when dashboard_stats_script.sql is installed, else DASHBOARD_COUNTS_SQL"""
+    cursor.execute(DASHBOARD_STATS_INSTALLED_SQL)
+    return DASHBOARD_STATS_SQL if cursor.fetchone()[0] is not None else DASHBOARD_COUNTS_SQL
+
+
+def load_context(cursor):
+    """ID ranges the operations draw random keys from, and the dashboard totals query"""
+    ctx = {"dashboard_sql": dashboard_stats_sql(cursor)}
+    for name, table, column in [("customer", "CUSTOMER", "CustomerID"), ("event", "EVENT", "EventID"),
+                                ("show", "SHOW", "ShowID"), ("booking", "BOOKING", "BookingID")]:
+        cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {table}")
+        low, high = cursor.fetchone()
+        ctx[name] = (low or 0, high or 0)
+    return ctx
+
+
+def _random_id(rng, ctx, name):
+    low, high = ctx[name]
+    return rng.randint(low, high) if high else 0
+
+
+# --- read operations ---
+
+def dashboard(cursor, rng, ctx):
+    _run(cursor, ctx["dashboard_sql"])
+    return _run(cursor, RECENT_BOOKINGS_SQL)
+
+
+def _grid_page(cursor, keyset_query, cursor_value):
+    sql, params = keyset_query.page_sql(PAGE_SIZE, after=cursor_value)
+    return _run(cursor, sql, params)
+
+
+def customers_page(cursor, rng, ctx):
+    after = (_random_id(rng, ctx, "customer"),) if rng.random() < 0.8 else None
+    return _grid_page(cursor, CUSTOMERS_PAGE, after)
+
+
+def events_page(cursor, rng, ctx):
+    if rng.random() >= FILTERED_PAGE_SHARE:
+        return _grid_page(cursor, EVENTS_PAGE, None)
+    event_type = rng.choice(EVENT_TYPES + [None])
+    status = rng.choice(EVENT_STATUSES) if event_type is None or rng.random() < 0.5 else None
+    return _grid_page(cursor, events_page_query(event_type, status), None)
+
+
+def bookings_page(cursor, rng, ctx):
+    if rng.random() >= FILTERED_PAGE_SHARE:
+        return _grid_page(cursor, BOOKINGS_PAGE, None)
+    return _grid_page(cursor, bookings_page_query(rng.choice(BOOKING_STATUSES)), None)
+
+
+def customer_lookup(cursor, rng, ctx):
+    return _run(cursor, *search_customers(rng.choice(NAME_PREFIXES)))
+
+
+def event_lookup(cursor, rng, ctx):
+    return _run(cursor, *search_events("Generated" if rng.random() < 0.5 else rng.choice(NAME_PREFIXES)))
+
+
+def event_search(cursor, rng, ctx):
+    """A ranked search of the Events tab (needs search_script.sql)"""
+    text = rng.choice(SEARCH_TERMS)
+    event_type = rng.choice(EVENT_TYPES) if rng.random() < FILTERED_PAGE_SHARE else None
+    return _grid_page(cursor, events_query(text, event_type=event_type), None)
+
+
+def booking_lookup(cursor, rng, ctx):
+    return _run(cursor, *search_bookings(str(_random_id(rng, ctx, "booking"))))
+
+
+def report_preview(cursor, rng, ctx):
+    view, order_by = rng.choice(REPORTS)
+    return _run(cursor, f"SELECT TOP (?) * FROM {view} ORDER BY {order_by}", (REPORT_PREVIEW_ROWS,))
+
+
+def seats_available(cursor, rng, ctx):
+    return _run(cursor, "SELECT AvailableSeats FROM dbo.tvf_AvailableSeatsForShow(?)", (_random_id(rng, ctx, "show"),))
+
+
+# --- write operations (commit on success, roll back on error) ---
+
+def create_booking(cursor, rng, ctx):
+    """Book 1-4 free seats of a random show through sp_CreateBookingWithPayment"""
+    show_id = _random_id(rng, ctx, "show")
+    seats = _run(cursor, """
+        SELECT TOP (?) ST.SeatID, SH.EventID, SH.Price
+        FROM SHOW SH
+        INNER JOIN SEAT ST ON ST.ScreenID = SH.ScreenID
+        WHERE SH.ShowID = ?
+          AND NOT EXISTS (SELECT 1 FROM SEAT_BOOKING SB WHERE SB.ShowID = SH.ShowID AND SB.SeatID = ST.SeatID)
+        ORDER BY ST.SeatID
+    """, (rng.randint(1, 4), show_id))
+    if not seats:
+        return []
+
+    seat_ids = ",".join(str(row[0]) for row in seats)
+    amount = float(seats[0][2]) * len(seats)
+    rows = _run(cursor, """
+        DECLARE @BookingID INT, @PaymentID INT;
+        EXEC sp_CreateBookingWithPayment
+            @CustomerID = ?, @EventID = ?, @ShowID = ?, @SeatIDs = ?,
+            @PaymentAmount = ?, @PaymentType = 'Wallet', @WalletType = 'Apple Pay',
+            @BookingID = @BookingID OUTPUT, @PaymentID = @PaymentID OUTPUT;
+        SELECT @BookingID, @PaymentID;
+    """, (_random_id(rng, ctx, "customer"), seats[0][1], show_id, seat_ids, amount))
+    cursor.connection.commit()
+    return rows
+
+
+def cancel_booking(cursor, rng, ctx):
+    """Cancel the first confirmed booking at or after a random ID through sp_CancelBooking"""
+    rows = _run(cursor, """
+        SELECT TOP 1 BookingID FROM BOOKING
+        WHERE BookingStatus = 'Confirmed' AND BookingID >= ?
+        ORDER BY BookingID
+    """, (_random_id(rng, ctx, "booking"),))
+    if not rows:
+        return []
+
+    rows = _run(cursor, """
+        DECLARE @RefundAmount DECIMAL(10,2);
+        EXEC sp_CancelBooking @BookingID = ?, @RefundAmount = @RefundAmount OUTPUT;
+        SELECT @RefundAmount;
+    """, (rows[0][0],))
+    cursor.connection.commit()
+    return rows
+
+
+OPERATIONS = {
+    "dashboard": dashboard,
+    "customers_page": customers_page,
+    "events_page": events_page,
+    "bookings_page": bookings_page,
+    "customer_lookup": customer_lookup,
+    "event_lookup": event_lookup,
+    "event_search": event_search,
+    "booking_lookup": booking_lookup,
+    "report_preview": report_preview,
+    "seats_available": seats_available,
+    "create_booking": create_booking,
+    "cancel_booking": cancel_booking,
+}
+
+WRITE_OPERATIONS = {"create_booking", "cancel_booking"}
+
+# Default mix: mostly page loads and lookups, ~15% writes
+DEFAULT_MIX = {
+    "dashboard": 15,
+    "customers_page": 10,
+    "events_page": 10,
+    "bookings_page": 10,
+    "customer_lookup": 8,
+    "event_lookup": 8,
+    "booking_lookup": 8,
+    "report_preview": 4,
+    "seats_available": 12,
+    "create_booking": 10,
+    "cancel_booking": 5,
+}
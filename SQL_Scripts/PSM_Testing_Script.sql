@@ -534,7 +534,7 @@ PRINT '============================================='
 GO
 
 -- =============================================
--- TEST 15: fn_CalculateCustomerLifetimeValue
+-- TEST 15: Customer Lifetime Value (inline TVF, all customers)
 -- =============================================
 PRINT ''
 PRINT '--- TEST 15: Calculate Customer Lifetime Value ---'
@@ -545,10 +545,11 @@ SELECT
     C.CustomerID,
     U.FirstName,
     U.LastName,
-    dbo.fn_CalculateCustomerLifetimeValue(C.CustomerID) AS LifetimeValue,
+    LTV.LifetimeValue,
     C.LoyaltyPoints
 FROM CUSTOMER C
 INNER JOIN [USER] U ON C.UserID = U.UserID
+CROSS APPLY dbo.tvf_CustomerLifetimeValue(C.CustomerID) LTV
 ORDER BY LifetimeValue DESC;
 GO
 
@@ -576,7 +577,7 @@ GROUP BY CustomerID;
 GO
 
 -- =============================================
--- TEST 17: fn_GetAvailableSeatsForShow
+-- TEST 17: Available Seats (inline TVF, all shows)
 -- =============================================
 PRINT ''
 PRINT '--- TEST 17: Get Available Seats for Shows ---'
@@ -589,12 +590,13 @@ SELECT
     S.ShowDateTime,
     SC.SeatCapacity AS TotalSeats,
     COUNT(SB.SeatBookingID) AS BookedSeats,
-    dbo.fn_GetAvailableSeatsForShow(S.ShowID) AS AvailableSeats
+    AV.AvailableSeats
 FROM SHOW S
 INNER JOIN EVENT E ON S.EventID = E.EventID
 INNER JOIN SCREEN SC ON S.ScreenID = SC.ScreenID
+CROSS APPLY dbo.tvf_AvailableSeatsForShow(S.ShowID) AV
 LEFT JOIN SEAT_BOOKING SB ON S.ShowID = SB.ShowID
-GROUP BY S.ShowID, E.Title, S.ShowDateTime, SC.SeatCapacity
+GROUP BY S.ShowID, E.Title, S.ShowDateTime, SC.SeatCapacity, AV.AvailableSeats
 ORDER BY S.ShowID;
 GO
 
@@ -625,7 +627,7 @@ GROUP BY S.ShowID, SC.SeatCapacity;
 GO
 
 -- =============================================
--- TEST 19: fn_CalculateEventOccupancy
+-- TEST 19: Event Occupancy (inline TVF, all events)
 -- =============================================
 PRINT ''
 PRINT '--- TEST 19: Calculate Event Occupancy Rates ---'
@@ -636,13 +638,14 @@ SELECT
     E.EventID,
     E.Title AS EventName,
     E.EventType,
-    dbo.fn_CalculateEventOccupancy(E.EventID) AS OccupancyRate,
+    OCC.OccupancyRate,
     COUNT(DISTINCT B.BookingID) AS TotalBookings,
     COUNT(DISTINCT T.TicketID) AS TicketsSold
 FROM EVENT E
+CROSS APPLY dbo.tvf_EventOccupancy(E.EventID) OCC
 LEFT JOIN BOOKING B ON E.EventID = B.EventID
 LEFT JOIN TICKET T ON B.BookingID = T.BookingID
-GROUP BY E.EventID, E.Title, E.EventType
+GROUP BY E.EventID, E.Title, E.EventType, OCC.OccupancyRate
 ORDER BY OccupancyRate DESC;
 GO
 
@@ -814,6 +817,10 @@ WHERE BookingID = @TestBookingForTrigger;
 PRINT 'Booking After Update:'
 SELECT BookingID, BookingStatus, TotalAmount FROM BOOKING WHERE BookingID = @TestBookingForTrigger;
 
+-- With the queued audit trigger (audit_queue_script.sql), move pending changes first
+IF OBJECT_ID('sp_DrainBookingAuditQueue', 'P') IS NOT NULL
+    EXEC sp_DrainBookingAuditQueue;
+
 PRINT 'Audit Table After Update:'
 SELECT TOP 5 * FROM BOOKING_AUDIT ORDER BY AuditID DESC;
 GO
@@ -835,6 +842,10 @@ WHERE BookingStatus = 'Confirmed' AND BookingID IN (
     SELECT TOP 3 BookingID FROM BOOKING WHERE BookingStatus = 'Confirmed' ORDER BY BookingID
 );
 
+-- With the queued audit trigger (audit_queue_script.sql), move pending changes first
+IF OBJECT_ID('sp_DrainBookingAuditQueue', 'P') IS NOT NULL
+    EXEC sp_DrainBookingAuditQueue;
+
 PRINT 'Audit Records After Multiple Updates:'
 SELECT TOP 10 * FROM BOOKING_AUDIT ORDER BY AuditID DESC;
 
@@ -867,10 +878,491 @@ WHERE BookingID = @StatusChangeBooking;
 PRINT 'After Status Change:'
 SELECT BookingID, BookingStatus, TotalAmount FROM BOOKING WHERE BookingID = @StatusChangeBooking;
 
+-- With the queued audit trigger (audit_queue_script.sql), move pending changes first
+IF OBJECT_ID('sp_DrainBookingAuditQueue', 'P') IS NOT NULL
+    EXEC sp_DrainBookingAuditQueue;
+
 PRINT 'Corresponding Audit Record:'
 SELECT TOP 1 * FROM BOOKING_AUDIT WHERE BookingID = @StatusChangeBooking ORDER BY AuditID DESC;
 GO
 
+-- =============================================
+-- SECTION 5: REPORT AND FUNCTION EQUIVALENCE TESTS
+-- The report views and sp_GenerateRevenueReport aggregate per booking/event
+-- before joining. On data where the original joins did not fan out (at most
+-- one ticket, snack line and payment per booking, one show per event) they
+-- must return exactly what the original join-then-aggregate queries returned.
+-- =============================================
+
+PRINT ''
+PRINT '============================================='
+PRINT 'SECTION 5: TESTING REPORT AND FUNCTION EQUIVALENCE'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- TEST 27: vw_CustomerBookingSummary vs original join
+-- =============================================
+PRINT ''
+PRINT '--- TEST 27: Customer Booking Summary matches original query on non-fan-out data ---'
+GO
+
+SELECT C.CustomerID
+INTO #NoFanOutCustomers
+FROM CUSTOMER C
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM BOOKING B
+    INNER JOIN TICKET T ON T.BookingID = B.BookingID
+    WHERE B.CustomerID = C.CustomerID
+    GROUP BY T.BookingID
+    HAVING COUNT(*) > 1
+);
+
+SELECT 
+    C.CustomerID,
+    U.FirstName,
+    U.LastName,
+    U.Email,
+    C.LoyaltyPoints,
+    COUNT(B.BookingID) AS TotalBookings,
+    SUM(CASE WHEN B.BookingStatus = 'Confirmed' THEN 1 ELSE 0 END) AS ActiveBookings,
+    SUM(CASE WHEN B.BookingStatus = 'Completed' THEN 1 ELSE 0 END) AS CompletedBookings,
+    SUM(CASE WHEN B.BookingStatus = 'Cancelled' THEN 1 ELSE 0 END) AS CancelledBookings,
+    SUM(B.TotalAmount) AS TotalSpent,
+    AVG(B.TotalAmount) AS AvgBookingAmount,
+    MAX(B.BookingDateTime) AS LastBookingDate,
+    COUNT(DISTINCT T.TicketID) AS TotalTickets
+INTO #LegacyCustomerSummary
+FROM CUSTOMER C
+INNER JOIN [USER] U ON C.UserID = U.UserID
+LEFT JOIN BOOKING B ON C.CustomerID = B.CustomerID
+LEFT JOIN TICKET T ON B.BookingID = T.BookingID
+WHERE C.CustomerID IN (SELECT CustomerID FROM #NoFanOutCustomers)
+GROUP BY C.CustomerID, U.FirstName, U.LastName, U.Email, C.LoyaltyPoints;
+
+DECLARE @CustomerDiffs INT;
+SELECT @CustomerDiffs = COUNT(*) FROM (
+    (SELECT * FROM #LegacyCustomerSummary
+     EXCEPT
+     SELECT * FROM vw_CustomerBookingSummary WHERE CustomerID IN (SELECT CustomerID FROM #NoFanOutCustomers))
+    UNION ALL
+    (SELECT * FROM vw_CustomerBookingSummary WHERE CustomerID IN (SELECT CustomerID FROM #NoFanOutCustomers)
+     EXCEPT
+     SELECT * FROM #LegacyCustomerSummary)
+) AS Diff;
+
+SELECT COUNT(*) AS CustomersCompared, @CustomerDiffs AS DifferingRows FROM #NoFanOutCustomers;
+IF @CustomerDiffs = 0
+    PRINT 'PASSED: vw_CustomerBookingSummary matches the original query';
+ELSE
+    PRINT 'FAILED: vw_CustomerBookingSummary differs from the original query';
+
+DROP TABLE #LegacyCustomerSummary;
+DROP TABLE #NoFanOutCustomers;
+GO
+
+-- =============================================
+-- TEST 28: vw_EventPerformanceDashboard vs original join
+-- =============================================
+PRINT ''
+PRINT '--- TEST 28: Event Performance Dashboard matches original query on non-fan-out data ---'
+GO
+
+SELECT E.EventID
+INTO #NoFanOutEvents
+FROM EVENT E
+WHERE (SELECT COUNT(*) FROM SHOW S WHERE S.EventID = E.EventID) <= 1
+  AND NOT EXISTS (
+    SELECT 1
+    FROM BOOKING B
+    INNER JOIN TICKET T ON T.BookingID = B.BookingID
+    WHERE B.EventID = E.EventID
+    GROUP BY T.BookingID
+    HAVING COUNT(*) > 1
+);
+
+SELECT 
+    E.EventID,
+    E.Title AS EventName,
+    E.EventType,
+    E.Status AS EventStatus,
+    E.StartDateTime,
+    E.EndDateTime,
+    O.CompanyName AS OrganizerName,
+    COUNT(DISTINCT B.BookingID) AS TotalBookings,
+    COUNT(DISTINCT T.TicketID) AS TicketsSold,
+    SUM(B.TotalAmount) AS TotalRevenue,
+    AVG(B.TotalAmount) AS AvgRevenuePerBooking,
+    COUNT(DISTINCT S.ShowID) AS TotalShows,
+    SUM(CASE WHEN B.BookingStatus = 'Cancelled' THEN B.TotalAmount ELSE 0 END) AS LostRevenue,
+    CAST(COUNT(DISTINCT T.TicketID) AS FLOAT) / NULLIF(COUNT(DISTINCT S.ShowID), 0) AS AvgTicketsPerShow
+INTO #LegacyEventDashboard
+FROM EVENT E
+LEFT JOIN ORGANIZER O ON E.OrganizerID = O.OrganizerID
+LEFT JOIN BOOKING B ON E.EventID = B.EventID
+LEFT JOIN TICKET T ON B.BookingID = T.BookingID
+LEFT JOIN SHOW S ON E.EventID = S.EventID
+WHERE E.EventID IN (SELECT EventID FROM #NoFanOutEvents)
+GROUP BY E.EventID, E.Title, E.EventType, E.Status, E.StartDateTime, E.EndDateTime, O.CompanyName;
+
+DECLARE @EventDiffs INT;
+SELECT @EventDiffs = COUNT(*) FROM (
+    (SELECT * FROM #LegacyEventDashboard
+     EXCEPT
+     SELECT * FROM vw_EventPerformanceDashboard WHERE EventID IN (SELECT EventID FROM #NoFanOutEvents))
+    UNION ALL
+    (SELECT * FROM vw_EventPerformanceDashboard WHERE EventID IN (SELECT EventID FROM #NoFanOutEvents)
+     EXCEPT
+     SELECT * FROM #LegacyEventDashboard)
+) AS Diff;
+
+SELECT COUNT(*) AS EventsCompared, @EventDiffs AS DifferingRows FROM #NoFanOutEvents;
+IF @EventDiffs = 0
+    PRINT 'PASSED: vw_EventPerformanceDashboard matches the original query';
+ELSE
+    PRINT 'FAILED: vw_EventPerformanceDashboard differs from the original query';
+
+DROP TABLE #LegacyEventDashboard;
+DROP TABLE #NoFanOutEvents;
+GO
+
+-- =============================================
+-- TEST 29: sp_GenerateRevenueReport output vs expected rows
+-- The procedure's per-event rows are captured with INSERT ... EXEC
+-- (@IncludeSummary = 0) and compared with:
+--   a) a fixture booking with 2 tickets and 2 snack lines, whose correct
+--      totals are known (the old join multiplied them by fan-out)
+--   b) the original event-level join, for titles without fan-out
+-- The fixture is rolled back.
+-- =============================================
+PRINT ''
+PRINT '--- TEST 29: Revenue report output matches expected rows ---'
+GO
+
+CREATE TABLE #ProcRevenue (
+    EventType VARCHAR(50),
+    EventName VARCHAR(200),
+    TotalBookings INT,
+    TotalTickets INT,
+    TotalRevenue DECIMAL(38,2),
+    SnackRevenue DECIMAL(38,2),
+    PaymentReceived DECIMAL(38,2),
+    AvgBookingAmount DECIMAL(38,6),
+    FirstBooking DATETIME,
+    LastBooking DATETIME
+);
+
+DECLARE @RevenueDiffs INT;
+DECLARE @FixtureEventID INT, @FixtureBookingID INT;
+DECLARE @CustomerID INT = (SELECT MIN(CustomerID) FROM CUSTOMER);
+DECLARE @SnackID INT = (SELECT MIN(SnackID) FROM SNACK);
+
+-- a) Fixture in a window with no other bookings
+BEGIN TRANSACTION;
+
+INSERT INTO EVENT (Title, EventType, Status, StartDateTime, EndDateTime)
+VALUES ('PSM Test 29 Revenue Event', 'Movie', 'Completed', '2001-02-01 18:00', '2001-02-01 20:00');
+SET @FixtureEventID = SCOPE_IDENTITY();
+
+INSERT INTO BOOKING (CustomerID, EventID, BookingDateTime, TotalAmount, BookingStatus)
+VALUES (@CustomerID, @FixtureEventID, '2001-01-15 12:00', 40.00, 'Confirmed');
+SET @FixtureBookingID = SCOPE_IDENTITY();
+
+-- Cancelled bookings are left out of the per-event rows
+INSERT INTO BOOKING (CustomerID, EventID, BookingDateTime, TotalAmount, BookingStatus)
+VALUES (@CustomerID, @FixtureEventID, '2001-01-16 12:00', 99.00, 'Cancelled');
+
+INSERT INTO TICKET (BookingID, TicketStatus, IssueDate, ValidUntil, QRCode)
+VALUES (@FixtureBookingID, 'Active', '2001-01-15', '2001-02-14', 'QR-PSM29-1'),
+       (@FixtureBookingID, 'Active', '2001-01-15', '2001-02-14', 'QR-PSM29-2');
+
+INSERT INTO BOOKING_SNACK (BookingID, SnackID, Quantity, UnitPrice, Subtotal)
+VALUES (@FixtureBookingID, @SnackID, 1, 5.00, 5.00),
+       (@FixtureBookingID, @SnackID, 2, 5.00, 10.00);
+
+INSERT INTO PAYMENT (BookingID, Amount, PaymentDateTime, TransactionReference)
+VALUES (@FixtureBookingID, 40.00, '2001-01-15 12:00', 'TXN-PSM-TEST-29');
+
+INSERT INTO #ProcRevenue
+EXEC sp_GenerateRevenueReport @StartDate = '2001-01-01', @EndDate = '2001-01-31', @IncludeSummary = 0;
+
+ROLLBACK TRANSACTION;
+
+SELECT @RevenueDiffs = COUNT(*) FROM (
+    (SELECT * FROM #ProcRevenue
+     EXCEPT
+     SELECT 'Movie', 'PSM Test 29 Revenue Event', 1, 2, 40.00, 15.00, 40.00, 40.00,
+            CAST('2001-01-15 12:00' AS DATETIME), CAST('2001-01-15 12:00' AS DATETIME))
+    UNION ALL
+    (SELECT 'Movie', 'PSM Test 29 Revenue Event', 1, 2, 40.00, 15.00, 40.00, 40.00,
+            CAST('2001-01-15 12:00' AS DATETIME), CAST('2001-01-15 12:00' AS DATETIME))
+     EXCEPT
+     SELECT * FROM #ProcRevenue)
+) AS Diff;
+
+SELECT * FROM #ProcRevenue;
+IF @RevenueDiffs = 0
+    PRINT 'PASSED: revenue report returns the expected totals for a fan-out booking';
+ELSE
+    PRINT 'FAILED: revenue report totals differ from the expected fixture row';
+
+-- b) Original join on the sample data, for titles whose bookings have no fan-out
+DECLARE @ReportStart DATETIME = '2024-01-01', @ReportEnd DATETIME = '2026-12-31';
+
+SELECT DISTINCT E.Title
+INTO #NoFanOutTitles
+FROM EVENT E
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM vw_AllBookings B
+    INNER JOIN EVENT E2 ON E2.EventID = B.EventID
+    WHERE E2.Title = E.Title
+      AND B.BookingDateTime BETWEEN @ReportStart AND @ReportEnd
+      AND ((SELECT COUNT(*) FROM vw_AllTickets T WHERE T.BookingID = B.BookingID) > 1
+        OR (SELECT COUNT(*) FROM vw_AllBookingSnacks BS WHERE BS.BookingID = B.BookingID) > 1
+        OR (SELECT COUNT(*) FROM vw_AllPayments P WHERE P.BookingID = B.BookingID) > 1)
+);
+
+SELECT 
+    E.EventType,
+    E.Title AS EventName,
+    COUNT(DISTINCT B.BookingID) AS TotalBookings,
+    COUNT(DISTINCT T.TicketID) AS TotalTickets,
+    SUM(B.TotalAmount) AS TotalRevenue,
+    SUM(BS.Subtotal) AS SnackRevenue,
+    SUM(P.Amount) AS PaymentReceived,
+    AVG(B.TotalAmount) AS AvgBookingAmount,
+    MIN(B.BookingDateTime) AS FirstBooking,
+    MAX(B.BookingDateTime) AS LastBooking
+INTO #LegacyRevenue
+FROM EVENT E
+INNER JOIN vw_AllBookings B ON E.EventID = B.EventID
+LEFT JOIN vw_AllTickets T ON B.BookingID = T.BookingID
+LEFT JOIN vw_AllBookingSnacks BS ON B.BookingID = BS.BookingID
+LEFT JOIN vw_AllPayments P ON B.BookingID = P.BookingID
+WHERE B.BookingDateTime BETWEEN @ReportStart AND @ReportEnd
+    AND B.BookingStatus IN ('Confirmed', 'Completed')
+    AND E.Title IN (SELECT Title FROM #NoFanOutTitles)
+GROUP BY E.EventType, E.Title;
+
+DELETE FROM #ProcRevenue;
+INSERT INTO #ProcRevenue
+EXEC sp_GenerateRevenueReport @StartDate = @ReportStart, @EndDate = @ReportEnd, @IncludeSummary = 0;
+DELETE FROM #ProcRevenue WHERE EventName NOT IN (SELECT Title FROM #NoFanOutTitles);
+
+SELECT @RevenueDiffs = COUNT(*) FROM (
+    (SELECT * FROM #LegacyRevenue EXCEPT SELECT * FROM #ProcRevenue)
+    UNION ALL
+    (SELECT * FROM #ProcRevenue EXCEPT SELECT * FROM #LegacyRevenue)
+) AS Diff;
+
+SELECT (SELECT COUNT(*) FROM #LegacyRevenue) AS TitlesCompared, @RevenueDiffs AS DifferingRows;
+IF @RevenueDiffs = 0
+    PRINT 'PASSED: revenue report output matches the original query';
+ELSE
+    PRINT 'FAILED: revenue report output differs from the original query';
+
+DROP TABLE #ProcRevenue;
+DROP TABLE #LegacyRevenue;
+DROP TABLE #NoFanOutTitles;
+GO
+
+-- =============================================
+-- TEST 30: Inline and batch TVFs match the scalar UDFs
+-- =============================================
+PRINT ''
+PRINT '--- TEST 30: Inline/batch table-valued functions match scalar UDFs ---'
+GO
+
+DECLARE @CustomerIDs VARCHAR(MAX), @ShowIDs VARCHAR(MAX), @EventIDs VARCHAR(MAX);
+SELECT @CustomerIDs = STRING_AGG(CAST(CustomerID AS VARCHAR(MAX)), ',') FROM CUSTOMER;
+SELECT @ShowIDs = STRING_AGG(CAST(ShowID AS VARCHAR(MAX)), ',') FROM SHOW;
+SELECT @EventIDs = STRING_AGG(CAST(EventID AS VARCHAR(MAX)), ',') FROM EVENT;
+
+DECLARE @FunctionDiffs INT = 0;
+
+SELECT @FunctionDiffs = @FunctionDiffs + COUNT(*)
+FROM CUSTOMER C
+CROSS APPLY dbo.tvf_CustomerLifetimeValue(C.CustomerID) LTV
+LEFT JOIN dbo.tvf_CustomerLifetimeValueBatch(@CustomerIDs) BATCH ON BATCH.CustomerID = C.CustomerID
+WHERE dbo.fn_CalculateCustomerLifetimeValue(C.CustomerID) <> LTV.LifetimeValue
+   OR BATCH.LifetimeValue IS NULL
+   OR BATCH.LifetimeValue <> LTV.LifetimeValue;
+
+SELECT @FunctionDiffs = @FunctionDiffs + COUNT(*)
+FROM SHOW S
+CROSS APPLY dbo.tvf_AvailableSeatsForShow(S.ShowID) AV
+LEFT JOIN dbo.tvf_AvailableSeatsForShowBatch(@ShowIDs) BATCH ON BATCH.ShowID = S.ShowID
+WHERE dbo.fn_GetAvailableSeatsForShow(S.ShowID) <> AV.AvailableSeats
+   OR BATCH.AvailableSeats IS NULL
+   OR BATCH.AvailableSeats <> AV.AvailableSeats;
+
+SELECT @FunctionDiffs = @FunctionDiffs + COUNT(*)
+FROM EVENT E
+CROSS APPLY dbo.tvf_EventOccupancy(E.EventID) OCC
+LEFT JOIN dbo.tvf_EventOccupancyBatch(@EventIDs) BATCH ON BATCH.EventID = E.EventID
+WHERE dbo.fn_CalculateEventOccupancy(E.EventID) <> OCC.OccupancyRate
+   OR BATCH.OccupancyRate IS NULL
+   OR BATCH.OccupancyRate <> OCC.OccupancyRate;
+
+SELECT @FunctionDiffs AS DifferingValues;
+IF @FunctionDiffs = 0
+    PRINT 'PASSED: inline and batch functions match the scalar UDFs';
+ELSE
+    PRINT 'FAILED: inline or batch functions differ from the scalar UDFs';
+
+PRINT 'Occupancy of Upcoming Events (one set-based query):'
+SELECT * FROM vw_UpcomingEventOccupancy ORDER BY OccupancyRate DESC;
+GO
+
+-- =============================================
+-- TEST 31: Archiving a booking leaves lifetime value and occupancy unchanged
+-- One confirmed booking with seats is completed and moved to ARCHIVE_BOOKING
+-- and ARCHIVE_SEAT_BOOKING the way sp_ArchiveClosedBookings moves it; the
+-- scalar, inline and batch functions must return the same values before and
+-- after. The move is rolled back.
+-- =============================================
+PRINT ''
+PRINT '--- TEST 31: Archived bookings still count towards lifetime value and occupancy ---'
+GO
+
+DECLARE @ArchiveBookingID INT, @ArchiveCustomerID INT, @ArchiveEventID INT;
+DECLARE @CLVBefore DECIMAL(10,2), @CLVInlineBefore DECIMAL(10,2), @CLVBatchBefore DECIMAL(10,2);
+DECLARE @CLVAfter DECIMAL(10,2), @CLVInlineAfter DECIMAL(10,2), @CLVBatchAfter DECIMAL(10,2);
+DECLARE @OccBefore DECIMAL(5,2), @OccInlineBefore DECIMAL(5,2), @OccBatchBefore DECIMAL(5,2);
+DECLARE @OccAfter DECIMAL(5,2), @OccInlineAfter DECIMAL(5,2), @OccBatchAfter DECIMAL(5,2);
+DECLARE @StillLive INT;
+
+BEGIN TRANSACTION;
+
+SELECT TOP 1 @ArchiveBookingID = B.BookingID, @ArchiveCustomerID = B.CustomerID, @ArchiveEventID = B.EventID
+FROM BOOKING B
+WHERE B.BookingStatus IN ('Confirmed', 'Completed')
+  AND EXISTS (SELECT 1 FROM SEAT_BOOKING SB WHERE SB.BookingID = B.BookingID)
+ORDER BY B.BookingID;
+
+-- Only closed bookings are archived
+UPDATE BOOKING SET BookingStatus = 'Completed' WHERE BookingID = @ArchiveBookingID;
+
+SELECT @CLVBefore = dbo.fn_CalculateCustomerLifetimeValue(@ArchiveCustomerID),
+       @OccBefore = dbo.fn_CalculateEventOccupancy(@ArchiveEventID);
+SELECT @CLVInlineBefore = LifetimeValue FROM dbo.tvf_CustomerLifetimeValue(@ArchiveCustomerID);
+SELECT @CLVBatchBefore = LifetimeValue FROM dbo.tvf_CustomerLifetimeValueBatch(CAST(@ArchiveCustomerID AS VARCHAR(MAX)));
+SELECT @OccInlineBefore = OccupancyRate FROM dbo.tvf_EventOccupancy(@ArchiveEventID);
+SELECT @OccBatchBefore = OccupancyRate FROM dbo.tvf_EventOccupancyBatch(CAST(@ArchiveEventID AS VARCHAR(MAX)));
+
+INSERT INTO ARCHIVE_BOOKING
+SELECT CAST(BookingDateTime AS DATE), BookingID, CustomerID, EventID, BookingDateTime,
+       TotalAmount, BookingStatus, GETDATE()
+FROM BOOKING
+WHERE BookingID = @ArchiveBookingID;
+
+INSERT INTO ARCHIVE_SEAT_BOOKING
+SELECT CAST(B.BookingDateTime AS DATE), SB.SeatBookingID, SB.BookingID, SB.SeatID, SB.ShowID
+FROM SEAT_BOOKING SB
+INNER JOIN BOOKING B ON B.BookingID = SB.BookingID
+WHERE SB.BookingID = @ArchiveBookingID;
+
+-- Seat bookings, tickets and snack lines go with the booking through ON DELETE CASCADE
+EXEC sp_set_session_context @key = N'BookingArchive', @value = 1;
+DELETE FROM PAYMENT WHERE BookingID = @ArchiveBookingID;
+DELETE FROM BOOKING WHERE BookingID = @ArchiveBookingID;
+EXEC sp_set_session_context @key = N'BookingArchive', @value = 0;
+
+SELECT @StillLive = COUNT(*) FROM SEAT_BOOKING WHERE BookingID = @ArchiveBookingID;
+
+SELECT @CLVAfter = dbo.fn_CalculateCustomerLifetimeValue(@ArchiveCustomerID),
+       @OccAfter = dbo.fn_CalculateEventOccupancy(@ArchiveEventID);
+SELECT @CLVInlineAfter = LifetimeValue FROM dbo.tvf_CustomerLifetimeValue(@ArchiveCustomerID);
+SELECT @CLVBatchAfter = LifetimeValue FROM dbo.tvf_CustomerLifetimeValueBatch(CAST(@ArchiveCustomerID AS VARCHAR(MAX)));
+SELECT @OccInlineAfter = OccupancyRate FROM dbo.tvf_EventOccupancy(@ArchiveEventID);
+SELECT @OccBatchAfter = OccupancyRate FROM dbo.tvf_EventOccupancyBatch(CAST(@ArchiveEventID AS VARCHAR(MAX)));
+
+ROLLBACK TRANSACTION;
+
+SELECT @ArchiveBookingID AS ArchivedBookingID,
+       @CLVBefore AS LifetimeValueBefore, @CLVAfter AS LifetimeValueAfter,
+       @OccBefore AS OccupancyBefore, @OccAfter AS OccupancyAfter;
+
+IF @ArchiveBookingID IS NULL
+    PRINT 'FAILED: no confirmed booking with seats to archive';
+ELSE IF @StillLive = 0
+    AND @CLVAfter = @CLVBefore AND @CLVInlineAfter = @CLVInlineBefore AND @CLVBatchAfter = @CLVBatchBefore
+    AND @CLVInlineAfter = @CLVAfter AND @CLVBatchAfter = @CLVAfter
+    AND @OccAfter = @OccBefore AND @OccInlineAfter = @OccInlineBefore AND @OccBatchAfter = @OccBatchBefore
+    AND @OccInlineAfter = @OccAfter AND @OccBatchAfter = @OccAfter
+    PRINT 'PASSED: lifetime value and occupancy include archived bookings';
+ELSE
+    PRINT 'FAILED: lifetime value or occupancy changed when the booking was archived';
+GO
+
+-- =============================================
+-- TEST 32: sp_CreateBookingWithPayment refuses a held seat (Should Fail)
+-- A seat held by one customer through sp_HoldSeats (seat_hold_script.sql)
+-- must not be sold directly to another; the hold is released afterwards.
+-- =============================================
+PRINT ''
+PRINT '--- TEST 32: Direct booking of a held seat (Should Fail) ---'
+GO
+
+IF OBJECT_ID('SEAT_HOLD', 'U') IS NULL
+BEGIN
+    PRINT 'SKIPPED: seat_hold_script.sql is not installed';
+END
+ELSE
+BEGIN
+    DECLARE @HoldShowID INT, @HoldEventID INT, @HeldSeat INT;
+    DECLARE @HoldCustomerID INT = (SELECT MAX(CustomerID) FROM CUSTOMER);
+    DECLARE @BuyerCustomerID INT = (SELECT MIN(CustomerID) FROM CUSTOMER);
+    DECLARE @HoldToken32 UNIQUEIDENTIFIER, @HoldExpires32 DATETIME2(3);
+    DECLARE @BookingID32 INT, @PaymentID32 INT, @HeldSeats32 VARCHAR(20);
+    DECLARE @HoldError NVARCHAR(4000);
+
+    SELECT TOP 1 @HoldShowID = SH.ShowID, @HoldEventID = SH.EventID, @HeldSeat = ST.SeatID
+    FROM SHOW SH
+    INNER JOIN SEAT ST ON ST.ScreenID = SH.ScreenID
+    WHERE NOT EXISTS (SELECT 1 FROM SEAT_BOOKING SB WHERE SB.ShowID = SH.ShowID AND SB.SeatID = ST.SeatID)
+      AND NOT EXISTS (SELECT 1 FROM SEAT_HOLD H WHERE H.ShowID = SH.ShowID AND H.SeatID = ST.SeatID)
+    ORDER BY SH.ShowID, ST.SeatID;
+
+    SET @HeldSeats32 = CAST(@HeldSeat AS VARCHAR(20));
+
+    EXEC sp_HoldSeats
+        @ShowID = @HoldShowID,
+        @SeatIDs = @HeldSeats32,
+        @CustomerID = @HoldCustomerID,
+        @HoldSeconds = 300,
+        @HoldToken = @HoldToken32 OUTPUT,
+        @ExpiresAt = @HoldExpires32 OUTPUT;
+
+    BEGIN TRY
+        EXEC sp_CreateBookingWithPayment 
+            @CustomerID = @BuyerCustomerID,
+            @EventID = @HoldEventID,
+            @ShowID = @HoldShowID,
+            @SeatIDs = @HeldSeats32,
+            @PaymentAmount = 15.00,
+            @PaymentType = 'Card',
+            @CardNumber = '4532756279624512',
+            @CardHolderName = 'Test User',
+            @BookingID = @BookingID32 OUTPUT,
+            @PaymentID = @PaymentID32 OUTPUT;
+    END TRY
+    BEGIN CATCH
+        SET @HoldError = ERROR_MESSAGE();
+    END CATCH
+
+    DELETE FROM SEAT_HOLD WHERE HoldToken = @HoldToken32;
+
+    SELECT @HoldShowID AS ShowID, @HeldSeat AS HeldSeatID, @BookingID32 AS BookingID, @HoldError AS Error;
+    IF @BookingID32 IS NULL AND @HoldError LIKE '%held by another buyer%'
+        PRINT 'PASSED: a seat under a live hold cannot be booked directly';
+    ELSE
+        PRINT 'FAILED: a held seat was booked, or the booking failed for another reason';
+END
+GO
+
 -- =============================================
 -- FINAL SUMMARY
 -- =============================================
@@ -881,12 +1373,13 @@ PRINT 'TESTING COMPLETED SUCCESSFULLY!'
 PRINT '============================================='
 PRINT ''
 PRINT 'Summary of Tests Performed:'
-PRINT '- 14 Stored Procedure Tests (including error handling)'
+PRINT '- 15 Stored Procedure Tests (including error handling and seat holds)'
 PRINT '- 6 User-Defined Function Tests'
 PRINT '- 3 View Tests with multiple queries'
 PRINT '- 3 DML Trigger Tests'
+PRINT '- 5 Equivalence Tests (rewritten reports, inline/batch functions, archived bookings)'
 PRINT '============================================='
-PRINT 'Total: 26 Comprehensive Tests'
+PRINT 'Total: 32 Comprehensive Tests'
 PRINT '============================================='
 PRINT ''
 PRINT 'Review Results Above to Verify:'
@@ -894,6 +1387,7 @@ PRINT '1. All stored procedures execute without errors'
 PRINT '2. All functions return correct values'
 PRINT '3. All views display data correctly'
 PRINT '4. Trigger logs all changes to BOOKING_AUDIT table'
+PRINT '5. Rewritten reports and inline functions match the originals and count archived bookings (PASSED lines)'
 PRINT '============================================='
 GO
 
@@ -915,6 +1409,10 @@ PRINT 'Total Payments Processed:'
 SELECT COUNT(*) AS TotalPayments FROM PAYMENT;
 
 PRINT ''
+-- With the queued audit trigger (audit_queue_script.sql), move pending changes first
+IF OBJECT_ID('sp_DrainBookingAuditQueue', 'P') IS NOT NULL
+    EXEC sp_DrainBookingAuditQueue;
+
 PRINT 'Total Audit Records Created:'
 SELECT COUNT(*) AS TotalAuditRecords FROM BOOKING_AUDIT;
 
@@ -0,0 +1,630 @@
+-- =============================================
+-- Event & Ticket Booking System - ARCHIVE Script
+-- Group 5 - DAMG6210
+-- Columnstore archive tier for closed bookings and audit history
+-- =============================================
+-- BOOKING, TICKET, SEAT_BOOKING, BOOKING_SNACK, PAYMENT and BOOKING_AUDIT
+-- otherwise keep every booking ever made in the rowstore that serves live
+-- traffic. sp_ArchiveClosedBookings moves Completed/Cancelled bookings (with
+-- their child rows) whose booking month and event lie before a configurable
+-- horizon into the ARCHIVE_* tables (create_tables.sql): clustered
+-- columnstores partitioned by month. sp_PurgeArchive drops whole months past
+-- a retention period.
+--
+-- Sliding window: each month is loaded into the empty ARCHIVE_STAGE_* tables
+-- and switched into its own partition (a metadata-only move), and purged by
+-- switching the partition back out. Boundaries are split in ahead of a load
+-- and merged away after a purge, so splits and merges only ever touch empty
+-- partitions.
+--
+-- Reports, Power BI views, the reporting refresh and the dashboard
+-- reconciliation read both tiers through the vw_All* views (psm_script.sql).
+-- Moves set SESSION_CONTEXT 'BookingArchive' so the BOOKING triggers do not
+-- log them as deletes or take them out of the dashboard revenue.
+-- Run from SQL Agent or the CLI: python GUI/archive_bookings.py
+-- Run after reporting_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'ARCHIVE TIER SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: STAGING AND LOG TABLES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Staging and Log Tables ---'
+GO
+
+IF OBJECT_ID('ARCHIVE_STAGE_BOOKING', 'U') IS NOT NULL DROP TABLE ARCHIVE_STAGE_BOOKING;
+IF OBJECT_ID('ARCHIVE_STAGE_TICKET', 'U') IS NOT NULL DROP TABLE ARCHIVE_STAGE_TICKET;
+IF OBJECT_ID('ARCHIVE_STAGE_SEAT_BOOKING', 'U') IS NOT NULL DROP TABLE ARCHIVE_STAGE_SEAT_BOOKING;
+IF OBJECT_ID('ARCHIVE_STAGE_BOOKING_SNACK', 'U') IS NOT NULL DROP TABLE ARCHIVE_STAGE_BOOKING_SNACK;
+IF OBJECT_ID('ARCHIVE_STAGE_PAYMENT', 'U') IS NOT NULL DROP TABLE ARCHIVE_STAGE_PAYMENT;
+IF OBJECT_ID('ARCHIVE_STAGE_BOOKING_AUDIT', 'U') IS NOT NULL DROP TABLE ARCHIVE_STAGE_BOOKING_AUDIT;
+IF OBJECT_ID('ARCHIVE_RUN_LOG', 'U') IS NOT NULL DROP TABLE ARCHIVE_RUN_LOG;
+GO
+
+-- One staging table per archive table: same columns and columnstore, on the
+-- same filegroup, so a staged month can be switched in and a purged month out
+CREATE TABLE ARCHIVE_STAGE_BOOKING (
+    BookingDate DATE NOT NULL,
+    BookingID INT NOT NULL,
+    CustomerID INT NOT NULL,
+    EventID INT NOT NULL,
+    BookingDateTime DATETIME NOT NULL,
+    TotalAmount DECIMAL(10,2) NOT NULL,
+    BookingStatus VARCHAR(20),
+    ArchivedAt DATETIME NOT NULL
+) ON [PRIMARY];
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveStageBooking ON ARCHIVE_STAGE_BOOKING;
+
+CREATE TABLE ARCHIVE_STAGE_TICKET (
+    BookingDate DATE NOT NULL,
+    TicketID INT NOT NULL,
+    BookingID INT NOT NULL,
+    TicketStatus VARCHAR(20),
+    IssueDate DATE NOT NULL,
+    ValidUntil DATE,
+    QRCode VARCHAR(255)
+) ON [PRIMARY];
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveStageTicket ON ARCHIVE_STAGE_TICKET;
+
+CREATE TABLE ARCHIVE_STAGE_SEAT_BOOKING (
+    BookingDate DATE NOT NULL,
+    SeatBookingID INT NOT NULL,
+    BookingID INT NOT NULL,
+    SeatID INT NOT NULL,
+    ShowID INT NOT NULL
+) ON [PRIMARY];
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveStageSeatBooking ON ARCHIVE_STAGE_SEAT_BOOKING;
+
+CREATE TABLE ARCHIVE_STAGE_BOOKING_SNACK (
+    BookingDate DATE NOT NULL,
+    BookingSnackID INT NOT NULL,
+    BookingID INT NOT NULL,
+    SnackID INT NOT NULL,
+    Quantity INT NOT NULL,
+    UnitPrice DECIMAL(10,2) NOT NULL,
+    Subtotal DECIMAL(10,2) NOT NULL,
+    MatchDateTime DATETIME
+) ON [PRIMARY];
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveStageBookingSnack ON ARCHIVE_STAGE_BOOKING_SNACK;
+
+CREATE TABLE ARCHIVE_STAGE_PAYMENT (
+    BookingDate DATE NOT NULL,
+    PaymentID INT NOT NULL,
+    BookingID INT NOT NULL,
+    Amount DECIMAL(10,2) NOT NULL,
+    PaymentDateTime DATETIME NOT NULL,
+    TransactionReference VARCHAR(100),
+    PaymentType VARCHAR(20),
+    CardHolderName VARCHAR(100),
+    CardLast4 CHAR(4),
+    WalletType VARCHAR(50),
+    PayPalEmail VARCHAR(100)
+) ON [PRIMARY];
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveStagePayment ON ARCHIVE_STAGE_PAYMENT;
+
+CREATE TABLE ARCHIVE_STAGE_BOOKING_AUDIT (
+    AuditDate DATE NOT NULL,
+    AuditID INT NOT NULL,
+    BookingID INT NOT NULL,
+    OldStatus VARCHAR(20),
+    NewStatus VARCHAR(20),
+    OldTotalAmount DECIMAL(10,2),
+    NewTotalAmount DECIMAL(10,2),
+    ChangeDateTime DATETIME,
+    ChangedBy VARCHAR(100),
+    ChangeType VARCHAR(20)
+) ON [PRIMARY];
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveStageBookingAudit ON ARCHIVE_STAGE_BOOKING_AUDIT;
+GO
+
+CREATE TABLE ARCHIVE_RUN_LOG (
+    RunID INT IDENTITY(1,1) PRIMARY KEY,
+    RunType VARCHAR(20) NOT NULL,
+    StartedAt DATETIME NOT NULL,
+    FinishedAt DATETIME NULL,
+    Cutoff DATE NOT NULL, -- months before this date were archived / purged
+    MonthsProcessed INT NOT NULL DEFAULT 0,
+    BookingsMoved INT NOT NULL DEFAULT 0,
+    AuditRowsMoved INT NOT NULL DEFAULT 0,
+    Status VARCHAR(20) NOT NULL,
+    ErrorMessage NVARCHAR(4000) NULL,
+    CONSTRAINT CHK_ArchiveRunLog_RunType CHECK (RunType IN ('Archive', 'Purge')),
+    CONSTRAINT CHK_ArchiveRunLog_Status CHECK (Status IN ('Running', 'Succeeded', 'Failed'))
+);
+GO
+
+PRINT 'Created ARCHIVE_STAGE_* tables and ARCHIVE_RUN_LOG.';
+GO
+
+-- =============================================
+-- SECTION 2: PARTITION HELPERS
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Partition Helpers ---'
+GO
+
+-- =============================================
+-- SP: Ensure Archive Partition
+-- Purpose: Splits in the boundaries of @Month and the following month, so
+--          the month gets a partition of its own before it is loaded.
+-- =============================================
+IF OBJECT_ID('sp_EnsureArchivePartition', 'P') IS NOT NULL
+    DROP PROCEDURE sp_EnsureArchivePartition;
+GO
+
+CREATE PROCEDURE sp_EnsureArchivePartition
+    @Month DATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @Boundary DATE = DATEFROMPARTS(YEAR(@Month), MONTH(@Month), 1);
+    DECLARE @Last DATE = DATEADD(MONTH, 1, @Boundary);
+
+    WHILE @Boundary <= @Last
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1
+            FROM sys.partition_range_values RV
+            INNER JOIN sys.partition_functions PF ON PF.function_id = RV.function_id
+            WHERE PF.name = 'PF_ArchiveMonth' AND CAST(RV.value AS DATE) = @Boundary
+        )
+        BEGIN
+            ALTER PARTITION SCHEME PS_ArchiveMonth NEXT USED [PRIMARY];
+            ALTER PARTITION FUNCTION PF_ArchiveMonth() SPLIT RANGE (@Boundary);
+        END
+
+        SET @Boundary = DATEADD(MONTH, 1, @Boundary);
+    END
+END;
+GO
+
+PRINT 'Created sp_EnsureArchivePartition procedure.';
+GO
+
+-- =============================================
+-- SP: Move Archive Stage
+-- Purpose: Moves the rows staged in ARCHIVE_STAGE_<name> into the @Month
+--          partition of ARCHIVE_<name>. An empty partition (the usual case:
+--          a month crossing the horizon) is filled with a partition switch;
+--          stragglers for a month already archived are inserted.
+-- =============================================
+IF OBJECT_ID('sp_MoveArchiveStage', 'P') IS NOT NULL
+    DROP PROCEDURE sp_MoveArchiveStage;
+GO
+
+CREATE PROCEDURE sp_MoveArchiveStage
+    @Table SYSNAME,       -- e.g. 'ARCHIVE_BOOKING'
+    @DateColumn SYSNAME,  -- its partitioning column
+    @Month DATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @Stage SYSNAME = STUFF(@Table, 1, LEN('ARCHIVE_'), 'ARCHIVE_STAGE_');
+    DECLARE @Constraint SYSNAME = 'CHK_' + @Stage + '_Month';
+    DECLARE @Partition INT = $PARTITION.PF_ArchiveMonth(@Month);
+    DECLARE @Sql NVARCHAR(MAX);
+
+    IF EXISTS (
+        SELECT 1 FROM sys.partitions
+        WHERE object_id = OBJECT_ID(@Table) AND partition_number = @Partition AND rows > 0
+    )
+    BEGIN
+        SET @Sql = N'INSERT INTO ' + QUOTENAME(@Table) + N' SELECT * FROM ' + QUOTENAME(@Stage) + N';';
+    END
+    ELSE
+    BEGIN
+        -- A trusted CHECK constraint proves every staged row belongs to the target partition
+        SET @Sql =
+            N'ALTER TABLE ' + QUOTENAME(@Stage) + N' ADD CONSTRAINT ' + QUOTENAME(@Constraint)
+            + N' CHECK (' + QUOTENAME(@DateColumn) + N' >= ''' + CONVERT(CHAR(10), @Month, 23) + N''''
+            + N' AND ' + QUOTENAME(@DateColumn) + N' < ''' + CONVERT(CHAR(10), DATEADD(MONTH, 1, @Month), 23) + N''');'
+            + N' ALTER TABLE ' + QUOTENAME(@Stage) + N' SWITCH TO ' + QUOTENAME(@Table)
+            + N' PARTITION ' + CAST(@Partition AS NVARCHAR(10)) + N';'
+            + N' ALTER TABLE ' + QUOTENAME(@Stage) + N' DROP CONSTRAINT ' + QUOTENAME(@Constraint) + N';';
+    END
+
+    SET @Sql += N' TRUNCATE TABLE ' + QUOTENAME(@Stage) + N';';
+    EXEC sp_executesql @Sql;
+END;
+GO
+
+PRINT 'Created sp_MoveArchiveStage procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: ARCHIVE AND PURGE PROCEDURES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 3: Creating Archive and Purge Procedures ---'
+GO
+
+-- =============================================
+-- SP: Archive Closed Bookings
+-- Purpose: Moves Completed and Cancelled bookings booked before the first day
+--          of the month @HorizonMonths ago, whose event also ended before
+--          then, into the archive tier with their tickets, seat bookings,
+--          snack lines and payments; audit rows older than the horizon move
+--          with them. One transaction per month, oldest first; @MaxMonths
+--          limits the months handled in one run. Audit rows the reporting
+--          refresh has not consumed yet are left in place.
+-- =============================================
+IF OBJECT_ID('sp_ArchiveClosedBookings', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ArchiveClosedBookings;
+GO
+
+CREATE PROCEDURE sp_ArchiveClosedBookings
+    @HorizonMonths INT = 12,
+    @MaxMonths INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @RunID INT;
+    DECLARE @Now DATETIME = GETDATE();
+    DECLARE @Cutoff DATE;
+    DECLARE @AuditLimit INT = 2147483647;
+    DECLARE @Month DATE;
+    DECLARE @NextMonth DATE;
+    DECLARE @Months INT = 0;
+    DECLARE @Bookings INT = 0;
+    DECLARE @AuditRows INT = 0;
+
+    IF @HorizonMonths IS NULL OR @HorizonMonths < 1
+    BEGIN
+        RAISERROR('Horizon must be at least one month.', 16, 1);
+        RETURN;
+    END
+
+    SET @Cutoff = DATEADD(MONTH, -@HorizonMonths, DATEFROMPARTS(YEAR(@Now), MONTH(@Now), 1));
+
+    INSERT INTO ARCHIVE_RUN_LOG (RunType, StartedAt, Cutoff, Status)
+    VALUES ('Archive', @Now, @Cutoff, 'Running');
+    SET @RunID = SCOPE_IDENTITY();
+
+    CREATE TABLE #Move (BookingID INT PRIMARY KEY, BookingDate DATE NOT NULL);
+    CREATE TABLE #MoveAudit (AuditID INT PRIMARY KEY);
+
+    BEGIN TRY
+        -- Keep audit rows until sp_RefreshReportingTables has read them
+        IF OBJECT_ID('RPT_REFRESH_STATE', 'U') IS NOT NULL
+            SELECT @AuditLimit = LastAuditID FROM RPT_REFRESH_STATE WHERE StateID = 1;
+
+        DECLARE MonthCursor CURSOR LOCAL FAST_FORWARD FOR
+            SELECT TOP (ISNULL(@MaxMonths, 2147483647)) Month
+            FROM (
+                SELECT DATEFROMPARTS(YEAR(B.BookingDateTime), MONTH(B.BookingDateTime), 1) AS Month
+                FROM BOOKING B
+                INNER JOIN EVENT E ON E.EventID = B.EventID
+                WHERE B.BookingStatus IN ('Completed', 'Cancelled')
+                  AND B.BookingDateTime < @Cutoff
+                  AND E.EndDateTime < @Cutoff
+                UNION
+                SELECT DATEFROMPARTS(YEAR(A.ChangeDateTime), MONTH(A.ChangeDateTime), 1)
+                FROM BOOKING_AUDIT A
+                WHERE A.ChangeDateTime < @Cutoff AND A.AuditID <= @AuditLimit
+            ) AS M
+            ORDER BY Month;
+
+        OPEN MonthCursor;
+        FETCH NEXT FROM MonthCursor INTO @Month;
+
+        WHILE @@FETCH_STATUS = 0
+        BEGIN
+            SET @NextMonth = DATEADD(MONTH, 1, @Month);
+
+            -- Boundary changes run outside the transaction; the partitions they split are empty
+            EXEC sp_EnsureArchivePartition @Month;
+
+            BEGIN TRANSACTION;
+
+            TRUNCATE TABLE #Move;
+            TRUNCATE TABLE #MoveAudit;
+
+            INSERT INTO #Move (BookingID, BookingDate)
+            SELECT B.BookingID, CAST(B.BookingDateTime AS DATE)
+            FROM BOOKING B WITH (UPDLOCK)
+            INNER JOIN EVENT E ON E.EventID = B.EventID
+            WHERE B.BookingStatus IN ('Completed', 'Cancelled')
+              AND B.BookingDateTime >= @Month
+              AND B.BookingDateTime < @NextMonth
+              AND B.BookingDateTime < @Cutoff
+              AND E.EndDateTime < @Cutoff;
+
+            INSERT INTO #MoveAudit (AuditID)
+            SELECT AuditID
+            FROM BOOKING_AUDIT WITH (UPDLOCK)
+            WHERE ChangeDateTime >= @Month
+              AND ChangeDateTime < @NextMonth
+              AND ChangeDateTime < @Cutoff
+              AND AuditID <= @AuditLimit;
+
+            -- Stage the month
+            INSERT INTO ARCHIVE_STAGE_BOOKING WITH (TABLOCK)
+            SELECT M.BookingDate, B.BookingID, B.CustomerID, B.EventID, B.BookingDateTime,
+                   B.TotalAmount, B.BookingStatus, @Now
+            FROM #Move M
+            INNER JOIN BOOKING B ON B.BookingID = M.BookingID;
+
+            INSERT INTO ARCHIVE_STAGE_TICKET WITH (TABLOCK)
+            SELECT M.BookingDate, T.TicketID, T.BookingID, T.TicketStatus, T.IssueDate, T.ValidUntil, T.QRCode
+            FROM #Move M
+            INNER JOIN TICKET T ON T.BookingID = M.BookingID;
+
+            INSERT INTO ARCHIVE_STAGE_SEAT_BOOKING WITH (TABLOCK)
+            SELECT M.BookingDate, SB.SeatBookingID, SB.BookingID, SB.SeatID, SB.ShowID
+            FROM #Move M
+            INNER JOIN SEAT_BOOKING SB ON SB.BookingID = M.BookingID;
+
+            INSERT INTO ARCHIVE_STAGE_BOOKING_SNACK WITH (TABLOCK)
+            SELECT M.BookingDate, BS.BookingSnackID, BS.BookingID, BS.SnackID, BS.Quantity,
+                   BS.UnitPrice, BS.Subtotal, BS.MatchDateTime
+            FROM #Move M
+            INNER JOIN BOOKING_SNACK BS ON BS.BookingID = M.BookingID;
+
+            INSERT INTO ARCHIVE_STAGE_PAYMENT WITH (TABLOCK)
+            SELECT
+                M.BookingDate, P.PaymentID, P.BookingID, P.Amount, P.PaymentDateTime, P.TransactionReference,
+                CASE
+                    WHEN CP.PaymentID IS NOT NULL THEN 'Card'
+                    WHEN WP.PaymentID IS NOT NULL THEN 'Wallet'
+                    WHEN PP.PaymentID IS NOT NULL THEN 'PayPal'
+                END,
+                CP.CardHolderName,
+                CP.CardLast4,
+                WP.WalletType,
+                PP.PayPalEmail
+            FROM #Move M
+            INNER JOIN PAYMENT P ON P.BookingID = M.BookingID
+            LEFT JOIN CARD_PAYMENT CP ON CP.PaymentID = P.PaymentID
+            LEFT JOIN WALLET_PAYMENT WP ON WP.PaymentID = P.PaymentID
+            LEFT JOIN PAYPAL_PAYMENT PP ON PP.PaymentID = P.PaymentID;
+
+            INSERT INTO ARCHIVE_STAGE_BOOKING_AUDIT WITH (TABLOCK)
+            SELECT CAST(A.ChangeDateTime AS DATE), A.AuditID, A.BookingID, A.OldStatus, A.NewStatus,
+                   A.OldTotalAmount, A.NewTotalAmount, A.ChangeDateTime, A.ChangedBy, A.ChangeType
+            FROM #MoveAudit MA
+            INNER JOIN BOOKING_AUDIT A ON A.AuditID = MA.AuditID;
+
+            -- Switch (or insert) the staged month into the archive tables
+            EXEC sp_MoveArchiveStage 'ARCHIVE_BOOKING', 'BookingDate', @Month;
+            EXEC sp_MoveArchiveStage 'ARCHIVE_TICKET', 'BookingDate', @Month;
+            EXEC sp_MoveArchiveStage 'ARCHIVE_SEAT_BOOKING', 'BookingDate', @Month;
+            EXEC sp_MoveArchiveStage 'ARCHIVE_BOOKING_SNACK', 'BookingDate', @Month;
+            EXEC sp_MoveArchiveStage 'ARCHIVE_PAYMENT', 'BookingDate', @Month;
+            EXEC sp_MoveArchiveStage 'ARCHIVE_BOOKING_AUDIT', 'AuditDate', @Month;
+
+            -- Remove the hot rows; TICKET, SEAT_BOOKING, BOOKING_SNACK and the
+            -- payment subtype rows go with them through ON DELETE CASCADE
+            EXEC sp_set_session_context @key = N'BookingArchive', @value = 1;
+
+            DELETE P
+            FROM PAYMENT P
+            INNER JOIN #Move M ON M.BookingID = P.BookingID;
+
+            DELETE B
+            FROM BOOKING B
+            INNER JOIN #Move M ON M.BookingID = B.BookingID;
+
+            SET @Bookings += @@ROWCOUNT;
+
+            DELETE A
+            FROM BOOKING_AUDIT A
+            INNER JOIN #MoveAudit MA ON MA.AuditID = A.AuditID;
+
+            SET @AuditRows += @@ROWCOUNT;
+
+            EXEC sp_set_session_context @key = N'BookingArchive', @value = 0;
+
+            COMMIT TRANSACTION;
+
+            SET @Months += 1;
+            FETCH NEXT FROM MonthCursor INTO @Month;
+        END
+
+        CLOSE MonthCursor;
+        DEALLOCATE MonthCursor;
+
+        UPDATE ARCHIVE_RUN_LOG
+        SET FinishedAt = GETDATE(),
+            MonthsProcessed = @Months,
+            BookingsMoved = @Bookings,
+            AuditRowsMoved = @AuditRows,
+            Status = 'Succeeded'
+        WHERE RunID = @RunID;
+
+        SELECT RunID, RunType, StartedAt, FinishedAt, Cutoff, MonthsProcessed, BookingsMoved, AuditRowsMoved, Status
+        FROM ARCHIVE_RUN_LOG
+        WHERE RunID = @RunID;
+
+        PRINT 'Archived ' + CAST(@Bookings AS VARCHAR) + ' booking(s) and ' + CAST(@AuditRows AS VARCHAR)
+            + ' audit row(s) from ' + CAST(@Months AS VARCHAR) + ' month(s) before ' + CONVERT(VARCHAR(10), @Cutoff, 23) + '.';
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        EXEC sp_set_session_context @key = N'BookingArchive', @value = 0;
+
+        IF CURSOR_STATUS('local', 'MonthCursor') >= 0
+            CLOSE MonthCursor;
+        IF CURSOR_STATUS('local', 'MonthCursor') >= -1
+            DEALLOCATE MonthCursor;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        -- Months committed before the failure stay archived
+        UPDATE ARCHIVE_RUN_LOG
+        SET FinishedAt = GETDATE(),
+            MonthsProcessed = @Months,
+            BookingsMoved = @Bookings,
+            AuditRowsMoved = @AuditRows,
+            Status = 'Failed',
+            ErrorMessage = @ErrorMessage
+        WHERE RunID = @RunID;
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_ArchiveClosedBookings procedure.';
+GO
+
+-- =============================================
+-- SP: Purge Archive
+-- Purpose: Drops archived months that started more than @RetentionMonths
+--          ago: each month's partitions are switched out to the staging
+--          tables and truncated, then its boundary is merged away.
+-- =============================================
+IF OBJECT_ID('sp_PurgeArchive', 'P') IS NOT NULL
+    DROP PROCEDURE sp_PurgeArchive;
+GO
+
+CREATE PROCEDURE sp_PurgeArchive
+    @RetentionMonths INT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @RunID INT;
+    DECLARE @Now DATETIME = GETDATE();
+    DECLARE @Cutoff DATE;
+    DECLARE @Month DATE;
+    DECLARE @Partition INT;
+    DECLARE @Months INT = 0;
+    DECLARE @Bookings INT = 0;
+    DECLARE @AuditRows INT = 0;
+
+    IF @RetentionMonths IS NULL OR @RetentionMonths < 1
+    BEGIN
+        RAISERROR('Retention must be at least one month.', 16, 1);
+        RETURN;
+    END
+
+    SET @Cutoff = DATEADD(MONTH, -@RetentionMonths, DATEFROMPARTS(YEAR(@Now), MONTH(@Now), 1));
+
+    INSERT INTO ARCHIVE_RUN_LOG (RunType, StartedAt, Cutoff, Status)
+    VALUES ('Purge', @Now, @Cutoff, 'Running');
+    SET @RunID = SCOPE_IDENTITY();
+
+    BEGIN TRY
+        -- Oldest boundary first, so the partition left of it is always empty when merged
+        WHILE 1 = 1
+        BEGIN
+            SET @Month = NULL;
+
+            SELECT TOP 1 @Month = CAST(RV.value AS DATE)
+            FROM sys.partition_range_values RV
+            INNER JOIN sys.partition_functions PF ON PF.function_id = RV.function_id
+            WHERE PF.name = 'PF_ArchiveMonth' AND CAST(RV.value AS DATE) < @Cutoff
+            ORDER BY RV.boundary_id;
+
+            IF @Month IS NULL
+                BREAK;
+
+            SET @Partition = $PARTITION.PF_ArchiveMonth(@Month);
+
+            BEGIN TRANSACTION;
+
+            SELECT @Bookings += COUNT(*) FROM ARCHIVE_BOOKING WHERE $PARTITION.PF_ArchiveMonth(BookingDate) = @Partition;
+            SELECT @AuditRows += COUNT(*) FROM ARCHIVE_BOOKING_AUDIT WHERE $PARTITION.PF_ArchiveMonth(AuditDate) = @Partition;
+
+            ALTER TABLE ARCHIVE_BOOKING SWITCH PARTITION @Partition TO ARCHIVE_STAGE_BOOKING;
+            ALTER TABLE ARCHIVE_TICKET SWITCH PARTITION @Partition TO ARCHIVE_STAGE_TICKET;
+            ALTER TABLE ARCHIVE_SEAT_BOOKING SWITCH PARTITION @Partition TO ARCHIVE_STAGE_SEAT_BOOKING;
+            ALTER TABLE ARCHIVE_BOOKING_SNACK SWITCH PARTITION @Partition TO ARCHIVE_STAGE_BOOKING_SNACK;
+            ALTER TABLE ARCHIVE_PAYMENT SWITCH PARTITION @Partition TO ARCHIVE_STAGE_PAYMENT;
+            ALTER TABLE ARCHIVE_BOOKING_AUDIT SWITCH PARTITION @Partition TO ARCHIVE_STAGE_BOOKING_AUDIT;
+
+            TRUNCATE TABLE ARCHIVE_STAGE_BOOKING;
+            TRUNCATE TABLE ARCHIVE_STAGE_TICKET;
+            TRUNCATE TABLE ARCHIVE_STAGE_SEAT_BOOKING;
+            TRUNCATE TABLE ARCHIVE_STAGE_BOOKING_SNACK;
+            TRUNCATE TABLE ARCHIVE_STAGE_PAYMENT;
+            TRUNCATE TABLE ARCHIVE_STAGE_BOOKING_AUDIT;
+
+            ALTER PARTITION FUNCTION PF_ArchiveMonth() MERGE RANGE (@Month);
+
+            COMMIT TRANSACTION;
+
+            SET @Months += 1;
+        END
+
+        UPDATE ARCHIVE_RUN_LOG
+        SET FinishedAt = GETDATE(),
+            MonthsProcessed = @Months,
+            BookingsMoved = @Bookings,
+            AuditRowsMoved = @AuditRows,
+            Status = 'Succeeded'
+        WHERE RunID = @RunID;
+
+        SELECT RunID, RunType, StartedAt, FinishedAt, Cutoff, MonthsProcessed, BookingsMoved, AuditRowsMoved, Status
+        FROM ARCHIVE_RUN_LOG
+        WHERE RunID = @RunID;
+
+        PRINT 'Purged ' + CAST(@Months AS VARCHAR) + ' archived month(s) before ' + CONVERT(VARCHAR(10), @Cutoff, 23) + '.';
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        UPDATE ARCHIVE_RUN_LOG
+        SET FinishedAt = GETDATE(),
+            MonthsProcessed = @Months,
+            Status = 'Failed',
+            ErrorMessage = @ErrorMessage
+        WHERE RunID = @RunID;
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_PurgeArchive procedure.';
+GO
+
+-- =============================================
+-- SECTION 4: SCHEDULING
+-- =============================================
+-- Monthly sliding-window job with SQL Server Agent (archive at a 12 month
+-- horizon, keep 7 years of archive):
+-- EXEC msdb.dbo.sp_add_job @job_name = N'EventBooking - Archive Window';
+-- EXEC msdb.dbo.sp_add_jobstep @job_name = N'EventBooking - Archive Window',
+--      @step_name = N'Archive', @database_name = N'EventBookingSystem',
+--      @command = N'EXEC sp_ArchiveClosedBookings @HorizonMonths = 12; EXEC sp_PurgeArchive @RetentionMonths = 84;';
+-- EXEC msdb.dbo.sp_add_jobschedule @job_name = N'EventBooking - Archive Window',
+--      @name = N'Monthly', @freq_type = 16, @freq_interval = 1, @active_start_time = 020000;
+-- EXEC msdb.dbo.sp_add_jobserver @job_name = N'EventBooking - Archive Window';
+
+PRINT ''
+PRINT '============================================='
+PRINT 'ARCHIVE SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
@@ -0,0 +1,201 @@
+-- =============================================
+-- Event & Ticket Booking System - AUDIT QUEUE Script
+-- Group 5 - DAMG6210
+-- Queued booking audit with a batch drainer
+-- =============================================
+-- psm_script.sql's trg_Booking_Audit writes straight into BOOKING_AUDIT,
+-- inside the transaction of every booking update or delete, and each row
+-- also maintains the BOOKING_AUDIT lookup indexes (indexes_script.sql).
+-- This script swaps in a queued variant:
+--   - trg_Booking_Audit appends one minimal row per change to
+--     BOOKING_AUDIT_QUEUE, an append-only table with only an identity key,
+--     so bulk status flips (sp_UpdateEventStatus, sp_CancelBooking) hold
+--     their locks for as short a time as possible
+--   - sp_DrainBookingAuditQueue moves queued rows into BOOKING_AUDIT in
+--     batches, in change order, keeping the original change time and user
+-- Run the drainer from SQL Agent or: python GUI/drain_audit.py --interval 10
+-- sp_RefreshReportingTables drains the queue before it reads the audit.
+-- Re-running psm_script.sql restores the synchronous trigger.
+-- Run after psm_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'AUDIT QUEUE SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: QUEUE TABLE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Audit Queue ---'
+GO
+
+-- Keep changes captured by a previous run of this script
+IF OBJECT_ID('sp_DrainBookingAuditQueue', 'P') IS NOT NULL AND OBJECT_ID('BOOKING_AUDIT_QUEUE', 'U') IS NOT NULL
+    EXEC sp_DrainBookingAuditQueue;
+GO
+
+IF OBJECT_ID('BOOKING_AUDIT_QUEUE', 'U') IS NOT NULL
+    DROP TABLE BOOKING_AUDIT_QUEUE;
+GO
+
+CREATE TABLE BOOKING_AUDIT_QUEUE (
+    QueueID BIGINT IDENTITY(1,1) PRIMARY KEY,
+    BookingID INT NOT NULL,
+    OldStatus VARCHAR(20),
+    NewStatus VARCHAR(20),
+    OldTotalAmount DECIMAL(10,2),
+    NewTotalAmount DECIMAL(10,2),
+    ChangeDateTime DATETIME NOT NULL DEFAULT GETDATE(),
+    ChangedBy VARCHAR(100) NOT NULL DEFAULT SYSTEM_USER, -- captured here: the drainer runs as another login
+    ChangeType VARCHAR(20) NOT NULL
+);
+GO
+
+PRINT 'Created BOOKING_AUDIT_QUEUE table.';
+GO
+
+-- =============================================
+-- SECTION 2: QUEUED AUDIT TRIGGER
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Replacing trg_Booking_Audit ---'
+GO
+
+IF OBJECT_ID('trg_Booking_Audit', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Booking_Audit;
+GO
+
+CREATE TRIGGER trg_Booking_Audit
+ON BOOKING
+AFTER UPDATE, DELETE
+AS
+BEGIN
+    IF @@ROWCOUNT = 0
+        RETURN;
+
+    SET NOCOUNT ON;
+
+    -- Moving closed bookings to the archive tier is not a change to the booking
+    IF SESSION_CONTEXT(N'BookingArchive') = 1
+        RETURN;
+
+    INSERT INTO BOOKING_AUDIT_QUEUE (BookingID, OldStatus, NewStatus, OldTotalAmount, NewTotalAmount, ChangeType)
+    SELECT
+        d.BookingID,
+        d.BookingStatus,
+        CASE WHEN i.BookingID IS NULL THEN 'DELETED' ELSE i.BookingStatus END,
+        d.TotalAmount,
+        CASE WHEN i.BookingID IS NULL THEN 0 ELSE i.TotalAmount END,
+        CASE WHEN i.BookingID IS NULL THEN 'DELETE' ELSE 'UPDATE' END
+    FROM deleted d
+    LEFT JOIN inserted i ON d.BookingID = i.BookingID
+    WHERE i.BookingID IS NULL
+       OR d.BookingStatus <> i.BookingStatus
+       OR d.TotalAmount <> i.TotalAmount;
+END;
+GO
+
+PRINT 'Created queued trg_Booking_Audit trigger.';
+GO
+
+-- =============================================
+-- SECTION 3: DRAINER
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 3: Creating Drainer ---'
+GO
+
+-- =============================================
+-- SP: Drain Booking Audit Queue
+-- Purpose: Moves queued audit rows into BOOKING_AUDIT, oldest first, in
+--          batches of @BatchSize. Each batch is one DELETE ... OUTPUT INTO
+--          under an exclusive application lock, so concurrent drainers
+--          cannot interleave and AuditIDs follow commit order (the
+--          reporting refresh uses AuditID as its watermark).
+--          Returns no result set (it also runs inside the reporting refresh);
+--          the count is in @RowsDrained.
+-- =============================================
+IF OBJECT_ID('sp_DrainBookingAuditQueue', 'P') IS NOT NULL
+    DROP PROCEDURE sp_DrainBookingAuditQueue;
+GO
+
+CREATE PROCEDURE sp_DrainBookingAuditQueue
+    @BatchSize INT = 5000,
+    @RowsDrained INT = NULL OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @Moved INT = 1;
+
+    SET @RowsDrained = 0;
+
+    BEGIN TRY
+        WHILE @Moved > 0
+        BEGIN
+            BEGIN TRANSACTION;
+
+            EXEC sp_getapplock @Resource = 'BookingAuditDrain', @LockMode = 'Exclusive', @LockOwner = 'Transaction';
+
+            WITH Batch AS (
+                SELECT TOP (@BatchSize) *
+                FROM BOOKING_AUDIT_QUEUE
+                ORDER BY QueueID
+            )
+            DELETE FROM Batch
+            OUTPUT deleted.BookingID, deleted.OldStatus, deleted.NewStatus, deleted.OldTotalAmount,
+                   deleted.NewTotalAmount, deleted.ChangeDateTime, deleted.ChangedBy, deleted.ChangeType
+            INTO BOOKING_AUDIT (BookingID, OldStatus, NewStatus, OldTotalAmount,
+                                NewTotalAmount, ChangeDateTime, ChangedBy, ChangeType);
+
+            SET @Moved = @@ROWCOUNT;
+            SET @RowsDrained += @Moved;
+
+            COMMIT TRANSACTION;
+        END
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_DrainBookingAuditQueue procedure.';
+GO
+
+-- =============================================
+-- SECTION 4: DRAINER SCHEDULE
+-- =============================================
+-- Run the drainer from the CLI (python GUI/drain_audit.py --interval 10) or SQL Server Agent:
+-- EXEC msdb.dbo.sp_add_job @job_name = N'EventBooking - Drain Audit Queue';
+-- EXEC msdb.dbo.sp_add_jobstep @job_name = N'EventBooking - Drain Audit Queue',
+--      @step_name = N'Drain', @database_name = N'EventBookingSystem',
+--      @command = N'EXEC sp_DrainBookingAuditQueue;';
+-- EXEC msdb.dbo.sp_add_jobschedule @job_name = N'EventBooking - Drain Audit Queue',
+--      @name = N'Every minute', @freq_type = 4, @freq_interval = 1,
+--      @freq_subday_type = 4, @freq_subday_interval = 1;
+-- EXEC msdb.dbo.sp_add_jobserver @job_name = N'EventBooking - Drain Audit Queue';
+
+PRINT ''
+PRINT '============================================='
+PRINT 'AUDIT QUEUE SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
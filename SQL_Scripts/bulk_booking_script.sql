@@ -0,0 +1,329 @@
+-- =============================================
+-- Event & Ticket Booking System - BULK BOOKING Script
+-- Group 5 - DAMG6210
+-- Set-based batch booking alongside sp_CreateBookingWithPayment
+-- =============================================
+-- sp_CreateBookingWithPayment books one customer per call, so group sales and
+-- box-office imports need one round trip (and one seat-conflict check) per
+-- booking. sp_CreateBookingsBulk takes a whole batch as table-valued
+-- parameters, validates it in one set-based pass, inserts BOOKING,
+-- SEAT_BOOKING, TICKET and PAYMENT rows in bulk, and returns one outcome row
+-- per request. Invalid requests are rejected individually; the rest are booked.
+-- Python client: GUI/bulk_booking.py
+-- Run after psm_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'BULK BOOKING SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: TABLE TYPES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Table Types ---'
+GO
+
+IF OBJECT_ID('sp_CreateBookingsBulk', 'P') IS NOT NULL
+    DROP PROCEDURE sp_CreateBookingsBulk;
+GO
+
+IF TYPE_ID('BookingRequestList') IS NOT NULL
+    DROP TYPE BookingRequestList;
+IF TYPE_ID('BookingSeatList') IS NOT NULL
+    DROP TYPE BookingSeatList;
+GO
+
+-- One row per booking request; RequestRowID is chosen by the caller to match outcomes
+CREATE TYPE BookingRequestList AS TABLE (
+    RequestRowID INT NOT NULL PRIMARY KEY,
+    CustomerID INT NOT NULL,
+    ShowID INT NOT NULL,
+    PaymentAmount DECIMAL(10,2) NOT NULL,
+    PaymentType VARCHAR(20) NOT NULL, -- 'Card', 'Wallet', 'PayPal'
+    CardNumber VARCHAR(16) NULL,
+    CardHolderName VARCHAR(100) NULL,
+    WalletType VARCHAR(50) NULL,
+    PayPalEmail VARCHAR(100) NULL
+);
+GO
+
+-- Seats requested by each booking request
+CREATE TYPE BookingSeatList AS TABLE (
+    RequestRowID INT NOT NULL,
+    SeatID INT NOT NULL,
+    PRIMARY KEY (RequestRowID, SeatID)
+);
+GO
+
+PRINT 'Created table types BookingRequestList and BookingSeatList.';
+GO
+
+-- =============================================
+-- SECTION 2: BULK BOOKING PROCEDURE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Bulk Booking Procedure ---'
+GO
+
+-- =============================================
+-- SP: Create Bookings in Bulk
+-- Purpose: Books a batch of (customer, show, seats, payment) requests in one
+--          transaction. Returns RequestRowID, Status ('Booked'/'Rejected'),
+--          BookingID, PaymentID and ErrorMessage for every request.
+--          When two requests in the batch want the same seat, the lower
+--          RequestRowID wins.
+-- =============================================
+CREATE PROCEDURE sp_CreateBookingsBulk
+    @Requests BookingRequestList READONLY,
+    @Seats BookingSeatList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Error handling variables
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @Now DATETIME = GETDATE();
+
+    CREATE TABLE #Outcome (
+        RequestRowID INT PRIMARY KEY,
+        CustomerID INT NOT NULL,
+        EventID INT NULL,
+        ShowID INT NOT NULL,
+        PaymentAmount DECIMAL(10,2) NOT NULL,
+        PaymentType VARCHAR(20) NOT NULL,
+        CardNumber VARCHAR(16) NULL,
+        CardHolderName VARCHAR(100) NULL,
+        WalletType VARCHAR(50) NULL,
+        PayPalEmail VARCHAR(100) NULL,
+        BookingID INT NULL,
+        PaymentID INT NULL,
+        ErrorMessage VARCHAR(200) NULL
+    );
+
+    CREATE TABLE #BookingMap (RequestRowID INT PRIMARY KEY, BookingID INT NOT NULL);
+    CREATE TABLE #PaymentMap (RequestRowID INT PRIMARY KEY, PaymentID INT NOT NULL);
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        INSERT INTO #Outcome (
+            RequestRowID, CustomerID, EventID, ShowID, PaymentAmount, PaymentType,
+            CardNumber, CardHolderName, WalletType, PayPalEmail
+        )
+        SELECT
+            R.RequestRowID, R.CustomerID, SH.EventID, R.ShowID, R.PaymentAmount, R.PaymentType,
+            R.CardNumber, R.CardHolderName, R.WalletType, R.PayPalEmail
+        FROM @Requests R
+        LEFT JOIN SHOW SH ON R.ShowID = SH.ShowID;
+
+        -- Validation: each pass only looks at requests that are still valid
+        UPDATE O SET ErrorMessage = 'Customer does not exist.'
+        FROM #Outcome O
+        WHERE NOT EXISTS (SELECT 1 FROM CUSTOMER C WHERE C.CustomerID = O.CustomerID);
+
+        UPDATE #Outcome SET ErrorMessage = 'Show does not exist.'
+        WHERE ErrorMessage IS NULL AND EventID IS NULL;
+
+        UPDATE #Outcome SET ErrorMessage = 'Payment amount must be greater than zero.'
+        WHERE ErrorMessage IS NULL AND PaymentAmount <= 0;
+
+        UPDATE #Outcome SET ErrorMessage =
+            CASE
+                WHEN PaymentType = 'Card' AND (CardNumber IS NULL OR CardHolderName IS NULL)
+                    THEN 'Card details are required for card payment.'
+                WHEN PaymentType = 'Wallet' AND WalletType IS NULL
+                    THEN 'Wallet type is required for wallet payment.'
+                WHEN PaymentType = 'PayPal' AND PayPalEmail IS NULL
+                    THEN 'PayPal email is required for PayPal payment.'
+                WHEN PaymentType NOT IN ('Card', 'Wallet', 'PayPal')
+                    THEN 'Invalid payment type. Must be Card, Wallet, or PayPal.'
+            END
+        WHERE ErrorMessage IS NULL;
+
+        UPDATE O SET ErrorMessage = 'No seats requested.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND NOT EXISTS (SELECT 1 FROM @Seats S WHERE S.RequestRowID = O.RequestRowID);
+
+        UPDATE O SET ErrorMessage = 'One or more seats are not on the show''s screen.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (
+              SELECT 1
+              FROM @Seats S
+              INNER JOIN SHOW SH ON SH.ShowID = O.ShowID
+              LEFT JOIN SEAT ST ON ST.SeatID = S.SeatID AND ST.ScreenID = SH.ScreenID
+              WHERE S.RequestRowID = O.RequestRowID AND ST.SeatID IS NULL
+          );
+
+        -- Lock the requested (ShowID, SeatID) ranges so concurrent bookings wait for this batch
+        UPDATE O SET ErrorMessage = 'One or more seats are already booked for this show.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (
+              SELECT 1
+              FROM @Seats S
+              INNER JOIN SEAT_BOOKING SB WITH (UPDLOCK, HOLDLOCK)
+                  ON SB.ShowID = O.ShowID AND SB.SeatID = S.SeatID
+              WHERE S.RequestRowID = O.RequestRowID
+          );
+
+        -- Seats held by a buyer at checkout (seat_hold_script.sql) stay reserved until the hold lapses
+        IF OBJECT_ID('SEAT_HOLD', 'U') IS NOT NULL
+            UPDATE O SET ErrorMessage = 'One or more seats are held by another buyer.'
+            FROM #Outcome O
+            WHERE O.ErrorMessage IS NULL
+              AND EXISTS (
+                  SELECT 1
+                  FROM @Seats S
+                  INNER JOIN SEAT_HOLD H WITH (UPDLOCK, HOLDLOCK)
+                      ON H.ShowID = O.ShowID AND H.SeatID = S.SeatID
+                  WHERE S.RequestRowID = O.RequestRowID
+                    AND H.ExpiresAt > SYSUTCDATETIME()
+              );
+
+        -- Seats wanted by more than one valid request in this batch go to the lowest
+        -- RequestRowID: the first claim on each (ShowID, SeatID) is kept, later ones rejected
+        ;WITH SeatClaims AS (
+            SELECT
+                S.RequestRowID,
+                ROW_NUMBER() OVER (PARTITION BY O.ShowID, S.SeatID ORDER BY S.RequestRowID) AS ClaimOrder
+            FROM @Seats S
+            INNER JOIN #Outcome O ON O.RequestRowID = S.RequestRowID
+            WHERE O.ErrorMessage IS NULL
+        )
+        UPDATE O SET ErrorMessage = 'One or more seats are requested by an earlier row in this batch.'
+        FROM #Outcome O
+        WHERE O.RequestRowID IN (SELECT RequestRowID FROM SeatClaims WHERE ClaimOrder > 1);
+
+        -- Create bookings; MERGE exposes the source RequestRowID in OUTPUT
+        MERGE BOOKING AS target
+        USING (SELECT * FROM #Outcome WHERE ErrorMessage IS NULL) AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (CustomerID, EventID, BookingDateTime, TotalAmount, BookingStatus)
+            VALUES (src.CustomerID, src.EventID, @Now, src.PaymentAmount, 'Confirmed')
+        OUTPUT src.RequestRowID, inserted.BookingID INTO #BookingMap (RequestRowID, BookingID);
+
+        UPDATE O SET BookingID = M.BookingID
+        FROM #Outcome O
+        INNER JOIN #BookingMap M ON O.RequestRowID = M.RequestRowID;
+
+        -- Create seat bookings
+        INSERT INTO SEAT_BOOKING (BookingID, SeatID, ShowID)
+        SELECT O.BookingID, S.SeatID, O.ShowID
+        FROM #Outcome O
+        INNER JOIN @Seats S ON S.RequestRowID = O.RequestRowID
+        WHERE O.BookingID IS NOT NULL;
+
+        -- Generate tickets for each seat
+        INSERT INTO TICKET (BookingID, TicketStatus, IssueDate, ValidUntil, QRCode)
+        SELECT
+            O.BookingID,
+            'Active',
+            CAST(@Now AS DATE),
+            DATEADD(DAY, 30, CAST(@Now AS DATE)),
+            'QR' + CAST(O.BookingID AS VARCHAR) + '-' + CAST(S.SeatID AS VARCHAR)
+        FROM #Outcome O
+        INNER JOIN @Seats S ON S.RequestRowID = O.RequestRowID
+        WHERE O.BookingID IS NOT NULL;
+
+        -- Create payments
+        MERGE PAYMENT AS target
+        USING (SELECT * FROM #Outcome WHERE BookingID IS NOT NULL) AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (BookingID, Amount, PaymentDateTime, TransactionReference)
+            VALUES (
+                src.BookingID, src.PaymentAmount, @Now,
+                'TXN-' + FORMAT(@Now, 'yyyyMMddHHmmss') + '-' + CAST(src.BookingID AS VARCHAR)
+            )
+        OUTPUT src.RequestRowID, inserted.PaymentID INTO #PaymentMap (RequestRowID, PaymentID);
+
+        UPDATE O SET PaymentID = M.PaymentID
+        FROM #Outcome O
+        INNER JOIN #PaymentMap M ON O.RequestRowID = M.RequestRowID;
+
+        -- Create specific payment types
+        INSERT INTO CARD_PAYMENT (PaymentID, CardNumber, CardLast4, CardHolderName, ExpiryDate)
+        SELECT PaymentID, CardNumber, RIGHT(CardNumber, 4), CardHolderName, DATEADD(YEAR, 3, @Now)
+        FROM #Outcome
+        WHERE PaymentID IS NOT NULL AND PaymentType = 'Card';
+
+        INSERT INTO WALLET_PAYMENT (PaymentID, WalletType)
+        SELECT PaymentID, WalletType
+        FROM #Outcome
+        WHERE PaymentID IS NOT NULL AND PaymentType = 'Wallet';
+
+        INSERT INTO PAYPAL_PAYMENT (PaymentID, PayPalEmail)
+        SELECT PaymentID, PayPalEmail
+        FROM #Outcome
+        WHERE PaymentID IS NOT NULL AND PaymentType = 'PayPal';
+
+        -- Update customer loyalty points (1 point per dollar spent, per booking)
+        UPDATE C
+        SET LoyaltyPoints = C.LoyaltyPoints + P.Points
+        FROM CUSTOMER C
+        INNER JOIN (
+            SELECT CustomerID, SUM(CAST(PaymentAmount AS INT)) AS Points
+            FROM #Outcome
+            WHERE BookingID IS NOT NULL
+            GROUP BY CustomerID
+        ) AS P ON C.CustomerID = P.CustomerID;
+
+        COMMIT TRANSACTION;
+
+        SELECT
+            RequestRowID,
+            CASE WHEN BookingID IS NOT NULL THEN 'Booked' ELSE 'Rejected' END AS Status,
+            BookingID,
+            PaymentID,
+            ErrorMessage
+        FROM #Outcome
+        ORDER BY RequestRowID;
+
+        PRINT 'Bulk booking completed. Booked: ' + CAST((SELECT COUNT(*) FROM #BookingMap) AS VARCHAR)
+            + ', Rejected: ' + CAST((SELECT COUNT(*) FROM #Outcome WHERE BookingID IS NULL) AS VARCHAR);
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_CreateBookingsBulk procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: EXAMPLE
+-- =============================================
+-- DECLARE @Requests BookingRequestList;
+-- DECLARE @Seats BookingSeatList;
+-- INSERT INTO @Requests (RequestRowID, CustomerID, ShowID, PaymentAmount, PaymentType, WalletType)
+-- VALUES (1, 1, 1, 30.00, 'Wallet', 'Apple Pay'),
+--        (2, 2, 1, 15.00, 'Wallet', 'Google Pay');
+-- INSERT INTO @Seats (RequestRowID, SeatID) VALUES (1, 10), (1, 11), (2, 11);
+-- EXEC sp_CreateBookingsBulk @Requests, @Seats;  -- row 2 is rejected: seat 11 goes to row 1
+
+PRINT ''
+PRINT '============================================='
+PRINT 'BULK BOOKING SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
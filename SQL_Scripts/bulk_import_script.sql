@@ -0,0 +1,470 @@
+-- =============================================
+-- Event & Ticket Booking System - BULK IMPORT Script
+-- Group 5 - DAMG6210
+-- Set-based loading of customer lists and event/show catalogs
+-- =============================================
+-- The GUI adds customers and events one at a time; a new customer takes three
+-- round trips (INSERT USER, INSERT CUSTOMER, UPDATE USER). The import
+-- procedures take a whole batch as a table-valued parameter, validate it in
+-- set-based passes against the same rules as the CHECK, UNIQUE and FOREIGN KEY
+-- constraints, load the valid rows with one statement per table, and return
+-- one outcome row per input row. Invalid rows are rejected individually; the
+-- rest are loaded.
+-- Python client and CSV pipeline: GUI/bulk_import.py
+-- Run after psm_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'BULK IMPORT SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: TABLE TYPES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Table Types ---'
+GO
+
+IF OBJECT_ID('sp_ImportCustomers', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ImportCustomers;
+IF OBJECT_ID('sp_ImportEvents', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ImportEvents;
+IF OBJECT_ID('sp_ImportShows', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ImportShows;
+GO
+
+IF TYPE_ID('CustomerImportList') IS NOT NULL
+    DROP TYPE CustomerImportList;
+IF TYPE_ID('EventImportList') IS NOT NULL
+    DROP TYPE EventImportList;
+IF TYPE_ID('ShowImportList') IS NOT NULL
+    DROP TYPE ShowImportList;
+GO
+
+-- RowNumber is chosen by the caller (the CSV line number) to match outcomes
+CREATE TYPE CustomerImportList AS TABLE (
+    RowNumber INT NOT NULL PRIMARY KEY,
+    FirstName VARCHAR(50) NOT NULL,
+    LastName VARCHAR(50) NOT NULL,
+    Email VARCHAR(100) NOT NULL,
+    PhoneNumber VARCHAR(15) NULL,
+    LoyaltyPoints INT NOT NULL
+);
+GO
+
+CREATE TYPE EventImportList AS TABLE (
+    RowNumber INT NOT NULL PRIMARY KEY,
+    OrganizerID INT NULL,
+    Title VARCHAR(200) NOT NULL,
+    Description VARCHAR(1000) NULL,
+    EventType VARCHAR(50) NOT NULL,
+    Status VARCHAR(20) NOT NULL,
+    Language VARCHAR(30) NULL,
+    StartDateTime DATETIME NOT NULL,
+    EndDateTime DATETIME NOT NULL,
+    Duration INT NULL -- minutes; defaults to EndDateTime - StartDateTime
+);
+GO
+
+CREATE TYPE ShowImportList AS TABLE (
+    RowNumber INT NOT NULL PRIMARY KEY,
+    EventID INT NOT NULL,
+    MovieID INT NULL,
+    ScreenID INT NOT NULL,
+    ShowDateTime DATETIME NOT NULL,
+    ShowType VARCHAR(20) NULL,
+    Price DECIMAL(10,2) NOT NULL
+);
+GO
+
+PRINT 'Created table types CustomerImportList, EventImportList and ShowImportList.';
+GO
+
+-- =============================================
+-- SECTION 2: IMPORT PROCEDURES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Import Procedures ---'
+GO
+
+-- =============================================
+-- SP: Import Customers
+-- Purpose: Creates a USER and CUSTOMER for every valid row in three set-based
+--          statements. Returns RowNumber, Status ('Loaded'/'Rejected'),
+--          CustomerID and ErrorMessage for every row.
+--          When two rows share an email, the lower RowNumber wins.
+-- =============================================
+CREATE PROCEDURE sp_ImportCustomers
+    @Rows CustomerImportList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Error handling variables
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+
+    CREATE TABLE #Outcome (
+        RowNumber INT PRIMARY KEY,
+        FirstName VARCHAR(50) NOT NULL,
+        LastName VARCHAR(50) NOT NULL,
+        Email VARCHAR(100) NOT NULL,
+        PhoneNumber VARCHAR(15) NULL,
+        LoyaltyPoints INT NOT NULL,
+        UserID INT NULL,
+        CustomerID INT NULL,
+        ErrorMessage VARCHAR(200) NULL
+    );
+
+    CREATE TABLE #UserMap (RowNumber INT PRIMARY KEY, UserID INT NOT NULL);
+    CREATE TABLE #CustomerMap (UserID INT PRIMARY KEY, CustomerID INT NOT NULL);
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        INSERT INTO #Outcome (RowNumber, FirstName, LastName, Email, PhoneNumber, LoyaltyPoints)
+        SELECT RowNumber, FirstName, LastName, Email, PhoneNumber, LoyaltyPoints
+        FROM @Rows;
+
+        -- Validation: each pass only looks at rows that are still valid
+        UPDATE #Outcome SET ErrorMessage = 'Email address is not valid.'
+        WHERE Email NOT LIKE '%_@__%.__%'; -- CHK_User_Email
+
+        UPDATE #Outcome SET ErrorMessage = 'Loyalty points cannot be negative.'
+        WHERE ErrorMessage IS NULL AND LoyaltyPoints < 0;
+
+        -- Lock the emails so a concurrent import or sign-up cannot take them before the insert
+        UPDATE O SET ErrorMessage = 'Email is already registered.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (SELECT 1 FROM [USER] U WITH (UPDLOCK, HOLDLOCK) WHERE U.Email = O.Email);
+
+        UPDATE O SET ErrorMessage = 'Email appears on an earlier row of this import.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (
+              SELECT 1 FROM #Outcome O2
+              WHERE O2.Email = O.Email AND O2.RowNumber < O.RowNumber AND O2.ErrorMessage IS NULL
+          );
+
+        -- Create users; MERGE exposes the source RowNumber in OUTPUT
+        MERGE [USER] AS target
+        USING (SELECT * FROM #Outcome WHERE ErrorMessage IS NULL) AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (FirstName, LastName, Email, PhoneNumber, PasswordHash, Role, CustomerID, EmployeeID, OrganizerID)
+            VALUES (src.FirstName, src.LastName, src.Email, src.PhoneNumber, 'TEMP_HASH', 'Customer', NULL, NULL, NULL)
+        OUTPUT src.RowNumber, inserted.UserID INTO #UserMap (RowNumber, UserID);
+
+        UPDATE O SET UserID = M.UserID
+        FROM #Outcome O
+        INNER JOIN #UserMap M ON O.RowNumber = M.RowNumber;
+
+        -- Create customers
+        INSERT INTO CUSTOMER (UserID, LoyaltyPoints)
+        OUTPUT inserted.UserID, inserted.CustomerID INTO #CustomerMap (UserID, CustomerID)
+        SELECT UserID, LoyaltyPoints
+        FROM #Outcome
+        WHERE UserID IS NOT NULL;
+
+        UPDATE O SET CustomerID = M.CustomerID
+        FROM #Outcome O
+        INNER JOIN #CustomerMap M ON O.UserID = M.UserID;
+
+        -- Link users back to their customers
+        UPDATE U SET CustomerID = M.CustomerID
+        FROM [USER] U
+        INNER JOIN #CustomerMap M ON U.UserID = M.UserID;
+
+        COMMIT TRANSACTION;
+
+        SELECT
+            RowNumber,
+            CASE WHEN CustomerID IS NOT NULL THEN 'Loaded' ELSE 'Rejected' END AS Status,
+            CustomerID AS NewID,
+            ErrorMessage
+        FROM #Outcome
+        ORDER BY RowNumber;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_ImportCustomers procedure.';
+GO
+
+-- =============================================
+-- SP: Import Events
+-- Purpose: Inserts every valid event row in one statement. Returns
+--          RowNumber, Status, EventID and ErrorMessage for every row.
+--          An event with the same Title and StartDateTime as an existing one
+--          (or an earlier row) is rejected, so re-running a partly loaded
+--          catalog does not create duplicates.
+-- =============================================
+CREATE PROCEDURE sp_ImportEvents
+    @Rows EventImportList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Error handling variables
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+
+    CREATE TABLE #Outcome (
+        RowNumber INT PRIMARY KEY,
+        OrganizerID INT NULL,
+        Title VARCHAR(200) NOT NULL,
+        Description VARCHAR(1000) NULL,
+        EventType VARCHAR(50) NOT NULL,
+        Status VARCHAR(20) NOT NULL,
+        Language VARCHAR(30) NULL,
+        StartDateTime DATETIME NOT NULL,
+        EndDateTime DATETIME NOT NULL,
+        Duration INT NULL,
+        EventID INT NULL,
+        ErrorMessage VARCHAR(200) NULL
+    );
+
+    CREATE TABLE #EventMap (RowNumber INT PRIMARY KEY, EventID INT NOT NULL);
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        INSERT INTO #Outcome (
+            RowNumber, OrganizerID, Title, Description, EventType, Status, Language,
+            StartDateTime, EndDateTime, Duration
+        )
+        SELECT
+            RowNumber, OrganizerID, Title, Description, EventType, Status, Language,
+            StartDateTime, EndDateTime, ISNULL(Duration, DATEDIFF(MINUTE, StartDateTime, EndDateTime))
+        FROM @Rows;
+
+        -- Validation: each pass only looks at rows that are still valid
+        UPDATE #Outcome SET ErrorMessage = 'Event type must be Movie, Sport, or Exhibition.'
+        WHERE EventType NOT IN ('Movie', 'Sport', 'Exhibition'); -- CHK_Event_Type
+
+        UPDATE #Outcome SET ErrorMessage = 'Status must be Scheduled, Ongoing, Completed, or Cancelled.'
+        WHERE ErrorMessage IS NULL
+          AND Status NOT IN ('Scheduled', 'Ongoing', 'Completed', 'Cancelled'); -- CHK_Event_Status
+
+        UPDATE #Outcome SET ErrorMessage = 'End date/time must be after the start date/time.'
+        WHERE ErrorMessage IS NULL AND EndDateTime <= StartDateTime; -- CHK_Event_DateTime
+
+        UPDATE O SET ErrorMessage = 'Organizer does not exist.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND O.OrganizerID IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM ORGANIZER ORG WHERE ORG.OrganizerID = O.OrganizerID);
+
+        UPDATE O SET ErrorMessage = 'An event with this title and start time already exists.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (
+              SELECT 1 FROM EVENT E WITH (UPDLOCK, HOLDLOCK)
+              WHERE E.StartDateTime = O.StartDateTime AND E.Title = O.Title
+          );
+
+        UPDATE O SET ErrorMessage = 'The same event appears on an earlier row of this import.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (
+              SELECT 1 FROM #Outcome O2
+              WHERE O2.StartDateTime = O.StartDateTime AND O2.Title = O.Title
+                AND O2.RowNumber < O.RowNumber AND O2.ErrorMessage IS NULL
+          );
+
+        -- Create events; MERGE exposes the source RowNumber in OUTPUT
+        MERGE EVENT AS target
+        USING (SELECT * FROM #Outcome WHERE ErrorMessage IS NULL) AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (OrganizerID, Title, Description, EventType, Status, Language, StartDateTime, EndDateTime, Duration)
+            VALUES (src.OrganizerID, src.Title, src.Description, src.EventType, src.Status, src.Language,
+                    src.StartDateTime, src.EndDateTime, src.Duration)
+        OUTPUT src.RowNumber, inserted.EventID INTO #EventMap (RowNumber, EventID);
+
+        UPDATE O SET EventID = M.EventID
+        FROM #Outcome O
+        INNER JOIN #EventMap M ON O.RowNumber = M.RowNumber;
+
+        COMMIT TRANSACTION;
+
+        SELECT
+            RowNumber,
+            CASE WHEN EventID IS NOT NULL THEN 'Loaded' ELSE 'Rejected' END AS Status,
+            EventID AS NewID,
+            ErrorMessage
+        FROM #Outcome
+        ORDER BY RowNumber;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_ImportEvents procedure.';
+GO
+
+-- =============================================
+-- SP: Import Shows
+-- Purpose: Inserts every valid show row in one statement. Returns
+--          RowNumber, Status, ShowID and ErrorMessage for every row.
+--          A screen can only hold one show at a given start time.
+-- =============================================
+CREATE PROCEDURE sp_ImportShows
+    @Rows ShowImportList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Error handling variables
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+
+    CREATE TABLE #Outcome (
+        RowNumber INT PRIMARY KEY,
+        EventID INT NOT NULL,
+        MovieID INT NULL,
+        ScreenID INT NOT NULL,
+        ShowDateTime DATETIME NOT NULL,
+        ShowType VARCHAR(20) NULL,
+        Price DECIMAL(10,2) NOT NULL,
+        ShowID INT NULL,
+        ErrorMessage VARCHAR(200) NULL
+    );
+
+    CREATE TABLE #ShowMap (RowNumber INT PRIMARY KEY, ShowID INT NOT NULL);
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        INSERT INTO #Outcome (RowNumber, EventID, MovieID, ScreenID, ShowDateTime, ShowType, Price)
+        SELECT RowNumber, EventID, MovieID, ScreenID, ShowDateTime, ShowType, Price
+        FROM @Rows;
+
+        -- Validation: each pass only looks at rows that are still valid
+        UPDATE #Outcome SET ErrorMessage = 'Price must be greater than zero.'
+        WHERE Price <= 0; -- CHK_Show_Price
+
+        UPDATE O SET ErrorMessage = 'Event does not exist.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND NOT EXISTS (SELECT 1 FROM EVENT E WHERE E.EventID = O.EventID);
+
+        UPDATE O SET ErrorMessage = 'Event is cancelled.'
+        FROM #Outcome O
+        INNER JOIN EVENT E ON E.EventID = O.EventID
+        WHERE O.ErrorMessage IS NULL AND E.Status = 'Cancelled';
+
+        UPDATE O SET ErrorMessage = 'Movie does not exist for this event.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND O.MovieID IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM MOVIE M WHERE M.MovieID = O.MovieID AND M.EventID = O.EventID);
+
+        UPDATE O SET ErrorMessage = 'Screen does not exist.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND NOT EXISTS (SELECT 1 FROM SCREEN SC WHERE SC.ScreenID = O.ScreenID);
+
+        UPDATE O SET ErrorMessage = 'The screen already has a show at this time.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (
+              SELECT 1 FROM SHOW SH WITH (UPDLOCK, HOLDLOCK)
+              WHERE SH.ShowDateTime = O.ShowDateTime AND SH.ScreenID = O.ScreenID
+          );
+
+        UPDATE O SET ErrorMessage = 'The same screen and time appear on an earlier row of this import.'
+        FROM #Outcome O
+        WHERE O.ErrorMessage IS NULL
+          AND EXISTS (
+              SELECT 1 FROM #Outcome O2
+              WHERE O2.ShowDateTime = O.ShowDateTime AND O2.ScreenID = O.ScreenID
+                AND O2.RowNumber < O.RowNumber AND O2.ErrorMessage IS NULL
+          );
+
+        -- Create shows; MERGE exposes the source RowNumber in OUTPUT
+        MERGE SHOW AS target
+        USING (SELECT * FROM #Outcome WHERE ErrorMessage IS NULL) AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (EventID, MovieID, ScreenID, ShowDateTime, ShowType, Price)
+            VALUES (src.EventID, src.MovieID, src.ScreenID, src.ShowDateTime, src.ShowType, src.Price)
+        OUTPUT src.RowNumber, inserted.ShowID INTO #ShowMap (RowNumber, ShowID);
+
+        UPDATE O SET ShowID = M.ShowID
+        FROM #Outcome O
+        INNER JOIN #ShowMap M ON O.RowNumber = M.RowNumber;
+
+        COMMIT TRANSACTION;
+
+        SELECT
+            RowNumber,
+            CASE WHEN ShowID IS NOT NULL THEN 'Loaded' ELSE 'Rejected' END AS Status,
+            ShowID AS NewID,
+            ErrorMessage
+        FROM #Outcome
+        ORDER BY RowNumber;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_ImportShows procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: EXAMPLE
+-- =============================================
+-- DECLARE @Rows CustomerImportList;
+-- INSERT INTO @Rows (RowNumber, FirstName, LastName, Email, PhoneNumber, LoyaltyPoints)
+-- VALUES (2, 'Ava', 'Stone', 'ava.stone@example.com', '6175550101', 0),
+--        (3, 'Ben', 'Ortiz', 'ben.ortiz@example', NULL, 0),           -- rejected: invalid email
+--        (4, 'Ava', 'Stone', 'ava.stone@example.com', NULL, 10);      -- rejected: same email as row 2
+-- EXEC sp_ImportCustomers @Rows;
+
+PRINT ''
+PRINT '============================================='
+PRINT 'BULK IMPORT SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
@@ -21,6 +21,12 @@ GO
 -- =============================================
 -- DROP ALL TABLES IF EXIST (in reverse dependency order)
 -- =============================================
+IF OBJECT_ID('ARCHIVE_BOOKING_AUDIT', 'U') IS NOT NULL DROP TABLE ARCHIVE_BOOKING_AUDIT;
+IF OBJECT_ID('ARCHIVE_PAYMENT', 'U') IS NOT NULL DROP TABLE ARCHIVE_PAYMENT;
+IF OBJECT_ID('ARCHIVE_BOOKING_SNACK', 'U') IS NOT NULL DROP TABLE ARCHIVE_BOOKING_SNACK;
+IF OBJECT_ID('ARCHIVE_SEAT_BOOKING', 'U') IS NOT NULL DROP TABLE ARCHIVE_SEAT_BOOKING;
+IF OBJECT_ID('ARCHIVE_TICKET', 'U') IS NOT NULL DROP TABLE ARCHIVE_TICKET;
+IF OBJECT_ID('ARCHIVE_BOOKING', 'U') IS NOT NULL DROP TABLE ARCHIVE_BOOKING;
 IF OBJECT_ID('SEAT_BOOKING', 'U') IS NOT NULL DROP TABLE SEAT_BOOKING;
 IF OBJECT_ID('BOOKING_SNACK', 'U') IS NOT NULL DROP TABLE BOOKING_SNACK;
 IF OBJECT_ID('TICKET', 'U') IS NOT NULL DROP TABLE TICKET;
@@ -319,7 +325,8 @@ CREATE TABLE SEAT_BOOKING (
     ShowID INT NOT NULL,
     CONSTRAINT FK_SeatBooking_Booking FOREIGN KEY (BookingID) REFERENCES BOOKING(BookingID) ON DELETE CASCADE,
     CONSTRAINT FK_SeatBooking_Seat FOREIGN KEY (SeatID) REFERENCES SEAT(SeatID),
-    CONSTRAINT FK_SeatBooking_Show FOREIGN KEY (ShowID) REFERENCES SHOW(ShowID)
+    CONSTRAINT FK_SeatBooking_Show FOREIGN KEY (ShowID) REFERENCES SHOW(ShowID),
+    CONSTRAINT UQ_SeatBooking_Show_Seat UNIQUE (ShowID, SeatID)
 );
 
 -- =============================================
@@ -342,6 +349,7 @@ CREATE TABLE CARD_PAYMENT (
     CardID INT IDENTITY(1,1) PRIMARY KEY,
     PaymentID INT NOT NULL UNIQUE,
     CardNumber VARCHAR(16) NOT NULL, -- Will be encrypted
+    CardLast4 CHAR(4) NULL, -- Set on insert, so payment listings can be masked without decrypting
     CardHolderName VARCHAR(100) NOT NULL,
     ExpiryDate DATE,
     CONSTRAINT FK_CardPayment_Payment FOREIGN KEY (PaymentID) REFERENCES PAYMENT(PaymentID) ON DELETE CASCADE
@@ -365,5 +373,109 @@ CREATE TABLE PAYPAL_PAYMENT (
 
 GO
 
+-- =============================================
+-- ARCHIVE TIER (closed bookings past the archive horizon)
+-- =============================================
+-- Filled by sp_ArchiveClosedBookings (archive_script.sql). Each table is
+-- partitioned by booking month and stored as a clustered columnstore; there
+-- are no foreign keys, so archived history never blocks changes to the hot
+-- tables. Read both tiers through the vw_All* views (psm_script.sql).
+
+-- Monthly RANGE RIGHT partitions; boundaries are added by sp_EnsureArchivePartition
+-- as months are archived and removed by sp_PurgeArchive, so every loaded
+-- partition holds exactly one month
+CREATE PARTITION FUNCTION PF_ArchiveMonth (DATE) AS RANGE RIGHT FOR VALUES ();
+GO
+
+CREATE PARTITION SCHEME PS_ArchiveMonth AS PARTITION PF_ArchiveMonth ALL TO ([PRIMARY]);
+GO
+
+-- 27. ARCHIVE_BOOKING
+CREATE TABLE ARCHIVE_BOOKING (
+    BookingDate DATE NOT NULL, -- partitioning column: CAST(BookingDateTime AS DATE)
+    BookingID INT NOT NULL,
+    CustomerID INT NOT NULL,
+    EventID INT NOT NULL,
+    BookingDateTime DATETIME NOT NULL,
+    TotalAmount DECIMAL(10,2) NOT NULL,
+    BookingStatus VARCHAR(20),
+    ArchivedAt DATETIME NOT NULL
+) ON PS_ArchiveMonth(BookingDate);
+
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveBooking ON ARCHIVE_BOOKING ON PS_ArchiveMonth(BookingDate);
+
+-- 28. ARCHIVE_TICKET
+CREATE TABLE ARCHIVE_TICKET (
+    BookingDate DATE NOT NULL,
+    TicketID INT NOT NULL,
+    BookingID INT NOT NULL,
+    TicketStatus VARCHAR(20),
+    IssueDate DATE NOT NULL,
+    ValidUntil DATE,
+    QRCode VARCHAR(255)
+) ON PS_ArchiveMonth(BookingDate);
+
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveTicket ON ARCHIVE_TICKET ON PS_ArchiveMonth(BookingDate);
+
+-- 29. ARCHIVE_SEAT_BOOKING
+CREATE TABLE ARCHIVE_SEAT_BOOKING (
+    BookingDate DATE NOT NULL,
+    SeatBookingID INT NOT NULL,
+    BookingID INT NOT NULL,
+    SeatID INT NOT NULL,
+    ShowID INT NOT NULL
+) ON PS_ArchiveMonth(BookingDate);
+
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveSeatBooking ON ARCHIVE_SEAT_BOOKING ON PS_ArchiveMonth(BookingDate);
+
+-- 30. ARCHIVE_BOOKING_SNACK
+CREATE TABLE ARCHIVE_BOOKING_SNACK (
+    BookingDate DATE NOT NULL,
+    BookingSnackID INT NOT NULL,
+    BookingID INT NOT NULL,
+    SnackID INT NOT NULL,
+    Quantity INT NOT NULL,
+    UnitPrice DECIMAL(10,2) NOT NULL,
+    Subtotal DECIMAL(10,2) NOT NULL,
+    MatchDateTime DATETIME
+) ON PS_ArchiveMonth(BookingDate);
+
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveBookingSnack ON ARCHIVE_BOOKING_SNACK ON PS_ArchiveMonth(BookingDate);
+
+-- 31. ARCHIVE_PAYMENT (payment subtype rows folded in; card numbers are not archived, only the last 4 digits)
+CREATE TABLE ARCHIVE_PAYMENT (
+    BookingDate DATE NOT NULL,
+    PaymentID INT NOT NULL,
+    BookingID INT NOT NULL,
+    Amount DECIMAL(10,2) NOT NULL,
+    PaymentDateTime DATETIME NOT NULL,
+    TransactionReference VARCHAR(100),
+    PaymentType VARCHAR(20), -- 'Card', 'Wallet', 'PayPal'
+    CardHolderName VARCHAR(100),
+    CardLast4 CHAR(4),
+    WalletType VARCHAR(50),
+    PayPalEmail VARCHAR(100)
+) ON PS_ArchiveMonth(BookingDate);
+
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchivePayment ON ARCHIVE_PAYMENT ON PS_ArchiveMonth(BookingDate);
+
+-- 32. ARCHIVE_BOOKING_AUDIT (BOOKING_AUDIT rows by month of change)
+CREATE TABLE ARCHIVE_BOOKING_AUDIT (
+    AuditDate DATE NOT NULL, -- partitioning column: CAST(ChangeDateTime AS DATE)
+    AuditID INT NOT NULL,
+    BookingID INT NOT NULL,
+    OldStatus VARCHAR(20),
+    NewStatus VARCHAR(20),
+    OldTotalAmount DECIMAL(10,2),
+    NewTotalAmount DECIMAL(10,2),
+    ChangeDateTime DATETIME,
+    ChangedBy VARCHAR(100),
+    ChangeType VARCHAR(20)
+) ON PS_ArchiveMonth(AuditDate);
+
+CREATE CLUSTERED COLUMNSTORE INDEX CCI_ArchiveBookingAudit ON ARCHIVE_BOOKING_AUDIT ON PS_ArchiveMonth(AuditDate);
+
+GO
+
 PRINT 'DDL Script execution completed successfully!';
 GO
\ No newline at end of file
@@ -0,0 +1,280 @@
+-- =============================================
+-- Event & Ticket Booking System - DASHBOARD STATS Script
+-- Group 5 - DAMG6210
+-- Incrementally maintained dashboard aggregates
+-- =============================================
+-- The GUI dashboard used to run four COUNT/SUM subqueries over CUSTOMER,
+-- EVENT and BOOKING on every page load. This script keeps those totals in
+-- DASHBOARD_STATS, maintained by AFTER triggers on the three base tables, so
+-- every write path (sp_CreateBookingWithPayment, sp_CancelBooking,
+-- sp_UpdateEventStatus, the GUI's own INSERT/UPDATE/DELETE) applies its
+-- delta in the same transaction. The dashboard read becomes a lookup of a
+-- 16-row table.
+--
+-- The totals are striped over 16 slot rows (chosen by @@SPID) so concurrent
+-- booking transactions do not all queue on a single hot row.
+-- Run after psm_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'DASHBOARD STATS SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: SUMMARY TABLE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating DASHBOARD_STATS Table ---'
+GO
+
+IF OBJECT_ID('DASHBOARD_STATS', 'U') IS NOT NULL
+    DROP TABLE DASHBOARD_STATS;
+GO
+
+CREATE TABLE DASHBOARD_STATS (
+    SlotID TINYINT PRIMARY KEY,
+    TotalCustomers INT NOT NULL DEFAULT 0,
+    UpcomingEvents INT NOT NULL DEFAULT 0,
+    ActiveBookings INT NOT NULL DEFAULT 0,
+    TotalRevenue DECIMAL(18,2) NOT NULL DEFAULT 0,
+    LastUpdated DATETIME NOT NULL DEFAULT GETDATE(),
+    CONSTRAINT CHK_DashboardStats_Slot CHECK (SlotID BETWEEN 0 AND 15)
+);
+GO
+
+-- One row per slot; slot 0 holds the reconciled baseline
+INSERT INTO DASHBOARD_STATS (SlotID)
+SELECT TOP 16 ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) - 1
+FROM sys.all_objects;
+GO
+
+PRINT 'Created DASHBOARD_STATS table with 16 slots.';
+GO
+
+-- =============================================
+-- SECTION 2: RECONCILIATION PROCEDURE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Reconciliation Procedure ---'
+GO
+
+-- =============================================
+-- SP: Reconcile Dashboard Stats
+-- Purpose: Recomputes the totals from the base tables and reports any drift.
+--          Schedule it (e.g. nightly SQL Agent job) to correct drift from
+--          bulk loads that bypass triggers.
+-- =============================================
+IF OBJECT_ID('sp_ReconcileDashboardStats', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ReconcileDashboardStats;
+GO
+
+CREATE PROCEDURE sp_ReconcileDashboardStats
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        -- Block trigger deltas while the baseline is rebuilt
+        DECLARE @Current TABLE (
+            TotalCustomers INT, UpcomingEvents INT, ActiveBookings INT, TotalRevenue DECIMAL(18,2)
+        );
+
+        INSERT INTO @Current
+        SELECT SUM(TotalCustomers), SUM(UpcomingEvents), SUM(ActiveBookings), SUM(TotalRevenue)
+        FROM DASHBOARD_STATS WITH (TABLOCKX, HOLDLOCK);
+
+        DECLARE @Actual TABLE (
+            TotalCustomers INT, UpcomingEvents INT, ActiveBookings INT, TotalRevenue DECIMAL(18,2)
+        );
+
+        INSERT INTO @Actual
+        SELECT
+            (SELECT COUNT(*) FROM CUSTOMER),
+            (SELECT COUNT(*) FROM EVENT WHERE Status = 'Scheduled'),
+            (SELECT COUNT(*) FROM BOOKING WHERE BookingStatus = 'Confirmed'),
+            (SELECT ISNULL(SUM(TotalAmount), 0) FROM vw_AllBookings WHERE BookingStatus IN ('Confirmed', 'Completed'));
+
+        UPDATE DASHBOARD_STATS
+        SET TotalCustomers = CASE WHEN SlotID = 0 THEN A.TotalCustomers ELSE 0 END,
+            UpcomingEvents = CASE WHEN SlotID = 0 THEN A.UpcomingEvents ELSE 0 END,
+            ActiveBookings = CASE WHEN SlotID = 0 THEN A.ActiveBookings ELSE 0 END,
+            TotalRevenue = CASE WHEN SlotID = 0 THEN A.TotalRevenue ELSE 0 END,
+            LastUpdated = GETDATE()
+        FROM @Actual A;
+
+        COMMIT TRANSACTION;
+
+        -- Drift found (0 everywhere means the triggers kept the totals exact)
+        SELECT
+            A.TotalCustomers - ISNULL(C.TotalCustomers, 0) AS CustomerDrift,
+            A.UpcomingEvents - ISNULL(C.UpcomingEvents, 0) AS UpcomingEventDrift,
+            A.ActiveBookings - ISNULL(C.ActiveBookings, 0) AS ActiveBookingDrift,
+            A.TotalRevenue - ISNULL(C.TotalRevenue, 0) AS RevenueDrift
+        FROM @Actual A
+        CROSS JOIN @Current C;
+
+        PRINT 'Dashboard stats reconciled successfully.';
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_ReconcileDashboardStats procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: MAINTENANCE TRIGGERS
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 3: Creating Maintenance Triggers ---'
+GO
+
+-- =============================================
+-- TRIGGER: Customer count
+-- =============================================
+IF OBJECT_ID('trg_Customer_DashboardStats', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Customer_DashboardStats;
+GO
+
+CREATE TRIGGER trg_Customer_DashboardStats
+ON CUSTOMER
+AFTER INSERT, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @Delta INT = (SELECT COUNT(*) FROM inserted) - (SELECT COUNT(*) FROM deleted);
+
+    IF @Delta <> 0
+        UPDATE DASHBOARD_STATS
+        SET TotalCustomers = TotalCustomers + @Delta,
+            LastUpdated = GETDATE()
+        WHERE SlotID = @@SPID % 16;
+END;
+GO
+
+-- =============================================
+-- TRIGGER: Upcoming (Scheduled) event count
+-- =============================================
+IF OBJECT_ID('trg_Event_DashboardStats', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Event_DashboardStats;
+GO
+
+CREATE TRIGGER trg_Event_DashboardStats
+ON EVENT
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @Delta INT =
+        (SELECT COUNT(*) FROM inserted WHERE Status = 'Scheduled')
+      - (SELECT COUNT(*) FROM deleted WHERE Status = 'Scheduled');
+
+    IF @Delta <> 0
+        UPDATE DASHBOARD_STATS
+        SET UpcomingEvents = UpcomingEvents + @Delta,
+            LastUpdated = GETDATE()
+        WHERE SlotID = @@SPID % 16;
+END;
+GO
+
+-- =============================================
+-- TRIGGER: Active bookings and revenue
+-- =============================================
+IF OBJECT_ID('trg_Booking_DashboardStats', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Booking_DashboardStats;
+GO
+
+CREATE TRIGGER trg_Booking_DashboardStats
+ON BOOKING
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @BookingDelta INT;
+    DECLARE @RevenueDelta DECIMAL(18,2);
+
+    -- Bookings moved to the archive tier still count towards revenue
+    IF SESSION_CONTEXT(N'BookingArchive') = 1
+        RETURN;
+
+    SELECT
+        @BookingDelta = ISNULL(SUM(CASE WHEN BookingStatus = 'Confirmed' THEN Sign END), 0),
+        @RevenueDelta = ISNULL(SUM(CASE WHEN BookingStatus IN ('Confirmed', 'Completed') THEN Sign * TotalAmount END), 0)
+    FROM (
+        SELECT BookingStatus, TotalAmount, 1 AS Sign FROM inserted
+        UNION ALL
+        SELECT BookingStatus, TotalAmount, -1 AS Sign FROM deleted
+    ) AS Changes;
+
+    IF @BookingDelta <> 0 OR @RevenueDelta <> 0
+        UPDATE DASHBOARD_STATS
+        SET ActiveBookings = ActiveBookings + @BookingDelta,
+            TotalRevenue = TotalRevenue + @RevenueDelta,
+            LastUpdated = GETDATE()
+        WHERE SlotID = @@SPID % 16;
+END;
+GO
+
+PRINT 'Created dashboard maintenance triggers on CUSTOMER, EVENT and BOOKING.';
+GO
+
+-- =============================================
+-- SECTION 4: INITIAL LOAD AND VERIFICATION
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 4: Initial Load ---'
+GO
+
+EXEC sp_ReconcileDashboardStats;
+GO
+
+PRINT 'Dashboard totals (what the GUI reads):'
+SELECT
+    SUM(TotalCustomers) AS TotalCustomers,
+    SUM(UpcomingEvents) AS UpcomingEvents,
+    SUM(ActiveBookings) AS ActiveBookings,
+    SUM(TotalRevenue) AS TotalRevenue
+FROM DASHBOARD_STATS;
+GO
+
+-- Optional: nightly drift correction with SQL Server Agent
+-- EXEC msdb.dbo.sp_add_job @job_name = N'EventBooking - Reconcile Dashboard Stats';
+-- EXEC msdb.dbo.sp_add_jobstep @job_name = N'EventBooking - Reconcile Dashboard Stats',
+--      @step_name = N'Reconcile', @database_name = N'EventBookingSystem',
+--      @command = N'EXEC sp_ReconcileDashboardStats;';
+-- EXEC msdb.dbo.sp_add_jobschedule @job_name = N'EventBooking - Reconcile Dashboard Stats',
+--      @name = N'Nightly', @freq_type = 4, @freq_interval = 1, @active_start_time = 030000;
+-- EXEC msdb.dbo.sp_add_jobserver @job_name = N'EventBooking - Reconcile Dashboard Stats';
+
+PRINT ''
+PRINT '============================================='
+PRINT 'DASHBOARD STATS SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
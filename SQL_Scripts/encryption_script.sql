@@ -138,6 +138,13 @@ WHERE CardNumberEncrypted IS NULL;
 
 PRINT 'Encrypted ' + CAST(@@ROWCOUNT AS VARCHAR) + ' card numbers in CARD_PAYMENT table.';
 
+-- Store the last 4 digits of cards inserted without them, so masking never decrypts
+UPDATE CARD_PAYMENT
+SET CardLast4 = RIGHT(CONVERT(VARCHAR(16), DecryptByKey(CardNumberEncrypted)), 4)
+WHERE CardLast4 IS NULL AND CardNumberEncrypted IS NOT NULL;
+
+PRINT 'Stored last 4 digits of ' + CAST(@@ROWCOUNT AS VARCHAR) + ' card numbers in CARD_PAYMENT table.';
+
 -- Close the symmetric key
 CLOSE SYMMETRIC KEY EventBookingSymKey;
 
@@ -166,19 +173,25 @@ BEGIN
     SET NOCOUNT ON;
     
     DECLARE @DecryptedPassword VARCHAR(255);
+    DECLARE @KeyOpenedHere BIT = 0;
     
     BEGIN TRY
-        -- Open symmetric key
-        OPEN SYMMETRIC KEY EventBookingSymKey
-        DECRYPTION BY CERTIFICATE EventBookingCert;
+        -- Open symmetric key, unless this connection already holds it open
+        IF NOT EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey' AND database_id = DB_ID())
+        BEGIN
+            OPEN SYMMETRIC KEY EventBookingSymKey
+            DECRYPTION BY CERTIFICATE EventBookingCert;
+            SET @KeyOpenedHere = 1;
+        END
         
         -- Decrypt and compare password
         SELECT @DecryptedPassword = CONVERT(VARCHAR(255), DecryptByKey(PasswordHashEncrypted))
         FROM [USER]
         WHERE Email = @Email;
         
-        -- Close symmetric key
-        CLOSE SYMMETRIC KEY EventBookingSymKey;
+        -- Close symmetric key (a connection's key session stays open)
+        IF @KeyOpenedHere = 1
+            CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         -- Verify password
         IF @DecryptedPassword = @PasswordToVerify
@@ -188,7 +201,7 @@ BEGIN
     END TRY
     BEGIN CATCH
         -- Ensure key is closed on error
-        IF EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
+        IF @KeyOpenedHere = 1 AND EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
             CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         SET @IsValid = 0;
@@ -215,19 +228,34 @@ BEGIN
     SET NOCOUNT ON;
     
     DECLARE @DecryptedCardNumber VARCHAR(16);
+    DECLARE @KeyOpenedHere BIT = 0;
+    
+    -- Cards stored with their last 4 digits need no decryption
+    SET @MaskedCardNumber = NULL;
+    SELECT @MaskedCardNumber = '************' + CardLast4
+    FROM CARD_PAYMENT
+    WHERE CardID = @CardID AND CardLast4 IS NOT NULL;
+    
+    IF @MaskedCardNumber IS NOT NULL
+        RETURN;
     
     BEGIN TRY
-        -- Open symmetric key
-        OPEN SYMMETRIC KEY EventBookingSymKey
-        DECRYPTION BY CERTIFICATE EventBookingCert;
+        -- Open symmetric key, unless this connection already holds it open
+        IF NOT EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey' AND database_id = DB_ID())
+        BEGIN
+            OPEN SYMMETRIC KEY EventBookingSymKey
+            DECRYPTION BY CERTIFICATE EventBookingCert;
+            SET @KeyOpenedHere = 1;
+        END
         
         -- Decrypt card number
         SELECT @DecryptedCardNumber = CONVERT(VARCHAR(16), DecryptByKey(CardNumberEncrypted))
         FROM CARD_PAYMENT
         WHERE CardID = @CardID;
         
-        -- Close symmetric key
-        CLOSE SYMMETRIC KEY EventBookingSymKey;
+        -- Close symmetric key (a connection's key session stays open)
+        IF @KeyOpenedHere = 1
+            CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         -- Return masked card number (show last 4 digits only)
         IF @DecryptedCardNumber IS NOT NULL
@@ -237,7 +265,7 @@ BEGIN
     END TRY
     BEGIN CATCH
         -- Ensure key is closed on error
-        IF EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
+        IF @KeyOpenedHere = 1 AND EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
             CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         SET @MaskedCardNumber = NULL;
@@ -269,17 +297,23 @@ BEGIN
     SET NOCOUNT ON;
     
     DECLARE @EncryptedPassword VARBINARY(256);
+    DECLARE @KeyOpenedHere BIT = 0;
     
     BEGIN TRY
-        -- Open symmetric key
-        OPEN SYMMETRIC KEY EventBookingSymKey
-        DECRYPTION BY CERTIFICATE EventBookingCert;
+        -- Open symmetric key, unless this connection already holds it open
+        IF NOT EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey' AND database_id = DB_ID())
+        BEGIN
+            OPEN SYMMETRIC KEY EventBookingSymKey
+            DECRYPTION BY CERTIFICATE EventBookingCert;
+            SET @KeyOpenedHere = 1;
+        END
         
         -- Encrypt password
         SET @EncryptedPassword = EncryptByKey(Key_GUID('EventBookingSymKey'), @Password);
         
-        -- Close symmetric key
-        CLOSE SYMMETRIC KEY EventBookingSymKey;
+        -- Close symmetric key (a connection's key session stays open)
+        IF @KeyOpenedHere = 1
+            CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         -- Start transaction
         BEGIN TRANSACTION;
@@ -311,7 +345,7 @@ BEGIN
             ROLLBACK TRANSACTION;
         
         -- Ensure key is closed on error
-        IF EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
+        IF @KeyOpenedHere = 1 AND EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
             CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE();
@@ -339,27 +373,34 @@ BEGIN
     SET NOCOUNT ON;
     
     DECLARE @EncryptedCardNumber VARBINARY(256);
+    DECLARE @KeyOpenedHere BIT = 0;
     
     BEGIN TRY
-        -- Open symmetric key
-        OPEN SYMMETRIC KEY EventBookingSymKey
-        DECRYPTION BY CERTIFICATE EventBookingCert;
+        -- Open symmetric key, unless this connection already holds it open
+        IF NOT EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey' AND database_id = DB_ID())
+        BEGIN
+            OPEN SYMMETRIC KEY EventBookingSymKey
+            DECRYPTION BY CERTIFICATE EventBookingCert;
+            SET @KeyOpenedHere = 1;
+        END
         
         -- Encrypt card number
         SET @EncryptedCardNumber = EncryptByKey(Key_GUID('EventBookingSymKey'), @CardNumber);
         
-        -- Close symmetric key
-        CLOSE SYMMETRIC KEY EventBookingSymKey;
+        -- Close symmetric key (a connection's key session stays open)
+        IF @KeyOpenedHere = 1
+            CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         -- Start transaction
         BEGIN TRANSACTION;
         
         -- Insert card payment with encrypted card number
-        INSERT INTO CARD_PAYMENT (PaymentID, CardNumber, CardNumberEncrypted, CardHolderName, ExpiryDate)
+        INSERT INTO CARD_PAYMENT (PaymentID, CardNumber, CardNumberEncrypted, CardLast4, CardHolderName, ExpiryDate)
         VALUES (
             @PaymentID,
             @CardNumber, -- Store plain text temporarily (will be removed later)
             @EncryptedCardNumber,
+            RIGHT(@CardNumber, 4),
             @CardHolderName,
             @ExpiryDate
         );
@@ -376,7 +417,7 @@ BEGIN
             ROLLBACK TRANSACTION;
         
         -- Ensure key is closed on error
-        IF EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
+        IF @KeyOpenedHere = 1 AND EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
             CLOSE SYMMETRIC KEY EventBookingSymKey;
         
         DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE();
@@ -389,11 +430,110 @@ PRINT 'Created sp_AddCardPaymentWithEncryption procedure.';
 GO
 
 -- =============================================
--- SECTION 7: VERIFICATION AND TESTING
+-- SECTION 7: BATCH VERIFICATION AND MASKING
+-- =============================================
+-- Login bursts and payment listings should not pay OPEN SYMMETRIC KEY and a
+-- round trip per row: passwords are verified many per call, reusing a key
+-- session a pooled connection keeps open (GUI/credentials.py), and masked
+-- card numbers come from the CardLast4 column stored on insert.
+
+PRINT ''
+PRINT '--- Section 7: Creating Batch Verification and Masking ---'
+GO
+
+IF OBJECT_ID('sp_VerifyUserPasswordsBatch', 'P') IS NOT NULL
+    DROP PROCEDURE sp_VerifyUserPasswordsBatch;
+GO
+
+IF TYPE_ID('CredentialList') IS NOT NULL
+    DROP TYPE CredentialList;
+GO
+
+-- One row per login attempt; RowID is chosen by the caller to match results
+CREATE TYPE CredentialList AS TABLE (
+    RowID INT NOT NULL PRIMARY KEY,
+    Email VARCHAR(100) NOT NULL,
+    PasswordToVerify VARCHAR(255) NOT NULL
+);
+GO
+
+-- Procedure to verify a batch of passwords with one key open and one decryption pass
+CREATE PROCEDURE sp_VerifyUserPasswordsBatch
+    @Credentials CredentialList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    DECLARE @KeyOpenedHere BIT = 0;
+    
+    BEGIN TRY
+        -- Open symmetric key, unless this connection already holds it open
+        IF NOT EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey' AND database_id = DB_ID())
+        BEGIN
+            OPEN SYMMETRIC KEY EventBookingSymKey
+            DECRYPTION BY CERTIFICATE EventBookingCert;
+            SET @KeyOpenedHere = 1;
+        END
+        
+        -- Unknown emails come back as not valid
+        SELECT 
+            C.RowID,
+            C.Email,
+            CAST(CASE WHEN CONVERT(VARCHAR(255), DecryptByKey(U.PasswordHashEncrypted)) = C.PasswordToVerify
+                      THEN 1 ELSE 0 END AS BIT) AS IsValid
+        FROM @Credentials C
+        LEFT JOIN [USER] U ON U.Email = C.Email;
+        
+        -- Close symmetric key (a connection's key session stays open)
+        IF @KeyOpenedHere = 1
+            CLOSE SYMMETRIC KEY EventBookingSymKey;
+    END TRY
+    BEGIN CATCH
+        -- Ensure key is closed on error
+        IF @KeyOpenedHere = 1 AND EXISTS (SELECT * FROM sys.openkeys WHERE key_name = 'EventBookingSymKey')
+            CLOSE SYMMETRIC KEY EventBookingSymKey;
+        
+        DECLARE @ErrorMessage NVARCHAR(4000) = ERROR_MESSAGE();
+        RAISERROR(@ErrorMessage, 16, 1);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_VerifyUserPasswordsBatch procedure.';
+GO
+
+-- Masked card numbers for a comma-separated list of CardIDs. Rows stored
+-- before CardLast4 existed fall back to DecryptByKeyAutoCert, which needs no
+-- OPEN SYMMETRIC KEY and so can run inside a function.
+IF OBJECT_ID('tvf_MaskedCardNumbersBatch', 'IF') IS NOT NULL
+    DROP FUNCTION tvf_MaskedCardNumbersBatch;
+GO
+
+CREATE FUNCTION tvf_MaskedCardNumbersBatch (@CardIDs VARCHAR(MAX))
+RETURNS TABLE
+AS
+RETURN
+    SELECT 
+        CP.CardID,
+        CP.PaymentID,
+        CP.CardHolderName,
+        '************' + CASE
+            WHEN CP.CardLast4 IS NOT NULL THEN CP.CardLast4
+            ELSE RIGHT(CONVERT(VARCHAR(16), DecryptByKeyAutoCert(CERT_ID('EventBookingCert'), NULL, CP.CardNumberEncrypted)), 4)
+        END AS MaskedCardNumber
+    FROM (SELECT DISTINCT CAST(value AS INT) AS CardID FROM STRING_SPLIT(@CardIDs, ',') WHERE value <> '') AS IDs
+    INNER JOIN CARD_PAYMENT CP ON CP.CardID = IDs.CardID;
+GO
+
+PRINT 'Created tvf_MaskedCardNumbersBatch function.';
+GO
+
+-- =============================================
+-- SECTION 8: VERIFICATION AND TESTING
 -- =============================================
 
 PRINT ''
-PRINT '--- Section 7: Verification ---'
+PRINT '--- Section 8: Verification ---'
 GO
 
 -- Verify encryption setup
@@ -432,11 +572,11 @@ ELSE
 GO
 
 -- =============================================
--- SECTION 8: SAMPLE DECRYPTION QUERIES
+-- SECTION 9: SAMPLE DECRYPTION QUERIES
 -- =============================================
 
 PRINT ''
-PRINT '--- Section 8: Sample Encrypted Data View ---'
+PRINT '--- Section 9: Sample Encrypted Data View ---'
 GO
 
 PRINT 'Encrypted vs Plain Text Comparison (First 5 Users):'
@@ -477,11 +617,11 @@ CLOSE SYMMETRIC KEY EventBookingSymKey;
 GO
 
 -- =============================================
--- SECTION 9: TESTING ENCRYPTION PROCEDURES
+-- SECTION 10: TESTING ENCRYPTION PROCEDURES
 -- =============================================
 
 PRINT ''
-PRINT '--- Section 9: Testing Encryption Procedures ---'
+PRINT '--- Section 10: Testing Encryption Procedures ---'
 GO
 
 -- Test 1: Verify user password
@@ -509,6 +649,19 @@ EXEC sp_GetMaskedCardNumber
 PRINT 'Masked Card Number: ' + ISNULL(@MaskedCard, 'NULL');
 GO
 
+-- Test 2b: Batch verification and masking
+PRINT ''
+PRINT 'Test 2b: Batch Password Verification and Masking'
+DECLARE @Credentials CredentialList;
+INSERT INTO @Credentials (RowID, Email, PasswordToVerify) VALUES
+(1, 'michael.anderson@email.com', 'TEMP_HASH_001'),
+(2, 'michael.anderson@email.com', 'wrong password'),
+(3, 'nobody@email.com', 'TEMP_HASH_001');
+EXEC sp_VerifyUserPasswordsBatch @Credentials = @Credentials;
+
+SELECT CardID, MaskedCardNumber FROM dbo.tvf_MaskedCardNumbersBatch('1,2,3');
+GO
+
 -- Test 3: Create new user with encryption
 PRINT ''
 PRINT 'Test 3: Create New User with Encrypted Password'
@@ -554,7 +707,7 @@ PRINT '- Database Master Key created'
 PRINT '- Certificate created (valid until 2030-12-31)'
 PRINT '- Symmetric Key created (AES-256)'
 PRINT '- 2 columns encrypted (PasswordHash, CardNumber)'
-PRINT '- 4 encryption helper procedures created'
+PRINT '- 5 encryption helper procedures and 1 masking function created'
 PRINT '- All existing data encrypted'
 PRINT '============================================='
 PRINT ''
@@ -0,0 +1,479 @@
+-- =============================================
+-- Event & Ticket Booking System - EVENT TRANSITION Script
+-- Group 5 - DAMG6210
+-- Chunked, resumable event status transitions and a time-driven scheduler
+-- =============================================
+-- sp_UpdateEventStatus cancels or completes every booking and ticket of an
+-- event in one transaction. For a large event that holds thousands of row
+-- locks (escalating to table locks on BOOKING and TICKET) and blocks sales
+-- for every other event until it commits. The transition engine here:
+--   - flips EVENT.Status at once and records an EVENT_STATUS_TRANSITION row
+--   - updates the event's bookings and tickets in BookingID order, in short
+--     transactions of @BatchSize bookings, below the lock escalation
+--     threshold
+--   - commits a checkpoint (LastBookingID) with every batch, so a failed or
+--     interrupted run resumes where it stopped
+-- sp_ScheduleEventTransitions moves Scheduled events whose start has passed
+-- to Ongoing and events whose end has passed to Completed, then runs the
+-- open transitions.
+-- Run it from SQL Agent or the CLI: python GUI/event_transitions.py --schedule
+-- Run after psm_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'EVENT TRANSITION SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: CHECKPOINT TABLE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Checkpoint Table ---'
+GO
+
+IF OBJECT_ID('EVENT_STATUS_TRANSITION', 'U') IS NOT NULL
+    DROP TABLE EVENT_STATUS_TRANSITION;
+GO
+
+CREATE TABLE EVENT_STATUS_TRANSITION (
+    TransitionID INT IDENTITY(1,1) PRIMARY KEY,
+    EventID INT NOT NULL,
+    FromStatus VARCHAR(20) NULL,
+    ToStatus VARCHAR(20) NOT NULL,
+    RequestedAt DATETIME NOT NULL DEFAULT GETDATE(),
+    RequestedBy VARCHAR(100) NOT NULL DEFAULT SYSTEM_USER,
+    FinishedAt DATETIME NULL,
+    LastBookingID INT NOT NULL DEFAULT 0, -- checkpoint: bookings up to this ID are done
+    BatchesRun INT NOT NULL DEFAULT 0,
+    BookingsUpdated INT NOT NULL DEFAULT 0,
+    TicketsUpdated INT NOT NULL DEFAULT 0,
+    Status VARCHAR(20) NOT NULL DEFAULT 'Pending',
+    ErrorMessage NVARCHAR(4000) NULL,
+    CONSTRAINT FK_EventStatusTransition_Event FOREIGN KEY (EventID) REFERENCES EVENT(EventID) ON DELETE CASCADE,
+    CONSTRAINT CHK_EventStatusTransition_ToStatus CHECK (ToStatus IN ('Scheduled', 'Ongoing', 'Completed', 'Cancelled')),
+    CONSTRAINT CHK_EventStatusTransition_Status CHECK (Status IN ('Pending', 'Running', 'Succeeded', 'Failed', 'Superseded'))
+);
+GO
+
+-- At most one unfinished transition per event; also finds the open work for the scheduler
+CREATE UNIQUE NONCLUSTERED INDEX UX_EventStatusTransition_Open
+ON EVENT_STATUS_TRANSITION(EventID)
+INCLUDE (ToStatus, Status)
+WHERE Status IN ('Pending', 'Running', 'Failed');
+GO
+
+PRINT 'Created EVENT_STATUS_TRANSITION table.';
+GO
+
+-- =============================================
+-- SECTION 2: TRANSITION ENGINE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Transition Engine ---'
+GO
+
+-- =============================================
+-- SP: Start Event Transition
+-- Purpose: Sets the event's status and records the booking/ticket work as
+--          a Pending transition. An unfinished transition of the same event
+--          to the same status is reused (resume); one to another status is
+--          marked Superseded.
+-- =============================================
+IF OBJECT_ID('sp_StartEventTransition', 'P') IS NOT NULL
+    DROP PROCEDURE sp_StartEventTransition;
+GO
+
+CREATE PROCEDURE sp_StartEventTransition
+    @EventID INT,
+    @NewStatus VARCHAR(20),
+    @TransitionID INT OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @CurrentStatus VARCHAR(20);
+
+    SET @TransitionID = NULL;
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        SELECT @CurrentStatus = Status
+        FROM EVENT WITH (UPDLOCK)
+        WHERE EventID = @EventID;
+
+        IF @@ROWCOUNT = 0
+        BEGIN
+            RAISERROR('Event does not exist.', 16, 1);
+        END
+
+        IF @NewStatus NOT IN ('Scheduled', 'Ongoing', 'Completed', 'Cancelled')
+        BEGIN
+            RAISERROR('Invalid status. Must be Scheduled, Ongoing, Completed, or Cancelled.', 16, 1);
+        END
+
+        SELECT @TransitionID = TransitionID
+        FROM EVENT_STATUS_TRANSITION
+        WHERE EventID = @EventID
+          AND ToStatus = @NewStatus
+          AND Status IN ('Pending', 'Running', 'Failed');
+
+        IF @TransitionID IS NULL
+        BEGIN
+            UPDATE EVENT_STATUS_TRANSITION
+            SET Status = 'Superseded', FinishedAt = GETDATE()
+            WHERE EventID = @EventID AND Status IN ('Pending', 'Running', 'Failed');
+
+            UPDATE EVENT
+            SET Status = @NewStatus
+            WHERE EventID = @EventID;
+
+            -- Only cancelling and completing touch bookings
+            INSERT INTO EVENT_STATUS_TRANSITION (EventID, FromStatus, ToStatus, Status, FinishedAt)
+            VALUES (
+                @EventID, @CurrentStatus, @NewStatus,
+                CASE WHEN @NewStatus IN ('Cancelled', 'Completed') THEN 'Pending' ELSE 'Succeeded' END,
+                CASE WHEN @NewStatus IN ('Cancelled', 'Completed') THEN NULL ELSE GETDATE() END
+            );
+
+            SET @TransitionID = SCOPE_IDENTITY();
+        END
+
+        COMMIT TRANSACTION;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_StartEventTransition procedure.';
+GO
+
+-- =============================================
+-- SP: Run Event Transition
+-- Purpose: Applies a transition to the event's bookings and tickets in
+--          batches of @BatchSize bookings, one short transaction per batch,
+--          moving the checkpoint forward with each commit. Cancelling sets
+--          Confirmed bookings and their tickets to Cancelled; completing sets
+--          Confirmed bookings to Completed and Active tickets to Used (the
+--          same rules as sp_UpdateEventStatus). @MaxBatches bounds one call;
+--          calling again continues from the checkpoint. Progress is on the
+--          EVENT_STATUS_TRANSITION row; @Status returns its final status.
+-- =============================================
+IF OBJECT_ID('sp_RunEventTransition', 'P') IS NOT NULL
+    DROP PROCEDURE sp_RunEventTransition;
+GO
+
+CREATE PROCEDURE sp_RunEventTransition
+    @TransitionID INT,
+    @BatchSize INT = 1000,
+    @MaxBatches INT = NULL,
+    @Status VARCHAR(20) = NULL OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @EventID INT;
+    DECLARE @ToStatus VARCHAR(20);
+    DECLARE @LastBookingID INT;
+    DECLARE @Bookings INT;
+    DECLARE @Tickets INT;
+    DECLARE @Batches INT = 0;
+    DECLARE @Done BIT = 0;
+
+    IF @BatchSize IS NULL OR @BatchSize < 1
+    BEGIN
+        RAISERROR('Batch size must be at least 1.', 16, 1);
+        RETURN;
+    END
+
+    CREATE TABLE #Batch (BookingID INT PRIMARY KEY);
+
+    BEGIN TRY
+        WHILE @Done = 0 AND (@MaxBatches IS NULL OR @Batches < @MaxBatches)
+        BEGIN
+            BEGIN TRANSACTION;
+
+            -- The checkpoint row lock also keeps a second runner of the same transition out
+            SELECT @EventID = EventID, @ToStatus = ToStatus, @Status = Status, @LastBookingID = LastBookingID
+            FROM EVENT_STATUS_TRANSITION WITH (UPDLOCK, ROWLOCK)
+            WHERE TransitionID = @TransitionID;
+
+            IF @@ROWCOUNT = 0
+            BEGIN
+                RAISERROR('Transition does not exist.', 16, 1);
+            END
+
+            IF @Status NOT IN ('Pending', 'Running', 'Failed')
+            BEGIN
+                -- Finished or superseded meanwhile
+                COMMIT TRANSACTION;
+                BREAK;
+            END
+
+            TRUNCATE TABLE #Batch;
+
+            INSERT INTO #Batch (BookingID)
+            SELECT TOP (@BatchSize) BookingID
+            FROM BOOKING
+            WHERE EventID = @EventID AND BookingID > @LastBookingID
+            ORDER BY BookingID;
+
+            IF @@ROWCOUNT = 0
+            BEGIN
+                UPDATE EVENT_STATUS_TRANSITION
+                SET Status = 'Succeeded', FinishedAt = GETDATE(), ErrorMessage = NULL
+                WHERE TransitionID = @TransitionID;
+
+                SET @Done = 1;
+            END
+            ELSE
+            BEGIN
+                IF @ToStatus = 'Cancelled'
+                BEGIN
+                    UPDATE B WITH (ROWLOCK)
+                    SET B.BookingStatus = 'Cancelled'
+                    FROM BOOKING B
+                    INNER JOIN #Batch X ON X.BookingID = B.BookingID
+                    WHERE B.BookingStatus = 'Confirmed';
+
+                    SET @Bookings = @@ROWCOUNT;
+
+                    UPDATE T WITH (ROWLOCK)
+                    SET T.TicketStatus = 'Cancelled'
+                    FROM TICKET T
+                    INNER JOIN #Batch X ON X.BookingID = T.BookingID
+                    INNER JOIN BOOKING B ON B.BookingID = T.BookingID
+                    WHERE B.BookingStatus = 'Cancelled'
+                      AND (T.TicketStatus IS NULL OR T.TicketStatus <> 'Cancelled');
+
+                    SET @Tickets = @@ROWCOUNT;
+                END
+                ELSE
+                BEGIN
+                    UPDATE B WITH (ROWLOCK)
+                    SET B.BookingStatus = 'Completed'
+                    FROM BOOKING B
+                    INNER JOIN #Batch X ON X.BookingID = B.BookingID
+                    WHERE B.BookingStatus = 'Confirmed';
+
+                    SET @Bookings = @@ROWCOUNT;
+
+                    UPDATE T WITH (ROWLOCK)
+                    SET T.TicketStatus = 'Used'
+                    FROM TICKET T
+                    INNER JOIN #Batch X ON X.BookingID = T.BookingID
+                    WHERE T.TicketStatus = 'Active';
+
+                    SET @Tickets = @@ROWCOUNT;
+                END
+
+                UPDATE EVENT_STATUS_TRANSITION
+                SET Status = 'Running',
+                    LastBookingID = (SELECT MAX(BookingID) FROM #Batch),
+                    BatchesRun = BatchesRun + 1,
+                    BookingsUpdated = BookingsUpdated + @Bookings,
+                    TicketsUpdated = TicketsUpdated + @Tickets,
+                    ErrorMessage = NULL
+                WHERE TransitionID = @TransitionID;
+
+                SET @Batches += 1;
+            END
+
+            COMMIT TRANSACTION;
+        END
+
+        SELECT @Status = Status FROM EVENT_STATUS_TRANSITION WHERE TransitionID = @TransitionID;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        -- Batches committed before the failure stay done; the next run resumes after them
+        UPDATE EVENT_STATUS_TRANSITION
+        SET Status = 'Failed', ErrorMessage = @ErrorMessage
+        WHERE TransitionID = @TransitionID AND Status IN ('Pending', 'Running');
+
+        SET @Status = 'Failed';
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_RunEventTransition procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: SCHEDULER
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 3: Creating Scheduler ---'
+GO
+
+-- =============================================
+-- SP: Schedule Event Transitions
+-- Purpose: Time-driven status changes. Scheduled events whose start has
+--          passed become Ongoing; Scheduled or Ongoing events whose end has
+--          passed become Completed, with one Pending transition each (both
+--          set-based, in one short transaction). Then runs every open
+--          transition, oldest first, giving each at most @MaxBatchesPerEvent
+--          batches per call so one huge event cannot starve the rest.
+-- =============================================
+IF OBJECT_ID('sp_ScheduleEventTransitions', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ScheduleEventTransitions;
+GO
+
+CREATE PROCEDURE sp_ScheduleEventTransitions
+    @BatchSize INT = 1000,
+    @MaxBatchesPerEvent INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @Now DATETIME = GETDATE();
+    DECLARE @Started INT;
+    DECLARE @Completed INT;
+    DECLARE @TransitionID INT;
+    DECLARE @Status VARCHAR(20);
+    DECLARE @Run INT = 0;
+    DECLARE @Finished INT = 0;
+    DECLARE @Failed INT = 0;
+
+    CREATE TABLE #Ended (EventID INT PRIMARY KEY, FromStatus VARCHAR(20));
+    CREATE TABLE #Open (TransitionID INT PRIMARY KEY);
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        -- Completed first, so an event that started and ended since the last run goes straight there
+        UPDATE E
+        SET E.Status = 'Completed'
+        OUTPUT inserted.EventID, deleted.Status INTO #Ended (EventID, FromStatus)
+        FROM EVENT E
+        WHERE E.Status IN ('Scheduled', 'Ongoing') AND E.EndDateTime <= @Now;
+
+        SET @Completed = @@ROWCOUNT;
+
+        UPDATE EVENT_STATUS_TRANSITION
+        SET Status = 'Superseded', FinishedAt = @Now
+        WHERE Status IN ('Pending', 'Running', 'Failed')
+          AND EventID IN (SELECT EventID FROM #Ended);
+
+        INSERT INTO EVENT_STATUS_TRANSITION (EventID, FromStatus, ToStatus, RequestedBy, Status)
+        SELECT EventID, FromStatus, 'Completed', 'scheduler', 'Pending'
+        FROM #Ended;
+
+        UPDATE EVENT
+        SET Status = 'Ongoing'
+        WHERE Status = 'Scheduled' AND StartDateTime <= @Now AND EndDateTime > @Now;
+
+        SET @Started = @@ROWCOUNT;
+
+        COMMIT TRANSACTION;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+        RETURN;
+    END CATCH
+
+    PRINT 'Started ' + CAST(@Started AS VARCHAR) + ' event(s); completed ' + CAST(@Completed AS VARCHAR) + ' event(s).';
+
+    -- Run open transitions (including manual ones and earlier failures); a
+    -- failing event is recorded on its transition row and does not stop the others
+    INSERT INTO #Open (TransitionID)
+    SELECT TransitionID
+    FROM EVENT_STATUS_TRANSITION
+    WHERE Status IN ('Pending', 'Running', 'Failed');
+
+    DECLARE TransitionCursor CURSOR LOCAL FAST_FORWARD FOR
+        SELECT TransitionID FROM #Open ORDER BY TransitionID;
+
+    OPEN TransitionCursor;
+    FETCH NEXT FROM TransitionCursor INTO @TransitionID;
+
+    WHILE @@FETCH_STATUS = 0
+    BEGIN
+        BEGIN TRY
+            EXEC sp_RunEventTransition @TransitionID = @TransitionID, @BatchSize = @BatchSize,
+                 @MaxBatches = @MaxBatchesPerEvent, @Status = @Status OUTPUT;
+
+            SET @Run += 1;
+            IF @Status = 'Succeeded'
+                SET @Finished += 1;
+        END TRY
+        BEGIN CATCH
+            SET @Failed += 1;
+            PRINT 'Transition ' + CAST(@TransitionID AS VARCHAR) + ' failed: ' + ERROR_MESSAGE();
+        END CATCH
+
+        FETCH NEXT FROM TransitionCursor INTO @TransitionID;
+    END
+
+    CLOSE TransitionCursor;
+    DEALLOCATE TransitionCursor;
+
+    SELECT @Started AS EventsStarted, @Completed AS EventsCompleted,
+           @Run + @Failed AS TransitionsRun, @Finished AS TransitionsFinished, @Failed AS TransitionsFailed;
+END;
+GO
+
+PRINT 'Created sp_ScheduleEventTransitions procedure.';
+GO
+
+-- =============================================
+-- SECTION 4: SCHEDULE
+-- =============================================
+-- Run the scheduler from the CLI (python GUI/event_transitions.py --schedule) or SQL Server Agent:
+-- EXEC msdb.dbo.sp_add_job @job_name = N'EventBooking - Event Transitions';
+-- EXEC msdb.dbo.sp_add_jobstep @job_name = N'EventBooking - Event Transitions',
+--      @step_name = N'Schedule', @database_name = N'EventBookingSystem',
+--      @command = N'EXEC sp_ScheduleEventTransitions @MaxBatchesPerEvent = 50;';
+-- EXEC msdb.dbo.sp_add_jobschedule @job_name = N'EventBooking - Event Transitions',
+--      @name = N'Every 5 minutes', @freq_type = 4, @freq_interval = 1,
+--      @freq_subday_type = 4, @freq_subday_interval = 5;
+-- EXEC msdb.dbo.sp_add_jobserver @job_name = N'EventBooking - Event Transitions';
+
+PRINT ''
+PRINT '============================================='
+PRINT 'EVENT TRANSITION SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
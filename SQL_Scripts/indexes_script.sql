@@ -3,6 +3,9 @@
 -- Group 5 - DAMG6210
 -- P5 Submission - Non-Clustered Indexes for Performance Optimization
 -- =============================================
+-- GUI/index_advisor.py checks these against the cached query plans and
+-- proposes covering indexes for the shapes they miss.
+-- =============================================
 
 USE EventBookingSystem;
 GO
@@ -98,23 +101,41 @@ PRINT ''
 PRINT '--- Section 3: Status Column Indexes ---'
 GO
 
--- Index 7: BOOKING.BookingStatus (For filtering by booking status)
-IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Booking_BookingStatus' AND object_id = OBJECT_ID('BOOKING'))
+-- Index 7: BOOKING.BookingStatus + BookingDateTime (Bookings grid filtered by status, newest first)
+-- The clustered BookingID is appended ascending, matching the grid's keyset order.
+-- Replaces IX_Booking_BookingStatus (BookingStatus only), whose every use this index also serves.
+IF EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Booking_BookingStatus' AND object_id = OBJECT_ID('BOOKING'))
 BEGIN
-    CREATE NONCLUSTERED INDEX IX_Booking_BookingStatus
-    ON BOOKING(BookingStatus)
-    INCLUDE (BookingID, CustomerID, EventID, TotalAmount);
-    PRINT 'Created Index: IX_Booking_BookingStatus';
+    DROP INDEX IX_Booking_BookingStatus ON BOOKING;
+    PRINT 'Dropped superseded Index: IX_Booking_BookingStatus';
 END
 GO
 
--- Index 8: EVENT.Status (For filtering events by status)
-IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_Status' AND object_id = OBJECT_ID('EVENT'))
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Booking_Status_DateTime' AND object_id = OBJECT_ID('BOOKING'))
 BEGIN
-    CREATE NONCLUSTERED INDEX IX_Event_Status
-    ON EVENT(Status)
-    INCLUDE (EventID, Title, EventType, StartDateTime);
-    PRINT 'Created Index: IX_Event_Status';
+    CREATE NONCLUSTERED INDEX IX_Booking_Status_DateTime
+    ON BOOKING(BookingStatus, BookingDateTime DESC)
+    INCLUDE (CustomerID, EventID, TotalAmount);
+    PRINT 'Created Index: IX_Booking_Status_DateTime';
+END
+GO
+
+-- Index 8: EVENT.Status + StartDateTime (Events grid filtered by status, latest first)
+-- Covers every grid column, so pages need neither key lookups nor a sort.
+-- Replaces IX_Event_Status (Status only).
+IF EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_Status' AND object_id = OBJECT_ID('EVENT'))
+BEGIN
+    DROP INDEX IX_Event_Status ON EVENT;
+    PRINT 'Dropped superseded Index: IX_Event_Status';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_Status_StartDateTime' AND object_id = OBJECT_ID('EVENT'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Event_Status_StartDateTime
+    ON EVENT(Status, StartDateTime DESC, EventID DESC)
+    INCLUDE (Title, EventType, EndDateTime, Duration, OrganizerID);
+    PRINT 'Created Index: IX_Event_Status_StartDateTime';
 END
 GO
 
@@ -136,13 +157,33 @@ PRINT ''
 PRINT '--- Section 4: Type/Category Indexes ---'
 GO
 
--- Index 10: EVENT.EventType (For filtering by event type)
-IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_EventType' AND object_id = OBJECT_ID('EVENT'))
+-- Index 10: EVENT.EventType + StartDateTime, and EventType + Status + StartDateTime
+-- (Events grid filtered by type alone, or by type and status, latest first)
+-- Two indexes, because with Status between them a type-only filter could seek on
+-- EventType but would still have to sort every event of that type by start time.
+-- Together they replace IX_Event_EventType (EventType only).
+IF EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_EventType' AND object_id = OBJECT_ID('EVENT'))
+BEGIN
+    DROP INDEX IX_Event_EventType ON EVENT;
+    PRINT 'Dropped superseded Index: IX_Event_EventType';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_Type_StartDateTime' AND object_id = OBJECT_ID('EVENT'))
 BEGIN
-    CREATE NONCLUSTERED INDEX IX_Event_EventType
-    ON EVENT(EventType)
-    INCLUDE (EventID, Title, StartDateTime, Status);
-    PRINT 'Created Index: IX_Event_EventType';
+    CREATE NONCLUSTERED INDEX IX_Event_Type_StartDateTime
+    ON EVENT(EventType, StartDateTime DESC, EventID DESC)
+    INCLUDE (Title, Status, EndDateTime, Duration, OrganizerID);
+    PRINT 'Created Index: IX_Event_Type_StartDateTime';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_Type_Status_StartDateTime' AND object_id = OBJECT_ID('EVENT'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Event_Type_Status_StartDateTime
+    ON EVENT(EventType, Status, StartDateTime DESC, EventID DESC)
+    INCLUDE (Title, EndDateTime, Duration, OrganizerID);
+    PRINT 'Created Index: IX_Event_Type_Status_StartDateTime';
 END
 GO
 
@@ -271,7 +312,73 @@ END
 GO
 
 -- =============================================
--- SECTION 8: VERIFY ALL INDEXES CREATED
+-- SECTION 8: INDEXES FOR TYPEAHEAD LOOKUPS
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 8: Typeahead Lookup Indexes ---'
+GO
+
+-- Index 21: USER.LastName + FirstName (Customer/booking search by last name prefix)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_User_LastName_FirstName' AND object_id = OBJECT_ID('[USER]'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_User_LastName_FirstName
+    ON [USER](LastName, FirstName)
+    INCLUDE (Email, CustomerID);
+    PRINT 'Created Index: IX_User_LastName_FirstName';
+END
+GO
+
+-- Index 22: USER.FirstName (Customer search by first name prefix)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_User_FirstName' AND object_id = OBJECT_ID('[USER]'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_User_FirstName
+    ON [USER](FirstName)
+    INCLUDE (LastName, Email, CustomerID);
+    PRINT 'Created Index: IX_User_FirstName';
+END
+GO
+
+-- Index 23: EVENT.Title (Event search by title prefix)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Event_Title' AND object_id = OBJECT_ID('EVENT'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Event_Title
+    ON EVENT(Title)
+    INCLUDE (StartDateTime);
+    PRINT 'Created Index: IX_Event_Title';
+END
+GO
+
+-- =============================================
+-- SECTION 9: INDEXES FOR AUDIT LOOKUPS
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 9: Audit Lookup Indexes ---'
+GO
+
+-- Index 24: BOOKING_AUDIT.BookingID + ChangeDateTime (History of one booking)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_BookingAudit_BookingID' AND object_id = OBJECT_ID('BOOKING_AUDIT'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_BookingAudit_BookingID
+    ON BOOKING_AUDIT(BookingID, ChangeDateTime)
+    INCLUDE (OldStatus, NewStatus, OldTotalAmount, NewTotalAmount, ChangedBy, ChangeType);
+    PRINT 'Created Index: IX_BookingAudit_BookingID';
+END
+GO
+
+-- Index 25: BOOKING_AUDIT.ChangeDateTime (Changes in a time window)
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_BookingAudit_ChangeDateTime' AND object_id = OBJECT_ID('BOOKING_AUDIT'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_BookingAudit_ChangeDateTime
+    ON BOOKING_AUDIT(ChangeDateTime)
+    INCLUDE (BookingID, OldStatus, NewStatus, ChangeType);
+    PRINT 'Created Index: IX_BookingAudit_ChangeDateTime';
+END
+GO
+
+-- =============================================
+-- SECTION 10: VERIFY ALL INDEXES CREATED
 -- =============================================
 
 PRINT ''
@@ -305,14 +412,15 @@ WHERE i.object_id IN (
     OBJECT_ID('BOOKING'), OBJECT_ID('SEAT_BOOKING'), OBJECT_ID('EVENT'),
     OBJECT_ID('SHOW'), OBJECT_ID('TICKET'), OBJECT_ID('PAYMENT'),
     OBJECT_ID('SEAT'), OBJECT_ID('[USER]'), OBJECT_ID('CUSTOMER'),
-    OBJECT_ID('EMPLOYEE'), OBJECT_ID('BOOKING_SNACK'), OBJECT_ID('SCREEN')
+    OBJECT_ID('EMPLOYEE'), OBJECT_ID('BOOKING_SNACK'), OBJECT_ID('SCREEN'),
+    OBJECT_ID('BOOKING_AUDIT')
 )
 AND i.type_desc = 'NONCLUSTERED'
 AND i.name LIKE 'IX_%'
 ORDER BY TableName, IndexName;
 
 PRINT ''
-PRINT 'Total Non-Clustered Indexes Created: 20'
+PRINT 'Total Non-Clustered Indexes Created: 26'
 PRINT '============================================='
 GO
 
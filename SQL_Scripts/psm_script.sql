@@ -73,6 +73,21 @@ BEGIN
             RAISERROR('One or more seats are already booked for this show.', 16, 1);
         END
         
+        -- Check if seats are held by a buyer at checkout (seat_hold_script.sql); the hold
+        -- reserves them until it lapses. sp_ConfirmHeldSeats removes its own hold first.
+        IF OBJECT_ID('SEAT_HOLD', 'U') IS NOT NULL
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM SEAT_HOLD H WITH (UPDLOCK, HOLDLOCK)
+                WHERE H.ShowID = @ShowID
+                AND H.SeatID IN (SELECT value FROM STRING_SPLIT(@SeatIDs, ','))
+                AND H.ExpiresAt > SYSUTCDATETIME()
+            )
+            BEGIN
+                RAISERROR('One or more seats are held by another buyer.', 16, 1);
+            END
+        END
+        
         -- Create booking
         INSERT INTO BOOKING (CustomerID, EventID, BookingDateTime, TotalAmount, BookingStatus)
         VALUES (@CustomerID, @EventID, GETDATE(), @PaymentAmount, 'Confirmed');
@@ -108,8 +123,8 @@ BEGIN
             IF @CardNumber IS NULL OR @CardHolderName IS NULL
                 RAISERROR('Card details are required for card payment.', 16, 1);
                 
-            INSERT INTO CARD_PAYMENT (PaymentID, CardNumber, CardHolderName, ExpiryDate)
-            VALUES (@PaymentID, @CardNumber, @CardHolderName, DATEADD(YEAR, 3, GETDATE()));
+            INSERT INTO CARD_PAYMENT (PaymentID, CardNumber, CardLast4, CardHolderName, ExpiryDate)
+            VALUES (@PaymentID, @CardNumber, RIGHT(@CardNumber, 4), @CardHolderName, DATEADD(YEAR, 3, GETDATE()));
         END
         ELSE IF @PaymentType = 'Wallet'
         BEGIN
@@ -335,6 +350,8 @@ GO
 -- =============================================
 -- SP4: Update Event Status
 -- Purpose: Updates event status and cascades changes to related shows and bookings
+--          (one transaction; for large events use sp_StartEventTransition and
+--          sp_RunEventTransition from event_transition_script.sql)
 -- =============================================
 IF OBJECT_ID('sp_UpdateEventStatus', 'P') IS NOT NULL
     DROP PROCEDURE sp_UpdateEventStatus;
@@ -435,6 +452,8 @@ GO
 -- =============================================
 -- SP5: Generate Revenue Report
 -- Purpose: Generates comprehensive revenue report with transaction management
+--          (@IncludeSummary = 0 returns only the per-event result set, so it
+--          can be captured with INSERT ... EXEC)
 -- =============================================
 IF OBJECT_ID('sp_GenerateRevenueReport', 'P') IS NOT NULL
     DROP PROCEDURE sp_GenerateRevenueReport;
@@ -443,7 +462,8 @@ GO
 CREATE PROCEDURE sp_GenerateRevenueReport
     @StartDate DATETIME,
     @EndDate DATETIME,
-    @EventType VARCHAR(50) = NULL
+    @EventType VARCHAR(50) = NULL,
+    @IncludeSummary BIT = 1
 AS
 BEGIN
     SET NOCOUNT ON;
@@ -465,44 +485,59 @@ BEGIN
             RAISERROR('Invalid event type. Must be Movie, Sport, or Exhibition.', 16, 1);
         END
         
-        -- Generate comprehensive revenue report
+        -- One row per booking in range with its ticket, snack and payment subtotals.
+        -- Aggregating child tables per booking first keeps bookings from being
+        -- multiplied by tickets x snacks x payments in the totals below.
         SELECT 
+            B.BookingID,
+            B.BookingStatus,
+            B.TotalAmount,
+            B.BookingDateTime,
             E.EventType,
-            E.Title AS EventName,
-            COUNT(DISTINCT B.BookingID) AS TotalBookings,
-            COUNT(DISTINCT T.TicketID) AS TotalTickets,
-            SUM(B.TotalAmount) AS TotalRevenue,
-            SUM(BS.Subtotal) AS SnackRevenue,
-            SUM(P.Amount) AS PaymentReceived,
-            AVG(B.TotalAmount) AS AvgBookingAmount,
-            MIN(B.BookingDateTime) AS FirstBooking,
-            MAX(B.BookingDateTime) AS LastBooking
-        FROM EVENT E
-        INNER JOIN BOOKING B ON E.EventID = B.EventID
-        LEFT JOIN TICKET T ON B.BookingID = T.BookingID
-        LEFT JOIN BOOKING_SNACK BS ON B.BookingID = BS.BookingID
-        LEFT JOIN PAYMENT P ON B.BookingID = P.BookingID
+            E.Title,
+            T.TicketCount,
+            BS.SnackRevenue,
+            P.PaymentReceived
+        INTO #ReportBookings
+        FROM vw_AllBookings B
+        INNER JOIN EVENT E ON E.EventID = B.EventID
+        CROSS APPLY (SELECT COUNT(*) AS TicketCount FROM vw_AllTickets WHERE BookingID = B.BookingID) T
+        CROSS APPLY (SELECT SUM(Subtotal) AS SnackRevenue FROM vw_AllBookingSnacks WHERE BookingID = B.BookingID) BS
+        CROSS APPLY (SELECT SUM(Amount) AS PaymentReceived FROM vw_AllPayments WHERE BookingID = B.BookingID) P
         WHERE B.BookingDateTime BETWEEN @StartDate AND @EndDate
-            AND B.BookingStatus IN ('Confirmed', 'Completed')
-            AND (@EventType IS NULL OR E.EventType = @EventType)
-        GROUP BY E.EventType, E.Title
+            AND (@EventType IS NULL OR E.EventType = @EventType);
+        
+        -- Generate comprehensive revenue report
+        SELECT 
+            EventType,
+            Title AS EventName,
+            COUNT(*) AS TotalBookings,
+            SUM(TicketCount) AS TotalTickets,
+            SUM(TotalAmount) AS TotalRevenue,
+            SUM(SnackRevenue) AS SnackRevenue,
+            SUM(PaymentReceived) AS PaymentReceived,
+            AVG(TotalAmount) AS AvgBookingAmount,
+            MIN(BookingDateTime) AS FirstBooking,
+            MAX(BookingDateTime) AS LastBooking
+        FROM #ReportBookings
+        WHERE BookingStatus IN ('Confirmed', 'Completed')
+        GROUP BY EventType, Title
         ORDER BY TotalRevenue DESC;
         
         -- Summary statistics
+        IF @IncludeSummary = 1
         SELECT 
             'Summary' AS ReportType,
-            COUNT(DISTINCT B.BookingID) AS TotalBookings,
-            COUNT(DISTINCT T.TicketID) AS TotalTickets,
-            SUM(B.TotalAmount) AS TotalRevenue,
-            AVG(B.TotalAmount) AS AvgBookingAmount,
-            SUM(CASE WHEN B.BookingStatus = 'Cancelled' THEN 1 ELSE 0 END) AS CancelledBookings,
-            SUM(CASE WHEN B.BookingStatus = 'Confirmed' THEN 1 ELSE 0 END) AS ConfirmedBookings,
-            SUM(CASE WHEN B.BookingStatus = 'Completed' THEN 1 ELSE 0 END) AS CompletedBookings
-        FROM BOOKING B
-        LEFT JOIN TICKET T ON B.BookingID = T.BookingID
-        LEFT JOIN EVENT E ON B.EventID = E.EventID
-        WHERE B.BookingDateTime BETWEEN @StartDate AND @EndDate
-            AND (@EventType IS NULL OR E.EventType = @EventType);
+            COUNT(*) AS TotalBookings,
+            ISNULL(SUM(TicketCount), 0) AS TotalTickets,
+            SUM(TotalAmount) AS TotalRevenue,
+            AVG(TotalAmount) AS AvgBookingAmount,
+            SUM(CASE WHEN BookingStatus = 'Cancelled' THEN 1 ELSE 0 END) AS CancelledBookings,
+            SUM(CASE WHEN BookingStatus = 'Confirmed' THEN 1 ELSE 0 END) AS ConfirmedBookings,
+            SUM(CASE WHEN BookingStatus = 'Completed' THEN 1 ELSE 0 END) AS CompletedBookings
+        FROM #ReportBookings;
+        
+        DROP TABLE #ReportBookings;
         
         PRINT 'Revenue report generated successfully.';
         
@@ -518,12 +553,87 @@ END;
 GO
 
 -- =============================================
--- SECTION 2: USER-DEFINED FUNCTIONS (3 Functions)
+-- SECTION 2: USER-DEFINED FUNCTIONS (3 Scalar Functions + Inline Table-Valued Equivalents)
 -- =============================================
 
+-- =============================================
+-- Hot + archive tier views
+-- Purpose: Every booking, ticket, seat booking, snack line and payment,
+--          whether still in the live tables or moved to the ARCHIVE_*
+--          columnstore tables by sp_ArchiveClosedBookings (archive_script.sql).
+--          Customer lifetime value, event occupancy and the report and Power
+--          BI views read these; booking paths and seat availability keep
+--          using the live tables. Created ahead of the functions, since an
+--          inline function can only be created once the views it reads exist.
+-- =============================================
+IF OBJECT_ID('vw_AllBookings', 'V') IS NOT NULL
+    DROP VIEW vw_AllBookings;
+GO
+
+CREATE VIEW vw_AllBookings
+AS
+SELECT BookingID, CustomerID, EventID, BookingDateTime, TotalAmount, BookingStatus, CAST(0 AS BIT) AS IsArchived
+FROM BOOKING
+UNION ALL
+SELECT BookingID, CustomerID, EventID, BookingDateTime, TotalAmount, BookingStatus, CAST(1 AS BIT)
+FROM ARCHIVE_BOOKING;
+GO
+
+IF OBJECT_ID('vw_AllTickets', 'V') IS NOT NULL
+    DROP VIEW vw_AllTickets;
+GO
+
+CREATE VIEW vw_AllTickets
+AS
+SELECT TicketID, BookingID, TicketStatus, IssueDate, ValidUntil, QRCode
+FROM TICKET
+UNION ALL
+SELECT TicketID, BookingID, TicketStatus, IssueDate, ValidUntil, QRCode
+FROM ARCHIVE_TICKET;
+GO
+
+IF OBJECT_ID('vw_AllSeatBookings', 'V') IS NOT NULL
+    DROP VIEW vw_AllSeatBookings;
+GO
+
+CREATE VIEW vw_AllSeatBookings
+AS
+SELECT SeatBookingID, BookingID, SeatID, ShowID
+FROM SEAT_BOOKING
+UNION ALL
+SELECT SeatBookingID, BookingID, SeatID, ShowID
+FROM ARCHIVE_SEAT_BOOKING;
+GO
+
+IF OBJECT_ID('vw_AllBookingSnacks', 'V') IS NOT NULL
+    DROP VIEW vw_AllBookingSnacks;
+GO
+
+CREATE VIEW vw_AllBookingSnacks
+AS
+SELECT BookingSnackID, BookingID, SnackID, Quantity, UnitPrice, Subtotal, MatchDateTime
+FROM BOOKING_SNACK
+UNION ALL
+SELECT BookingSnackID, BookingID, SnackID, Quantity, UnitPrice, Subtotal, MatchDateTime
+FROM ARCHIVE_BOOKING_SNACK;
+GO
+
+IF OBJECT_ID('vw_AllPayments', 'V') IS NOT NULL
+    DROP VIEW vw_AllPayments;
+GO
+
+CREATE VIEW vw_AllPayments
+AS
+SELECT PaymentID, BookingID, Amount, PaymentDateTime, TransactionReference
+FROM PAYMENT
+UNION ALL
+SELECT PaymentID, BookingID, Amount, PaymentDateTime, TransactionReference
+FROM ARCHIVE_PAYMENT;
+GO
+
 -- =============================================
 -- UDF1: Calculate Customer Lifetime Value
--- Purpose: Calculates total revenue generated by a customer
+-- Purpose: Calculates total revenue generated by a customer, archived bookings included
 -- =============================================
 IF OBJECT_ID('dbo.fn_CalculateCustomerLifetimeValue', 'FN') IS NOT NULL
     DROP FUNCTION dbo.fn_CalculateCustomerLifetimeValue;
@@ -539,7 +649,7 @@ BEGIN
     DECLARE @LifetimeValue DECIMAL(10,2);
     
     SELECT @LifetimeValue = ISNULL(SUM(TotalAmount), 0)
-    FROM BOOKING
+    FROM vw_AllBookings
     WHERE CustomerID = @CustomerID 
         AND BookingStatus IN ('Confirmed', 'Completed');
     
@@ -590,7 +700,7 @@ GO
 
 -- =============================================
 -- UDF3: Calculate Event Occupancy Rate
--- Purpose: Calculates the occupancy percentage for an event
+-- Purpose: Calculates the occupancy percentage for an event, archived seat bookings included
 -- =============================================
 IF OBJECT_ID('dbo.fn_CalculateEventOccupancy', 'FN') IS NOT NULL
     DROP FUNCTION dbo.fn_CalculateEventOccupancy;
@@ -615,7 +725,7 @@ BEGIN
     
     -- Get total booked seats
     SELECT @BookedSeats = COUNT(*)
-    FROM SEAT_BOOKING SB
+    FROM vw_AllSeatBookings SB
     INNER JOIN SHOW S ON SB.ShowID = S.ShowID
     WHERE S.EventID = @EventID;
     
@@ -630,7 +740,173 @@ END;
 GO
 
 -- =============================================
--- SECTION 3: VIEWS (3 Views for Reporting)
+-- Inline table-valued equivalents of UDF1-UDF3
+-- Purpose: Set-based versions the optimizer expands into the calling query.
+-- Scalar UDFs run once per row and keep plans serial; use these with
+-- CROSS APPLY instead, or the *Batch variants for a list of IDs (comma-
+-- separated, like @SeatIDs) to get every result in one pass.
+-- =============================================
+IF OBJECT_ID('dbo.tvf_CustomerLifetimeValue', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_CustomerLifetimeValue;
+GO
+
+CREATE FUNCTION dbo.tvf_CustomerLifetimeValue
+(
+    @CustomerID INT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT CAST(ISNULL(SUM(TotalAmount), 0) AS DECIMAL(10,2)) AS LifetimeValue
+    FROM vw_AllBookings
+    WHERE CustomerID = @CustomerID 
+        AND BookingStatus IN ('Confirmed', 'Completed');
+GO
+
+IF OBJECT_ID('dbo.tvf_CustomerLifetimeValueBatch', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_CustomerLifetimeValueBatch;
+GO
+
+CREATE FUNCTION dbo.tvf_CustomerLifetimeValueBatch
+(
+    @CustomerIDs VARCHAR(MAX) -- Comma-separated customer IDs
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT 
+        IDs.CustomerID,
+        CAST(ISNULL(SUM(B.TotalAmount), 0) AS DECIMAL(10,2)) AS LifetimeValue
+    FROM (
+        SELECT DISTINCT CAST(LTRIM(RTRIM(value)) AS INT) AS CustomerID
+        FROM STRING_SPLIT(@CustomerIDs, ',')
+        WHERE LTRIM(RTRIM(value)) <> ''
+    ) IDs
+    LEFT JOIN vw_AllBookings B ON B.CustomerID = IDs.CustomerID
+        AND B.BookingStatus IN ('Confirmed', 'Completed')
+    GROUP BY IDs.CustomerID;
+GO
+
+IF OBJECT_ID('dbo.tvf_AvailableSeatsForShow', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_AvailableSeatsForShow;
+GO
+
+CREATE FUNCTION dbo.tvf_AvailableSeatsForShow
+(
+    @ShowID INT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT 
+        (SELECT COUNT(*)
+         FROM SHOW SH
+         INNER JOIN SEAT ST ON ST.ScreenID = SH.ScreenID
+         WHERE SH.ShowID = @ShowID)
+        - (SELECT COUNT(*) FROM SEAT_BOOKING WHERE ShowID = @ShowID) AS AvailableSeats;
+GO
+
+IF OBJECT_ID('dbo.tvf_AvailableSeatsForShowBatch', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_AvailableSeatsForShowBatch;
+GO
+
+CREATE FUNCTION dbo.tvf_AvailableSeatsForShowBatch
+(
+    @ShowIDs VARCHAR(MAX) -- Comma-separated show IDs
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT 
+        IDs.ShowID,
+        ISNULL(ScreenSeats.TotalSeats, 0) - ISNULL(Booked.BookedSeats, 0) AS AvailableSeats
+    FROM (
+        SELECT DISTINCT CAST(LTRIM(RTRIM(value)) AS INT) AS ShowID
+        FROM STRING_SPLIT(@ShowIDs, ',')
+        WHERE LTRIM(RTRIM(value)) <> ''
+    ) IDs
+    LEFT JOIN SHOW SH ON SH.ShowID = IDs.ShowID
+    LEFT JOIN (
+        SELECT ScreenID, COUNT(*) AS TotalSeats
+        FROM SEAT
+        GROUP BY ScreenID
+    ) ScreenSeats ON ScreenSeats.ScreenID = SH.ScreenID
+    LEFT JOIN (
+        SELECT ShowID, COUNT(*) AS BookedSeats
+        FROM SEAT_BOOKING
+        GROUP BY ShowID
+    ) Booked ON Booked.ShowID = IDs.ShowID;
+GO
+
+IF OBJECT_ID('dbo.tvf_EventOccupancy', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_EventOccupancy;
+GO
+
+CREATE FUNCTION dbo.tvf_EventOccupancy
+(
+    @EventID INT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT CAST(
+        CASE WHEN Capacity.TotalCapacity > 0
+             THEN (CAST(Booked.BookedSeats AS DECIMAL(10,2)) / Capacity.TotalCapacity) * 100
+             ELSE 0
+        END AS DECIMAL(5,2)) AS OccupancyRate
+    FROM (
+        SELECT SUM(SC.SeatCapacity) AS TotalCapacity
+        FROM SHOW S
+        INNER JOIN SCREEN SC ON S.ScreenID = SC.ScreenID
+        WHERE S.EventID = @EventID
+    ) Capacity
+    CROSS JOIN (
+        SELECT COUNT(*) AS BookedSeats
+        FROM vw_AllSeatBookings SB
+        INNER JOIN SHOW S ON SB.ShowID = S.ShowID
+        WHERE S.EventID = @EventID
+    ) Booked;
+GO
+
+IF OBJECT_ID('dbo.tvf_EventOccupancyBatch', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_EventOccupancyBatch;
+GO
+
+CREATE FUNCTION dbo.tvf_EventOccupancyBatch
+(
+    @EventIDs VARCHAR(MAX) -- Comma-separated event IDs
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT 
+        IDs.EventID,
+        CAST(
+            CASE WHEN Capacity.TotalCapacity > 0
+                 THEN (CAST(ISNULL(Booked.BookedSeats, 0) AS DECIMAL(10,2)) / Capacity.TotalCapacity) * 100
+                 ELSE 0
+            END AS DECIMAL(5,2)) AS OccupancyRate
+    FROM (
+        SELECT DISTINCT CAST(LTRIM(RTRIM(value)) AS INT) AS EventID
+        FROM STRING_SPLIT(@EventIDs, ',')
+        WHERE LTRIM(RTRIM(value)) <> ''
+    ) IDs
+    LEFT JOIN (
+        SELECT S.EventID, SUM(SC.SeatCapacity) AS TotalCapacity
+        FROM SHOW S
+        INNER JOIN SCREEN SC ON S.ScreenID = SC.ScreenID
+        GROUP BY S.EventID
+    ) Capacity ON Capacity.EventID = IDs.EventID
+    LEFT JOIN (
+        SELECT S.EventID, COUNT(*) AS BookedSeats
+        FROM vw_AllSeatBookings SB
+        INNER JOIN SHOW S ON SB.ShowID = S.ShowID
+        GROUP BY S.EventID
+    ) Booked ON Booked.EventID = IDs.EventID;
+GO
+
+-- =============================================
+-- SECTION 3: VIEWS (4 Views for Reporting)
 -- =============================================
 
 -- =============================================
@@ -643,25 +919,43 @@ GO
 
 CREATE VIEW vw_CustomerBookingSummary
 AS
+-- Tickets are counted per booking and bookings per customer before joining,
+-- so a booking with several tickets is still counted (and summed) once
 SELECT 
     C.CustomerID,
     U.FirstName,
     U.LastName,
     U.Email,
     C.LoyaltyPoints,
-    COUNT(B.BookingID) AS TotalBookings,
-    SUM(CASE WHEN B.BookingStatus = 'Confirmed' THEN 1 ELSE 0 END) AS ActiveBookings,
-    SUM(CASE WHEN B.BookingStatus = 'Completed' THEN 1 ELSE 0 END) AS CompletedBookings,
-    SUM(CASE WHEN B.BookingStatus = 'Cancelled' THEN 1 ELSE 0 END) AS CancelledBookings,
-    SUM(B.TotalAmount) AS TotalSpent,
-    AVG(B.TotalAmount) AS AvgBookingAmount,
-    MAX(B.BookingDateTime) AS LastBookingDate,
-    COUNT(DISTINCT T.TicketID) AS TotalTickets
+    ISNULL(CB.TotalBookings, 0) AS TotalBookings,
+    ISNULL(CB.ActiveBookings, 0) AS ActiveBookings,
+    ISNULL(CB.CompletedBookings, 0) AS CompletedBookings,
+    ISNULL(CB.CancelledBookings, 0) AS CancelledBookings,
+    CB.TotalSpent,
+    CB.AvgBookingAmount,
+    CB.LastBookingDate,
+    ISNULL(CB.TotalTickets, 0) AS TotalTickets
 FROM CUSTOMER C
 INNER JOIN [USER] U ON C.UserID = U.UserID
-LEFT JOIN BOOKING B ON C.CustomerID = B.CustomerID
-LEFT JOIN TICKET T ON B.BookingID = T.BookingID
-GROUP BY C.CustomerID, U.FirstName, U.LastName, U.Email, C.LoyaltyPoints;
+LEFT JOIN (
+    SELECT 
+        B.CustomerID,
+        COUNT(*) AS TotalBookings,
+        SUM(CASE WHEN B.BookingStatus = 'Confirmed' THEN 1 ELSE 0 END) AS ActiveBookings,
+        SUM(CASE WHEN B.BookingStatus = 'Completed' THEN 1 ELSE 0 END) AS CompletedBookings,
+        SUM(CASE WHEN B.BookingStatus = 'Cancelled' THEN 1 ELSE 0 END) AS CancelledBookings,
+        SUM(B.TotalAmount) AS TotalSpent,
+        AVG(B.TotalAmount) AS AvgBookingAmount,
+        MAX(B.BookingDateTime) AS LastBookingDate,
+        SUM(ISNULL(BT.TicketCount, 0)) AS TotalTickets
+    FROM vw_AllBookings B
+    LEFT JOIN (
+        SELECT BookingID, COUNT(*) AS TicketCount
+        FROM vw_AllTickets
+        GROUP BY BookingID
+    ) BT ON BT.BookingID = B.BookingID
+    GROUP BY B.CustomerID
+) CB ON CB.CustomerID = C.CustomerID;
 GO
 
 -- =============================================
@@ -674,6 +968,8 @@ GO
 
 CREATE VIEW vw_EventPerformanceDashboard
 AS
+-- Booking, ticket and show totals are aggregated per event separately and then
+-- joined 1:1, instead of joining bookings x tickets x shows and de-duplicating
 SELECT 
     E.EventID,
     E.Title AS EventName,
@@ -682,19 +978,36 @@ SELECT
     E.StartDateTime,
     E.EndDateTime,
     O.CompanyName AS OrganizerName,
-    COUNT(DISTINCT B.BookingID) AS TotalBookings,
-    COUNT(DISTINCT T.TicketID) AS TicketsSold,
-    SUM(B.TotalAmount) AS TotalRevenue,
-    AVG(B.TotalAmount) AS AvgRevenuePerBooking,
-    COUNT(DISTINCT S.ShowID) AS TotalShows,
-    SUM(CASE WHEN B.BookingStatus = 'Cancelled' THEN B.TotalAmount ELSE 0 END) AS LostRevenue,
-    CAST(COUNT(DISTINCT T.TicketID) AS FLOAT) / NULLIF(COUNT(DISTINCT S.ShowID), 0) AS AvgTicketsPerShow
+    ISNULL(EB.TotalBookings, 0) AS TotalBookings,
+    ISNULL(EB.TicketsSold, 0) AS TicketsSold,
+    EB.TotalRevenue,
+    EB.AvgRevenuePerBooking,
+    ISNULL(ES.TotalShows, 0) AS TotalShows,
+    ISNULL(EB.LostRevenue, 0) AS LostRevenue,
+    CAST(ISNULL(EB.TicketsSold, 0) AS FLOAT) / NULLIF(ES.TotalShows, 0) AS AvgTicketsPerShow
 FROM EVENT E
 LEFT JOIN ORGANIZER O ON E.OrganizerID = O.OrganizerID
-LEFT JOIN BOOKING B ON E.EventID = B.EventID
-LEFT JOIN TICKET T ON B.BookingID = T.BookingID
-LEFT JOIN SHOW S ON E.EventID = S.EventID
-GROUP BY E.EventID, E.Title, E.EventType, E.Status, E.StartDateTime, E.EndDateTime, O.CompanyName;
+LEFT JOIN (
+    SELECT 
+        B.EventID,
+        COUNT(*) AS TotalBookings,
+        SUM(ISNULL(BT.TicketCount, 0)) AS TicketsSold,
+        SUM(B.TotalAmount) AS TotalRevenue,
+        AVG(B.TotalAmount) AS AvgRevenuePerBooking,
+        SUM(CASE WHEN B.BookingStatus = 'Cancelled' THEN B.TotalAmount ELSE 0 END) AS LostRevenue
+    FROM vw_AllBookings B
+    LEFT JOIN (
+        SELECT BookingID, COUNT(*) AS TicketCount
+        FROM vw_AllTickets
+        GROUP BY BookingID
+    ) BT ON BT.BookingID = B.BookingID
+    GROUP BY B.EventID
+) EB ON EB.EventID = E.EventID
+LEFT JOIN (
+    SELECT EventID, COUNT(*) AS TotalShows
+    FROM SHOW
+    GROUP BY EventID
+) ES ON ES.EventID = E.EventID;
 GO
 
 -- =============================================
@@ -727,10 +1040,33 @@ SELECT
 FROM THEATER TH
 INNER JOIN SCREEN SC ON TH.TheaterID = SC.TheaterID
 LEFT JOIN SHOW SH ON SC.ScreenID = SH.ScreenID
-LEFT JOIN SEAT_BOOKING SB ON SH.ShowID = SB.ShowID
+LEFT JOIN vw_AllSeatBookings SB ON SH.ShowID = SB.ShowID
 GROUP BY TH.TheaterID, TH.TheaterName, TH.City, TH.State, SC.ScreenID, SC.ScreenNumber, SC.SeatCapacity;
 GO
 
+-- =============================================
+-- VIEW4: Upcoming Event Occupancy
+-- Purpose: Occupancy of every upcoming event in one set-based query
+-- =============================================
+IF OBJECT_ID('vw_UpcomingEventOccupancy', 'V') IS NOT NULL
+    DROP VIEW vw_UpcomingEventOccupancy;
+GO
+
+CREATE VIEW vw_UpcomingEventOccupancy
+AS
+SELECT 
+    E.EventID,
+    E.Title AS EventName,
+    E.EventType,
+    E.Status AS EventStatus,
+    E.StartDateTime,
+    O.OccupancyRate
+FROM EVENT E
+CROSS APPLY dbo.tvf_EventOccupancy(E.EventID) O
+WHERE E.StartDateTime > GETDATE()
+    AND E.Status <> 'Cancelled';
+GO
+
 
 -- =============================================
 -- Additional Power BI Data Views
@@ -767,12 +1103,12 @@ SELECT
     O.CompanyName AS OrganizerName,
     
     -- Ticket Count
-    (SELECT COUNT(*) FROM TICKET T WHERE T.BookingID = B.BookingID) AS TicketCount,
+    (SELECT COUNT(*) FROM vw_AllTickets T WHERE T.BookingID = B.BookingID) AS TicketCount,
     
     -- Snack Revenue
-    ISNULL((SELECT SUM(Subtotal) FROM BOOKING_SNACK BS WHERE BS.BookingID = B.BookingID), 0) AS SnackRevenue,
-    B.TotalAmount - ISNULL((SELECT SUM(Subtotal) FROM BOOKING_SNACK BS WHERE BS.BookingID = B.BookingID), 0) AS TicketRevenue
-FROM BOOKING B
+    ISNULL((SELECT SUM(Subtotal) FROM vw_AllBookingSnacks BS WHERE BS.BookingID = B.BookingID), 0) AS SnackRevenue,
+    B.TotalAmount - ISNULL((SELECT SUM(Subtotal) FROM vw_AllBookingSnacks BS WHERE BS.BookingID = B.BookingID), 0) AS TicketRevenue
+FROM vw_AllBookings B
 INNER JOIN CUSTOMER C ON B.CustomerID = C.CustomerID
 INNER JOIN [USER] U ON C.UserID = U.UserID
 INNER JOIN EVENT E ON B.EventID = E.EventID
@@ -802,12 +1138,12 @@ SELECT
     M.Rating,
     
     -- Occupancy Metrics
-    (SELECT COUNT(*) FROM SEAT_BOOKING SB WHERE SB.ShowID = SH.ShowID) AS SeatsSold,
+    (SELECT COUNT(*) FROM vw_AllSeatBookings SB WHERE SB.ShowID = SH.ShowID) AS SeatsSold,
     SC.SeatCapacity AS TotalSeats,
-    CAST((SELECT COUNT(*) FROM SEAT_BOOKING SB WHERE SB.ShowID = SH.ShowID) AS FLOAT) / SC.SeatCapacity * 100 AS OccupancyRate,
+    CAST((SELECT COUNT(*) FROM vw_AllSeatBookings SB WHERE SB.ShowID = SH.ShowID) AS FLOAT) / SC.SeatCapacity * 100 AS OccupancyRate,
     
     -- Revenue
-    SH.Price * (SELECT COUNT(*) FROM SEAT_BOOKING SB WHERE SB.ShowID = SH.ShowID) AS ShowRevenue
+    SH.Price * (SELECT COUNT(*) FROM vw_AllSeatBookings SB WHERE SB.ShowID = SH.ShowID) AS ShowRevenue
 FROM THEATER T
 INNER JOIN SCREEN SC ON T.TheaterID = SC.TheaterID
 INNER JOIN SHOW SH ON SC.ScreenID = SH.ScreenID
@@ -850,8 +1186,8 @@ SELECT
     END AS CustomerSegment
 FROM CUSTOMER C
 INNER JOIN [USER] U ON C.UserID = U.UserID
-LEFT JOIN BOOKING B ON C.CustomerID = B.CustomerID
-LEFT JOIN TICKET T ON B.BookingID = T.BookingID
+LEFT JOIN vw_AllBookings B ON C.CustomerID = B.CustomerID
+LEFT JOIN vw_AllTickets T ON B.BookingID = T.BookingID
 GROUP BY C.CustomerID, U.FirstName, U.LastName, U.Email, U.PhoneNumber, C.LoyaltyPoints;
 GO
 
@@ -888,8 +1224,8 @@ SELECT
 FROM EVENT E
 LEFT JOIN MOVIE M ON E.EventID = M.EventID
 LEFT JOIN SPORT S ON E.EventID = S.EventID
-LEFT JOIN BOOKING B ON E.EventID = B.EventID
-LEFT JOIN TICKET T ON B.BookingID = T.BookingID
+LEFT JOIN vw_AllBookings B ON E.EventID = B.EventID
+LEFT JOIN vw_AllTickets T ON B.BookingID = T.BookingID
 LEFT JOIN SHOW SH ON E.EventID = SH.EventID
 GROUP BY E.EventID, E.Title, E.EventType, E.StartDateTime, E.EndDateTime, E.Status, 
          M.Genre, M.Rating, S.SportType, S.TournamentName;
@@ -917,8 +1253,8 @@ SELECT
     
     -- Running Totals (for cumulative charts)
     SUM(SUM(B.TotalAmount)) OVER (ORDER BY CAST(B.BookingDateTime AS DATE)) AS CumulativeRevenue
-FROM BOOKING B
-INNER JOIN TICKET T ON B.BookingID = T.BookingID
+FROM vw_AllBookings B
+INNER JOIN vw_AllTickets T ON B.BookingID = T.BookingID
 INNER JOIN EVENT E ON B.EventID = E.EventID
 WHERE B.BookingStatus IN ('Confirmed', 'Completed')
 GROUP BY CAST(B.BookingDateTime AS DATE), 
@@ -951,7 +1287,7 @@ SELECT
     -- Revenue contribution
     SUM(BS.Subtotal) * 100.0 / SUM(SUM(BS.Subtotal)) OVER () AS RevenueContributionPercent
 FROM SNACK S
-LEFT JOIN BOOKING_SNACK BS ON S.SnackID = BS.SnackID
+LEFT JOIN vw_AllBookingSnacks BS ON S.SnackID = BS.SnackID
 GROUP BY S.SnackID, S.SnackName, S.SnackType, S.Price;
 GO
 
@@ -965,6 +1301,7 @@ PRINT 'Power BI views created successfully!';
 -- =============================================
 -- TRIGGER: Audit Booking Changes
 -- Purpose: Logs all changes to booking status for audit trail
+--          (audit_queue_script.sql swaps in a queued variant drained in batches)
 -- =============================================
 
 -- First, create audit table
@@ -985,6 +1322,20 @@ CREATE TABLE BOOKING_AUDIT (
 );
 GO
 
+-- Live and archived audit rows (ARCHIVE_BOOKING_AUDIT is filled by sp_ArchiveClosedBookings)
+IF OBJECT_ID('vw_AllBookingAudit', 'V') IS NOT NULL
+    DROP VIEW vw_AllBookingAudit;
+GO
+
+CREATE VIEW vw_AllBookingAudit
+AS
+SELECT AuditID, BookingID, OldStatus, NewStatus, OldTotalAmount, NewTotalAmount, ChangeDateTime, ChangedBy, ChangeType
+FROM BOOKING_AUDIT
+UNION ALL
+SELECT AuditID, BookingID, OldStatus, NewStatus, OldTotalAmount, NewTotalAmount, ChangeDateTime, ChangedBy, ChangeType
+FROM ARCHIVE_BOOKING_AUDIT;
+GO
+
 -- Create the trigger
 IF OBJECT_ID('trg_Booking_Audit', 'TR') IS NOT NULL
     DROP TRIGGER trg_Booking_Audit;
@@ -995,38 +1346,30 @@ ON BOOKING
 AFTER UPDATE, DELETE
 AS
 BEGIN
+    IF @@ROWCOUNT = 0
+        RETURN;
+
     SET NOCOUNT ON;
     
-    -- Handle UPDATE operations
-    IF EXISTS (SELECT 1 FROM inserted) AND EXISTS (SELECT 1 FROM deleted)
-    BEGIN
-        INSERT INTO BOOKING_AUDIT (BookingID, OldStatus, NewStatus, OldTotalAmount, NewTotalAmount, ChangeType)
-        SELECT 
-            d.BookingID,
-            d.BookingStatus,
-            i.BookingStatus,
-            d.TotalAmount,
-            i.TotalAmount,
-            'UPDATE'
-        FROM deleted d
-        INNER JOIN inserted i ON d.BookingID = i.BookingID
-        WHERE d.BookingStatus <> i.BookingStatus 
-           OR d.TotalAmount <> i.TotalAmount;
-    END
+    -- Moving closed bookings to the archive tier is not a change to the booking
+    IF SESSION_CONTEXT(N'BookingArchive') = 1
+        RETURN;
     
-    -- Handle DELETE operations
-    IF EXISTS (SELECT 1 FROM deleted) AND NOT EXISTS (SELECT 1 FROM inserted)
-    BEGIN
-        INSERT INTO BOOKING_AUDIT (BookingID, OldStatus, NewStatus, OldTotalAmount, NewTotalAmount, ChangeType)
-        SELECT 
-            d.BookingID,
-            d.BookingStatus,
-            'DELETED',
-            d.TotalAmount,
-            0,
-            'DELETE'
-        FROM deleted d;
-    END
+    -- One set-based pass: deleted rows without an inserted row are DELETEs,
+    -- the rest are UPDATEs that changed the status or the amount
+    INSERT INTO BOOKING_AUDIT (BookingID, OldStatus, NewStatus, OldTotalAmount, NewTotalAmount, ChangeType)
+    SELECT 
+        d.BookingID,
+        d.BookingStatus,
+        CASE WHEN i.BookingID IS NULL THEN 'DELETED' ELSE i.BookingStatus END,
+        d.TotalAmount,
+        CASE WHEN i.BookingID IS NULL THEN 0 ELSE i.TotalAmount END,
+        CASE WHEN i.BookingID IS NULL THEN 'DELETE' ELSE 'UPDATE' END
+    FROM deleted d
+    LEFT JOIN inserted i ON d.BookingID = i.BookingID
+    WHERE i.BookingID IS NULL
+       OR d.BookingStatus <> i.BookingStatus 
+       OR d.TotalAmount <> i.TotalAmount;
 END;
 GO
 
@@ -1039,8 +1382,8 @@ PRINT 'PSM Script Created Successfully!'
 PRINT '============================================='
 PRINT 'Created Objects:'
 PRINT '- 5 Stored Procedures with Transaction Management'
-PRINT '- 3 User-Defined Functions'
-PRINT '- 3 Views for Reporting'
+PRINT '- 3 User-Defined Functions (plus 6 inline table-valued equivalents)'
+PRINT '- 4 Views for Reporting (reading live and archived bookings)'
 PRINT '- 1 DML Trigger for Auditing'
 PRINT '============================================='
 GO
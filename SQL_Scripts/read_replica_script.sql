@@ -0,0 +1,109 @@
+-- =============================================
+-- Event & Ticket Booking System - READ REPLICA Script
+-- Group 5 - DAMG6210
+-- Replication heartbeat used to route reads to read replicas
+-- =============================================
+-- The GUI sends SELECT-only pages (Dashboard, View tabs, Reports) to read
+-- replicas opened with ApplicationIntent=ReadOnly and keeps writes on the
+-- primary. A replica is only used while it is fresh enough:
+--   - the router calls sp_ReplicaHeartbeat on the primary every few seconds,
+--     which stamps REPLICA_HEARTBEAT with the primary's clock
+--   - the row reaches each replica through replication like any other write
+--   - lag = primary stamp - stamp read on the replica, both from the primary's
+--     clock, so clock skew between servers does not matter
+-- A replica without the table (or that cannot be reached) is not used.
+-- Python client: GUI/db_router.py
+-- Run on the primary after create_tables.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'READ REPLICA SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: HEARTBEAT TABLE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating REPLICA_HEARTBEAT Table ---'
+GO
+
+IF OBJECT_ID('REPLICA_HEARTBEAT', 'U') IS NULL
+BEGIN
+    CREATE TABLE REPLICA_HEARTBEAT (
+        HeartbeatID TINYINT NOT NULL DEFAULT 1,
+        UpdatedAt DATETIME2(3) NOT NULL DEFAULT SYSUTCDATETIME(),
+        CONSTRAINT PK_ReplicaHeartbeat PRIMARY KEY CLUSTERED (HeartbeatID),
+        CONSTRAINT CK_ReplicaHeartbeat_SingleRow CHECK (HeartbeatID = 1)
+    );
+    PRINT 'Created REPLICA_HEARTBEAT table.';
+END
+ELSE
+BEGIN
+    PRINT 'REPLICA_HEARTBEAT table already exists.';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM REPLICA_HEARTBEAT)
+    INSERT INTO REPLICA_HEARTBEAT (HeartbeatID, UpdatedAt) VALUES (1, SYSUTCDATETIME());
+GO
+
+-- =============================================
+-- SECTION 2: HEARTBEAT PROCEDURE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Heartbeat Procedure ---'
+GO
+
+-- =============================================
+-- SP: Replica Heartbeat
+-- Purpose: Stamps the heartbeat row with the current UTC time and returns
+--          it. Called on the primary; replicas are compared against the
+--          returned value.
+-- =============================================
+IF OBJECT_ID('sp_ReplicaHeartbeat', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ReplicaHeartbeat;
+GO
+
+CREATE PROCEDURE sp_ReplicaHeartbeat
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    UPDATE REPLICA_HEARTBEAT
+    SET UpdatedAt = SYSUTCDATETIME()
+    OUTPUT INSERTED.UpdatedAt
+    WHERE HeartbeatID = 1;
+END;
+GO
+
+PRINT 'Created sp_ReplicaHeartbeat procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: CONFIGURING REPLICAS
+-- =============================================
+-- Replicas are listed in EVENT_BOOKING_READ_REPLICAS (connection strings
+-- separated by |, see GUI/db_config.py), e.g. the readable secondaries of an
+-- Always On availability group.
+--
+-- Testing with two local instances instead (e.g. two SQL Server containers
+-- on ports 1433 and 1434): restore a backup of EventBookingSystem on the
+-- second instance and point EVENT_BOOKING_READ_REPLICAS at it. Nothing
+-- replicates the heartbeat there, so set it on the stand-in replica to
+-- control its apparent lag:
+--   UPDATE REPLICA_HEARTBEAT SET UpdatedAt = '9999-12-31';  -- always fresh: reads go to it
+--   UPDATE REPLICA_HEARTBEAT SET UpdatedAt = SYSUTCDATETIME();
+--                                      -- fresh now, stale once it falls behind the primary
+-- Stopping the second instance exercises failover to the primary.
+
+PRINT ''
+PRINT '============================================='
+PRINT 'READ REPLICA SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
@@ -0,0 +1,535 @@
+-- =============================================
+-- Event & Ticket Booking System - REPORTING Script
+-- Group 5 - DAMG6210
+-- Pre-aggregated reporting tables with watermark-driven incremental refresh
+-- =============================================
+-- The vw_PowerBI_* views re-aggregate every BOOKING/TICKET/BOOKING_SNACK row
+-- on each query (TimeSeries also runs a window over the whole history).
+-- This script loads the same measures into RPT_* tables partitioned by
+-- booking month and exposes vw_RPT_* views over them for Power BI / the GUI.
+--
+-- sp_RefreshReportingTables only reprocesses the booking days touched since
+-- the last run, found from two watermarks:
+--   - BOOKING.BookingID  (new bookings)
+--   - BOOKING_AUDIT.AuditID (status/amount changes and deletes; when the
+--     queued audit trigger is installed (audit_queue_script.sql), the queue
+--     is drained first so pending changes are seen)
+-- Edits to EVENT attributes (e.g. EventType) are not watermarked; run a full
+-- refresh after bulk event changes.
+-- Bookings are read through the vw_All* views, so days whose bookings were
+-- moved to the archive tier (archive_script.sql) rebuild from the archive.
+-- Run it from SQL Agent or the CLI: python GUI/refresh_reporting.py [--full]
+-- Run after psm_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'REPORTING TABLES SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: PARTITIONING
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Partition Function and Scheme ---'
+GO
+
+-- Monthly partitions on booking date (2020-01 through 2030-12)
+IF NOT EXISTS (SELECT * FROM sys.partition_functions WHERE name = 'PF_ReportingMonth')
+BEGIN
+    DECLARE @Boundaries NVARCHAR(MAX) = N'';
+    DECLARE @Month DATE = '2020-01-01';
+
+    WHILE @Month <= '2030-12-01'
+    BEGIN
+        SET @Boundaries += CASE WHEN @Boundaries = N'' THEN N'' ELSE N', ' END
+                         + N'''' + CONVERT(NVARCHAR(10), @Month, 120) + N'''';
+        SET @Month = DATEADD(MONTH, 1, @Month);
+    END
+
+    EXEC (N'CREATE PARTITION FUNCTION PF_ReportingMonth (DATE) AS RANGE RIGHT FOR VALUES (' + @Boundaries + N')');
+    PRINT 'Created partition function PF_ReportingMonth.';
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.partition_schemes WHERE name = 'PS_ReportingMonth')
+BEGIN
+    CREATE PARTITION SCHEME PS_ReportingMonth
+    AS PARTITION PF_ReportingMonth ALL TO ([PRIMARY]);
+    PRINT 'Created partition scheme PS_ReportingMonth.';
+END
+GO
+
+-- =============================================
+-- SECTION 2: REPORTING TABLES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Reporting Tables ---'
+GO
+
+IF OBJECT_ID('RPT_BOOKING_FACT', 'U') IS NOT NULL DROP TABLE RPT_BOOKING_FACT;
+IF OBJECT_ID('RPT_DAILY_SALES', 'U') IS NOT NULL DROP TABLE RPT_DAILY_SALES;
+IF OBJECT_ID('RPT_DAILY_SNACK_SALES', 'U') IS NOT NULL DROP TABLE RPT_DAILY_SNACK_SALES;
+IF OBJECT_ID('RPT_REFRESH_STATE', 'U') IS NOT NULL DROP TABLE RPT_REFRESH_STATE;
+IF OBJECT_ID('RPT_REFRESH_LOG', 'U') IS NOT NULL DROP TABLE RPT_REFRESH_LOG;
+GO
+
+-- One row per booking with its ticket/snack subtotals (grain of vw_PowerBI_SalesOverview)
+CREATE TABLE RPT_BOOKING_FACT (
+    BookingDate DATE NOT NULL,
+    BookingID INT NOT NULL,
+    BookingDateTime DATETIME NOT NULL,
+    CustomerID INT NOT NULL,
+    EventID INT NOT NULL,
+    EventType VARCHAR(50) NOT NULL,
+    TotalAmount DECIMAL(10,2) NOT NULL,
+    BookingStatus VARCHAR(20),
+    TicketCount INT NOT NULL,
+    SnackRevenue DECIMAL(10,2) NOT NULL,
+    TicketRevenue DECIMAL(10,2) NOT NULL,
+    CONSTRAINT PK_RptBookingFact PRIMARY KEY CLUSTERED (BookingDate, BookingID)
+) ON PS_ReportingMonth(BookingDate);
+GO
+
+CREATE NONCLUSTERED INDEX IX_RptBookingFact_BookingID ON RPT_BOOKING_FACT(BookingID) ON PS_ReportingMonth(BookingDate);
+CREATE NONCLUSTERED INDEX IX_RptBookingFact_CustomerID ON RPT_BOOKING_FACT(CustomerID)
+    INCLUDE (BookingStatus, TotalAmount, TicketCount, BookingDateTime) ON PS_ReportingMonth(BookingDate);
+GO
+
+-- Confirmed/Completed bookings with tickets per day, hour and event type (grain of vw_PowerBI_TimeSeries)
+CREATE TABLE RPT_DAILY_SALES (
+    SalesDate DATE NOT NULL,
+    HourOfDay TINYINT NOT NULL,
+    EventType VARCHAR(50) NOT NULL,
+    DailyBookings INT NOT NULL,
+    DailyTickets INT NOT NULL,
+    DailyRevenue DECIMAL(18,2) NOT NULL,
+    UniqueCustomers INT NOT NULL,
+    CONSTRAINT PK_RptDailySales PRIMARY KEY CLUSTERED (SalesDate, HourOfDay, EventType)
+) ON PS_ReportingMonth(SalesDate);
+GO
+
+-- Snack sales per booking day
+CREATE TABLE RPT_DAILY_SNACK_SALES (
+    SalesDate DATE NOT NULL,
+    SnackID INT NOT NULL,
+    OrderCount INT NOT NULL,
+    LineCount INT NOT NULL,
+    TotalQuantitySold INT NOT NULL,
+    TotalRevenue DECIMAL(18,2) NOT NULL,
+    CONSTRAINT PK_RptDailySnackSales PRIMARY KEY CLUSTERED (SalesDate, SnackID)
+) ON PS_ReportingMonth(SalesDate);
+GO
+
+-- Watermarks of the last successful refresh
+CREATE TABLE RPT_REFRESH_STATE (
+    StateID TINYINT PRIMARY KEY DEFAULT 1,
+    LastBookingID INT NOT NULL DEFAULT 0,
+    LastAuditID INT NOT NULL DEFAULT 0,
+    LastRefreshed DATETIME NULL,
+    CONSTRAINT CHK_RptRefreshState_Single CHECK (StateID = 1)
+);
+GO
+
+INSERT INTO RPT_REFRESH_STATE (StateID) VALUES (1);
+GO
+
+CREATE TABLE RPT_REFRESH_LOG (
+    RunID INT IDENTITY(1,1) PRIMARY KEY,
+    RunType VARCHAR(20) NOT NULL,
+    StartedAt DATETIME NOT NULL,
+    FinishedAt DATETIME NULL,
+    DaysRefreshed INT NULL,
+    BookingRowsLoaded INT NULL,
+    Status VARCHAR(20) NOT NULL,
+    ErrorMessage NVARCHAR(4000) NULL,
+    CONSTRAINT CHK_RptRefreshLog_RunType CHECK (RunType IN ('Full', 'Incremental')),
+    CONSTRAINT CHK_RptRefreshLog_Status CHECK (Status IN ('Running', 'Succeeded', 'Failed'))
+);
+GO
+
+PRINT 'Created RPT_BOOKING_FACT, RPT_DAILY_SALES, RPT_DAILY_SNACK_SALES, RPT_REFRESH_STATE, RPT_REFRESH_LOG.';
+GO
+
+-- =============================================
+-- SECTION 3: REFRESH PROCEDURE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 3: Creating Refresh Procedure ---'
+GO
+
+-- =============================================
+-- SP: Refresh Reporting Tables
+-- Purpose: Rebuilds the reporting tables for every booking day touched since the
+--          last run (or all days when @FullRefresh = 1) in one transaction.
+--          @OverlapDays re-includes the most recent days on every run so bookings
+--          whose identity was allocated before, but committed after, the previous
+--          watermark are still picked up.
+-- =============================================
+IF OBJECT_ID('sp_RefreshReportingTables', 'P') IS NOT NULL
+    DROP PROCEDURE sp_RefreshReportingTables;
+GO
+
+CREATE PROCEDURE sp_RefreshReportingTables
+    @FullRefresh BIT = 0,
+    @OverlapDays INT = 1
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @RunID INT;
+    DECLARE @LastBookingID INT;
+    DECLARE @LastAuditID INT;
+    DECLARE @MaxBookingID INT;
+    DECLARE @MaxAuditID INT;
+    DECLARE @DaysRefreshed INT;
+    DECLARE @BookingRows INT;
+
+    INSERT INTO RPT_REFRESH_LOG (RunType, StartedAt, Status)
+    VALUES (CASE WHEN @FullRefresh = 1 THEN 'Full' ELSE 'Incremental' END, GETDATE(), 'Running');
+    SET @RunID = SCOPE_IDENTITY();
+
+    BEGIN TRY
+        IF OBJECT_ID('sp_DrainBookingAuditQueue', 'P') IS NOT NULL
+            EXEC sp_DrainBookingAuditQueue;
+
+        SELECT @LastBookingID = LastBookingID, @LastAuditID = LastAuditID
+        FROM RPT_REFRESH_STATE
+        WHERE StateID = 1;
+
+        -- Fall back to the old watermarks if archiving has emptied the live tables
+        SELECT @MaxBookingID = ISNULL(MAX(BookingID), @LastBookingID) FROM BOOKING;
+        SELECT @MaxAuditID = ISNULL(MAX(AuditID), @LastAuditID) FROM BOOKING_AUDIT;
+
+        -- Days to rebuild
+        CREATE TABLE #Days (Day DATE PRIMARY KEY);
+
+        IF @FullRefresh = 1
+        BEGIN
+            INSERT INTO #Days (Day)
+            SELECT DISTINCT CAST(BookingDateTime AS DATE) FROM vw_AllBookings
+            UNION
+            SELECT DISTINCT BookingDate FROM RPT_BOOKING_FACT;
+        END
+        ELSE
+        BEGIN
+            INSERT INTO #Days (Day)
+            -- New bookings
+            SELECT CAST(B.BookingDateTime AS DATE)
+            FROM vw_AllBookings B
+            WHERE B.BookingID > @LastBookingID AND B.BookingID <= @MaxBookingID
+            UNION
+            -- Changed/deleted bookings: the day they were reported under ...
+            SELECT F.BookingDate
+            FROM BOOKING_AUDIT A
+            INNER JOIN RPT_BOOKING_FACT F ON A.BookingID = F.BookingID
+            WHERE A.AuditID > @LastAuditID AND A.AuditID <= @MaxAuditID
+            UNION
+            -- ... and the day they belong to now
+            SELECT CAST(B.BookingDateTime AS DATE)
+            FROM BOOKING_AUDIT A
+            INNER JOIN vw_AllBookings B ON A.BookingID = B.BookingID
+            WHERE A.AuditID > @LastAuditID AND A.AuditID <= @MaxAuditID
+            UNION
+            -- Late-committing recent bookings
+            SELECT DISTINCT CAST(B.BookingDateTime AS DATE)
+            FROM vw_AllBookings B
+            WHERE B.BookingDateTime >= DATEADD(DAY, -@OverlapDays, CAST(GETDATE() AS DATE));
+        END
+
+        SELECT @DaysRefreshed = COUNT(*) FROM #Days;
+
+        BEGIN TRANSACTION;
+
+        -- Booking fact: per-booking subtotals computed before joining, so no fan-out
+        DELETE F
+        FROM RPT_BOOKING_FACT F
+        INNER JOIN #Days D ON F.BookingDate = D.Day;
+
+        INSERT INTO RPT_BOOKING_FACT (
+            BookingDate, BookingID, BookingDateTime, CustomerID, EventID, EventType,
+            TotalAmount, BookingStatus, TicketCount, SnackRevenue, TicketRevenue
+        )
+        SELECT
+            D.Day,
+            B.BookingID,
+            B.BookingDateTime,
+            B.CustomerID,
+            B.EventID,
+            E.EventType,
+            B.TotalAmount,
+            B.BookingStatus,
+            ISNULL(T.TicketCount, 0),
+            ISNULL(S.SnackRevenue, 0),
+            B.TotalAmount - ISNULL(S.SnackRevenue, 0)
+        FROM #Days D
+        INNER JOIN vw_AllBookings B
+            ON B.BookingDateTime >= D.Day
+           AND B.BookingDateTime < DATEADD(DAY, 1, D.Day)
+        INNER JOIN EVENT E ON B.EventID = E.EventID
+        LEFT JOIN (
+            SELECT BookingID, COUNT(*) AS TicketCount
+            FROM vw_AllTickets
+            GROUP BY BookingID
+        ) AS T ON T.BookingID = B.BookingID
+        LEFT JOIN (
+            SELECT BookingID, SUM(Subtotal) AS SnackRevenue
+            FROM vw_AllBookingSnacks
+            GROUP BY BookingID
+        ) AS S ON S.BookingID = B.BookingID;
+
+        SET @BookingRows = @@ROWCOUNT;
+
+        -- Daily sales from the fact table (only bookings with tickets, as in vw_PowerBI_TimeSeries)
+        DELETE S
+        FROM RPT_DAILY_SALES S
+        INNER JOIN #Days D ON S.SalesDate = D.Day;
+
+        INSERT INTO RPT_DAILY_SALES (
+            SalesDate, HourOfDay, EventType, DailyBookings, DailyTickets, DailyRevenue, UniqueCustomers
+        )
+        SELECT
+            F.BookingDate,
+            DATEPART(HOUR, F.BookingDateTime),
+            F.EventType,
+            COUNT(*),
+            SUM(F.TicketCount),
+            SUM(F.TotalAmount),
+            COUNT(DISTINCT F.CustomerID)
+        FROM RPT_BOOKING_FACT F
+        INNER JOIN #Days D ON F.BookingDate = D.Day
+        WHERE F.BookingStatus IN ('Confirmed', 'Completed')
+          AND F.TicketCount > 0
+        GROUP BY F.BookingDate, DATEPART(HOUR, F.BookingDateTime), F.EventType;
+
+        -- Daily snack sales
+        DELETE S
+        FROM RPT_DAILY_SNACK_SALES S
+        INNER JOIN #Days D ON S.SalesDate = D.Day;
+
+        INSERT INTO RPT_DAILY_SNACK_SALES (SalesDate, SnackID, OrderCount, LineCount, TotalQuantitySold, TotalRevenue)
+        SELECT
+            F.BookingDate,
+            BS.SnackID,
+            COUNT(DISTINCT BS.BookingID),
+            COUNT(*),
+            SUM(BS.Quantity),
+            SUM(BS.Subtotal)
+        FROM RPT_BOOKING_FACT F
+        INNER JOIN #Days D ON F.BookingDate = D.Day
+        INNER JOIN vw_AllBookingSnacks BS ON BS.BookingID = F.BookingID
+        GROUP BY F.BookingDate, BS.SnackID;
+
+        -- Advance the watermarks
+        UPDATE RPT_REFRESH_STATE
+        SET LastBookingID = @MaxBookingID,
+            LastAuditID = @MaxAuditID,
+            LastRefreshed = GETDATE()
+        WHERE StateID = 1;
+
+        COMMIT TRANSACTION;
+
+        UPDATE RPT_REFRESH_LOG
+        SET FinishedAt = GETDATE(),
+            DaysRefreshed = @DaysRefreshed,
+            BookingRowsLoaded = @BookingRows,
+            Status = 'Succeeded'
+        WHERE RunID = @RunID;
+
+        SELECT RunID, RunType, StartedAt, FinishedAt, DaysRefreshed, BookingRowsLoaded, Status
+        FROM RPT_REFRESH_LOG
+        WHERE RunID = @RunID;
+
+        PRINT 'Reporting tables refreshed. Days: ' + CAST(@DaysRefreshed AS VARCHAR)
+            + ', Booking rows: ' + CAST(@BookingRows AS VARCHAR);
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        UPDATE RPT_REFRESH_LOG
+        SET FinishedAt = GETDATE(),
+            Status = 'Failed',
+            ErrorMessage = @ErrorMessage
+        WHERE RunID = @RunID;
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_RefreshReportingTables procedure.';
+GO
+
+-- =============================================
+-- SECTION 4: REPORTING VIEWS
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 4: Creating Reporting Views ---'
+GO
+
+-- Same columns as vw_PowerBI_SalesOverview, read from the fact table
+CREATE OR ALTER VIEW vw_RPT_SalesOverview
+AS
+SELECT
+    F.BookingID,
+    F.BookingDateTime,
+    F.BookingDate,
+    DATEPART(YEAR, F.BookingDate) AS BookingYear,
+    DATEPART(MONTH, F.BookingDate) AS BookingMonth,
+    DATENAME(MONTH, F.BookingDate) AS MonthName,
+    DATEPART(QUARTER, F.BookingDate) AS BookingQuarter,
+    DATENAME(WEEKDAY, F.BookingDate) AS DayOfWeek,
+    F.TotalAmount,
+    F.BookingStatus,
+
+    -- Customer Info
+    C.CustomerID,
+    U.FirstName + ' ' + U.LastName AS CustomerName,
+    C.LoyaltyPoints,
+
+    -- Event Info
+    E.EventID,
+    E.Title AS EventName,
+    E.EventType,
+    E.Status AS EventStatus,
+    E.StartDateTime AS EventStartDate,
+    O.CompanyName AS OrganizerName,
+
+    F.TicketCount,
+    F.SnackRevenue,
+    F.TicketRevenue
+FROM RPT_BOOKING_FACT F
+INNER JOIN CUSTOMER C ON F.CustomerID = C.CustomerID
+INNER JOIN [USER] U ON C.UserID = U.UserID
+INNER JOIN EVENT E ON F.EventID = E.EventID
+LEFT JOIN ORGANIZER O ON E.OrganizerID = O.OrganizerID;
+GO
+
+-- Same columns as vw_PowerBI_TimeSeries; the running total only scans the small aggregate table.
+-- Revenue is summed per booking, not per ticket row, so multi-ticket bookings are counted once.
+CREATE OR ALTER VIEW vw_RPT_TimeSeries
+AS
+SELECT
+    S.SalesDate AS Date,
+    DATEPART(YEAR, S.SalesDate) AS Year,
+    DATEPART(MONTH, S.SalesDate) AS Month,
+    DATEPART(QUARTER, S.SalesDate) AS Quarter,
+    DATENAME(WEEKDAY, S.SalesDate) AS DayOfWeek,
+    S.HourOfDay,
+    S.DailyBookings,
+    S.DailyTickets,
+    S.DailyRevenue,
+    S.DailyRevenue / NULLIF(S.DailyBookings, 0) AS AvgDailyBookingValue,
+    S.UniqueCustomers,
+    S.EventType,
+    SUM(S.DailyRevenue) OVER (ORDER BY S.SalesDate) AS CumulativeRevenue
+FROM RPT_DAILY_SALES S;
+GO
+
+-- Same columns as vw_PowerBI_CustomerInsights, aggregated from the narrow fact table
+CREATE OR ALTER VIEW vw_RPT_CustomerInsights
+AS
+SELECT
+    C.CustomerID,
+    U.FirstName,
+    U.LastName,
+    U.FirstName + ' ' + U.LastName AS FullName,
+    U.Email,
+    U.PhoneNumber,
+    C.LoyaltyPoints,
+    ISNULL(F.TotalBookings, 0) AS TotalBookings,
+    ISNULL(F.ActiveBookings, 0) AS ActiveBookings,
+    ISNULL(F.CompletedBookings, 0) AS CompletedBookings,
+    ISNULL(F.CancelledBookings, 0) AS CancelledBookings,
+    ISNULL(F.TotalSpent, 0) AS TotalSpent,
+    F.AvgBookingValue,
+    F.LastBookingDate,
+    F.FirstBookingDate,
+    ISNULL(F.TotalTickets, 0) AS TotalTickets,
+    CASE
+        WHEN ISNULL(F.TotalSpent, 0) > 500 THEN 'VIP'
+        WHEN ISNULL(F.TotalSpent, 0) > 200 THEN 'Regular'
+        ELSE 'Occasional'
+    END AS CustomerSegment
+FROM CUSTOMER C
+INNER JOIN [USER] U ON C.UserID = U.UserID
+LEFT JOIN (
+    SELECT
+        CustomerID,
+        COUNT(*) AS TotalBookings,
+        SUM(CASE WHEN BookingStatus = 'Confirmed' THEN 1 ELSE 0 END) AS ActiveBookings,
+        SUM(CASE WHEN BookingStatus = 'Completed' THEN 1 ELSE 0 END) AS CompletedBookings,
+        SUM(CASE WHEN BookingStatus = 'Cancelled' THEN 1 ELSE 0 END) AS CancelledBookings,
+        SUM(CASE WHEN BookingStatus IN ('Confirmed', 'Completed') THEN TotalAmount ELSE 0 END) AS TotalSpent,
+        AVG(CASE WHEN BookingStatus IN ('Confirmed', 'Completed') THEN TotalAmount ELSE NULL END) AS AvgBookingValue,
+        MAX(BookingDateTime) AS LastBookingDate,
+        MIN(BookingDateTime) AS FirstBookingDate,
+        SUM(TicketCount) AS TotalTickets
+    FROM RPT_BOOKING_FACT
+    GROUP BY CustomerID
+) AS F ON F.CustomerID = C.CustomerID;
+GO
+
+-- Same columns as vw_PowerBI_SnackSales, from the daily snack aggregate
+CREATE OR ALTER VIEW vw_RPT_SnackSales
+AS
+SELECT
+    S.SnackID,
+    S.SnackName,
+    S.SnackType,
+    S.Price AS UnitPrice,
+    ISNULL(D.OrderCount, 0) AS OrderCount,
+    D.TotalQuantitySold,
+    D.TotalRevenue,
+    D.TotalQuantitySold / NULLIF(D.LineCount, 0) AS AvgQuantityPerOrder,
+    D.TotalRevenue / NULLIF(D.LineCount, 0) AS AvgRevenuePerOrder,
+    RANK() OVER (ORDER BY D.TotalQuantitySold DESC) AS PopularityRank,
+    D.TotalRevenue * 100.0 / SUM(D.TotalRevenue) OVER () AS RevenueContributionPercent
+FROM SNACK S
+LEFT JOIN (
+    SELECT
+        SnackID,
+        SUM(OrderCount) AS OrderCount,
+        SUM(LineCount) AS LineCount,
+        SUM(TotalQuantitySold) AS TotalQuantitySold,
+        SUM(TotalRevenue) AS TotalRevenue
+    FROM RPT_DAILY_SNACK_SALES
+    GROUP BY SnackID
+) AS D ON D.SnackID = S.SnackID;
+GO
+
+PRINT 'Created vw_RPT_SalesOverview, vw_RPT_TimeSeries, vw_RPT_CustomerInsights, vw_RPT_SnackSales.';
+GO
+
+-- =============================================
+-- SECTION 5: INITIAL LOAD
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 5: Initial Full Refresh ---'
+GO
+
+EXEC sp_RefreshReportingTables @FullRefresh = 1;
+GO
+
+PRINT ''
+PRINT '============================================='
+PRINT 'REPORTING SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
@@ -0,0 +1,784 @@
+-- =============================================
+-- Event & Ticket Booking System - EVENT SEARCH Script
+-- Group 5 - DAMG6210
+-- Trigger-maintained inverted index for ranked, faceted event search
+-- =============================================
+-- Events are found by the words of their title, description, movie title
+-- and genre, sport, tournament and league, exhibition theme and curator,
+-- the teams and venue of their matches and the theaters showing them.
+--   - EVENT_SEARCH_TERM holds one posting per (word, event) with the weight
+--     of the most important field the word appears in, plus the event's
+--     type, status and start so facet filters are checked inside the scan
+--   - EVENT_SEARCH_VOCAB counts the events per word; it expands prefixes
+--     and picks the rarest word of a query to drive the search
+--   - EVENT_SEARCH_CITY lists the cities each event plays in (theaters of
+--     its shows, venues of its matches)
+-- Triggers on the source tables re-index the affected events in the same
+-- transaction; status and date changes only update the facet columns.
+-- tvf_SearchEvents ranks the events containing every word of a query.
+-- A full-text index would need the Full-Text Search feature, which is not
+-- installed with every SQL Server edition or container image; this index
+-- only uses plain tables.
+-- Python client: GUI/event_search.py
+-- Run after psm_script.sql (and again after loading data with
+-- generate_data.py, or use python event_search.py --rebuild).
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'EVENT SEARCH SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: INDEX TABLES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Search Index Tables ---'
+GO
+
+IF OBJECT_ID('EVENT_SEARCH_TERM', 'U') IS NOT NULL
+    DROP TABLE EVENT_SEARCH_TERM;
+GO
+
+CREATE TABLE EVENT_SEARCH_TERM (
+    Term VARCHAR(40) NOT NULL,
+    EventID INT NOT NULL,
+    Weight TINYINT NOT NULL,
+    EventType VARCHAR(50) NOT NULL,
+    Status VARCHAR(20) NULL,
+    StartDateTime DATETIME NOT NULL
+);
+GO
+
+-- Postings of a word in rank order, so the best matches of a common word are read first
+CREATE UNIQUE CLUSTERED INDEX CX_EventSearchTerm
+ON EVENT_SEARCH_TERM (Term, Weight DESC, StartDateTime DESC, EventID DESC);
+GO
+
+-- Probes for the other words of a query, and re-indexing by event
+CREATE UNIQUE NONCLUSTERED INDEX UX_EventSearchTerm_Term_EventID
+ON EVENT_SEARCH_TERM (Term, EventID)
+INCLUDE (Weight);
+GO
+
+CREATE NONCLUSTERED INDEX IX_EventSearchTerm_EventID
+ON EVENT_SEARCH_TERM (EventID);
+GO
+
+IF OBJECT_ID('EVENT_SEARCH_VOCAB', 'U') IS NOT NULL
+    DROP TABLE EVENT_SEARCH_VOCAB;
+GO
+
+CREATE TABLE EVENT_SEARCH_VOCAB (
+    Term VARCHAR(40) NOT NULL,
+    DocCount INT NOT NULL,
+    CONSTRAINT PK_EventSearchVocab PRIMARY KEY CLUSTERED (Term)
+);
+GO
+
+IF OBJECT_ID('EVENT_SEARCH_CITY', 'U') IS NOT NULL
+    DROP TABLE EVENT_SEARCH_CITY;
+GO
+
+CREATE TABLE EVENT_SEARCH_CITY (
+    City VARCHAR(50) NOT NULL,
+    EventID INT NOT NULL,
+    CONSTRAINT PK_EventSearchCity PRIMARY KEY CLUSTERED (City, EventID)
+);
+GO
+
+CREATE NONCLUSTERED INDEX IX_EventSearchCity_EventID
+ON EVENT_SEARCH_CITY (EventID);
+GO
+
+-- Re-indexing an event reads its matches by EventID
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_Match_EventID' AND object_id = OBJECT_ID('MATCH'))
+BEGIN
+    CREATE NONCLUSTERED INDEX IX_Match_EventID
+    ON MATCH(EventID);
+    PRINT 'Created Index: IX_Match_EventID';
+END
+GO
+
+PRINT 'Created EVENT_SEARCH_TERM, EVENT_SEARCH_VOCAB and EVENT_SEARCH_CITY tables.';
+GO
+
+-- =============================================
+-- SECTION 2: TOKENIZER AND INDEXING PROCEDURES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Tokenizer and Indexing Procedures ---'
+GO
+
+-- =============================================
+-- FUNCTION: Search Terms
+-- Purpose: Splits text into distinct lower-case words of 2-40 characters,
+--          dropping punctuation and common stop words. Used for both the
+--          indexed fields and the query, so they always agree.
+-- =============================================
+IF OBJECT_ID('dbo.tvf_SearchTerms', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_SearchTerms;
+GO
+
+CREATE FUNCTION dbo.tvf_SearchTerms
+(
+    @Text VARCHAR(MAX)
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT DISTINCT CAST(Words.value AS VARCHAR(40)) AS Term
+    FROM STRING_SPLIT(
+        TRANSLATE(
+            LOWER(@Text),
+            '.,;:!?()[]{}<>/\|+-*=&#@~^%$"_`' + CHAR(39) + CHAR(9) + CHAR(10) + CHAR(13),
+            REPLICATE(' ', 35)
+        ),
+        ' '
+    ) AS Words
+    WHERE LEN(Words.value) BETWEEN 2 AND 40
+      AND Words.value NOT IN ('an', 'and', 'at', 'by', 'for', 'from', 'in', 'is', 'of', 'on', 'the', 'to', 'vs', 'with');
+GO
+
+IF TYPE_ID('EventIDList') IS NULL
+    CREATE TYPE EventIDList AS TABLE (
+        EventID INT NOT NULL PRIMARY KEY
+    );
+GO
+
+-- =============================================
+-- SP: Index Events
+-- Purpose: Rebuilds the postings, word counts and cities of the given
+--          events from the source tables. Events that no longer exist are
+--          removed from the index. Called by the triggers below.
+-- Field weights: title 10, genre/tournament/theme/teams 6,
+--                sport/league 4, curator/venue/theater/city 3,
+--                event type 2, language/description 1
+-- =============================================
+IF OBJECT_ID('sp_IndexEvents', 'P') IS NOT NULL
+    DROP PROCEDURE sp_IndexEvents;
+GO
+
+CREATE PROCEDURE sp_IndexEvents
+    @EventIDs EventIDList READONLY
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+
+    DECLARE @Removed TABLE (Term VARCHAR(40) NOT NULL);
+    DECLARE @Postings TABLE (
+        Term VARCHAR(40) NOT NULL,
+        EventID INT NOT NULL,
+        Weight TINYINT NOT NULL,
+        PRIMARY KEY (Term, EventID)
+    );
+
+    -- Each word of an event once, at the weight of its most important field
+    INSERT INTO @Postings (Term, EventID, Weight)
+    SELECT W.Term, F.EventID, MAX(F.Weight)
+    FROM (
+        SELECT E.EventID, F.Weight, F.Text
+        FROM EVENT E
+        INNER JOIN @EventIDs I ON I.EventID = E.EventID
+        CROSS APPLY (VALUES (10, E.Title), (2, E.EventType), (1, E.Language), (1, E.Description)) AS F (Weight, Text)
+
+        UNION ALL
+        SELECT M.EventID, F.Weight, F.Text
+        FROM MOVIE M
+        INNER JOIN @EventIDs I ON I.EventID = M.EventID
+        CROSS APPLY (VALUES (10, M.Title), (6, M.Genre)) AS F (Weight, Text)
+
+        UNION ALL
+        SELECT S.EventID, F.Weight, F.Text
+        FROM SPORT S
+        INNER JOIN @EventIDs I ON I.EventID = S.EventID
+        CROSS APPLY (VALUES (6, S.TournamentName), (4, S.SportType), (4, S.League)) AS F (Weight, Text)
+
+        UNION ALL
+        SELECT X.EventID, F.Weight, F.Text
+        FROM EXHIBITION X
+        INNER JOIN @EventIDs I ON I.EventID = X.EventID
+        CROSS APPLY (VALUES (6, X.ExhibitionTheme), (3, CONCAT(X.CuratorFName, ' ', X.CuratorLName))) AS F (Weight, Text)
+
+        UNION ALL
+        SELECT MA.EventID, F.Weight, F.Text
+        FROM MATCH MA
+        INNER JOIN @EventIDs I ON I.EventID = MA.EventID
+        INNER JOIN TEAM H ON H.TeamID = MA.HomeTeamID
+        INNER JOIN TEAM A ON A.TeamID = MA.AwayTeamID
+        INNER JOIN VENUE V ON V.VenueID = MA.VenueID
+        CROSS APPLY (VALUES (6, H.TeamName), (6, A.TeamName), (3, V.VenueName), (3, V.City)) AS F (Weight, Text)
+
+        UNION ALL
+        SELECT Th.EventID, F.Weight, F.Text
+        FROM (
+            SELECT DISTINCT SH.EventID, T.TheaterName, T.City
+            FROM SHOW SH
+            INNER JOIN @EventIDs I ON I.EventID = SH.EventID
+            INNER JOIN SCREEN SC ON SC.ScreenID = SH.ScreenID
+            INNER JOIN THEATER T ON T.TheaterID = SC.TheaterID
+        ) AS Th
+        CROSS APPLY (VALUES (3, Th.TheaterName), (3, Th.City)) AS F (Weight, Text)
+    ) AS F
+    CROSS APPLY dbo.tvf_SearchTerms(F.Text) AS W
+    GROUP BY W.Term, F.EventID;
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        DELETE P
+        OUTPUT DELETED.Term INTO @Removed (Term)
+        FROM EVENT_SEARCH_TERM P
+        INNER JOIN @EventIDs I ON I.EventID = P.EventID;
+
+        INSERT INTO EVENT_SEARCH_TERM (Term, EventID, Weight, EventType, Status, StartDateTime)
+        SELECT P.Term, P.EventID, P.Weight, E.EventType, E.Status, E.StartDateTime
+        FROM @Postings P
+        INNER JOIN EVENT E ON E.EventID = P.EventID;
+
+        -- Word counts move by the difference between the old and new postings
+        MERGE EVENT_SEARCH_VOCAB AS V
+        USING (
+            SELECT Term, SUM(Delta) AS Delta
+            FROM (
+                SELECT Term, -1 AS Delta FROM @Removed
+                UNION ALL
+                SELECT Term, 1 FROM @Postings
+            ) AS Changes
+            GROUP BY Term
+            HAVING SUM(Delta) <> 0
+        ) AS D
+        ON V.Term = D.Term
+        WHEN MATCHED AND V.DocCount + D.Delta <= 0 THEN
+            DELETE
+        WHEN MATCHED THEN
+            UPDATE SET DocCount = V.DocCount + D.Delta
+        WHEN NOT MATCHED AND D.Delta > 0 THEN
+            INSERT (Term, DocCount) VALUES (D.Term, D.Delta);
+
+        DELETE C
+        FROM EVENT_SEARCH_CITY C
+        INNER JOIN @EventIDs I ON I.EventID = C.EventID;
+
+        INSERT INTO EVENT_SEARCH_CITY (City, EventID)
+        SELECT V.City, MA.EventID
+        FROM MATCH MA
+        INNER JOIN @EventIDs I ON I.EventID = MA.EventID
+        INNER JOIN VENUE V ON V.VenueID = MA.VenueID
+        UNION
+        SELECT T.City, SH.EventID
+        FROM SHOW SH
+        INNER JOIN @EventIDs I ON I.EventID = SH.EventID
+        INNER JOIN SCREEN SC ON SC.ScreenID = SH.ScreenID
+        INNER JOIN THEATER T ON T.TheaterID = SC.TheaterID;
+
+        COMMIT TRANSACTION;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_IndexEvents procedure.';
+GO
+
+-- =============================================
+-- SP: Rebuild Event Search
+-- Purpose: Re-indexes every event from scratch, @BatchSize events per
+--          transaction. Run after bulk loads that bypass the triggers.
+-- =============================================
+IF OBJECT_ID('sp_RebuildEventSearch', 'P') IS NOT NULL
+    DROP PROCEDURE sp_RebuildEventSearch;
+GO
+
+CREATE PROCEDURE sp_RebuildEventSearch
+    @BatchSize INT = 5000
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+    DECLARE @LastEventID INT = 0;
+    DECLARE @EventsIndexed INT = 0;
+    DECLARE @Batch INT;
+
+    TRUNCATE TABLE EVENT_SEARCH_TERM;
+    TRUNCATE TABLE EVENT_SEARCH_VOCAB;
+    TRUNCATE TABLE EVENT_SEARCH_CITY;
+
+    WHILE 1 = 1
+    BEGIN
+        DELETE FROM @EventIDs;
+
+        INSERT INTO @EventIDs (EventID)
+        SELECT TOP (@BatchSize) EventID
+        FROM EVENT
+        WHERE EventID > @LastEventID
+        ORDER BY EventID;
+
+        SET @Batch = @@ROWCOUNT;
+        IF @Batch = 0
+            BREAK;
+
+        SELECT @LastEventID = MAX(EventID) FROM @EventIDs;
+        EXEC sp_IndexEvents @EventIDs;
+        SET @EventsIndexed += @Batch;
+    END
+
+    SELECT
+        @EventsIndexed AS EventsIndexed,
+        (SELECT COUNT_BIG(*) FROM EVENT_SEARCH_TERM) AS Postings,
+        (SELECT COUNT(*) FROM EVENT_SEARCH_VOCAB) AS Terms;
+END;
+GO
+
+PRINT 'Created sp_RebuildEventSearch procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: MAINTENANCE TRIGGERS
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 3: Creating Search Maintenance Triggers ---'
+GO
+
+-- =============================================
+-- TRIGGER: Event text and facets
+-- =============================================
+IF OBJECT_ID('trg_Event_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Event_Search;
+GO
+
+CREATE TRIGGER trg_Event_Search
+ON EVENT
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    -- Status and date changes (transitions, the scheduler) only move the facet columns
+    IF EXISTS (SELECT * FROM inserted) AND EXISTS (SELECT * FROM deleted)
+       AND NOT (UPDATE(Title) OR UPDATE(Description) OR UPDATE(EventType) OR UPDATE(Language))
+    BEGIN
+        IF UPDATE(Status) OR UPDATE(StartDateTime)
+            UPDATE P
+            SET Status = I.Status,
+                StartDateTime = I.StartDateTime
+            FROM EVENT_SEARCH_TERM P
+            INNER JOIN inserted I ON I.EventID = P.EventID;
+        RETURN;
+    END
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT EventID FROM inserted
+    UNION
+    SELECT EventID FROM deleted;
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+-- =============================================
+-- TRIGGERS: Movie, sport and exhibition details
+-- =============================================
+IF OBJECT_ID('trg_Movie_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Movie_Search;
+GO
+
+CREATE TRIGGER trg_Movie_Search
+ON MOVIE
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT EventID FROM inserted
+    UNION
+    SELECT EventID FROM deleted;
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+IF OBJECT_ID('trg_Sport_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Sport_Search;
+GO
+
+CREATE TRIGGER trg_Sport_Search
+ON SPORT
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT EventID FROM inserted
+    UNION
+    SELECT EventID FROM deleted;
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+IF OBJECT_ID('trg_Exhibition_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Exhibition_Search;
+GO
+
+CREATE TRIGGER trg_Exhibition_Search
+ON EXHIBITION
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT EventID FROM inserted
+    UNION
+    SELECT EventID FROM deleted;
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+-- =============================================
+-- TRIGGER: Match teams and venue (score and status updates are ignored)
+-- =============================================
+IF OBJECT_ID('trg_Match_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Match_Search;
+GO
+
+CREATE TRIGGER trg_Match_Search
+ON MATCH
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    IF EXISTS (SELECT * FROM inserted) AND EXISTS (SELECT * FROM deleted)
+       AND NOT (UPDATE(EventID) OR UPDATE(VenueID) OR UPDATE(HomeTeamID) OR UPDATE(AwayTeamID))
+        RETURN;
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT EventID FROM inserted
+    UNION
+    SELECT EventID FROM deleted;
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+-- =============================================
+-- TRIGGER: Shows (only when an event gains or loses a theater)
+-- =============================================
+IF OBJECT_ID('trg_Show_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Show_Search;
+GO
+
+CREATE TRIGGER trg_Show_Search
+ON SHOW
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    IF EXISTS (SELECT * FROM inserted) AND EXISTS (SELECT * FROM deleted)
+       AND NOT (UPDATE(EventID) OR UPDATE(ScreenID))
+        RETURN;
+
+    -- A theater is new (or gone) for an event when no other show of the event plays there
+    INSERT INTO @EventIDs (EventID)
+    SELECT DISTINCT Changed.EventID
+    FROM (
+        SELECT ShowID, EventID, ScreenID FROM inserted
+        UNION ALL
+        SELECT ShowID, EventID, ScreenID FROM deleted
+    ) AS Changed
+    INNER JOIN SCREEN SC ON SC.ScreenID = Changed.ScreenID
+    WHERE NOT EXISTS (
+        SELECT *
+        FROM SHOW Other
+        INNER JOIN SCREEN OtherScreen ON OtherScreen.ScreenID = Other.ScreenID
+        WHERE Other.EventID = Changed.EventID
+          AND OtherScreen.TheaterID = SC.TheaterID
+          AND Other.ShowID NOT IN (SELECT ShowID FROM inserted)
+    );
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+-- =============================================
+-- TRIGGERS: Renamed teams, venues and theaters
+-- =============================================
+IF OBJECT_ID('trg_Team_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Team_Search;
+GO
+
+CREATE TRIGGER trg_Team_Search
+ON TEAM
+AFTER UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    IF NOT UPDATE(TeamName)
+        RETURN;
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT DISTINCT MA.EventID
+    FROM MATCH MA
+    INNER JOIN inserted I ON I.TeamID IN (MA.HomeTeamID, MA.AwayTeamID);
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+IF OBJECT_ID('trg_Venue_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Venue_Search;
+GO
+
+CREATE TRIGGER trg_Venue_Search
+ON VENUE
+AFTER UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    IF NOT (UPDATE(VenueName) OR UPDATE(City))
+        RETURN;
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT DISTINCT MA.EventID
+    FROM MATCH MA
+    INNER JOIN inserted I ON I.VenueID = MA.VenueID;
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+IF OBJECT_ID('trg_Theater_Search', 'TR') IS NOT NULL
+    DROP TRIGGER trg_Theater_Search;
+GO
+
+CREATE TRIGGER trg_Theater_Search
+ON THEATER
+AFTER UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @EventIDs EventIDList;
+
+    IF NOT (UPDATE(TheaterName) OR UPDATE(City))
+        RETURN;
+
+    INSERT INTO @EventIDs (EventID)
+    SELECT DISTINCT SH.EventID
+    FROM SHOW SH
+    INNER JOIN SCREEN SC ON SC.ScreenID = SH.ScreenID
+    INNER JOIN inserted I ON I.TheaterID = SC.TheaterID;
+
+    IF @@ROWCOUNT > 0
+        EXEC sp_IndexEvents @EventIDs;
+END;
+GO
+
+PRINT 'Created search maintenance triggers on EVENT, MOVIE, SPORT, EXHIBITION, MATCH, SHOW, TEAM, VENUE and THEATER.';
+GO
+
+-- =============================================
+-- SECTION 4: SEARCH FUNCTION
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 4: Creating Search Function ---'
+GO
+
+-- =============================================
+-- FUNCTION: Search Events
+-- Purpose: Events containing every word of @Query, with their score (the
+--          sum over the words of the best field weight, doubled for an
+--          exact word and single for a prefix). NULL facets match anything;
+--          @StartFrom is inclusive and @StartTo exclusive.
+-- Cost is bounded by the query, not the table: each word expands to at
+-- most 10 indexed words (exact match first, then the most common words it
+-- starts, from 3 letters on), and only the 2,000 best postings of each
+-- expansion of the rarest word become candidates, which the other words
+-- then probe by (Term, EventID). Results are exact while the rarest word
+-- matches at most 2,000 events after the type/status/date/city facets, all
+-- of which are checked while the postings are read.
+-- =============================================
+IF OBJECT_ID('dbo.tvf_SearchEvents', 'TF') IS NOT NULL
+    DROP FUNCTION dbo.tvf_SearchEvents;
+GO
+
+CREATE FUNCTION dbo.tvf_SearchEvents
+(
+    @Query VARCHAR(200),
+    @EventType VARCHAR(50),
+    @Status VARCHAR(20),
+    @StartFrom DATETIME,
+    @StartTo DATETIME,
+    @City VARCHAR(50)
+)
+RETURNS @Results TABLE (
+    EventID INT NOT NULL PRIMARY KEY,
+    Score INT NOT NULL,
+    StartDateTime DATETIME NOT NULL
+)
+AS
+BEGIN
+    DECLARE @Words TABLE (
+        WordNo INT IDENTITY(1,1) PRIMARY KEY,
+        Word VARCHAR(40) NOT NULL
+    );
+    DECLARE @Expanded TABLE (
+        WordNo INT NOT NULL,
+        Term VARCHAR(40) NOT NULL,
+        Boost TINYINT NOT NULL,
+        DocCount INT NOT NULL,
+        PRIMARY KEY (WordNo, Term)
+    );
+    DECLARE @Candidates TABLE (
+        EventID INT NOT NULL PRIMARY KEY,
+        StartDateTime DATETIME NOT NULL,
+        Score INT NOT NULL,
+        WordsMatched INT NOT NULL
+    );
+    DECLARE @WordCount INT;
+    DECLARE @DrivingWord INT;
+
+    INSERT INTO @Words (Word)
+    SELECT Term FROM dbo.tvf_SearchTerms(@Query);
+
+    SELECT @WordCount = COUNT(*) FROM @Words;
+    IF @WordCount = 0
+        RETURN;
+
+    INSERT INTO @Expanded (WordNo, Term, Boost, DocCount)
+    SELECT W.WordNo, V.Term, CASE WHEN V.Term = W.Word THEN 2 ELSE 1 END, V.DocCount
+    FROM @Words W
+    CROSS APPLY (
+        SELECT TOP (10) Vocab.Term, Vocab.DocCount
+        FROM EVENT_SEARCH_VOCAB Vocab
+        WHERE Vocab.Term LIKE W.Word + CASE WHEN LEN(W.Word) >= 3 THEN '%' ELSE '' END
+        ORDER BY CASE WHEN Vocab.Term = W.Word THEN 0 ELSE 1 END, Vocab.DocCount DESC
+    ) AS V;
+
+    -- A word that matches nothing leaves no event containing every word
+    IF (SELECT COUNT(DISTINCT WordNo) FROM @Expanded) < @WordCount
+        RETURN;
+
+    SELECT TOP (1) @DrivingWord = WordNo
+    FROM @Expanded
+    GROUP BY WordNo
+    ORDER BY SUM(CAST(DocCount AS BIGINT)), WordNo;
+
+    INSERT INTO @Candidates (EventID, StartDateTime, Score, WordsMatched)
+    SELECT P.EventID, MAX(P.StartDateTime), MAX(P.Weight * X.Boost), 1
+    FROM @Expanded X
+    CROSS APPLY (
+        SELECT TOP (2000) Posting.EventID, Posting.Weight, Posting.StartDateTime
+        FROM EVENT_SEARCH_TERM Posting
+        WHERE Posting.Term = X.Term
+          AND (@EventType IS NULL OR Posting.EventType = @EventType)
+          AND (@Status IS NULL OR Posting.Status = @Status)
+          AND (@StartFrom IS NULL OR Posting.StartDateTime >= @StartFrom)
+          AND (@StartTo IS NULL OR Posting.StartDateTime < @StartTo)
+          AND (@City IS NULL
+               OR EXISTS (SELECT * FROM EVENT_SEARCH_CITY EC WHERE EC.City = @City AND EC.EventID = Posting.EventID))
+        ORDER BY Posting.Weight DESC, Posting.StartDateTime DESC, Posting.EventID DESC
+    ) AS P
+    WHERE X.WordNo = @DrivingWord
+    GROUP BY P.EventID;
+
+    -- Every other word adds the best weight it has in the candidate
+    IF @WordCount > 1
+        UPDATE C
+        SET Score = C.Score + Matches.Score,
+            WordsMatched = C.WordsMatched + Matches.Words
+        FROM @Candidates C
+        INNER JOIN (
+            SELECT PerWord.EventID, SUM(PerWord.Best) AS Score, COUNT(*) AS Words
+            FROM (
+                SELECT Candidate.EventID, X.WordNo, MAX(Posting.Weight * X.Boost) AS Best
+                FROM @Candidates Candidate
+                INNER JOIN @Expanded X ON X.WordNo <> @DrivingWord
+                INNER JOIN EVENT_SEARCH_TERM Posting
+                    ON Posting.Term = X.Term AND Posting.EventID = Candidate.EventID
+                GROUP BY Candidate.EventID, X.WordNo
+            ) AS PerWord
+            GROUP BY PerWord.EventID
+        ) AS Matches ON Matches.EventID = C.EventID;
+
+    INSERT INTO @Results (EventID, Score, StartDateTime)
+    SELECT C.EventID, C.Score, C.StartDateTime
+    FROM @Candidates C
+    WHERE C.WordsMatched = @WordCount;
+
+    RETURN;
+END;
+GO
+
+PRINT 'Created tvf_SearchEvents function.';
+GO
+
+-- =============================================
+-- SECTION 5: INITIAL BUILD
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 5: Indexing Existing Events ---'
+GO
+
+EXEC sp_RebuildEventSearch;
+GO
+
+PRINT ''
+PRINT '============================================='
+PRINT 'EVENT SEARCH SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO
@@ -0,0 +1,422 @@
+-- =============================================
+-- Event & Ticket Booking System - SEAT HOLD Script
+-- Group 5 - DAMG6210
+-- Short-lived seat holds for high-demand on-sales
+-- =============================================
+-- Buyers first hold seats (sp_HoldSeats), then pay and confirm the hold into a
+-- booking (sp_ConfirmHeldSeats). Double sales are prevented by keys, not by
+-- long or escalated locks:
+--   - SEAT_HOLD is keyed on (ShowID, SeatID), so a seat has at most one holder
+--   - SEAT_BOOKING has a UNIQUE (ShowID, SeatID) constraint
+-- A hold is claimed with a plain INSERT; losing a race surfaces as a key
+-- violation that is reported as 'Unavailable'. The direct and bulk booking
+-- procedures refuse seats under a live hold. Expired holds are taken over
+-- by the next buyer and purged in batches by sp_SweepExpiredSeatHolds.
+-- Python client: GUI/seat_holds.py
+-- Run after psm_script.sql.
+-- =============================================
+
+USE EventBookingSystem;
+GO
+
+PRINT '============================================='
+PRINT 'SEAT HOLD SETUP'
+PRINT '============================================='
+GO
+
+-- =============================================
+-- SECTION 1: SEAT UNIQUENESS AND HOLD TABLE
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 1: Creating Seat Constraint and SEAT_HOLD Table ---'
+GO
+
+-- Databases created before the constraint was added to create_tables.sql
+IF NOT EXISTS (SELECT * FROM sys.key_constraints WHERE name = 'UQ_SeatBooking_Show_Seat')
+BEGIN
+    ALTER TABLE SEAT_BOOKING
+    ADD CONSTRAINT UQ_SeatBooking_Show_Seat UNIQUE (ShowID, SeatID);
+    PRINT 'Added UQ_SeatBooking_Show_Seat constraint to SEAT_BOOKING.';
+END
+ELSE
+BEGIN
+    PRINT 'UQ_SeatBooking_Show_Seat constraint already exists.';
+END
+GO
+
+IF OBJECT_ID('SEAT_HOLD', 'U') IS NOT NULL
+    DROP TABLE SEAT_HOLD;
+GO
+
+CREATE TABLE SEAT_HOLD (
+    ShowID INT NOT NULL,
+    SeatID INT NOT NULL,
+    HoldToken UNIQUEIDENTIFIER NOT NULL,
+    CustomerID INT NULL,
+    HeldAt DATETIME2(3) NOT NULL DEFAULT SYSUTCDATETIME(),
+    ExpiresAt DATETIME2(3) NOT NULL,
+    CONSTRAINT PK_SeatHold PRIMARY KEY CLUSTERED (ShowID, SeatID),
+    CONSTRAINT FK_SeatHold_Show FOREIGN KEY (ShowID) REFERENCES SHOW(ShowID),
+    CONSTRAINT FK_SeatHold_Seat FOREIGN KEY (SeatID) REFERENCES SEAT(SeatID),
+    CONSTRAINT FK_SeatHold_Customer FOREIGN KEY (CustomerID) REFERENCES CUSTOMER(CustomerID)
+);
+GO
+
+CREATE NONCLUSTERED INDEX IX_SeatHold_HoldToken ON SEAT_HOLD(HoldToken) INCLUDE (ExpiresAt);
+CREATE NONCLUSTERED INDEX IX_SeatHold_ExpiresAt ON SEAT_HOLD(ExpiresAt);
+GO
+
+-- Holds are tiny and short-lived; keep the engine from escalating to a table lock
+ALTER TABLE SEAT_HOLD SET (LOCK_ESCALATION = DISABLE);
+GO
+
+PRINT 'Created SEAT_HOLD table.';
+GO
+
+-- =============================================
+-- SECTION 2: HOLD PROCEDURES
+-- =============================================
+
+PRINT ''
+PRINT '--- Section 2: Creating Seat Hold Procedures ---'
+GO
+
+-- =============================================
+-- SP: Hold Seats
+-- Purpose: Holds all requested seats for @HoldSeconds, or none of them.
+--          Returns one row: Status ('Held', 'Unavailable'), HoldToken, ExpiresAt.
+--          Pass an existing @HoldToken to add seats to a hold (it keeps one expiry).
+-- =============================================
+IF OBJECT_ID('sp_HoldSeats', 'P') IS NOT NULL
+    DROP PROCEDURE sp_HoldSeats;
+GO
+
+CREATE PROCEDURE sp_HoldSeats
+    @ShowID INT,
+    @SeatIDs VARCHAR(MAX), -- Comma-separated seat IDs
+    @CustomerID INT = NULL,
+    @HoldSeconds INT = 300,
+    @HoldToken UNIQUEIDENTIFIER = NULL OUTPUT,
+    @ExpiresAt DATETIME2(3) = NULL OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @Now DATETIME2(3) = SYSUTCDATETIME();
+    DECLARE @Requested INT;
+    DECLARE @Seats TABLE (SeatID INT PRIMARY KEY);
+
+    INSERT INTO @Seats (SeatID)
+    SELECT DISTINCT CAST(value AS INT) FROM STRING_SPLIT(@SeatIDs, ',');
+    SET @Requested = @@ROWCOUNT;
+
+    IF @Requested = 0
+    BEGIN
+        RAISERROR('No seats requested.', 16, 1);
+        RETURN;
+    END
+
+    IF NOT EXISTS (SELECT 1 FROM SHOW WHERE ShowID = @ShowID)
+    BEGIN
+        RAISERROR('Show does not exist.', 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (
+        SELECT 1
+        FROM @Seats S
+        LEFT JOIN SEAT ST ON ST.SeatID = S.SeatID
+            AND ST.ScreenID = (SELECT ScreenID FROM SHOW WHERE ShowID = @ShowID)
+        WHERE ST.SeatID IS NULL
+    )
+    BEGIN
+        RAISERROR('One or more seats are not on the show''s screen.', 16, 1);
+        RETURN;
+    END
+
+    IF @HoldToken IS NULL
+    BEGIN
+        SET @HoldToken = NEWID();
+        SET @ExpiresAt = DATEADD(SECOND, @HoldSeconds, @Now);
+    END
+    ELSE
+    BEGIN
+        IF EXISTS (SELECT 1 FROM SEAT_HOLD WHERE HoldToken = @HoldToken AND ShowID <> @ShowID)
+        BEGIN
+            RAISERROR('Hold token belongs to another show.', 16, 1);
+            RETURN;
+        END
+
+        IF EXISTS (SELECT 1 FROM SEAT_HOLD WHERE HoldToken = @HoldToken AND ISNULL(CustomerID, 0) <> ISNULL(@CustomerID, 0))
+        BEGIN
+            RAISERROR('Hold token belongs to another customer.', 16, 1);
+            RETURN;
+        END
+
+        SELECT @ExpiresAt = MIN(ExpiresAt) FROM SEAT_HOLD WHERE HoldToken = @HoldToken;
+        IF @ExpiresAt IS NULL OR @ExpiresAt <= @Now
+            SET @ExpiresAt = DATEADD(SECOND, @HoldSeconds, @Now);
+    END
+
+    BEGIN TRY
+        -- Sold seats are never held
+        IF EXISTS (
+            SELECT 1 FROM SEAT_BOOKING SB
+            INNER JOIN @Seats S ON SB.SeatID = S.SeatID
+            WHERE SB.ShowID = @ShowID
+        )
+        BEGIN
+            SELECT 'Unavailable' AS Status, CAST(NULL AS UNIQUEIDENTIFIER) AS HoldToken, CAST(NULL AS DATETIME2(3)) AS ExpiresAt;
+            RETURN;
+        END
+
+        BEGIN TRANSACTION;
+
+        -- Take over expired holds on the requested seats (row locks on existing keys only)
+        DELETE H
+        FROM SEAT_HOLD H WITH (ROWLOCK)
+        INNER JOIN @Seats S ON H.SeatID = S.SeatID
+        WHERE H.ShowID = @ShowID
+          AND H.ExpiresAt <= @Now;
+
+        -- Claim the seats; a live hold by anyone else makes the PK reject the insert
+        INSERT INTO SEAT_HOLD (ShowID, SeatID, HoldToken, CustomerID, HeldAt, ExpiresAt)
+        SELECT @ShowID, S.SeatID, @HoldToken, @CustomerID, @Now, @ExpiresAt
+        FROM @Seats S
+        WHERE NOT EXISTS (
+            SELECT 1 FROM SEAT_HOLD H
+            WHERE H.ShowID = @ShowID AND H.SeatID = S.SeatID AND H.HoldToken = @HoldToken
+        );
+
+        COMMIT TRANSACTION;
+
+        SELECT 'Held' AS Status, @HoldToken AS HoldToken, @ExpiresAt AS ExpiresAt;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        -- Another buyer holds at least one seat: report it, don't fail the caller
+        IF ERROR_NUMBER() IN (2627, 2601)
+        BEGIN
+            SELECT 'Unavailable' AS Status, CAST(NULL AS UNIQUEIDENTIFIER) AS HoldToken, CAST(NULL AS DATETIME2(3)) AS ExpiresAt;
+            RETURN;
+        END
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_HoldSeats procedure.';
+GO
+
+-- =============================================
+-- SP: Confirm Held Seats
+-- Purpose: Converts a live hold into a booking with payment through
+--          sp_CreateBookingWithPayment. Confirm-or-fail: returns one row with
+--          Status 'Booked' (with BookingID/PaymentID and the booked ShowID/SeatIDs),
+--          'Expired' (hold gone or lapsed), 'NotHeld' (the hold was taken for
+--          another customer) or 'SeatsSold' (a seat was booked while the hold was
+--          being taken; once a hold exists, sp_CreateBookingWithPayment and
+--          sp_CreateBookingsBulk refuse its seats).
+--          A hold taken without a customer can be confirmed by any customer.
+-- =============================================
+IF OBJECT_ID('sp_ConfirmHeldSeats', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ConfirmHeldSeats;
+GO
+
+CREATE PROCEDURE sp_ConfirmHeldSeats
+    @HoldToken UNIQUEIDENTIFIER,
+    @CustomerID INT,
+    @PaymentAmount DECIMAL(10,2),
+    @PaymentType VARCHAR(20), -- 'Card', 'Wallet', 'PayPal'
+    @CardNumber VARCHAR(16) = NULL,
+    @CardHolderName VARCHAR(100) = NULL,
+    @WalletType VARCHAR(50) = NULL,
+    @PayPalEmail VARCHAR(100) = NULL,
+    @BookingID INT = NULL OUTPUT,
+    @PaymentID INT = NULL OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @ErrorMessage NVARCHAR(4000);
+    DECLARE @ErrorSeverity INT;
+    DECLARE @ErrorState INT;
+    DECLARE @Now DATETIME2(3) = SYSUTCDATETIME();
+    DECLARE @ShowID INT;
+    DECLARE @EventID INT;
+    DECLARE @SeatIDs VARCHAR(MAX);
+    DECLARE @Held TABLE (ShowID INT, SeatID INT, ExpiresAt DATETIME2(3));
+
+    BEGIN TRY
+        BEGIN TRANSACTION;
+
+        -- Consume the hold; if the sweeper or another buyer got there first, it is gone
+        DELETE H
+        OUTPUT deleted.ShowID, deleted.SeatID, deleted.ExpiresAt INTO @Held
+        FROM SEAT_HOLD H WITH (ROWLOCK)
+        WHERE H.HoldToken = @HoldToken
+          AND (H.CustomerID = @CustomerID OR H.CustomerID IS NULL);
+
+        -- The hold is live but was taken for someone else: leave it in place
+        IF NOT EXISTS (SELECT 1 FROM @Held)
+           AND EXISTS (SELECT 1 FROM SEAT_HOLD WHERE HoldToken = @HoldToken AND ExpiresAt > @Now)
+        BEGIN
+            ROLLBACK TRANSACTION;
+            SELECT 'NotHeld' AS Status, CAST(NULL AS INT) AS BookingID, CAST(NULL AS INT) AS PaymentID,
+                   CAST(NULL AS INT) AS ShowID, CAST(NULL AS VARCHAR(MAX)) AS SeatIDs;
+            RETURN;
+        END
+
+        IF NOT EXISTS (SELECT 1 FROM @Held) OR EXISTS (SELECT 1 FROM @Held WHERE ExpiresAt <= @Now)
+        BEGIN
+            ROLLBACK TRANSACTION;
+            SELECT 'Expired' AS Status, CAST(NULL AS INT) AS BookingID, CAST(NULL AS INT) AS PaymentID,
+                   CAST(NULL AS INT) AS ShowID, CAST(NULL AS VARCHAR(MAX)) AS SeatIDs;
+            RETURN;
+        END
+
+        SELECT @ShowID = MIN(ShowID) FROM @Held;
+
+        IF EXISTS (
+            SELECT 1 FROM SEAT_BOOKING SB WITH (UPDLOCK, HOLDLOCK)
+            INNER JOIN @Held H ON SB.ShowID = H.ShowID AND SB.SeatID = H.SeatID
+        )
+        BEGIN
+            ROLLBACK TRANSACTION;
+            SELECT 'SeatsSold' AS Status, CAST(NULL AS INT) AS BookingID, CAST(NULL AS INT) AS PaymentID,
+                   CAST(NULL AS INT) AS ShowID, CAST(NULL AS VARCHAR(MAX)) AS SeatIDs;
+            RETURN;
+        END
+
+        SELECT @EventID = EventID FROM SHOW WHERE ShowID = @ShowID;
+        SELECT @SeatIDs = STRING_AGG(CAST(SeatID AS VARCHAR(MAX)), ',') FROM @Held;
+
+        EXEC sp_CreateBookingWithPayment
+            @CustomerID = @CustomerID,
+            @EventID = @EventID,
+            @ShowID = @ShowID,
+            @SeatIDs = @SeatIDs,
+            @PaymentAmount = @PaymentAmount,
+            @PaymentType = @PaymentType,
+            @CardNumber = @CardNumber,
+            @CardHolderName = @CardHolderName,
+            @WalletType = @WalletType,
+            @PayPalEmail = @PayPalEmail,
+            @BookingID = @BookingID OUTPUT,
+            @PaymentID = @PaymentID OUTPUT;
+
+        COMMIT TRANSACTION;
+
+        SELECT 'Booked' AS Status, @BookingID AS BookingID, @PaymentID AS PaymentID,
+               @ShowID AS ShowID, @SeatIDs AS SeatIDs;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+
+        SELECT @ErrorMessage = ERROR_MESSAGE(),
+               @ErrorSeverity = ERROR_SEVERITY(),
+               @ErrorState = ERROR_STATE();
+
+        RAISERROR(@ErrorMessage, @ErrorSeverity, @ErrorState);
+    END CATCH
+END;
+GO
+
+PRINT 'Created sp_ConfirmHeldSeats procedure.';
+GO
+
+-- =============================================
+-- SP: Release Seat Hold
+-- Purpose: Gives held seats back before expiry (checkout abandoned)
+-- =============================================
+IF OBJECT_ID('sp_ReleaseSeatHold', 'P') IS NOT NULL
+    DROP PROCEDURE sp_ReleaseSeatHold;
+GO
+
+CREATE PROCEDURE sp_ReleaseSeatHold
+    @HoldToken UNIQUEIDENTIFIER,
+    @SeatsReleased INT = NULL OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DELETE FROM SEAT_HOLD WITH (ROWLOCK)
+    WHERE HoldToken = @HoldToken;
+
+    SET @SeatsReleased = @@ROWCOUNT;
+END;
+GO
+
+PRINT 'Created sp_ReleaseSeatHold procedure.';
+GO
+
+-- =============================================
+-- SP: Sweep Expired Seat Holds
+-- Purpose: Purges lapsed holds in small batches. READPAST skips rows a buyer
+--          is touching right now, so the sweeper never blocks an on-sale.
+-- =============================================
+IF OBJECT_ID('sp_SweepExpiredSeatHolds', 'P') IS NOT NULL
+    DROP PROCEDURE sp_SweepExpiredSeatHolds;
+GO
+
+CREATE PROCEDURE sp_SweepExpiredSeatHolds
+    @BatchSize INT = 1000,
+    @SeatsSwept INT = NULL OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @Now DATETIME2(3) = SYSUTCDATETIME();
+    DECLARE @Deleted INT = 1;
+
+    SET @SeatsSwept = 0;
+
+    WHILE @Deleted > 0
+    BEGIN
+        DELETE TOP (@BatchSize)
+        FROM SEAT_HOLD WITH (ROWLOCK, READPAST)
+        WHERE ExpiresAt <= @Now;
+
+        SET @Deleted = @@ROWCOUNT;
+        SET @SeatsSwept += @Deleted;
+    END
+
+    SELECT @SeatsSwept AS SeatsSwept;
+END;
+GO
+
+PRINT 'Created sp_SweepExpiredSeatHolds procedure.';
+GO
+
+-- =============================================
+-- SECTION 3: SWEEPER SCHEDULE
+-- =============================================
+-- Run the sweeper from the CLI (python GUI/seat_holds.py --sweep) or SQL Server Agent:
+-- EXEC msdb.dbo.sp_add_job @job_name = N'EventBooking - Sweep Seat Holds';
+-- EXEC msdb.dbo.sp_add_jobstep @job_name = N'EventBooking - Sweep Seat Holds',
+--      @step_name = N'Sweep', @database_name = N'EventBookingSystem',
+--      @command = N'EXEC sp_SweepExpiredSeatHolds;';
+-- EXEC msdb.dbo.sp_add_jobschedule @job_name = N'EventBooking - Sweep Seat Holds',
+--      @name = N'Every minute', @freq_type = 4, @freq_interval = 1,
+--      @freq_subday_type = 4, @freq_subday_interval = 1;
+-- EXEC msdb.dbo.sp_add_jobserver @job_name = N'EventBooking - Sweep Seat Holds';
+
+PRINT ''
+PRINT '============================================='
+PRINT 'SEAT HOLD SCRIPT COMPLETED SUCCESSFULLY!'
+PRINT '============================================='
+GO